@@ -10,14 +10,22 @@ from __future__ import annotations
 
 import abc
 import logging
+from typing import Union
 
 from intrinsic.hardware.gripper.eoat import gripper_client
 from intrinsic.hardware.gripper.service.proto import generic_gripper_pb2
 from intrinsic.resources.proto import resource_handle_pb2
+from intrinsic.world.python import joint_mirror as joint_mirror_lib
 from intrinsic.world.python import object_world_client
 from intrinsic.world.python import object_world_resources
 import numpy as np
 
+# Target for gripper joint position updates. A JointMirror sends the updates
+# asynchronously instead of blocking on the world service.
+_JointPositionTarget = Union[
+    object_world_client.ObjectWorldClient, joint_mirror_lib.JointMirror
+]
+
 
 class Gripper(metaclass=abc.ABCMeta):
   """Gripper interface that communicates with grippers.
@@ -215,6 +223,7 @@ class PinchGripper(Gripper):
       gripper_handle: resource_handle_pb2.ResourceHandle,
       world: object_world_client.ObjectWorldClient,
       is_simulated: bool = False,
+      joint_mirror: joint_mirror_lib.JointMirror | None = None,
   ):
     """Constructor.
 
@@ -222,9 +231,13 @@ class PinchGripper(Gripper):
       gripper_handle: The resource handle of the gripper.
       world: The object world. Used for updating gripper joint positions.
       is_simulated: Whether the gripper is simulated.
+      joint_mirror: Optional JointMirror for 'world'. If set, gripper joint
+        positions are updated through it without blocking the caller.
     """
     self._is_simulated = is_simulated
-    self._world = world
+    self._joint_position_target: _JointPositionTarget = (
+        joint_mirror if joint_mirror is not None else world
+    )
     self._name = gripper_handle.name
 
     # Gripper object in the object world.
@@ -259,7 +272,7 @@ class PinchGripper(Gripper):
 
     # Update gripper joint positions in object world.
     _update_pinch_gripper_joint_positions(
-        self._world, "grasp", self._gripper_object
+        self._joint_position_target, "grasp", self._gripper_object
     )
 
   def release(self) -> None:
@@ -269,7 +282,7 @@ class PinchGripper(Gripper):
 
     # Update gripper joint positions in object world.
     _update_pinch_gripper_joint_positions(
-        self._world, "release", self._gripper_object
+        self._joint_position_target, "release", self._gripper_object
     )
 
   def gripping_indicated(self) -> bool:
@@ -326,6 +339,7 @@ class AdaptivePinchGripper(Gripper):
       gripper_handle: resource_handle_pb2.ResourceHandle,
       world: object_world_client.ObjectWorldClient,
       is_simulated: bool = False,
+      joint_mirror: joint_mirror_lib.JointMirror | None = None,
   ):
     """Constructor.
 
@@ -333,9 +347,13 @@ class AdaptivePinchGripper(Gripper):
       gripper_handle: The resource handle of the gripper.
       world: The object world. Used for updating gripper joint positions.
       is_simulated: Whether the gripper is simulated.
+      joint_mirror: Optional JointMirror for 'world'. If set, gripper joint
+        positions are updated through it without blocking the caller.
     """
     self._is_simulated = is_simulated
-    self._world = world
+    self._joint_position_target: _JointPositionTarget = (
+        joint_mirror if joint_mirror is not None else world
+    )
     self._name = gripper_handle.name
 
     # Gripper object in the object world.
@@ -370,7 +388,7 @@ class AdaptivePinchGripper(Gripper):
 
     # Update gripper joint positions in object world.
     # Adaptive pinch gripper is fully closed at its maximum position.
-    self._world.update_joint_positions(
+    self._joint_position_target.update_joint_positions(
         self._gripper_object,
         joint_positions=self._gripper_object.joint_application_limits.max_position.values,
     )
@@ -382,7 +400,7 @@ class AdaptivePinchGripper(Gripper):
 
     # Update gripper joint positions in object world.
     # Adaptive pinch gripper is fully open at its minimum position.
-    self._world.update_joint_positions(
+    self._joint_position_target.update_joint_positions(
         self._gripper_object,
         joint_positions=self._gripper_object.joint_application_limits.min_position.values,
     )
@@ -459,7 +477,7 @@ class AdaptivePinchGripper(Gripper):
       )
 
     if gripper_joint_position is not None:
-      self._world.update_joint_positions(
+      self._joint_position_target.update_joint_positions(
           self._gripper_object,
           joint_positions=list(gripper_joint_position),
       )
@@ -477,7 +495,7 @@ class AdaptivePinchGripper(Gripper):
 
 
 def _update_pinch_gripper_joint_positions(
-    world: object_world_client.ObjectWorldClient,
+    world: _JointPositionTarget,
     command: str,
     gripper_object: object_world_resources.KinematicObject,
 ):
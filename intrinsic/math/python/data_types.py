@@ -21,6 +21,8 @@ Quaternion = quaternion.Quaternion
 class Twist:
   """A class which represents a twist with linear and angular components."""
 
+  __slots__ = ('linear', 'angular')
+
   def __init__(
       self,
       linear: Optional[VECTOR_TYPE] = None,
@@ -66,6 +68,8 @@ class Twist:
 class Wrench:
   """A class which represents a wrench with force and torque components."""
 
+  __slots__ = ('force', 'torque')
+
   def __init__(
       self,
       force: Optional[VECTOR_TYPE] = None,
@@ -111,6 +115,8 @@ class Wrench:
 class Stiffness:
   """A class which represents stiffness."""
 
+  __slots__ = ('linear', 'torsional', 'matrix6x6')
+
   def __init__(
       self,
       linear: Optional[VECTOR_TYPE] = None,
@@ -205,11 +211,10 @@ def pose3_to_transform(pose: Pose3) -> cart_space_pb2.Transform:
   Returns:
     A Transform proto object.
   """
+  tx, ty, tz, qx, qy, qz, qw = pose.vec7.tolist()
   return cart_space_pb2.Transform(
-      pos=cart_space_pb2.Point(x=pose.vec7[0], y=pose.vec7[1], z=pose.vec7[2]),
-      rot=cart_space_pb2.Rotation(
-          qx=pose.vec7[3], qy=pose.vec7[4], qz=pose.vec7[5], qw=pose.vec7[6]
-      ),
+      pos=cart_space_pb2.Point(x=tx, y=ty, z=tz),
+      rot=cart_space_pb2.Rotation(qx=qx, qy=qy, qz=qz, qw=qw),
   )
 
 
@@ -48,6 +48,15 @@ class TypesTest(absltest.TestCase):
     else:
       self.fail('A ValueError is expected when matrix6x6 shape is invalid.')
 
+  def test_value_types_have_no_instance_dict(self):
+    for value in (
+        data_types.Twist(),
+        data_types.Wrench(),
+        data_types.Stiffness.from_scalar(1.0),
+    ):
+      with self.subTest(value=type(value).__name__):
+        self.assertFalse(hasattr(value, '__dict__'))
+
   def test_vec6_to_pose3(self):
     pose = data_types.vec6_to_pose3([1.0, 2.0, 3.0, 0.5, 0.2, 0.4])
 
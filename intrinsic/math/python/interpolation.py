@@ -0,0 +1,438 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Vectorized interpolation of rotations, translations and poses (python3).
+
+The functions operate on numpy arrays of quaternions [x, y, z, w] and
+translations and broadcast over leading dimensions, so that densifying or
+resampling a trajectory with thousands of waypoints does not require a Python
+loop over Quaternion or Pose3 objects:
+
+  times = np.linspace(0.0, 1.0, len(waypoints))
+  dense_poses = interpolation.resample_poses(
+      times, waypoints, np.linspace(0.0, 1.0, 10000),
+      translation_method=interpolation.CUBIC,
+  )
+  evenly_spaced_poses = interpolation.resample_by_arc_length(waypoints, 100)
+
+Waypoints can be given as a Pose3Array or as a sequence of Pose3 objects.
+"""
+
+from typing import Sequence, Text, Union
+
+from intrinsic.math.python import pose3
+from intrinsic.math.python import pose3_array
+from intrinsic.math.python import rotation3
+from intrinsic.math.python import rotation3_array
+import numpy as np
+
+# ----------------------------------------------------------------------------
+# Interpolation methods.
+LINEAR = 'linear'
+CUBIC = 'cubic'
+SLERP = 'slerp'
+NLERP = 'nlerp'
+
+# ----------------------------------------------------------------------------
+# Error messages for exceptions.
+TIMES_INVALID_MESSAGE = 'Times should be a strictly increasing (N,) array'
+LENGTH_MISMATCH_MESSAGE = 'Times and waypoints should have the same length'
+NO_WAYPOINTS_MESSAGE = 'At least one waypoint is required'
+UNKNOWN_METHOD_MESSAGE = 'Unknown interpolation method'
+
+# Below this angle between two quaternions SLERP falls back to NLERP, which
+# agrees with it to machine precision and avoids dividing by sin(angle) ~ 0.
+_SLERP_MIN_ANGLE = 1e-6
+
+PosesType = Union[pose3_array.Pose3Array, Sequence[pose3.Pose3]]
+
+
+def lerp(start: np.ndarray, end: np.ndarray, fraction) -> np.ndarray:
+  """Linearly interpolates between arrays of vectors.
+
+  Args:
+    start: Start vectors with shape (..., D).
+    end: End vectors with shape (..., D).
+    fraction: Interpolation parameters with shape (...), where 0 gives start
+      and 1 gives end.
+
+  Returns:
+    The interpolated vectors with the broadcast shape (..., D).
+  """
+  fraction = np.asarray(fraction, dtype=np.float64)[..., np.newaxis]
+  start = np.asarray(start, dtype=np.float64)
+  return start + fraction * (np.asarray(end, dtype=np.float64) - start)
+
+
+def nlerp(start_xyzw: np.ndarray, end_xyzw: np.ndarray, fraction) -> np.ndarray:
+  """Normalized linear interpolation between arrays of quaternions.
+
+  Faster than slerp(), but the angular velocity is not constant over the
+  interpolation.  Like slerp(), follows the shorter of the two arcs.
+
+  Args:
+    start_xyzw: Non-zero start quaternions with shape (..., 4).
+    end_xyzw: Non-zero end quaternions with shape (..., 4).
+    fraction: Interpolation parameters with shape (...), where 0 gives start
+      and 1 gives end.
+
+  Returns:
+    The interpolated unit quaternions with the broadcast shape (..., 4).
+  """
+  start_xyzw, end_xyzw = _normalized_same_hemisphere(start_xyzw, end_xyzw)
+  return rotation3_array.normalized_quaternions(
+      lerp(start_xyzw, end_xyzw, fraction)
+  )
+
+
+def slerp(start_xyzw: np.ndarray, end_xyzw: np.ndarray, fraction) -> np.ndarray:
+  """Spherical linear interpolation between arrays of quaternions.
+
+  Rotates with constant angular velocity about a fixed axis from start to end
+  along the shorter of the two arcs.
+
+  Args:
+    start_xyzw: Non-zero start quaternions with shape (..., 4).
+    end_xyzw: Non-zero end quaternions with shape (..., 4).
+    fraction: Interpolation parameters with shape (...), where 0 gives start
+      and 1 gives end.
+
+  Returns:
+    The interpolated unit quaternions with the broadcast shape (..., 4).
+  """
+  start_xyzw, end_xyzw = _normalized_same_hemisphere(start_xyzw, end_xyzw)
+  fraction = np.asarray(fraction, dtype=np.float64)[..., np.newaxis]
+  cos_angle = np.minimum(
+      np.sum(start_xyzw * end_xyzw, axis=-1, keepdims=True), 1.0
+  )
+  angle = np.arccos(cos_angle)
+  small = angle < _SLERP_MIN_ANGLE
+  sin_angle = np.where(small, 1.0, np.sin(angle))
+  start_weight = np.where(
+      small, 1.0 - fraction, np.sin((1.0 - fraction) * angle) / sin_angle
+  )
+  end_weight = np.where(small, fraction, np.sin(fraction * angle) / sin_angle)
+  return rotation3_array.normalized_quaternions(
+      start_weight * start_xyzw + end_weight * end_xyzw
+  )
+
+
+def interpolate_rotation(
+    start: rotation3.Rotation3,
+    end: rotation3.Rotation3,
+    fraction: float,
+    method: Text = SLERP,
+) -> rotation3.Rotation3:
+  """Interpolates between two rotations.
+
+  Args:
+    start: Rotation at fraction 0.
+    end: Rotation at fraction 1.
+    fraction: Interpolation parameter.
+    method: SLERP or NLERP.
+
+  Returns:
+    The interpolated rotation.
+
+  Raises:
+    ValueError: If the method is unknown.
+  """
+  xyzw = _rotation_function(method)(
+      start.quaternion.xyzw, end.quaternion.xyzw, fraction
+  )
+  return rotation3.Rotation3.from_xyzw(xyzw)
+
+
+def interpolate_pose(
+    start: pose3.Pose3,
+    end: pose3.Pose3,
+    fraction: float,
+    rotation_method: Text = SLERP,
+) -> pose3.Pose3:
+  """Interpolates between two poses.
+
+  The translation is interpolated linearly and the rotation with the given
+  method, independently of each other.
+
+  Args:
+    start: Pose at fraction 0.
+    end: Pose at fraction 1.
+    fraction: Interpolation parameter.
+    rotation_method: SLERP or NLERP.
+
+  Returns:
+    The interpolated pose.
+
+  Raises:
+    ValueError: If the method is unknown.
+  """
+  return pose3.Pose3(
+      rotation=interpolate_rotation(
+          start.rotation, end.rotation, fraction, method=rotation_method
+      ),
+      translation=lerp(start.translation, end.translation, fraction),
+  )
+
+
+def resample_translations(
+    times: np.ndarray,
+    translations: np.ndarray,
+    query_times: np.ndarray,
+    method: Text = LINEAR,
+) -> np.ndarray:
+  """Interpolates waypoint translations at the query times.
+
+  The CUBIC method uses a cubic Hermite spline with Catmull-Rom tangents, which
+  passes through all waypoints and has a continuous velocity.  Query times
+  outside of [times[0], times[-1]] are clamped to that interval.
+
+  Args:
+    times: Strictly increasing (N,) waypoint times.
+    translations: (N, D) waypoint translations.
+    query_times: (M,) times at which to evaluate the trajectory.
+    method: LINEAR or CUBIC.
+
+  Returns:
+    The (M, D) interpolated translations.
+
+  Raises:
+    ValueError: If the times are invalid, the lengths do not match or the
+      method is unknown.
+  """
+  times = _check_times(times, len(translations))
+  translations = np.asarray(translations, dtype=np.float64)
+  if method not in (LINEAR, CUBIC):
+    raise ValueError('%s: %r' % (UNKNOWN_METHOD_MESSAGE, method))
+  if len(times) == 1:
+    return np.repeat(translations, len(np.atleast_1d(query_times)), axis=0)
+  segment, fraction = _segments_and_fractions(times, query_times)
+  start = translations[segment]
+  end = translations[segment + 1]
+  if method == LINEAR:
+    return lerp(start, end, fraction)
+  tangents = _catmull_rom_tangents(times, translations)
+  durations = (times[segment + 1] - times[segment])[:, np.newaxis]
+  s = fraction[:, np.newaxis]
+  s2 = s * s
+  s3 = s2 * s
+  return (
+      (2 * s3 - 3 * s2 + 1) * start
+      + (s3 - 2 * s2 + s) * durations * tangents[segment]
+      + (3 * s2 - 2 * s3) * end
+      + (s3 - s2) * durations * tangents[segment + 1]
+  )
+
+
+def resample_quaternions(
+    times: np.ndarray,
+    xyzw: np.ndarray,
+    query_times: np.ndarray,
+    method: Text = SLERP,
+) -> np.ndarray:
+  """Interpolates waypoint quaternions at the query times.
+
+  Consecutive waypoints are interpolated along the shorter arc.  Query times
+  outside of [times[0], times[-1]] are clamped to that interval.
+
+  Args:
+    times: Strictly increasing (N,) waypoint times.
+    xyzw: (N, 4) non-zero waypoint quaternions.
+    query_times: (M,) times at which to evaluate the trajectory.
+    method: SLERP or NLERP.
+
+  Returns:
+    The (M, 4) interpolated unit quaternions.
+
+  Raises:
+    ValueError: If the times are invalid, the lengths do not match or the
+      method is unknown.
+  """
+  times = _check_times(times, len(xyzw))
+  xyzw = np.asarray(xyzw, dtype=np.float64)
+  interpolate = _rotation_function(method)
+  if len(times) == 1:
+    return np.repeat(
+        rotation3_array.normalized_quaternions(xyzw),
+        len(np.atleast_1d(query_times)),
+        axis=0,
+    )
+  segment, fraction = _segments_and_fractions(times, query_times)
+  return interpolate(xyzw[segment], xyzw[segment + 1], fraction)
+
+
+def resample_poses(
+    times: np.ndarray,
+    poses: PosesType,
+    query_times: np.ndarray,
+    translation_method: Text = LINEAR,
+    rotation_method: Text = SLERP,
+) -> pose3_array.Pose3Array:
+  """Interpolates a trajectory of waypoint poses at the query times.
+
+  Translations and rotations are interpolated independently, see
+  resample_translations() and resample_quaternions().
+
+  Args:
+    times: Strictly increasing (N,) waypoint times.
+    poses: The N waypoint poses.
+    query_times: (M,) times at which to evaluate the trajectory.
+    translation_method: LINEAR or CUBIC.
+    rotation_method: SLERP or NLERP.
+
+  Returns:
+    The M interpolated poses.
+
+  Raises:
+    ValueError: If the times are invalid, the lengths do not match or a method
+      is unknown.
+  """
+  poses = _as_pose3_array(poses)
+  translation = resample_translations(
+      times, poses.translation, query_times, method=translation_method
+  )
+  xyzw = resample_quaternions(
+      times, poses.rotation.xyzw, query_times, method=rotation_method
+  )
+  return pose3_array.Pose3Array._from_trusted_arrays(xyzw, translation)  # pylint: disable=protected-access
+
+
+def cumulative_arc_length(
+    poses: PosesType, rotation_weight: float = 0.0
+) -> np.ndarray:
+  """Returns the arc length from the first waypoint to each waypoint.
+
+  The length of the segment between two waypoints is the distance between
+  their translations plus rotation_weight times the angle between their
+  rotations in radians.  With the default weight of zero only the translation
+  contributes.
+
+  Args:
+    poses: The N waypoint poses.
+    rotation_weight: Length per radian of rotation, e.g. the radius of the
+      tool if rotations should count like the distance traveled by its tip.
+
+  Returns:
+    The non-decreasing (N,) cumulative arc lengths, starting at 0.
+
+  Raises:
+    ValueError: If there are no poses.
+  """
+  poses = _as_pose3_array(poses)
+  translation = poses.translation
+  segment_lengths = np.linalg.norm(np.diff(translation, axis=0), axis=1)
+  if rotation_weight:
+    xyzw = rotation3_array.normalized_quaternions(poses.rotation.xyzw)
+    cos_half_angle = np.abs(np.sum(xyzw[:-1] * xyzw[1:], axis=1))
+    segment_lengths += (
+        rotation_weight * 2 * np.arccos(np.minimum(cos_half_angle, 1.0))
+    )
+  return np.concatenate(([0.0], np.cumsum(segment_lengths)))
+
+
+def resample_by_arc_length(
+    poses: PosesType,
+    num_samples: int,
+    rotation_weight: float = 0.0,
+    rotation_method: Text = SLERP,
+) -> pose3_array.Pose3Array:
+  """Resamples a path of waypoints at evenly spaced arc lengths.
+
+  The path is the piecewise linear interpolation of the waypoints.  The first
+  and last samples are the first and last waypoints.  Waypoints that coincide
+  with their predecessor do not contribute to the path.
+
+  Args:
+    poses: The N waypoint poses.
+    num_samples: Number of samples.
+    rotation_weight: Length per radian of rotation, see cumulative_arc_length().
+    rotation_method: SLERP or NLERP.
+
+  Returns:
+    The num_samples resampled poses.
+
+  Raises:
+    ValueError: If there are no poses or the method is unknown.
+  """
+  poses = _as_pose3_array(poses)
+  arc_length = cumulative_arc_length(poses, rotation_weight=rotation_weight)
+  # Drops zero-length segments, so that the arc length is strictly increasing.
+  keep = np.concatenate(([True], np.diff(arc_length) > 0))
+  query_arc_length = np.linspace(0.0, arc_length[-1], num_samples)
+  return resample_poses(
+      arc_length[keep],
+      poses[keep],
+      query_arc_length,
+      rotation_method=rotation_method,
+  )
+
+
+def _as_pose3_array(poses: PosesType) -> pose3_array.Pose3Array:
+  """Returns the poses as a Pose3Array with at least one element."""
+  if not isinstance(poses, pose3_array.Pose3Array):
+    poses = pose3_array.Pose3Array.from_poses(poses)
+  if not len(poses):  # pylint: disable=g-explicit-length-test
+    raise ValueError(NO_WAYPOINTS_MESSAGE)
+  return poses
+
+
+def _check_times(times: np.ndarray, num_waypoints: int) -> np.ndarray:
+  """Validates the waypoint times and returns them as a float64 array."""
+  times = np.asarray(times, dtype=np.float64)
+  if num_waypoints < 1:
+    raise ValueError(NO_WAYPOINTS_MESSAGE)
+  if times.ndim != 1 or np.any(np.diff(times) <= 0):
+    raise ValueError('%s: %r' % (TIMES_INVALID_MESSAGE, times))
+  if len(times) != num_waypoints:
+    raise ValueError(
+        '%s: %d != %d' % (LENGTH_MISMATCH_MESSAGE, len(times), num_waypoints)
+    )
+  return times
+
+
+def _segments_and_fractions(times: np.ndarray, query_times: np.ndarray):
+  """Returns the segment index and fraction within it of each query time."""
+  query_times = np.clip(
+      np.atleast_1d(np.asarray(query_times, dtype=np.float64)),
+      times[0],
+      times[-1],
+  )
+  segment = np.clip(
+      np.searchsorted(times, query_times, side='right') - 1, 0, len(times) - 2
+  )
+  fraction = (query_times - times[segment]) / (
+      times[segment + 1] - times[segment]
+  )
+  return segment, fraction
+
+
+def _catmull_rom_tangents(times: np.ndarray, values: np.ndarray) -> np.ndarray:
+  """Returns the finite difference tangents of values at the waypoints."""
+  tangents = np.empty_like(values)
+  tangents[1:-1] = (values[2:] - values[:-2]) / (times[2:] - times[:-2])[
+      :, np.newaxis
+  ]
+  tangents[0] = (values[1] - values[0]) / (times[1] - times[0])
+  tangents[-1] = (values[-1] - values[-2]) / (times[-1] - times[-2])
+  return tangents
+
+
+def _normalized_same_hemisphere(start_xyzw: np.ndarray, end_xyzw: np.ndarray):
+  """Normalizes the quaternions and flips end to the hemisphere of start."""
+  start_xyzw = rotation3_array.normalized_quaternions(
+      np.asarray(start_xyzw, dtype=np.float64)
+  )
+  end_xyzw = rotation3_array.normalized_quaternions(
+      np.asarray(end_xyzw, dtype=np.float64)
+  )
+  sign = np.where(
+      np.sum(start_xyzw * end_xyzw, axis=-1, keepdims=True) < 0, -1.0, 1.0
+  )
+  return start_xyzw, sign * end_xyzw
+
+
+def _rotation_function(method: Text):
+  """Returns slerp or nlerp for the method name."""
+  if method == SLERP:
+    return slerp
+  if method == NLERP:
+    return nlerp
+  raise ValueError('%s: %r' % (UNKNOWN_METHOD_MESSAGE, method))
@@ -0,0 +1,241 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.math.python.interpolation."""
+
+import math
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from intrinsic.math.python import interpolation
+from intrinsic.math.python import math_test
+from intrinsic.math.python import pose3
+from intrinsic.math.python import pose3_array
+from intrinsic.math.python import rotation3
+import numpy as np
+
+_TEST_ROTATIONS = [rotation for _, rotation in math_test.make_named_rotations()]
+
+
+class InterpolationTest(parameterized.TestCase, math_test.TestCase):
+
+  @parameterized.parameters(interpolation.SLERP, interpolation.NLERP)
+  def test_interpolate_rotation_end_points(self, method):
+    for start in _TEST_ROTATIONS:
+      for end in _TEST_ROTATIONS:
+        self.assert_rotation_close(
+            interpolation.interpolate_rotation(start, end, 0.0, method), start
+        )
+        self.assert_rotation_close(
+            interpolation.interpolate_rotation(start, end, 1.0, method), end
+        )
+
+  @parameterized.parameters(0.0, 0.25, 0.5, 0.8, 1.0)
+  def test_slerp_has_constant_angular_velocity(self, fraction):
+    axis = np.array([1.0, 2.0, 3.0])
+    start = rotation3.Rotation3.from_axis_angle(axis, 0.2)
+    end = rotation3.Rotation3.from_axis_angle(axis, 2.2)
+    self.assert_rotation_close(
+        interpolation.interpolate_rotation(start, end, fraction),
+        rotation3.Rotation3.from_axis_angle(axis, 0.2 + 2.0 * fraction),
+    )
+
+  def test_slerp_takes_shorter_arc(self):
+    start = rotation3.Rotation3.from_axis_angle((0, 0, 1), 0.1)
+    # The same rotation as 0.3 radians, but with the negated quaternion.
+    end = rotation3.Rotation3.from_xyzw(
+        -rotation3.Rotation3.from_axis_angle((0, 0, 1), 0.3).quaternion.xyzw
+    )
+    self.assert_rotation_close(
+        interpolation.interpolate_rotation(start, end, 0.5),
+        rotation3.Rotation3.from_axis_angle((0, 0, 1), 0.2),
+    )
+
+  def test_slerp_of_nearly_equal_quaternions(self):
+    start = np.array([0.0, 0.0, 0.0, 1.0])
+    end = np.array([1e-9, 0.0, 0.0, 1.0])
+    xyzw = interpolation.slerp(start, end, 0.5)
+    self.assertTrue(np.all(np.isfinite(xyzw)))
+    self.assert_all_close(xyzw, [5e-10, 0.0, 0.0, 1.0])
+
+  def test_slerp_broadcasts(self):
+    starts = np.array([rotation.quaternion.xyzw for rotation in _TEST_ROTATIONS])
+    end = rotation3.Rotation3.from_axis_angle((1, 0, 0), 1.0)
+    xyzw = interpolation.slerp(starts, end.quaternion.xyzw, 0.3)
+    self.assertEqual(xyzw.shape, starts.shape)
+    for i, start in enumerate(_TEST_ROTATIONS):
+      self.assert_rotation_close(
+          rotation3.Rotation3.from_xyzw(xyzw[i]),
+          interpolation.interpolate_rotation(start, end, 0.3),
+      )
+
+  def test_interpolate_pose(self):
+    start = pose3.Pose3(
+        rotation3.Rotation3.from_axis_angle((0, 1, 0), 0.0), (0, 0, 0)
+    )
+    end = pose3.Pose3(
+        rotation3.Rotation3.from_axis_angle((0, 1, 0), 1.0), (2, 4, 6)
+    )
+    self.assert_pose_close(
+        interpolation.interpolate_pose(start, end, 0.5),
+        pose3.Pose3(
+            rotation3.Rotation3.from_axis_angle((0, 1, 0), 0.5), (1, 2, 3)
+        ),
+    )
+
+  def test_resample_translations_linear(self):
+    times = np.array([0.0, 1.0, 3.0])
+    translations = np.array([[0.0, 0.0], [1.0, 2.0], [3.0, 2.0]])
+    resampled = interpolation.resample_translations(
+        times, translations, [-1.0, 0.5, 1.0, 2.0, 4.0]
+    )
+    self.assert_all_close(
+        resampled, [[0, 0], [0.5, 1.0], [1.0, 2.0], [2.0, 2.0], [3.0, 2.0]]
+    )
+
+  def test_resample_translations_cubic_passes_through_waypoints(self):
+    times = np.array([0.0, 0.5, 1.5, 2.0, 4.0])
+    translations = np.random.default_rng(0).uniform(size=(5, 3))
+    resampled = interpolation.resample_translations(
+        times, translations, times, method=interpolation.CUBIC
+    )
+    self.assert_all_close(resampled, translations)
+
+  def test_resample_translations_cubic_reproduces_straight_lines(self):
+    times = np.array([0.0, 1.0, 2.0, 3.0])
+    translations = np.outer(times, [1.0, -2.0, 0.5])
+    query_times = np.linspace(0.0, 3.0, 31)
+    resampled = interpolation.resample_translations(
+        times, translations, query_times, method=interpolation.CUBIC
+    )
+    self.assert_all_close(resampled, np.outer(query_times, [1.0, -2.0, 0.5]))
+
+  def test_resample_poses_matches_interpolate_pose(self):
+    poses = [
+        pose3.Pose3(rotation, (i, 2 * i, -i))
+        for i, rotation in enumerate(_TEST_ROTATIONS)
+    ]
+    times = np.arange(len(poses), dtype=np.float64)
+    query_times = np.linspace(0.0, times[-1], 4 * len(poses))
+    resampled = interpolation.resample_poses(times, poses, query_times)
+    self.assertIsInstance(resampled, pose3_array.Pose3Array)
+    self.assertLen(resampled, len(query_times))
+    for i, query_time in enumerate(query_times):
+      segment = min(int(query_time), len(poses) - 2)
+      self.assert_pose_close(
+          resampled[i],
+          interpolation.interpolate_pose(
+              poses[segment], poses[segment + 1], query_time - segment
+          ),
+      )
+
+  def test_resample_single_waypoint(self):
+    pose = pose3.Pose3(_TEST_ROTATIONS[-1], (1, 2, 3))
+    resampled = interpolation.resample_poses([0.0], [pose], [-1.0, 0.0, 1.0])
+    self.assertLen(resampled, 3)
+    self.assertTrue(resampled.almost_equal(pose))
+
+  @parameterized.named_parameters(
+      ('not_increasing', [0.0, 1.0, 1.0]),
+      ('wrong_length', [0.0, 1.0]),
+      ('not_vector', [[0.0, 1.0, 2.0]]),
+  )
+  def test_resample_invalid_times_raises(self, times):
+    with self.assertRaises(ValueError):
+      interpolation.resample_poses(
+          times, pose3_array.Pose3Array.identity(3), [0.5]
+      )
+
+  def test_resample_unknown_method_raises(self):
+    with self.assertRaises(ValueError):
+      interpolation.resample_poses(
+          [0.0, 1.0],
+          pose3_array.Pose3Array.identity(2),
+          [0.5],
+          rotation_method='squad',
+      )
+    with self.assertRaises(ValueError):
+      interpolation.resample_translations(
+          [0.0, 1.0], np.zeros((2, 3)), [0.5], method='quintic'
+      )
+
+  def test_resample_no_waypoints_raises(self):
+    with self.assertRaises(ValueError):
+      interpolation.resample_by_arc_length([], 10)
+
+  def test_cumulative_arc_length(self):
+    poses = [
+        pose3.Pose3(translation=(0, 0, 0)),
+        pose3.Pose3(translation=(3, 4, 0)),
+        pose3.Pose3(
+            rotation3.Rotation3.from_axis_angle((0, 0, 1), 0.5), (3, 4, 1)
+        ),
+    ]
+    self.assert_all_close(
+        interpolation.cumulative_arc_length(poses), [0.0, 5.0, 6.0]
+    )
+    self.assert_all_close(
+        interpolation.cumulative_arc_length(poses, rotation_weight=2.0),
+        [0.0, 5.0, 7.0],
+    )
+
+  def test_resample_by_arc_length_is_evenly_spaced(self):
+    poses = [
+        pose3.Pose3(translation=(0, 0, 0)),
+        pose3.Pose3(translation=(1, 0, 0)),
+        pose3.Pose3(translation=(1, 0, 0)),
+        pose3.Pose3(translation=(1, 3, 0)),
+    ]
+    resampled = interpolation.resample_by_arc_length(poses, 9)
+    self.assert_all_close(
+        np.linalg.norm(np.diff(resampled.translation, axis=0), axis=1),
+        np.full(8, 0.5),
+    )
+    self.assert_all_close(resampled.translation[0], (0, 0, 0))
+    self.assert_all_close(resampled.translation[-1], (1, 3, 0))
+
+  def test_resample_by_arc_length_of_rotation_only_path(self):
+    axis = (0, 0, 1)
+    poses = [
+        pose3.Pose3(rotation3.Rotation3.from_axis_angle(axis, angle))
+        for angle in (0.0, 0.5, 2.0)
+    ]
+    resampled = interpolation.resample_by_arc_length(
+        poses, 5, rotation_weight=1.0
+    )
+    for i, pose in enumerate(resampled):
+      self.assert_pose_close(
+          pose,
+          pose3.Pose3(rotation3.Rotation3.from_axis_angle(axis, 0.5 * i)),
+      )
+
+  def test_resample_by_arc_length_of_constant_path(self):
+    pose = pose3.Pose3(_TEST_ROTATIONS[1], (1, 2, 3))
+    resampled = interpolation.resample_by_arc_length([pose, pose], 3)
+    self.assertLen(resampled, 3)
+    self.assertTrue(resampled.almost_equal(pose))
+
+  def test_resample_large_trajectory(self):
+    num_waypoints = 10000
+    angles = np.linspace(0.0, 2 * math.pi, num_waypoints)
+    xyzw = np.zeros((num_waypoints, 4))
+    xyzw[:, 2] = np.sin(angles / 2)
+    xyzw[:, 3] = np.cos(angles / 2)
+    translation = np.stack(
+        (np.cos(angles), np.sin(angles), np.zeros(num_waypoints)), axis=1
+    )
+    poses = pose3_array.Pose3Array.from_vec7(np.hstack((translation, xyzw)))
+    resampled = interpolation.resample_poses(
+        angles,
+        poses,
+        np.linspace(0.0, 2 * math.pi, 3 * num_waypoints),
+        translation_method=interpolation.CUBIC,
+    )
+    self.assertLen(resampled, 3 * num_waypoints)
+    self.assert_all_close(
+        np.linalg.norm(resampled.translation, axis=1),
+        np.ones(3 * num_waypoints),
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
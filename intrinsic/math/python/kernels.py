@@ -0,0 +1,231 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Kernels for the quaternion and pose arithmetic of the math value types.
+
+The value types call these kernels for their hot operations.  If numba is
+installed, the kernels are compiled to machine code on first use, which removes
+the interpreter overhead of the arithmetic.  Otherwise the fallback runs the
+same kernel source as plain Python on Python floats, which for four- and
+seven-element vectors is faster than numpy operations on tiny arrays, except
+for the conjugate, where a single numpy multiplication is fastest.
+
+All kernels take float64 numpy arrays and return new float64 numpy arrays.
+They do not validate their inputs; callers are responsible for passing
+finite values and non-zero quaternions with the documented shapes.
+
+Set the environment variable INTRINSIC_MATH_DISABLE_COMPILED_KERNELS to a
+non-empty value to use the fallback even if numba is installed.
+"""
+
+import dataclasses
+import math
+import os
+from typing import Callable, Optional
+
+import numpy as np
+
+try:
+  # pytype: disable=import-error
+  # pylint: disable=g-import-not-at-top
+  import numba
+  # pytype: enable=import-error
+  # pylint: enable=g-import-not-at-top
+except ImportError:
+  numba = None
+
+# Environment variable which disables the compiled kernels.
+DISABLE_COMPILED_KERNELS_ENV_VAR = 'INTRINSIC_MATH_DISABLE_COMPILED_KERNELS'
+
+# The kernel source below is restricted to scalar arithmetic, indexing and
+# np.empty, so that numba can compile it in nopython mode and plain Python can
+# run it on lists of floats.
+
+
+def _quaternion_multiply(lhs, rhs):
+  """Returns the quaternion product lhs * rhs of two [x, y, z, w] vectors."""
+  x1, y1, z1, w1 = lhs[0], lhs[1], lhs[2], lhs[3]
+  x2, y2, z2, w2 = rhs[0], rhs[1], rhs[2], rhs[3]
+  result = np.empty(4)
+  result[0] = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+  result[1] = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+  result[2] = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+  result[3] = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+  return result
+
+
+def _quaternion_conjugate(xyzw):
+  """Returns the conjugate [-x, -y, -z, w] of the quaternion."""
+  result = np.empty(4)
+  result[0] = -xyzw[0]
+  result[1] = -xyzw[1]
+  result[2] = -xyzw[2]
+  result[3] = xyzw[3]
+  return result
+
+
+def _quaternion_normalize(xyzw):
+  """Returns the non-zero quaternion scaled to magnitude 1."""
+  x, y, z, w = xyzw[0], xyzw[1], xyzw[2], xyzw[3]
+  norm = math.sqrt(x * x + y * y + z * z + w * w)
+  result = np.empty(4)
+  result[0] = x / norm
+  result[1] = y / norm
+  result[2] = z / norm
+  result[3] = w / norm
+  return result
+
+
+def _quaternion_rotate(xyzw, point):
+  """Rotates the point by the non-zero quaternion, (q * p * q^-1).
+
+  Uses the same closed form as rotation3.rotate_point_values(), which is exact
+  for quaternions that are not normalized.
+
+  Args:
+    xyzw: Components of a non-zero quaternion with real component last.
+    point: The point to be rotated.
+
+  Returns:
+    The rotated point.
+  """
+  x, y, z, w = xyzw[0], xyzw[1], xyzw[2], xyzw[3]
+  px, py, pz = point[0], point[1], point[2]
+  v_dot_v = x * x + y * y + z * z
+  scale = 1.0 / (v_dot_v + w * w)
+  a = (w * w - v_dot_v) * scale
+  b = 2.0 * (x * px + y * py + z * pz) * scale
+  c = 2.0 * w * scale
+  result = np.empty(3)
+  result[0] = a * px + b * x + c * (y * pz - z * py)
+  result[1] = a * py + b * y + c * (z * px - x * pz)
+  result[2] = a * pz + b * z + c * (x * py - y * px)
+  return result
+
+
+def _pose_multiply(lhs, rhs):
+  """Returns the composition lhs * rhs of two poses in vec7 representation.
+
+  Fuses rotating the translation of rhs by the rotation of lhs with the
+  quaternion product, see _quaternion_rotate() and _quaternion_multiply().
+
+  Args:
+    lhs: Left hand side pose as [tx, ty, tz, qx, qy, qz, qw].
+    rhs: Right hand side pose as [tx, ty, tz, qx, qy, qz, qw].
+
+  Returns:
+    The product as [tx, ty, tz, qx, qy, qz, qw].
+  """
+  x1, y1, z1, w1 = lhs[3], lhs[4], lhs[5], lhs[6]
+  x2, y2, z2, w2 = rhs[3], rhs[4], rhs[5], rhs[6]
+  px, py, pz = rhs[0], rhs[1], rhs[2]
+  v_dot_v = x1 * x1 + y1 * y1 + z1 * z1
+  scale = 1.0 / (v_dot_v + w1 * w1)
+  a = (w1 * w1 - v_dot_v) * scale
+  b = 2.0 * (x1 * px + y1 * py + z1 * pz) * scale
+  c = 2.0 * w1 * scale
+  result = np.empty(7)
+  result[0] = a * px + b * x1 + c * (y1 * pz - z1 * py) + lhs[0]
+  result[1] = a * py + b * y1 + c * (z1 * px - x1 * pz) + lhs[1]
+  result[2] = a * pz + b * z1 + c * (x1 * py - y1 * px) + lhs[2]
+  result[3] = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+  result[4] = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+  result[5] = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+  result[6] = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+  return result
+
+
+@dataclasses.dataclass(frozen=True)
+class Kernels:
+  """A complete set of kernel implementations.
+
+  Attributes:
+    name: Name of the implementation, e.g. for benchmark output.
+    quaternion_multiply: (lhs_xyzw, rhs_xyzw) -> product xyzw.
+    quaternion_conjugate: (xyzw) -> conjugate xyzw.
+    quaternion_normalize: (xyzw) -> unit xyzw.
+    quaternion_rotate: (xyzw, point) -> rotated point.
+    pose_multiply: (lhs_vec7, rhs_vec7) -> product vec7.
+  """
+
+  name: str
+  quaternion_multiply: Callable[[np.ndarray, np.ndarray], np.ndarray]
+  quaternion_conjugate: Callable[[np.ndarray], np.ndarray]
+  quaternion_normalize: Callable[[np.ndarray], np.ndarray]
+  quaternion_rotate: Callable[[np.ndarray, np.ndarray], np.ndarray]
+  pose_multiply: Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def _unary_on_floats(kernel):
+  """Runs the kernel on the values of its array argument as Python floats."""
+
+  def unary_kernel(values: np.ndarray) -> np.ndarray:
+    return kernel(values.tolist())
+
+  return unary_kernel
+
+
+def _binary_on_floats(kernel):
+  """Runs the kernel on the values of its array arguments as Python floats."""
+
+  def binary_kernel(lhs: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+    return kernel(lhs.tolist(), rhs.tolist())
+
+  return binary_kernel
+
+
+# Numpy constant vector for computing the conjugate.
+_QUATERNION_CONJUGATE_SCALE_FACTORS = np.array(
+    [-1, -1, -1, 1], dtype=np.float64
+)
+
+
+def _numpy_quaternion_conjugate(xyzw: np.ndarray) -> np.ndarray:
+  return xyzw * _QUATERNION_CONJUGATE_SCALE_FACTORS
+
+
+# The fallback, which runs the kernel source as plain Python on floats.
+FALLBACK_KERNELS = Kernels(
+    name='fallback',
+    quaternion_multiply=_binary_on_floats(_quaternion_multiply),
+    quaternion_conjugate=_numpy_quaternion_conjugate,
+    quaternion_normalize=_unary_on_floats(_quaternion_normalize),
+    quaternion_rotate=_binary_on_floats(_quaternion_rotate),
+    pose_multiply=_binary_on_floats(_pose_multiply),
+)
+
+
+def _make_compiled_kernels() -> Optional[Kernels]:
+  """Returns the kernels compiled with numba, or None if it is unavailable."""
+  if numba is None:
+    return None
+  jit = numba.njit(cache=True, nogil=True)
+  return Kernels(
+      name='numba',
+      quaternion_multiply=jit(_quaternion_multiply),
+      quaternion_conjugate=jit(_quaternion_conjugate),
+      quaternion_normalize=jit(_quaternion_normalize),
+      quaternion_rotate=jit(_quaternion_rotate),
+      pose_multiply=jit(_pose_multiply),
+  )
+
+
+# The kernels compiled with numba, or None if numba is not installed.
+COMPILED_KERNELS = _make_compiled_kernels()
+
+
+def _select_kernels() -> Kernels:
+  if COMPILED_KERNELS is None or os.environ.get(
+      DISABLE_COMPILED_KERNELS_ENV_VAR
+  ):
+    return FALLBACK_KERNELS
+  return COMPILED_KERNELS
+
+
+# The kernels used by the math value types.
+KERNELS = _select_kernels()
+
+quaternion_multiply = KERNELS.quaternion_multiply
+quaternion_conjugate = KERNELS.quaternion_conjugate
+quaternion_normalize = KERNELS.quaternion_normalize
+quaternion_rotate = KERNELS.quaternion_rotate
+pose_multiply = KERNELS.pose_multiply
@@ -0,0 +1,104 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.math.python.kernels."""
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from intrinsic.math.python import kernels
+from intrinsic.math.python import rotation3_array
+import numpy as np
+
+_IMPLEMENTATIONS = [
+    (implementation.name, implementation)
+    for implementation in (kernels.FALLBACK_KERNELS, kernels.COMPILED_KERNELS)
+    if implementation is not None
+]
+
+_rng = np.random.default_rng(0)
+_QUATERNIONS = list(_rng.normal(size=(10, 4))) + [np.array([0.0, 0, 0, 1])]
+_POINTS = list(_rng.normal(size=(10, 3))) + [np.zeros(3)]
+
+
+class KernelsTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(*_IMPLEMENTATIONS)
+  def test_quaternion_multiply(self, implementation):
+    for lhs in _QUATERNIONS:
+      for rhs in _QUATERNIONS:
+        np.testing.assert_allclose(
+            implementation.quaternion_multiply(lhs, rhs),
+            rotation3_array.quaternion_product(lhs, rhs),
+            rtol=1e-12,
+            atol=1e-12,
+        )
+
+  @parameterized.named_parameters(*_IMPLEMENTATIONS)
+  def test_quaternion_conjugate(self, implementation):
+    for xyzw in _QUATERNIONS:
+      np.testing.assert_array_equal(
+          implementation.quaternion_conjugate(xyzw),
+          rotation3_array.quaternion_conjugates(xyzw),
+      )
+
+  @parameterized.named_parameters(*_IMPLEMENTATIONS)
+  def test_quaternion_normalize(self, implementation):
+    for xyzw in _QUATERNIONS:
+      np.testing.assert_allclose(
+          implementation.quaternion_normalize(xyzw),
+          rotation3_array.normalized_quaternions(xyzw),
+          rtol=1e-12,
+      )
+
+  @parameterized.named_parameters(*_IMPLEMENTATIONS)
+  def test_quaternion_rotate_is_exact_for_non_unit_quaternions(
+      self, implementation
+  ):
+    for xyzw in _QUATERNIONS:
+      for point in _POINTS:
+        np.testing.assert_allclose(
+            implementation.quaternion_rotate(xyzw, point),
+            rotation3_array.rotate_points(
+                rotation3_array.normalized_quaternions(xyzw), point
+            ),
+            rtol=1e-12,
+            atol=1e-12,
+        )
+
+  @parameterized.named_parameters(*_IMPLEMENTATIONS)
+  def test_pose_multiply(self, implementation):
+    for lhs_xyzw, lhs_translation in zip(_QUATERNIONS, _POINTS):
+      for rhs_xyzw, rhs_translation in zip(_QUATERNIONS, _POINTS[::-1]):
+        lhs = np.concatenate((lhs_translation, lhs_xyzw))
+        rhs = np.concatenate((rhs_translation, rhs_xyzw))
+        product = implementation.pose_multiply(lhs, rhs)
+        np.testing.assert_array_equal(
+            product[:3],
+            implementation.quaternion_rotate(lhs_xyzw, rhs_translation)
+            + lhs_translation,
+        )
+        np.testing.assert_array_equal(
+            product[3:], implementation.quaternion_multiply(lhs_xyzw, rhs_xyzw)
+        )
+
+  @parameterized.named_parameters(*_IMPLEMENTATIONS)
+  def test_kernels_return_new_float64_arrays(self, implementation):
+    xyzw = _QUATERNIONS[0]
+    result = implementation.quaternion_conjugate(xyzw)
+    self.assertEqual(result.dtype, np.float64)
+    self.assertIsNot(result, xyzw)
+
+  def test_compiled_kernels_match_fallback_kernels(self):
+    if kernels.COMPILED_KERNELS is None:
+      self.skipTest('numba is not installed.')
+    for lhs in _QUATERNIONS:
+      for rhs in _QUATERNIONS:
+        np.testing.assert_allclose(
+            kernels.COMPILED_KERNELS.quaternion_multiply(lhs, rhs),
+            kernels.FALLBACK_KERNELS.quaternion_multiply(lhs, rhs),
+            rtol=1e-15,
+            atol=1e-15,
+        )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,393 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Micro-benchmarks for the math value types.
+
+Measures the latency of hot operations such as Pose3 composition, point
+transformation and construction, as well as the memory used per instance of
+the value types. Every benchmark has a budget which is far above the expected
+value but well below that of the unoptimized implementations, so that running
+with --check catches performance regressions without being sensitive to
+machine noise.
+
+Usage:
+  bazel run //intrinsic/math/python:math_benchmark -- --check
+"""
+
+import dataclasses
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, List, Optional
+
+from absl import app
+from absl import flags
+from intrinsic.math.python import data_types
+from intrinsic.math.python import interpolation
+from intrinsic.math.python import kernels
+from intrinsic.math.python import pose3
+from intrinsic.math.python import pose3_array
+from intrinsic.math.python import pose_geometry
+from intrinsic.math.python import proto_conversion
+from intrinsic.math.python import quaternion
+from intrinsic.math.python import rotation3
+from intrinsic.math.python import rotation3_array
+import numpy as np
+
+_ITERATIONS = flags.DEFINE_integer(
+    'iterations', 20000, 'Number of calls per measurement.'
+)
+_REPEATS = flags.DEFINE_integer(
+    'repeats', 5, 'Number of measurements; the fastest one is reported.'
+)
+_INSTANCES = flags.DEFINE_integer(
+    'instances', 10000, 'Number of instances allocated per memory benchmark.'
+)
+_CHECK = flags.DEFINE_bool(
+    'check', False, 'Exit with an error if any benchmark exceeds its budget.'
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class Benchmark:
+  """A micro-benchmark.
+
+  Attributes:
+    name: Name of the benchmark.
+    function: The operation to measure. Called without arguments.
+    budget_us: Maximum acceptable latency per call in microseconds.
+    max_iterations: Caps the number of calls per measurement, for batch
+      operations which take milliseconds.
+  """
+
+  name: str
+  function: Callable[[], object]
+  budget_us: float
+  max_iterations: Optional[int] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class MemoryBenchmark:
+  """A benchmark of the memory used per instance of a value type.
+
+  Attributes:
+    name: Name of the benchmark.
+    factory: Creates one instance. Called without arguments.
+    budget_bytes: Maximum acceptable memory per instance in bytes.
+  """
+
+  name: str
+  factory: Callable[[], object]
+  budget_bytes: int
+
+
+def _make_benchmarks() -> List[Benchmark]:
+  """Returns all benchmarks with their inputs set up."""
+  pose_a = pose3.Pose3(
+      rotation3.Rotation3.from_axis_angle((1, 2, 3), 0.4), (1, 2, 3)
+  )
+  pose_b = pose3.Pose3(
+      rotation3.Rotation3.from_axis_angle((3, 2, 1), 0.7), (3, 2, 1)
+  )
+  point = np.array([0.1, 0.2, 0.3])
+  vec7 = np.array([1.0, 2.0, 3.0, 0.0, 0.0, 0.6, 0.8])
+  rotation = pose_a.rotation
+  translation = (1.0, 2.0, 3.0)
+  num_waypoints = 10000
+  waypoint_times = np.arange(num_waypoints, dtype=np.float64)
+  waypoints = pose3_array.Pose3Array.from_vec7(
+      np.random.default_rng(0).uniform(size=(num_waypoints, 7)),
+      normalize=True,
+  )
+  query_times = np.linspace(0.0, num_waypoints - 1, num_waypoints)
+  matrices = waypoints.rotation.matrix3x3()
+  num_grasps = 5000
+  rng = np.random.default_rng(1)
+  grasps = pose3_array.Pose3Array.from_vec7(
+      np.hstack(
+          (
+              rng.uniform(-0.2, 0.2, (num_grasps, 3)),
+              rng.normal(size=(num_grasps, 4)),
+          )
+      ),
+      normalize=True,
+  )
+  grasp_scores = rng.uniform(size=num_grasps)
+  grasp_tree = pose_geometry.PoseKDTree(grasps)
+  return [
+      Benchmark('Pose3 * Pose3', lambda: pose_a * pose_b, 50.0),
+      Benchmark('Pose3.inverse', pose_a.inverse, 50.0),
+      Benchmark(
+          'Pose3.multiply_by_inverse',
+          lambda: pose_a.multiply_by_inverse(pose_b),
+          50.0,
+      ),
+      Benchmark(
+          'Pose3.transform_point', lambda: pose_a.transform_point(point), 30.0
+      ),
+      Benchmark(
+          'Rotation3.rotate_point',
+          lambda: pose_a.rotation.rotate_point(point),
+          30.0,
+      ),
+      Benchmark(
+          'Rotation3 * Rotation3',
+          lambda: pose_a.rotation * pose_b.rotation,
+          30.0,
+      ),
+      Benchmark('Pose3()', pose3.Pose3, 50.0),
+      Benchmark(
+          'Pose3(rotation, translation)',
+          lambda: pose3.Pose3(rotation, translation),
+          60.0,
+      ),
+      Benchmark('Pose3.from_vec7', lambda: pose3.Pose3.from_vec7(vec7), 150.0),
+      # Derived representations are cached, so repeated use only copies them.
+      Benchmark(
+          'Rotation3.matrix3x3 (first use)',
+          lambda: rotation3.Rotation3(rotation.quaternion).matrix3x3(),
+          100.0,
+      ),
+      Benchmark('Rotation3.matrix3x3 (repeated)', rotation.matrix3x3, 5.0),
+      Benchmark(
+          'Rotation3.euler_angles (repeated)', rotation.euler_angles, 10.0
+      ),
+      Benchmark('Rotation3.inverse (repeated)', rotation.inverse, 2.0),
+      Benchmark('Pose3.matrix4x4 (repeated)', pose_a.matrix4x4, 5.0),
+      Benchmark(
+          'resample_poses (10k waypoints)',
+          lambda: interpolation.resample_poses(
+              waypoint_times,
+              waypoints,
+              query_times,
+              translation_method=interpolation.CUBIC,
+          ),
+          50000.0,
+          max_iterations=20,
+      ),
+      Benchmark(
+          'resample_by_arc_length (10k)',
+          lambda: interpolation.resample_by_arc_length(
+              waypoints, num_waypoints
+          ),
+          50000.0,
+          max_iterations=20,
+      ),
+      Benchmark(
+          'PoseKDTree (5k grasps)',
+          lambda: pose_geometry.PoseKDTree(grasps),
+          50000.0,
+          max_iterations=20,
+      ),
+      Benchmark(
+          'PoseKDTree.query (5k grasps, k=5)',
+          lambda: grasp_tree.query(grasps, k=5),
+          200000.0,
+          max_iterations=20,
+      ),
+      Benchmark(
+          'non_maximum_suppression (5k grasps)',
+          lambda: pose_geometry.non_maximum_suppression(
+              grasps,
+              grasp_scores,
+              translation_threshold=0.02,
+              rotation_threshold=0.35,
+          ),
+          200000.0,
+          max_iterations=20,
+      ),
+  ] + [
+      Benchmark(
+          'Rotation3Array.from_matrix (10k, %s)' % validate,
+          lambda validate=validate: rotation3_array.Rotation3Array.from_matrix(
+              matrices, validate=validate
+          ),
+          50000.0,
+          max_iterations=20,
+      )
+      for validate in (
+          rotation3_array.VALIDATE_STRICT,
+          rotation3_array.VALIDATE_FAST,
+          rotation3_array.VALIDATE_NONE,
+      )
+  ]
+
+
+def _make_kernel_benchmarks() -> List[Benchmark]:
+  """Returns benchmarks of every available kernel implementation."""
+  xyzw_a = np.array([0.1, 0.2, 0.3, 0.9])
+  xyzw_b = np.array([0.3, 0.2, 0.1, 0.9])
+  point = np.array([0.1, 0.2, 0.3])
+  vec7_a = np.array([1.0, 2.0, 3.0, 0.1, 0.2, 0.3, 0.9])
+  vec7_b = np.array([3.0, 2.0, 1.0, 0.3, 0.2, 0.1, 0.9])
+  benchmarks = []
+  for implementation in (kernels.FALLBACK_KERNELS, kernels.COMPILED_KERNELS):
+    if implementation is None:
+      continue
+    # Compiles the kernels before the measurement.
+    implementation.pose_multiply(vec7_a, vec7_b)
+    implementation.quaternion_multiply(xyzw_a, xyzw_b)
+    implementation.quaternion_conjugate(xyzw_a)
+    implementation.quaternion_normalize(xyzw_a)
+    implementation.quaternion_rotate(xyzw_a, point)
+    benchmarks += [
+        Benchmark(
+            'kernels[%s].quaternion_multiply' % implementation.name,
+            lambda k=implementation: k.quaternion_multiply(xyzw_a, xyzw_b),
+            5.0,
+        ),
+        Benchmark(
+            'kernels[%s].quaternion_conjugate' % implementation.name,
+            lambda k=implementation: k.quaternion_conjugate(xyzw_a),
+            5.0,
+        ),
+        Benchmark(
+            'kernels[%s].quaternion_normalize' % implementation.name,
+            lambda k=implementation: k.quaternion_normalize(xyzw_a),
+            5.0,
+        ),
+        Benchmark(
+            'kernels[%s].quaternion_rotate' % implementation.name,
+            lambda k=implementation: k.quaternion_rotate(xyzw_a, point),
+            5.0,
+        ),
+        Benchmark(
+            'kernels[%s].pose_multiply' % implementation.name,
+            lambda k=implementation: k.pose_multiply(vec7_a, vec7_b),
+            5.0,
+        ),
+    ]
+  return benchmarks
+
+
+def _make_array_benchmarks() -> List[Benchmark]:
+  """Returns benchmarks of converting large arrays to and from Array protos."""
+  benchmarks = []
+  for size_mb in (10, 100):
+    # A float32 image with the given size.
+    array = (
+        np.random.default_rng(0)
+        .uniform(size=(size_mb * 512, 512))
+        .astype(np.float32)
+    )
+    proto = proto_conversion.ndarray_to_proto(array)
+    out = proto_conversion.ndarray_to_proto(array)
+    budget_us = size_mb * 5000.0
+    benchmarks += [
+        Benchmark(
+            'ndarray_to_proto (%d MB)' % size_mb,
+            lambda array=array: proto_conversion.ndarray_to_proto(array),
+            budget_us,
+            max_iterations=3,
+        ),
+        Benchmark(
+            'ndarray_to_proto (%d MB, out)' % size_mb,
+            lambda array=array, out=out: proto_conversion.ndarray_to_proto(
+                array, out=out
+            ),
+            budget_us,
+            max_iterations=3,
+        ),
+        Benchmark(
+            'ndarray_to_proto (%d MB, transposed)' % size_mb,
+            lambda array=array: proto_conversion.ndarray_to_proto(array.T),
+            budget_us,
+            max_iterations=3,
+        ),
+        Benchmark(
+            'ndarray_from_proto (%d MB)' % size_mb,
+            lambda proto=proto: proto_conversion.ndarray_from_proto(proto),
+            budget_us,
+            max_iterations=3,
+        ),
+    ]
+  return benchmarks
+
+
+def _make_memory_benchmarks() -> List[MemoryBenchmark]:
+  """Returns all memory benchmarks."""
+  rng = np.random.default_rng(0)
+  return [
+      MemoryBenchmark(
+          'Pose3',
+          lambda: pose3.Pose3.from_vec7(rng.uniform(size=7), normalize=True),
+          280,
+      ),
+      MemoryBenchmark(
+          'Quaternion',
+          lambda: quaternion.Quaternion(rng.uniform(size=4)),
+          200,
+      ),
+      MemoryBenchmark(
+          'Twist',
+          lambda: data_types.Twist(rng.uniform(size=3), rng.uniform(size=3)),
+          340,
+      ),
+  ]
+
+
+def measure_us(
+    function: Callable[[], object], iterations: int, repeats: int
+) -> float:
+  """Returns the fastest measured latency of function in microseconds."""
+  timer = timeit.Timer(function)
+  return min(timer.repeat(repeat=repeats, number=iterations)) / iterations * 1e6
+
+
+def measure_bytes_per_instance(
+    factory: Callable[[], object], instances: int
+) -> float:
+  """Returns the memory retained per instance created by factory."""
+  tracemalloc.start()
+  try:
+    start, _ = tracemalloc.get_traced_memory()
+    objects = [factory() for _ in range(instances)]
+    end, _ = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+  # The list itself holds one pointer per instance.
+  return (end - start) / len(objects) - 8
+
+
+def main(argv: List[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  failures = []
+  for benchmark in (
+      _make_benchmarks() + _make_kernel_benchmarks() + _make_array_benchmarks()
+  ):
+    iterations = _ITERATIONS.value
+    if benchmark.max_iterations is not None:
+      iterations = min(iterations, benchmark.max_iterations)
+    latency_us = measure_us(benchmark.function, iterations, _REPEATS.value)
+    over_budget = latency_us > benchmark.budget_us
+    print(
+        '%-40s %10.3f us  (budget %.1f us)%s'
+        % (
+            benchmark.name,
+            latency_us,
+            benchmark.budget_us,
+            '  OVER BUDGET' if over_budget else '',
+        )
+    )
+    if over_budget:
+      failures.append(benchmark.name)
+  for benchmark in _make_memory_benchmarks():
+    size_bytes = measure_bytes_per_instance(benchmark.factory, _INSTANCES.value)
+    over_budget = size_bytes > benchmark.budget_bytes
+    print(
+        '%-40s %10.1f B   (budget %d B)%s'
+        % (
+            'sizeof ' + benchmark.name,
+            size_bytes,
+            benchmark.budget_bytes,
+            '  OVER BUDGET' if over_budget else '',
+        )
+    )
+    if over_budget:
+      failures.append('sizeof ' + benchmark.name)
+  if _CHECK.value and failures:
+    sys.exit('Benchmarks over budget: %s' % ', '.join(failures))
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -25,6 +25,7 @@ The inverse of a pose is the reverse transformation:
 
 from typing import Optional, Text
 
+from intrinsic.math.python import kernels
 from intrinsic.math.python import math_types
 from intrinsic.math.python import quaternion as quaternion_class
 from intrinsic.math.python import rotation3
@@ -53,6 +54,12 @@ class Pose3(object):
   The pose is a rigid 6 degree-of-freedom transformation represented
   as a Rotation3 object and a 3D translation vector.
 
+  Both are stored in a single contiguous float64 buffer in vec7 order,
+  [tx, ty, tz, qx, qy, qz, qw], and the class uses __slots__, so that large
+  collections of poses stay compact.  The Rotation3 object is only created on
+  first access of the rotation property, and the 4x4 matrix is computed on
+  first use and cached, as poses are immutable.
+
   Properties:
     rotation: Rotation as a Rotation3 object.
     quaternion: Rotation as a quaternion.
@@ -65,6 +72,8 @@ class Pose3(object):
     from_vec7
   """
 
+  __slots__ = ('_vec7', '_rotation', '_matrix4x4')
+
   def __init__(
       self,
       rotation: Optional[rotation3.Rotation3] = None,
@@ -81,13 +90,38 @@ class Pose3(object):
       rotation: 3D rotation component of pose, identity by default.
       translation: translation vector component of pose, zero by default.
     """
-    self._rotation = rotation or rotation3.Rotation3.identity()
+    rotation = rotation or rotation3.Rotation3.identity()
+    self._vec7 = np.empty(7, dtype=np.float64)
     if translation is None:
-      self._translation = np.zeros(3, dtype=np.float64)
+      self._vec7[:3] = 0.0
     else:
-      self._translation = vector_util.as_vector3(
+      self._vec7[:3] = vector_util.as_vector3(
           translation, err_msg=TRANSLATION_INVALID_MESSAGE
-      ).copy()
+      )
+    self._vec7[3:] = rotation.quaternion._xyzw  # pylint: disable=protected-access
+    # Created from the buffer on first access.
+    self._rotation: Optional[rotation3.Rotation3] = None
+    self._matrix4x4: Optional[np.ndarray] = None
+
+  @classmethod
+  def _from_trusted_vec7(cls, vec7: np.ndarray) -> 'Pose3':
+    """Wraps a vec7 buffer without validation.
+
+    Only for values computed from valid poses within this package, e.g. by
+    composition or inversion.
+
+    Args:
+      vec7: [tx, ty, tz, qx, qy, qz, qw] as a float64 array that is not shared,
+        with finite values and a non-zero quaternion.
+
+    Returns:
+      The pose.
+    """
+    pose = cls.__new__(cls)
+    pose._vec7 = vec7
+    pose._rotation = None
+    pose._matrix4x4 = None
+    return pose
 
   # --------------------------------------------------------------------------
   # Properties
@@ -96,6 +130,10 @@ class Pose3(object):
   @property
   def rotation(self) -> rotation3.Rotation3:
     """Accessor to extract the rotation property."""
+    if self._rotation is None:
+      self._rotation = rotation3.Rotation3._from_trusted_quaternion(  # pylint: disable=protected-access
+          quaternion_class.Quaternion._from_trusted_xyzw(self._vec7[3:])  # pylint: disable=protected-access
+      )
     return self._rotation
 
   @property
@@ -107,7 +145,7 @@ class Pose3(object):
     Returns:
       A unit quaternion.
     """
-    return quaternion_class.Quaternion(xyzw=self.rotation.quaternion.xyzw)
+    return quaternion_class.Quaternion(xyzw=self._vec7[3:])
 
   @property
   def translation(self) -> np.ndarray:
@@ -118,12 +156,12 @@ class Pose3(object):
     Returns:
      A 3D vector in a numpy array.
     """
-    return self._translation.copy()
+    return self._vec7[:3].copy()
 
   @property
   def vec7(self) -> np.ndarray:
     """Returns seven-value representation: [tx, ty, tz, qx, qy, qz, qw]."""
-    return np.hstack((self.translation, self.quaternion.xyzw))
+    return self._vec7.copy()
 
   # --------------------------------------------------------------------------
   # Utility functions
@@ -151,7 +189,9 @@ class Pose3(object):
     Raises:
       ValueError: Raised by rotate_point if the point is not a finite 3D vector.
     """
-    return self.rotation.rotate_point(point) + self.translation
+    tx, ty, tz, *xyzw = self._vec7.tolist()
+    x, y, z = rotation3.rotate_point_values(xyzw, point)
+    return np.array((x + tx, y + ty, z + tz), dtype=np.float64)
 
   def inverse(self) -> 'Pose3':
     """Calculates the inverse of this transform.
@@ -171,9 +211,12 @@ class Pose3(object):
     Returns:
       A pose representing the inverse.
     """
-    rotation_inverse = self.rotation.inverse()
-    translation_inverse = -(rotation_inverse.rotate_point(self.translation))
-    return Pose3(rotation=rotation_inverse, translation=translation_inverse)
+    tx, ty, tz, x, y, z, w = self._vec7.tolist()
+    inverse_xyzw = (-x, -y, -z, w)
+    ix, iy, iz = rotation3.rotate_point_values(inverse_xyzw, (tx, ty, tz))
+    return Pose3._from_trusted_vec7(
+        np.array((-ix, -iy, -iz, *inverse_xyzw), dtype=np.float64)
+    )
 
   def multiply(self, other: 'Pose3') -> 'Pose3':
     """Calculates the product (or composition) of the two transforms.
@@ -198,10 +241,11 @@ class Pose3(object):
     Returns:
       Product of the two poses as a Pose3.
     """
-
-    result_translation = self.transform_point(other.translation)
-    result_rotation = self.rotation * other.rotation
-    return Pose3(rotation=result_rotation, translation=result_translation)
+    return Pose3._from_trusted_vec7(
+        kernels.pose_multiply(
+            self._vec7, other._vec7  # pylint: disable=protected-access
+        )
+    )
 
   def multiply_by_inverse(self, other: 'Pose3') -> 'Pose3':
     """Calculates the product of the inverse of this transform with the other.
@@ -225,12 +269,15 @@ class Pose3(object):
     Returns:
       Product of the inverse of this transform with the other as a Pose3.
     """
-    rotation_inverse = self.rotation.inverse()
-    result_translation = rotation_inverse.rotate_point(
-        other.translation - self.translation
+    vec7 = self._vec7
+    other_vec7 = other._vec7  # pylint: disable=protected-access
+    inverse_xyzw = kernels.quaternion_conjugate(vec7[3:])
+    result = np.empty(7)
+    result[:3] = kernels.quaternion_rotate(
+        inverse_xyzw, other_vec7[:3] - vec7[:3]
     )
-    result_rotation = rotation_inverse * other.rotation
-    return Pose3(rotation=result_rotation, translation=result_translation)
+    result[3:] = kernels.quaternion_multiply(inverse_xyzw, other_vec7[3:])
+    return Pose3._from_trusted_vec7(result)
 
   def almost_equal(
       self,
@@ -265,10 +312,12 @@ class Pose3(object):
     Returns:
       The 4x4 matrix transformation.
     """
-    matrix4x4 = np.identity(4)
-    matrix4x4[:3, :3] = self.rotation.matrix3x3()
-    matrix4x4[:3, 3] = self.translation
-    return matrix4x4
+    if self._matrix4x4 is None:
+      matrix4x4 = np.identity(4)
+      matrix4x4[:3, :3] = self.rotation.matrix3x3()
+      matrix4x4[:3, 3] = self._vec7[:3]
+      self._matrix4x4 = matrix4x4
+    return self._matrix4x4.copy()
 
   # --------------------------------------------------------------------------
   # Operators
@@ -276,6 +325,9 @@ class Pose3(object):
 
   def __mul__(self, other: 'Pose3') -> 'Pose3':
     """Returns the product: self * other."""
+    if not isinstance(other, Pose3):
+      # Lets batch types such as Pose3Array implement other * self.
+      return NotImplemented
     return self.multiply(other)
 
   def __eq__(self, other: 'Pose3') -> bool:
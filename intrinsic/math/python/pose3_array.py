@@ -0,0 +1,417 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Pose3Array class (python3).
+
+A batch of N 6 degree-of-freedom (6DoF) rigid poses, stored as an (N, 4) array
+of unit quaternions and an (N, 3) array of translations.
+
+All operations are vectorized over the batch.  This is intended for workloads
+such as transforming point clouds or composing large sets of candidate poses,
+where a Python loop over Pose3 objects would dominate the run time:
+
+  world_poses_grasp = world_pose_object * object_poses_grasp
+  points_world = world_pose_camera.transform_points(points_camera)
+
+Indexing with an integer returns a Pose3; indexing with a slice, integer array
+or boolean mask returns a Pose3Array.
+"""
+
+from typing import Iterator, List, Optional, Sequence, Text, Union
+
+from intrinsic.math.python import math_types
+from intrinsic.math.python import pose3
+from intrinsic.math.python import rotation3_array
+import numpy as np
+
+# ----------------------------------------------------------------------------
+# Error messages for exceptions.
+TRANSLATION_ARRAY_INVALID_MESSAGE = (
+    'Translation array in Pose3Array should have shape (N, 3)'
+)
+LENGTH_MISMATCH_MESSAGE = 'Rotations and translations should have same length'
+VEC7_ARRAY_INVALID_MESSAGE = 'vec7 array should have shape (N, 7)'
+MATRIX_ARRAY_INVALID_MESSAGE = 'Matrix array should have shape (N, 4, 4)'
+
+PoseOrPoseArrayType = Union['Pose3Array', pose3.Pose3]
+
+
+class Pose3Array(object):
+  """A class which represents a batch of N poses.
+
+  Binary operations with another Pose3Array broadcast over the batch: both
+  operands must have the same length or one of them must have length 1.  A
+  Pose3 operand is treated like a Pose3Array of length 1.
+
+  Properties:
+    rotation: Rotations as a Rotation3Array.
+    translation: (N, 3) translations as a numpy array.
+    vec7: (N, 7) array of [tx, ty, tz, qx, qy, qz, qw].
+
+  Factory functions:
+    identity
+    from_vec7
+    from_matrix4x4
+    from_poses
+  """
+
+  def __init__(
+      self,
+      rotation: Optional[rotation3_array.Rotation3Array] = None,
+      translation: Optional[np.ndarray] = None,
+  ):
+    """Constructs a new batch of poses.
+
+    If only one of rotation and translation is given, the other one defaults
+    to identity rotations or zero translations of the same length.
+
+    Args:
+      rotation: Rotations of the poses.
+      translation: (N, 3) translations of the poses.
+
+    Raises:
+      ValueError: If neither argument is given, if the translations have the
+        wrong shape or non-finite values or if the lengths do not match.
+    """
+    if translation is None:
+      if rotation is None:
+        raise ValueError('Pose3Array requires a rotation or translation.')
+      translation = np.zeros((len(rotation), 3), dtype=np.float64)
+    else:
+      translation = np.array(translation, dtype=np.float64)
+      if translation.ndim != 2 or translation.shape[1] != 3:
+        raise ValueError(
+            '%s: Actual: %s'
+            % (TRANSLATION_ARRAY_INVALID_MESSAGE, translation.shape)
+        )
+      if not np.all(np.isfinite(translation)):
+        raise ValueError(
+            '%s: %r' % (TRANSLATION_ARRAY_INVALID_MESSAGE, translation)
+        )
+    if rotation is None:
+      rotation = rotation3_array.Rotation3Array.identity(len(translation))
+    elif len(rotation) != len(translation):
+      raise ValueError(
+          '%s: %d != %d'
+          % (LENGTH_MISMATCH_MESSAGE, len(rotation), len(translation))
+      )
+    self._rotation = rotation
+    self._translation = translation
+
+  @classmethod
+  def _from_trusted_arrays(
+      cls, xyzw: np.ndarray, translation: np.ndarray
+  ) -> 'Pose3Array':
+    """Wraps owned (N, 4) quaternion and (N, 3) arrays without validation."""
+    poses = cls.__new__(cls)
+    poses._rotation = rotation3_array.Rotation3Array._from_trusted_xyzw(xyzw)  # pylint: disable=protected-access
+    poses._translation = translation
+    return poses
+
+  # --------------------------------------------------------------------------
+  # Properties
+  # --------------------------------------------------------------------------
+
+  @property
+  def rotation(self) -> rotation3_array.Rotation3Array:
+    """Returns the rotations of the poses."""
+    return self._rotation
+
+  @property
+  def translation(self) -> np.ndarray:
+    """Returns a copy of the (N, 3) translations."""
+    return self._translation.copy()
+
+  @property
+  def vec7(self) -> np.ndarray:
+    """Returns the (N, 7) array of [tx, ty, tz, qx, qy, qz, qw]."""
+    return np.hstack((self._translation, self._rotation._xyzw))  # pylint: disable=protected-access
+
+  # --------------------------------------------------------------------------
+  # Utility functions
+  # --------------------------------------------------------------------------
+
+  def transform_points(self, points: math_types.VectorType) -> np.ndarray:
+    """Transforms points by the poses: T(v) = R(v) + p.
+
+    Broadcasting rules:
+      - N poses and a single point (3,) give (N, 3) points.
+      - A single pose and M points (M, 3) give (M, 3) points.
+      - N poses and N points (N, 3) transform each point by its pose.
+
+    Args:
+      points: A 3D point or an (M, 3) array of points.
+
+    Returns:
+      The transformed points as a numpy array.
+
+    Raises:
+      ValueError: If the points have the wrong shape or the lengths of the
+        poses and points cannot be broadcast.
+    """
+    return self._rotation.rotate_points(points) + self._translation
+
+  def inverse(self) -> 'Pose3Array':
+    """Calculates the inverse of every pose.
+
+    T'(v) = R'(v - p) = R'(v) - R'(p)
+
+    Returns:
+      The inverse poses.
+    """
+    xyzw = rotation3_array.quaternion_conjugates(
+        self._rotation._xyzw  # pylint: disable=protected-access
+    )
+    translation = -rotation3_array.rotate_points(
+        rotation3_array.normalized_quaternions(xyzw), self._translation
+    )
+    return Pose3Array._from_trusted_arrays(xyzw, translation)
+
+  def multiply(self, other: PoseOrPoseArrayType) -> 'Pose3Array':
+    """Calculates the element-wise compositions (self * other).
+
+    If self contains the transforms from frame B to C and other the transforms
+    from frame A to B, the result contains the transforms from A to C.
+
+    Args:
+      other: Right hand operand as a Pose3Array or Pose3.
+
+    Returns:
+      The products of the poses as a Pose3Array.
+
+    Raises:
+      ValueError: If the lengths of the operands cannot be broadcast.
+    """
+    other_xyzw, other_translation = _as_arrays(other)
+    rotation3_array.check_broadcast_lengths(len(self), len(other_xyzw))
+    self_xyzw = self._rotation._xyzw  # pylint: disable=protected-access
+    translation = (
+        rotation3_array.rotate_points(
+            rotation3_array.normalized_quaternions(self_xyzw), other_translation
+        )
+        + self._translation
+    )
+    xyzw = rotation3_array.quaternion_product(self_xyzw, other_xyzw)
+    return Pose3Array._from_trusted_arrays(xyzw, translation)
+
+  def multiply_by_inverse(self, other: PoseOrPoseArrayType) -> 'Pose3Array':
+    """Calculates the element-wise products (self^-1 * other).
+
+    Args:
+      other: Right hand operand as a Pose3Array or Pose3.
+
+    Returns:
+      The products of the inverse poses with the other poses.
+
+    Raises:
+      ValueError: If the lengths of the operands cannot be broadcast.
+    """
+    other_xyzw, other_translation = _as_arrays(other)
+    rotation3_array.check_broadcast_lengths(len(self), len(other_xyzw))
+    inverse_xyzw = rotation3_array.quaternion_conjugates(
+        self._rotation._xyzw  # pylint: disable=protected-access
+    )
+    translation = rotation3_array.rotate_points(
+        rotation3_array.normalized_quaternions(inverse_xyzw),
+        other_translation - self._translation,
+    )
+    xyzw = rotation3_array.quaternion_product(inverse_xyzw, other_xyzw)
+    return Pose3Array._from_trusted_arrays(xyzw, translation)
+
+  def matrix4x4(self) -> np.ndarray:
+    """Returns the (N, 4, 4) stack of homogeneous transformation matrices."""
+    matrices = np.zeros((len(self), 4, 4), dtype=np.float64)
+    matrices[:, :3, :3] = self._rotation.matrix3x3()
+    matrices[:, :3, 3] = self._translation
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+  def almost_equal(
+      self,
+      other: PoseOrPoseArrayType,
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+  ) -> bool:
+    """Tests whether all poses are equivalent within tolerances.
+
+    Args:
+      other: Poses to compare against self, broadcast over the batch.
+      rtol: relative tolerance
+      atol: absolute tolerance
+
+    Returns:
+      True if every pair of poses is equivalent.
+    """
+    if isinstance(other, pose3.Pose3):
+      other = Pose3Array.from_poses([other])
+    return np.allclose(
+        self._translation, other._translation, rtol=rtol, atol=atol  # pylint: disable=protected-access
+    ) and self._rotation.almost_equal(other.rotation, rtol=rtol, atol=atol)
+
+  def to_poses(self) -> List[pose3.Pose3]:
+    """Returns the poses as a list of Pose3 objects."""
+    return [self[i] for i in range(len(self))]
+
+  # --------------------------------------------------------------------------
+  # Operators
+  # --------------------------------------------------------------------------
+
+  def __len__(self) -> int:
+    return self._translation.shape[0]
+
+  def __iter__(self) -> Iterator[pose3.Pose3]:
+    for i in range(len(self)):
+      yield self[i]
+
+  def __getitem__(self, index) -> PoseOrPoseArrayType:
+    """Returns a Pose3 for an integer index and a Pose3Array else."""
+    if isinstance(index, (int, np.integer)):
+      return pose3.Pose3(
+          rotation=self._rotation[index], translation=self._translation[index]
+      )
+    return Pose3Array._from_trusted_arrays(
+        np.array(self._rotation._xyzw[index], ndmin=2),  # pylint: disable=protected-access
+        np.array(self._translation[index], ndmin=2),
+    )
+
+  def __mul__(self, other: PoseOrPoseArrayType) -> 'Pose3Array':
+    """Returns the element-wise products: self * other."""
+    if not isinstance(other, (Pose3Array, pose3.Pose3)):
+      return NotImplemented
+    return self.multiply(other)
+
+  def __rmul__(self, other: pose3.Pose3) -> 'Pose3Array':
+    """Returns the products other * self for a Pose3 operand."""
+    if not isinstance(other, pose3.Pose3):
+      return NotImplemented
+    return Pose3Array.from_poses([other]).multiply(self)
+
+  __hash__ = None  # This class is not hashable.
+
+  # --------------------------------------------------------------------------
+  # Factory functions
+  # --------------------------------------------------------------------------
+
+  @classmethod
+  def identity(cls, length: int) -> 'Pose3Array':
+    """Returns an array of identity poses with the given length."""
+    return cls(rotation=rotation3_array.Rotation3Array.identity(length))
+
+  @classmethod
+  def from_vec7(
+      cls, vec7_values: np.ndarray, normalize: bool = False
+  ) -> 'Pose3Array':
+    """Constructs poses from an (N, 7) array of [tx, ty, tz, qx, qy, qz, qw].
+
+    Args:
+      vec7_values: The (N, 7) array of vec7 vectors.
+      normalize: Indicates whether to normalize the quaternions.
+
+    Returns:
+      The poses as a Pose3Array.
+
+    Raises:
+      ValueError: If the input has the wrong shape or invalid values.
+    """
+    vec7 = np.asarray(vec7_values, dtype=np.float64)
+    if vec7.ndim != 2 or vec7.shape[1] != 7:
+      raise ValueError(
+          '%s: Actual: %s' % (VEC7_ARRAY_INVALID_MESSAGE, vec7.shape)
+      )
+    return cls(
+        rotation=rotation3_array.Rotation3Array(
+            vec7[:, 3:7], normalize=normalize
+        ),
+        translation=vec7[:, :3],
+    )
+
+  @classmethod
+  def from_matrix4x4(
+      cls,
+      matrices: np.ndarray,
+      validate: Text = rotation3_array.VALIDATE_STRICT,
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+  ) -> 'Pose3Array':
+    """Constructs poses from an (N, 4, 4) stack of homogeneous transforms.
+
+    The batch equivalent of Pose3.from_matrix4x4().
+
+    Args:
+      matrices: The (N, 4, 4) transformation matrices.
+      validate: VALIDATE_STRICT, VALIDATE_FAST or VALIDATE_NONE, see
+        rotation3_array.check_rotation_matrices().  Unless it is
+        VALIDATE_NONE, the last row of every matrix must be [0, 0, 0, 1] and
+        the translations must be finite.
+      rtol: relative error tolerance, passed through to np.isclose.
+      atol: absolute error tolerance, passed through to np.isclose.
+
+    Returns:
+      The poses as a Pose3Array.
+
+    Raises:
+      ValueError: If the input has the wrong shape or fails validation.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    if matrices.ndim != 3 or matrices.shape[1:] != (4, 4):
+      raise ValueError(
+          '%s: Actual: %s' % (MATRIX_ARRAY_INVALID_MESSAGE, matrices.shape)
+      )
+    rotation = rotation3_array.Rotation3Array.from_matrix(
+        matrices, validate=validate, rtol=rtol, atol=atol
+    )
+    translation = matrices[:, :3, 3].copy()
+    if validate != rotation3_array.VALIDATE_NONE:
+      homogeneous = np.all(matrices[:, 3, :] == (0.0, 0.0, 0.0, 1.0), axis=1)
+      valid = homogeneous & np.all(np.isfinite(translation), axis=1)
+      if not np.all(valid):
+        raise ValueError(
+            '%s: %s rows %s'
+            % (
+                pose3.MATRIX_INVALID_MESSAGE,
+                pose3.HOMOGENEOUS_MATRIX_FORM,
+                np.flatnonzero(~valid),
+            )
+        )
+    return cls._from_trusted_arrays(
+        rotation._xyzw, translation  # pylint: disable=protected-access
+    )
+
+  @classmethod
+  def from_poses(cls, poses: Sequence[pose3.Pose3]) -> 'Pose3Array':
+    """Constructs the batch from a sequence of Pose3 objects.
+
+    The quaternions and translations are copied without modification, so that
+    the conversion to and from a list of poses is lossless.
+
+    Args:
+      poses: The poses.
+
+    Returns:
+      A Pose3Array with len(poses) elements.
+    """
+    xyzw = np.empty((len(poses), 4), dtype=np.float64)
+    translation = np.empty((len(poses), 3), dtype=np.float64)
+    for i, pose in enumerate(poses):
+      xyzw[i] = pose.rotation.quaternion.xyzw
+      translation[i] = pose.translation
+    return cls._from_trusted_arrays(xyzw, translation)
+
+  # --------------------------------------------------------------------------
+  # String representations
+  # --------------------------------------------------------------------------
+
+  def __str__(self) -> Text:
+    return 'Pose3Array(%s,%s)' % (self._rotation, self._translation)
+
+  def __repr__(self) -> Text:
+    return 'Pose3Array(%r,%r)' % (self._rotation, self._translation)
+
+
+def _as_arrays(poses: PoseOrPoseArrayType):
+  """Returns the (N, 4) quaternions and (N, 3) translations of poses."""
+  if isinstance(poses, pose3.Pose3):
+    return (
+        poses.rotation.quaternion.xyzw[np.newaxis],
+        poses.translation[np.newaxis],
+    )
+  return poses.rotation._xyzw, poses._translation  # pylint: disable=protected-access
@@ -0,0 +1,138 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.math.python.pose3_array."""
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from intrinsic.math.python import math_test
+from intrinsic.math.python import pose3
+from intrinsic.math.python import pose3_array
+from intrinsic.math.python import rotation3
+from intrinsic.math.python import rotation3_array
+import numpy as np
+
+_TEST_POSES = [pose for _, pose in math_test.make_named_poses()]
+_TEST_VECTORS = [vector for _, vector in math_test.make_named_vectors()]
+
+
+class Pose3ArrayTest(parameterized.TestCase, math_test.TestCase):
+
+  def test_from_poses_is_lossless(self):
+    poses = pose3_array.Pose3Array.from_poses(_TEST_POSES)
+    self.assertLen(poses, len(_TEST_POSES))
+    for pose, expected in zip(poses.to_poses(), _TEST_POSES):
+      self.assertEqual(pose, expected)
+      self.assertEqual(pose.quaternion, expected.quaternion)
+
+  def test_init_defaults(self):
+    poses = pose3_array.Pose3Array(translation=np.ones((2, 3)))
+    self.assertTrue(poses.rotation.almost_equal(rotation3.Rotation3.identity()))
+    poses = pose3_array.Pose3Array(
+        rotation=rotation3_array.Rotation3Array.identity(3)
+    )
+    self.assert_all_equal(poses.translation, np.zeros((3, 3)))
+
+  def test_init_length_mismatch_raises(self):
+    with self.assertRaises(ValueError):
+      pose3_array.Pose3Array(
+          rotation=rotation3_array.Rotation3Array.identity(2),
+          translation=np.zeros((3, 3)),
+      )
+
+  def test_transform_points_matches_pose3(self):
+    poses = pose3_array.Pose3Array.from_poses(_TEST_POSES)
+    for vector in _TEST_VECTORS:
+      transformed = poses.transform_points(vector)
+      for i, pose in enumerate(_TEST_POSES):
+        self.assert_all_close(transformed[i], pose.transform_point(vector))
+
+  def test_transform_points_of_point_cloud(self):
+    pose = _TEST_POSES[-1]
+    points = np.array(_TEST_VECTORS)
+    transformed = pose3_array.Pose3Array.from_poses([pose]).transform_points(
+        points
+    )
+    self.assertEqual(transformed.shape, points.shape)
+    for i, point in enumerate(points):
+      self.assert_all_close(transformed[i], pose.transform_point(point))
+
+  def test_multiply(self):
+    poses = pose3_array.Pose3Array.from_poses(_TEST_POSES)
+    for other in _TEST_POSES:
+      products = poses * other
+      left_products = other * poses
+      for i, pose in enumerate(_TEST_POSES):
+        self.assert_pose_close(products[i], pose * other)
+        self.assert_pose_close(left_products[i], other * pose)
+
+  def test_multiply_element_wise(self):
+    poses = pose3_array.Pose3Array.from_poses(_TEST_POSES)
+    others = poses[::-1]
+    products = poses * others
+    for i, pose in enumerate(_TEST_POSES):
+      self.assert_pose_close(products[i], pose * _TEST_POSES[-1 - i])
+
+  def test_multiply_length_mismatch_raises(self):
+    with self.assertRaises(ValueError):
+      pose3_array.Pose3Array.identity(2) * pose3_array.Pose3Array.identity(3)
+
+  def test_inverse_and_multiply_by_inverse(self):
+    poses = pose3_array.Pose3Array.from_poses(_TEST_POSES)
+    self.assertTrue((poses * poses.inverse()).almost_equal(pose3.Pose3()))
+    other = _TEST_POSES[1]
+    quotients = poses.multiply_by_inverse(other)
+    for i, pose in enumerate(_TEST_POSES):
+      self.assert_pose_close(quotients[i], pose.multiply_by_inverse(other))
+
+  def test_matrix4x4_round_trip(self):
+    poses = pose3_array.Pose3Array.from_poses(_TEST_POSES)
+    matrices = poses.matrix4x4()
+    self.assertEqual(matrices.shape, (len(_TEST_POSES), 4, 4))
+    for i, pose in enumerate(_TEST_POSES):
+      self.assert_all_close(matrices[i], pose.matrix4x4())
+    self.assertTrue(
+        pose3_array.Pose3Array.from_matrix4x4(matrices).almost_equal(poses)
+    )
+
+  def test_from_matrix4x4_validation(self):
+    matrices = pose3_array.Pose3Array.from_poses(_TEST_POSES).matrix4x4()
+    matrices[1, 3, 0] = 0.5
+    with self.assertRaisesRegex(ValueError, r'rows \[1\]'):
+      pose3_array.Pose3Array.from_matrix4x4(matrices)
+    with self.assertRaises(ValueError):
+      pose3_array.Pose3Array.from_matrix4x4(
+          matrices, validate=rotation3_array.VALIDATE_FAST
+      )
+    poses = pose3_array.Pose3Array.from_matrix4x4(
+        matrices, validate=rotation3_array.VALIDATE_NONE
+    )
+    self.assert_pose_close(poses[1], _TEST_POSES[1])
+
+  def test_vec7_round_trip(self):
+    poses = pose3_array.Pose3Array.from_poses(_TEST_POSES)
+    vec7 = poses.vec7
+    for i, pose in enumerate(_TEST_POSES):
+      self.assert_all_close(vec7[i], pose.vec7)
+    self.assertTrue(pose3_array.Pose3Array.from_vec7(vec7).almost_equal(poses))
+
+  @parameterized.named_parameters(
+      ('wrong_shape', np.zeros((2, 6))),
+      ('vector', np.zeros(7)),
+  )
+  def test_from_vec7_invalid_shape_raises(self, vec7):
+    with self.assertRaises(ValueError):
+      pose3_array.Pose3Array.from_vec7(vec7)
+
+  def test_indexing(self):
+    poses = pose3_array.Pose3Array.from_poses(_TEST_POSES)
+    self.assertIsInstance(poses[0], pose3.Pose3)
+    self.assertEqual(poses[-1], _TEST_POSES[-1])
+    self.assertLen(poses[:2], 2)
+    mask = np.zeros(len(poses), dtype=bool)
+    mask[1] = True
+    self.assertEqual(poses[mask][0], _TEST_POSES[1])
+    self.assertEqual(list(poses), _TEST_POSES)
+
+
+if __name__ == '__main__':
+  absltest.main()
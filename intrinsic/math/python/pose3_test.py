@@ -2,6 +2,8 @@
 
 """Tests for intrinsic.math.python.pose3."""
 
+import pickle
+
 from absl.testing import absltest
 from absl.testing import parameterized
 from intrinsic.math.python import math_test
@@ -27,6 +29,20 @@ class Pose3Test(parameterized.TestCase, math_test.TestCase):
     self.assertEqual(pose.rotation, rotation)
     self.assert_all_equal(pose.translation, translation)
 
+  @parameterized.named_parameters(*_TEST_NAMED_POSES)
+  def test_pickle_round_trip(self, pose):
+    unpickled_pose = pickle.loads(pickle.dumps(pose))
+    self.assertEqual(unpickled_pose, pose)
+    self.assert_all_equal(unpickled_pose.vec7, pose.vec7)
+
+  def test_has_no_instance_dict(self):
+    pose = pose3.Pose3(translation=(1, 2, 3))
+    self.assertFalse(hasattr(pose, '__dict__'))
+    self.assertFalse(hasattr(pose.rotation, '__dict__'))
+    self.assertFalse(hasattr(pose.quaternion, '__dict__'))
+    with self.assertRaises(AttributeError):
+      pose.frame = 'world'
+
   @parameterized.named_parameters(*_TEST_NAMED_QUATERNIONS)
   def test_rotation(self, quat):
     rotation = rotation3.Rotation3(quat)
@@ -105,6 +121,19 @@ class Pose3Test(parameterized.TestCase, math_test.TestCase):
               err_msg='%s: %s' % (name, vector),
           )
 
+  @parameterized.named_parameters(*_TEST_NAMED_POSES)
+  def test_multiply_matches_components(self, pose1):
+    for pose2_name, pose2 in _TEST_NAMED_POSES:
+      with self.subTest(pose2=pose2_name):
+        product = pose1 * pose2
+        self.assert_rotation_close(
+            product.rotation, pose1.rotation * pose2.rotation
+        )
+        self.assert_all_close(
+            product.translation,
+            pose1.rotation.rotate_point(pose2.translation) + pose1.translation,
+        )
+
   @parameterized.named_parameters(*_TEST_NAMED_POSES)
   def test_multiply_by_inverse(self, pose1):
     for pose2_name, pose2 in _TEST_NAMED_POSES:
@@ -175,6 +204,15 @@ class Pose3Test(parameterized.TestCase, math_test.TestCase):
         transformed_vector = np.matmul(pose_matrix, vector_h)[:3]
         self.assert_all_close(posed_vector, transformed_vector)
 
+  @parameterized.named_parameters(*_TEST_NAMED_POSES)
+  def test_matrix4x4_is_cached(self, pose):
+    matrix = pose.matrix4x4()
+    matrix[:] = 0
+    expected = np.identity(4)
+    expected[:3, :3] = pose.rotation.matrix3x3()
+    expected[:3, 3] = pose.translation
+    self.assert_all_equal(pose.matrix4x4(), expected)
+
   def test_from_matrix4x4_identity(self):
     self.assert_pose_close(
         pose3.Pose3.from_matrix4x4(np.identity(4)), pose3.Pose3.identity()
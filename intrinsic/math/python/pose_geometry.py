@@ -0,0 +1,552 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Distances, nearest neighbor queries and clustering for sets of poses.
+
+Vectorized helpers for workloads such as deduplicating grasp candidates or
+finding the candidates closest to an approach pose:
+
+  distances = pose_geometry.translation_distances(candidates, approach_pose)
+  tree = pose_geometry.PoseKDTree(candidates)
+  distances, indices = tree.query(
+      approach_pose, k=5, max_rotation_distance=math.radians(30)
+  )
+  kept = pose_geometry.non_maximum_suppression(
+      candidates, scores, translation_threshold=0.01,
+      rotation_threshold=math.radians(15),
+  )
+
+Rotation distances are geodesic angles in radians, i.e. the angle of the
+rotation which takes one orientation to the other, in [0, pi].  Poses can be
+given as a Pose3Array, a single Pose3 or a sequence of Pose3 objects.
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple, Union
+
+from intrinsic.math.python import pose3
+from intrinsic.math.python import pose3_array
+from intrinsic.math.python import rotation3
+from intrinsic.math.python import rotation3_array
+import numpy as np
+
+# ----------------------------------------------------------------------------
+# Error messages for exceptions.
+SCORES_INVALID_MESSAGE = 'Scores should have shape (N,) for N poses'
+LEAF_SIZE_INVALID_MESSAGE = 'Leaf size should be positive'
+
+# Default maximum number of poses in a leaf of PoseKDTree.
+_DEFAULT_LEAF_SIZE = 64
+
+# Number of candidates for which non_maximum_suppression() queries neighbors
+# at once. Bounds the memory used for the neighbor lists.
+_SUPPRESSION_CHUNK_SIZE = 1024
+
+PosesType = Union[pose3_array.Pose3Array, pose3.Pose3, Sequence[pose3.Pose3]]
+RotationsType = Union[
+    rotation3_array.Rotation3Array,
+    rotation3.Rotation3,
+    pose3_array.Pose3Array,
+    pose3.Pose3,
+    Sequence[pose3.Pose3],
+]
+
+
+def translation_distances(poses_a: PosesType, poses_b: PosesType) -> np.ndarray:
+  """Returns the element-wise distances between the translations of poses.
+
+  Args:
+    poses_a: N poses or a single pose.
+    poses_b: N poses or a single pose, broadcast against poses_a.
+
+  Returns:
+    The (N,) Euclidean distances.
+
+  Raises:
+    ValueError: If the numbers of poses cannot be broadcast.
+  """
+  translation_a = _as_pose3_array(poses_a).translation
+  translation_b = _as_pose3_array(poses_b).translation
+  rotation3_array.check_broadcast_lengths(
+      len(translation_a), len(translation_b)
+  )
+  return np.linalg.norm(translation_a - translation_b, axis=1)
+
+
+def rotation_distances(
+    rotations_a: RotationsType, rotations_b: RotationsType
+) -> np.ndarray:
+  """Returns the element-wise geodesic distances between rotations.
+
+  Args:
+    rotations_a: N rotations, or poses whose rotations are compared.
+    rotations_b: N rotations or poses, broadcast against rotations_a.
+
+  Returns:
+    The (N,) rotation angles in radians, in [0, pi].
+
+  Raises:
+    ValueError: If the numbers of rotations cannot be broadcast.
+  """
+  xyzw_a = _unit_quaternions(rotations_a)
+  xyzw_b = _unit_quaternions(rotations_b)
+  rotation3_array.check_broadcast_lengths(len(xyzw_a), len(xyzw_b))
+  return _angles_from_dots(np.sum(xyzw_a * xyzw_b, axis=1))
+
+
+def pairwise_translation_distances(
+    poses_a: PosesType, poses_b: PosesType
+) -> np.ndarray:
+  """Returns the (N, M) distances between the translations of all pairs."""
+  translation_a = _as_pose3_array(poses_a).translation
+  translation_b = _as_pose3_array(poses_b).translation
+  return np.linalg.norm(
+      translation_a[:, np.newaxis, :] - translation_b[np.newaxis, :, :], axis=2
+  )
+
+
+def pairwise_rotation_distances(
+    rotations_a: RotationsType, rotations_b: RotationsType
+) -> np.ndarray:
+  """Returns the (N, M) geodesic distances in radians between all pairs."""
+  return _angles_from_dots(
+      np.matmul(
+          _unit_quaternions(rotations_a), _unit_quaternions(rotations_b).T
+      )
+  )
+
+
+class PoseKDTree(object):
+  """A KD-tree over the translations of a fixed set of poses.
+
+  Nearest neighbor and radius queries are by translation distance.  They can
+  additionally be restricted to poses within a maximum rotation distance of
+  the query pose.  The restriction is applied while searching, so that k
+  neighbors are returned whenever k poses satisfy it.
+
+  Queries are batched: all query poses traverse the tree together and the
+  distances between the queries which reach a leaf and the poses in it are
+  computed as one array operation, so the interpreter overhead is per visited
+  node rather than per query.
+  """
+
+  def __init__(self, poses: PosesType, leaf_size: int = _DEFAULT_LEAF_SIZE):
+    """Builds the tree.
+
+    Args:
+      poses: The poses to index.
+      leaf_size: Maximum number of poses in a leaf.
+
+    Raises:
+      ValueError: If the leaf size is not positive.
+    """
+    if leaf_size < 1:
+      raise ValueError('%s: %d' % (LEAF_SIZE_INVALID_MESSAGE, leaf_size))
+    poses = _as_pose3_array(poses)
+    translation = poses.translation
+    self._leaf_size = leaf_size
+    # Pose indices in tree order, so that every node covers a contiguous range.
+    self._order = np.arange(len(translation))
+    self._starts: List[int] = []
+    self._ends: List[int] = []
+    # Child node ids, or -1 for leaves.
+    self._lefts: List[int] = []
+    self._rights: List[int] = []
+    # Split dimensions and values of the inner nodes.
+    self._split_dimensions = []
+    self._split_values = []
+    box_mins = []
+    box_maxs = []
+    if len(translation):  # pylint: disable=g-explicit-length-test
+      self._build(translation, 0, len(translation), box_mins, box_maxs)
+    self._children = np.array((self._lefts, self._rights), dtype=np.intp)
+    self._split_dimensions = np.array(self._split_dimensions, dtype=np.intp)
+    self._split_values = np.array(self._split_values)
+    self._box_mins = np.array(box_mins).reshape(-1, 3)
+    self._box_maxs = np.array(box_maxs).reshape(-1, 3)
+    # Translations in tree order as (3, N), for computing distances per axis.
+    self._translation_columns = translation[self._order].T.copy()
+    self._xyzw = rotation3_array.normalized_quaternions(
+        poses.rotation.xyzw[self._order]
+    )
+
+  def _build(
+      self,
+      translation: np.ndarray,
+      start: int,
+      end: int,
+      box_mins: List[np.ndarray],
+      box_maxs: List[np.ndarray],
+  ) -> int:
+    """Recursively builds the subtree for order[start:end]; returns its id."""
+    node = len(self._starts)
+    points = translation[self._order[start:end]]
+    box_min = points.min(axis=0)
+    box_max = points.max(axis=0)
+    self._starts.append(start)
+    self._ends.append(end)
+    self._lefts.append(-1)
+    self._rights.append(-1)
+    self._split_dimensions.append(0)
+    self._split_values.append(0.0)
+    box_mins.append(box_min)
+    box_maxs.append(box_max)
+    if end - start <= self._leaf_size:
+      return node
+    # Splits at the median of the dimension with the largest extent.
+    dimension = int(np.argmax(box_max - box_min))
+    middle = (start + end) // 2
+    partition = np.argpartition(points[:, dimension], middle - start)
+    self._order[start:end] = self._order[start:end][partition]
+    self._split_dimensions[node] = dimension
+    self._split_values[node] = float(
+        translation[self._order[middle], dimension]
+    )
+    self._lefts[node] = self._build(
+        translation, start, middle, box_mins, box_maxs
+    )
+    self._rights[node] = self._build(
+        translation, middle, end, box_mins, box_maxs
+    )
+    return node
+
+  def __len__(self) -> int:
+    return len(self._order)
+
+  def query(
+      self,
+      poses: PosesType,
+      k: int = 1,
+      max_rotation_distance: Optional[float] = None,
+  ) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds the k poses with the nearest translations to each query pose.
+
+    Args:
+      poses: The M query poses, or a single query pose (M = 1).
+      k: Number of neighbors.
+      max_rotation_distance: If given, only poses whose rotation distance to
+        the query pose is at most this angle in radians are considered.
+
+    Returns:
+      (M, k) translation distances and (M, k) indices of the neighbors in
+      order of increasing distance.  If fewer than k poses satisfy the
+      rotation restriction, the missing neighbors have distance inf and
+      index -1.
+    """
+    points, xyzw = _pose_values(poses)
+    k = max(k, 0)
+    distances = np.full((len(points), k), np.inf)
+    indices = np.full((len(points), k), -1, dtype=np.intp)
+    if not len(self) or not k:  # pylint: disable=g-explicit-length-test
+      return distances, indices
+    min_abs_dot = _min_abs_dot(max_rotation_distance)
+    # Works with squared distances. Seeds the neighbors from the leaf
+    # containing each query, so that the traversal below prunes most nodes.
+    home_leaves = self._find_leaves(points)
+    for leaf in np.unique(home_leaves).tolist():
+      queries = np.flatnonzero(home_leaves == leaf)
+      self._update_nearest(
+          leaf, queries, points, xyzw, min_abs_dot, distances, indices
+      )
+    stack = [(0, np.arange(len(points)))]
+    while stack:
+      node, queries = stack.pop()
+      queries = queries[
+          self._box_squared_distances(node, points[queries])
+          <= distances[queries].max(axis=1)
+      ]
+      if not len(queries):  # pylint: disable=g-explicit-length-test
+        continue
+      if self._lefts[node] >= 0:
+        stack.append((self._lefts[node], queries))
+        stack.append((self._rights[node], queries))
+        continue
+      queries = queries[home_leaves[queries] != node]
+      if len(queries):  # pylint: disable=g-explicit-length-test
+        self._update_nearest(
+            node, queries, points, xyzw, min_abs_dot, distances, indices
+        )
+    # Sorts the neighbors by distance and then by index.
+    found = indices >= 0
+    ranks = np.lexsort(
+        (np.where(found, self._order[indices], len(self)), distances), axis=1
+    )
+    distances = np.sqrt(np.take_along_axis(distances, ranks, axis=1))
+    indices = np.take_along_axis(indices, ranks, axis=1)
+    return distances, np.where(indices >= 0, self._order[indices], -1)
+
+  def query_radius(
+      self,
+      poses: PosesType,
+      radius: float,
+      max_rotation_distance: Optional[float] = None,
+  ) -> List[np.ndarray]:
+    """Finds all poses with translations within the radius of each query.
+
+    Args:
+      poses: The M query poses, or a single query pose (M = 1).
+      radius: Maximum translation distance.
+      max_rotation_distance: If given, only poses whose rotation distance to
+        the query pose is at most this angle in radians are returned.
+
+    Returns:
+      A list with the sorted indices of the poses for each query pose.
+    """
+    points, xyzw = _pose_values(poses)
+    queries, neighbors = self._radius_pairs(
+        points, xyzw, radius, max_rotation_distance
+    )
+    return np.split(
+        neighbors, np.searchsorted(queries, np.arange(1, len(points)))
+    )
+
+  def _radius_pairs(
+      self,
+      points: np.ndarray,
+      xyzw: np.ndarray,
+      radius: float,
+      max_rotation_distance: Optional[float],
+  ) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns all (query, pose) index pairs within the radius.
+
+    Args:
+      points: (M, 3) query translations.
+      xyzw: (M, 4) query unit quaternions.
+      radius: Maximum translation distance.
+      max_rotation_distance: Optional maximum rotation distance in radians.
+
+    Returns:
+      The query indices and the pose indices of the pairs, sorted by query
+      and then by pose.
+    """
+    min_abs_dot = _min_abs_dot(max_rotation_distance)
+    squared_radius = radius * radius
+    pair_queries = [np.empty(0, dtype=np.intp)]
+    pair_poses = [np.empty(0, dtype=np.intp)]
+    stack = [(0, np.arange(len(points)))]
+    while stack and len(self):  # pylint: disable=g-explicit-length-test
+      node, queries = stack.pop()
+      queries = queries[
+          self._box_squared_distances(node, points[queries]) <= squared_radius
+      ]
+      if not len(queries):  # pylint: disable=g-explicit-length-test
+        continue
+      if self._lefts[node] >= 0:
+        stack.append((self._lefts[node], queries))
+        stack.append((self._rights[node], queries))
+        continue
+      rows, columns = np.nonzero(
+          self._leaf_squared_distances(node, points[queries]) <= squared_radius
+      )
+      queries = queries[rows]
+      columns += self._starts[node]
+      if min_abs_dot > -np.inf:
+        # Only the pairs within the radius are checked for their rotations.
+        within = (
+            np.abs(np.einsum('ij,ij->i', xyzw[queries], self._xyzw[columns]))
+            >= min_abs_dot
+        )
+        queries = queries[within]
+        columns = columns[within]
+      pair_queries.append(queries)
+      pair_poses.append(self._order[columns])
+    pair_queries = np.concatenate(pair_queries)
+    pair_poses = np.concatenate(pair_poses)
+    order = np.lexsort((pair_poses, pair_queries))
+    return pair_queries[order], pair_poses[order]
+
+  def _find_leaves(self, points: np.ndarray) -> np.ndarray:
+    """Returns the id of the leaf whose cell contains each point."""
+    lefts, rights = self._children
+    dimensions = self._split_dimensions
+    values = self._split_values
+    nodes = np.zeros(len(points), dtype=np.intp)
+    inner = np.flatnonzero(lefts[nodes] >= 0)
+    while len(inner):  # pylint: disable=g-explicit-length-test
+      current = nodes[inner]
+      goes_left = points[inner, dimensions[current]] < values[current]
+      nodes[inner] = np.where(goes_left, lefts[current], rights[current])
+      inner = inner[lefts[nodes[inner]] >= 0]
+    return nodes
+
+  def _box_squared_distances(self, node: int, points: np.ndarray) -> np.ndarray:
+    """Returns the squared distances from points to the box of a node."""
+    offsets = np.maximum(
+        np.maximum(
+            self._box_mins[node] - points, points - self._box_maxs[node]
+        ),
+        0.0,
+    )
+    return np.einsum('ij,ij->i', offsets, offsets)
+
+  def _leaf_squared_distances(
+      self, node: int, points: np.ndarray
+  ) -> np.ndarray:
+    """Returns the (M, L) squared distances from points to the leaf poses."""
+    start, end = self._starts[node], self._ends[node]
+    # Accumulating per axis is faster than reducing over an axis of length 3.
+    squared_distances = np.zeros((len(points), end - start))
+    for axis in range(3):
+      offsets = (
+          self._translation_columns[axis, start:end]
+          - points[:, axis, np.newaxis]
+      )
+      squared_distances += offsets * offsets
+    return squared_distances
+
+  def _update_nearest(
+      self,
+      node: int,
+      queries: np.ndarray,
+      points: np.ndarray,
+      xyzw: np.ndarray,
+      min_abs_dot: float,
+      distances: np.ndarray,
+      indices: np.ndarray,
+  ) -> None:
+    """Merges the poses of a leaf into the k nearest neighbors of queries.
+
+    Args:
+      node: Id of the leaf.
+      queries: Indices of the queries to update.
+      points: (M, 3) translations of all queries.
+      xyzw: (M, 4) unit quaternions of all queries.
+      min_abs_dot: The rotation restriction, see _min_abs_dot().
+      distances: (M, k) squared distances of the nearest neighbors, updated
+        in place.
+      indices: (M, k) tree order indices of the nearest neighbors, or -1,
+        updated in place.
+    """
+    k = distances.shape[1]
+    start, end = self._starts[node], self._ends[node]
+    leaf_distances = self._leaf_squared_distances(node, points[queries])
+    leaf_indices = np.broadcast_to(np.arange(start, end), leaf_distances.shape)
+    if min_abs_dot > -np.inf:
+      excluded = (
+          np.abs(xyzw[queries].dot(self._xyzw[start:end].T)) < min_abs_dot
+      )
+      leaf_distances[excluded] = np.inf
+      leaf_indices = np.where(excluded, -1, leaf_indices)
+    # Only merges into the queries for which the leaf has a nearer pose.
+    improves = leaf_distances.min(axis=1) < distances[queries].max(axis=1)
+    queries = queries[improves]
+    leaf_distances = leaf_distances[improves]
+    leaf_indices = leaf_indices[improves]
+    merged_distances = np.concatenate(
+        (distances[queries], leaf_distances), axis=1
+    )
+    merged_indices = np.concatenate((indices[queries], leaf_indices), axis=1)
+    nearest = np.argpartition(merged_distances, k - 1, axis=1)[:, :k]
+    distances[queries] = np.take_along_axis(merged_distances, nearest, axis=1)
+    indices[queries] = np.take_along_axis(merged_indices, nearest, axis=1)
+
+
+def non_maximum_suppression(
+    poses: PosesType,
+    scores: np.ndarray,
+    translation_threshold: float,
+    rotation_threshold: Optional[float] = None,
+    max_results: Optional[int] = None,
+) -> np.ndarray:
+  """Greedy non-maximum suppression over poses.
+
+  Repeatedly keeps the pose with the highest score that has not been
+  suppressed yet and suppresses all poses within translation_threshold of it
+  (and, if given, within rotation_threshold radians).  Ties in the scores are
+  broken by the order of the poses.
+
+  Args:
+    poses: The N candidate poses.
+    scores: (N,) scores, higher is better.
+    translation_threshold: Poses within this distance of a kept pose are
+      suppressed.
+    rotation_threshold: If given, only poses which are also within this
+      rotation distance are suppressed.
+    max_results: If given, stops after keeping this many poses.
+
+  Returns:
+    The indices of the kept poses in order of decreasing score.
+
+  Raises:
+    ValueError: If the scores do not have shape (N,).
+  """
+  poses = _as_pose3_array(poses)
+  scores = np.asarray(scores, dtype=np.float64)
+  if scores.shape != (len(poses),):
+    raise ValueError(
+        '%s: %s != (%d,)' % (SCORES_INVALID_MESSAGE, scores.shape, len(poses))
+    )
+  tree = PoseKDTree(poses)
+  translation, xyzw = _pose_values(poses)
+  suppressed = np.zeros(len(poses), dtype=bool)
+  kept = []
+  order = np.argsort(-scores, kind='stable')
+  for chunk_start in range(0, len(order), _SUPPRESSION_CHUNK_SIZE):
+    # Queries the neighbors of the candidates in the chunk which have not been
+    # suppressed by earlier chunks at once, then suppresses in score order.
+    chunk = order[chunk_start : chunk_start + _SUPPRESSION_CHUNK_SIZE]
+    chunk = chunk[~suppressed[chunk]]
+    queries, neighbors = tree._radius_pairs(  # pylint: disable=protected-access
+        translation[chunk],
+        xyzw[chunk],
+        translation_threshold,
+        rotation_threshold,
+    )
+    bounds = np.searchsorted(queries, np.arange(len(chunk) + 1)).tolist()
+    for i, index in enumerate(chunk.tolist()):
+      if suppressed[index]:
+        continue
+      kept.append(index)
+      if max_results is not None and len(kept) >= max_results:
+        return np.array(kept, dtype=np.intp)
+      suppressed[neighbors[bounds[i] : bounds[i + 1]]] = True
+  return np.array(kept, dtype=np.intp)
+
+
+def _as_pose3_array(poses: PosesType) -> pose3_array.Pose3Array:
+  if isinstance(poses, pose3_array.Pose3Array):
+    return poses
+  if isinstance(poses, pose3.Pose3):
+    poses = [poses]
+  return pose3_array.Pose3Array.from_poses(poses)
+
+
+def _unit_quaternions(rotations: RotationsType) -> np.ndarray:
+  """Returns the (N, 4) unit quaternions of rotations or poses."""
+  if isinstance(rotations, rotation3.Rotation3):
+    xyzw = rotations.quaternion.xyzw[np.newaxis]
+  elif isinstance(rotations, rotation3_array.Rotation3Array):
+    xyzw = rotations.xyzw
+  else:
+    xyzw = _as_pose3_array(rotations).rotation.xyzw
+  return rotation3_array.normalized_quaternions(xyzw)
+
+
+def _pose_values(poses: PosesType) -> Tuple[np.ndarray, np.ndarray]:
+  """Returns the (M, 3) translations and (M, 4) unit quaternions of poses."""
+  poses = _as_pose3_array(poses)
+  return poses.translation, rotation3_array.normalized_quaternions(
+      poses.rotation.xyzw
+  )
+
+
+def _min_abs_dot(max_rotation_distance: Optional[float]) -> float:
+  """Returns the quaternion dot product bound of a rotation restriction.
+
+  Two unit quaternions are within the rotation distance if the absolute value
+  of their dot product is at least cos(max_rotation_distance / 2), which
+  avoids computing the angles.
+
+  Args:
+    max_rotation_distance: Maximum rotation distance in radians, or None.
+
+  Returns:
+    The bound, or -inf if there is no restriction.
+  """
+  if max_rotation_distance is None or max_rotation_distance >= math.pi:
+    return -np.inf
+  return math.cos(max(max_rotation_distance, 0.0) / 2.0)
+
+
+def _angles_from_dots(dots: np.ndarray) -> np.ndarray:
+  """Converts dot products of unit quaternions to rotation angles."""
+  return 2.0 * np.arccos(np.minimum(np.abs(dots), 1.0))
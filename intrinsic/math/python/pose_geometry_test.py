@@ -0,0 +1,209 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.math.python.pose_geometry."""
+
+import math
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from intrinsic.math.python import math_test
+from intrinsic.math.python import pose3
+from intrinsic.math.python import pose3_array
+from intrinsic.math.python import pose_geometry
+from intrinsic.math.python import rotation3
+import numpy as np
+
+
+def _random_poses(num_poses: int, seed: int = 0) -> pose3_array.Pose3Array:
+  rng = np.random.default_rng(seed)
+  vec7 = np.hstack(
+      (
+          rng.uniform(-1.0, 1.0, size=(num_poses, 3)),
+          rng.normal(size=(num_poses, 4)),
+      )
+  )
+  return pose3_array.Pose3Array.from_vec7(vec7, normalize=True)
+
+
+class PoseGeometryTest(parameterized.TestCase, math_test.TestCase):
+
+  def test_translation_distances(self):
+    poses = pose3_array.Pose3Array.from_poses(
+        [
+            pose3.Pose3(translation=(0, 0, 0)),
+            pose3.Pose3(translation=(3, 4, 0)),
+        ]
+    )
+    self.assert_all_close(
+        pose_geometry.translation_distances(
+            poses, pose3.Pose3(translation=(0, 0, 1))
+        ),
+        [1.0, math.sqrt(26.0)],
+    )
+
+  def test_rotation_distances(self):
+    axis = (1, 2, 3)
+    rotations = [
+        rotation3.Rotation3.from_axis_angle(axis, angle)
+        for angle in (0.0, 0.5, 3.0)
+    ]
+    poses = [pose3.Pose3(rotation) for rotation in rotations]
+    reference = rotation3.Rotation3.from_axis_angle(axis, 0.5)
+    self.assert_all_close(
+        pose_geometry.rotation_distances(poses, reference), [0.5, 0.0, 2.5]
+    )
+
+  def test_rotation_distance_ignores_quaternion_sign(self):
+    rotation = rotation3.Rotation3.from_axis_angle((0, 1, 0), 0.3)
+    negated = rotation3.Rotation3.from_xyzw(-rotation.quaternion.xyzw)
+    self.assert_all_close(
+        pose_geometry.rotation_distances(rotation, negated), [0.0]
+    )
+
+  def test_rotation_distances_length_mismatch_raises(self):
+    with self.assertRaises(ValueError):
+      pose_geometry.rotation_distances(_random_poses(2), _random_poses(3))
+
+  def test_pairwise_distances_match_elementwise(self):
+    poses_a = _random_poses(5, seed=1)
+    poses_b = _random_poses(7, seed=2)
+    translation = pose_geometry.pairwise_translation_distances(poses_a, poses_b)
+    rotation = pose_geometry.pairwise_rotation_distances(poses_a, poses_b)
+    self.assertEqual(translation.shape, (5, 7))
+    self.assertEqual(rotation.shape, (5, 7))
+    for i in range(5):
+      self.assert_all_close(
+          translation[i],
+          pose_geometry.translation_distances(poses_b, poses_a[i]),
+      )
+      self.assert_all_close(
+          rotation[i], pose_geometry.rotation_distances(poses_b, poses_a[i])
+      )
+
+  @parameterized.parameters(1, 4, 32)
+  def test_query_matches_brute_force(self, leaf_size):
+    poses = _random_poses(500)
+    queries = _random_poses(20, seed=3)
+    tree = pose_geometry.PoseKDTree(poses, leaf_size=leaf_size)
+    self.assertLen(tree, 500)
+    distances, indices = tree.query(queries, k=5)
+    self.assertEqual(distances.shape, (20, 5))
+    self.assertEqual(indices.shape, (20, 5))
+    for i, query in enumerate(queries):
+      expected = pose_geometry.translation_distances(poses, query)
+      expected_indices = np.argsort(expected, kind='stable')[:5]
+      np.testing.assert_array_equal(indices[i], expected_indices)
+      self.assert_all_close(distances[i], expected[expected_indices])
+
+  def test_query_with_rotation_filter(self):
+    poses = _random_poses(500)
+    queries = _random_poses(20, seed=4)
+    tree = pose_geometry.PoseKDTree(poses)
+    max_angle = math.radians(60.0)
+    _, indices = tree.query(queries, k=3, max_rotation_distance=max_angle)
+    for i, query in enumerate(queries):
+      distances = pose_geometry.translation_distances(poses, query)
+      candidates = np.flatnonzero(
+          pose_geometry.rotation_distances(poses, query) <= max_angle
+      )
+      expected = candidates[np.argsort(distances[candidates], kind='stable')]
+      np.testing.assert_array_equal(indices[i], expected[:3])
+
+  def test_query_single_pose(self):
+    poses = _random_poses(100)
+    distances, indices = pose_geometry.PoseKDTree(poses).query(poses[7], k=2)
+    np.testing.assert_array_equal(indices[:, 0], [7])
+    self.assert_all_close(distances[:, 0], [0.0])
+
+  def test_query_returns_fewer_if_filtered(self):
+    poses = pose3_array.Pose3Array.from_poses(
+        [
+            pose3.Pose3(translation=(0, 0, 0)),
+            pose3.Pose3(
+                rotation3.Rotation3.from_axis_angle((0, 0, 1), 1.0), (1, 0, 0)
+            ),
+        ]
+    )
+    tree = pose_geometry.PoseKDTree(poses)
+    distances, indices = tree.query(
+        pose3.Pose3(translation=(2, 0, 0)), k=3, max_rotation_distance=0.5
+    )
+    np.testing.assert_array_equal(indices, [[0, -1, -1]])
+    self.assert_all_close(distances, [[2.0, np.inf, np.inf]])
+
+  def test_query_empty_tree(self):
+    tree = pose_geometry.PoseKDTree([])
+    distances, indices = tree.query(pose3.Pose3(), k=3)
+    np.testing.assert_array_equal(distances, [[np.inf] * 3])
+    np.testing.assert_array_equal(indices, [[-1] * 3])
+    (neighbors,) = tree.query_radius(pose3.Pose3(), 1.0)
+    self.assertEmpty(neighbors)
+
+  def test_query_radius_matches_brute_force(self):
+    poses = _random_poses(500)
+    queries = _random_poses(20, seed=5)
+    tree = pose_geometry.PoseKDTree(poses)
+    neighbors = tree.query_radius(queries, 0.4, max_rotation_distance=1.0)
+    self.assertLen(neighbors, 20)
+    for i, query in enumerate(queries):
+      within = (pose_geometry.translation_distances(poses, query) <= 0.4) & (
+          pose_geometry.rotation_distances(poses, query) <= 1.0
+      )
+      np.testing.assert_array_equal(neighbors[i], np.flatnonzero(within))
+
+  def test_invalid_leaf_size_raises(self):
+    with self.assertRaises(ValueError):
+      pose_geometry.PoseKDTree(_random_poses(3), leaf_size=0)
+
+  def test_non_maximum_suppression(self):
+    poses = pose3_array.Pose3Array.from_poses(
+        [
+            pose3.Pose3(translation=(0, 0, 0)),
+            pose3.Pose3(translation=(0.005, 0, 0)),
+            pose3.Pose3(translation=(1, 0, 0)),
+            pose3.Pose3(
+                rotation3.Rotation3.from_axis_angle((1, 0, 0), 1.0), (0, 0, 0)
+            ),
+        ]
+    )
+    scores = [0.5, 0.9, 0.1, 0.2]
+    np.testing.assert_array_equal(
+        pose_geometry.non_maximum_suppression(poses, scores, 0.01), [1, 2]
+    )
+    np.testing.assert_array_equal(
+        pose_geometry.non_maximum_suppression(
+            poses, scores, 0.01, rotation_threshold=0.5
+        ),
+        [1, 3, 2],
+    )
+    np.testing.assert_array_equal(
+        pose_geometry.non_maximum_suppression(
+            poses, scores, 0.01, rotation_threshold=0.5, max_results=2
+        ),
+        [1, 3],
+    )
+
+  def test_non_maximum_suppression_matches_brute_force(self):
+    poses = _random_poses(2000)
+    scores = np.random.default_rng(6).uniform(size=2000)
+    kept = pose_geometry.non_maximum_suppression(
+        poses, scores, 0.2, rotation_threshold=1.0
+    )
+    translation = pose_geometry.pairwise_translation_distances(poses, poses)
+    rotation = pose_geometry.pairwise_rotation_distances(poses, poses)
+    neighbors = (translation <= 0.2) & (rotation <= 1.0)
+    suppressed = np.zeros(2000, dtype=bool)
+    expected = []
+    for index in np.argsort(-scores, kind='stable'):
+      if not suppressed[index]:
+        expected.append(index)
+        suppressed |= neighbors[index]
+    np.testing.assert_array_equal(kept, expected)
+
+  def test_non_maximum_suppression_invalid_scores_raises(self):
+    with self.assertRaises(ValueError):
+      pose_geometry.non_maximum_suppression(_random_poses(3), [1.0, 2.0], 0.1)
+
+
+if __name__ == '__main__':
+  absltest.main()
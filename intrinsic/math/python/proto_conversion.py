@@ -2,9 +2,12 @@
 
 """Converters from intrinsic math protos to commonly used in-memory representations."""
 
+import itertools
 import sys
+from typing import Iterable, List, MutableSequence, Optional, Sized, TypeVar
 
 from intrinsic.icon.proto import cart_space_pb2
+from intrinsic.icon.proto import joint_space_pb2
 from intrinsic.math.proto import array_pb2
 from intrinsic.math.proto import matrix_pb2
 from intrinsic.math.proto import point_pb2
@@ -12,11 +15,35 @@ from intrinsic.math.proto import pose_pb2
 from intrinsic.math.proto import quaternion_pb2
 from intrinsic.math.proto import vector3_pb2
 from intrinsic.math.python import data_types
+from intrinsic.math.python import math_types
+from intrinsic.math.python import quaternion
 import numpy as np
 
+_MessageT = TypeVar('_MessageT')
 
-def ndarray_from_proto(array_proto: array_pb2.Array) -> np.ndarray:
-  """Converts Array proto to np.ndarray."""
+
+def ndarray_from_proto(
+    array_proto: array_pb2.Array, copy: bool = False
+) -> np.ndarray:
+  """Converts Array proto to np.ndarray.
+
+  By default, returns a read-only view of the data bytes of the proto, so
+  large arrays such as depth images are not copied again after reading the
+  bytes field.  The view references the bytes object it was created from,
+  which keeps the data alive and unchanged even if the proto is modified or
+  deleted afterwards.  The dtype of the view has the byte order of the proto.
+
+  Args:
+    array_proto: The array as proto.
+    copy: If true, returns a writable copy instead of a view.
+
+  Returns:
+    The array with the shape of the proto.
+
+  Raises:
+    ValueError: If the scalar type or byte order of the proto is invalid or
+      the size of the data does not match the shape.
+  """
   if (
       array_proto.byte_order == array_pb2.Array.NO_BYTE_ORDER
       and array_proto.type not in _NO_BYTE_ORDER_SCALAR_TYPES
@@ -42,11 +69,32 @@ def ndarray_from_proto(array_proto: array_pb2.Array) -> np.ndarray:
   else:
     dtype = dtype.newbyteorder(np_byte_order)
 
-  return np.frombuffer(array_proto.data, dtype=dtype).reshape(array_proto.shape)
+  array = np.frombuffer(array_proto.data, dtype=dtype).reshape(
+      array_proto.shape
+  )
+  return array.copy() if copy else array
+
+
+def ndarray_to_proto(
+    array: np.ndarray, out: Optional[array_pb2.Array] = None
+) -> array_pb2.Array:
+  """Converts np.ndarray to Array proto.
+
+  The data is encoded in C order with a single copy, also if the array is not
+  C-contiguous, e.g. a transposed or sliced view.
+
+  Args:
+    array: The array to convert.
+    out: If given, the message to write to instead of a new one, for example
+      the Array field of an enclosing message.  Its previous contents are
+      replaced.  This avoids copying the data again with CopyFrom().
 
+  Returns:
+    The Array proto, which is out if it was given.
 
-def ndarray_to_proto(array: np.ndarray) -> array_pb2.Array:
-  """Converts np.ndarray to Array proto."""
+  Raises:
+    ValueError: If the dtype of the array is not supported.
+  """
   try:
     scalar_type = _NP_TYPE_TO_SCALAR_TYPE[array.dtype.type]
   except KeyError as err:
@@ -67,12 +115,13 @@ def ndarray_to_proto(array: np.ndarray) -> array_pb2.Array:
           f'Unrecognized numpy byte order: {array.dtype.byteorder!r}'
       ) from err
 
-  return array_pb2.Array(
-      data=array.tobytes(),
-      shape=array.shape,
-      type=scalar_type,
-      byte_order=byte_order,
-  )
+  if out is None:
+    out = array_pb2.Array()
+  out.data = array.tobytes()
+  out.shape[:] = array.shape
+  out.type = scalar_type
+  out.byte_order = byte_order
+  return out
 
 
 def ndarray_from_matrix_proto(proto: matrix_pb2.Matrixd) -> np.ndarray:
@@ -194,6 +243,280 @@ def wrench_from_proto(wrench: cart_space_pb2.Wrench) -> data_types.Wrench:
   )
 
 
+# Bulk converters between repeated proto fields (or any iterable of protos) and
+# numpy arrays with one row per proto. Each converter makes a single pass over
+# the protos and allocates the result array once.
+
+
+def points_from_protos(protos: Iterable[point_pb2.Point]) -> np.ndarray:
+  """Converts point protos to an (N, 3) array of [x, y, z]."""
+  return _rows_from_protos(protos, lambda p: (p.x, p.y, p.z), 3)
+
+
+def points_to_protos(
+    points: np.ndarray,
+    repeated_field: Optional[MutableSequence[point_pb2.Point]] = None,
+) -> List[point_pb2.Point]:
+  """Converts an (N, 3) array of [x, y, z] to point protos.
+
+  Args:
+    points: The points, one per row.
+    repeated_field: If given, the protos are also appended to this field.
+
+  Returns:
+    The point protos.
+
+  Raises:
+    ValueError: If the array does not have shape (N, 3).
+  """
+  rows = _check_rows(points, 3, 'points')
+  return _extend(
+      repeated_field,
+      [point_pb2.Point(x=x, y=y, z=z) for x, y, z in rows],
+  )
+
+
+def quaternions_from_protos(
+    protos: Iterable[quaternion_pb2.Quaternion],
+) -> np.ndarray:
+  """Converts quaternion protos to an (N, 4) array of [x, y, z, w]."""
+  return _rows_from_protos(protos, lambda q: (q.x, q.y, q.z, q.w), 4)
+
+
+def quaternions_to_protos(
+    quaternions: np.ndarray,
+    repeated_field: Optional[MutableSequence[quaternion_pb2.Quaternion]] = None,
+) -> List[quaternion_pb2.Quaternion]:
+  """Converts an (N, 4) array of [x, y, z, w] to quaternion protos.
+
+  Args:
+    quaternions: The quaternions, one per row.
+    repeated_field: If given, the protos are also appended to this field.
+
+  Returns:
+    The quaternion protos.
+
+  Raises:
+    ValueError: If the array does not have shape (N, 4).
+  """
+  rows = _check_rows(quaternions, 4, 'quaternions')
+  return _extend(
+      repeated_field,
+      [quaternion_pb2.Quaternion(x=x, y=y, z=z, w=w) for x, y, z, w in rows],
+  )
+
+
+def poses_from_protos(
+    protos: Iterable[pose_pb2.Pose], check_normalized: bool = True
+) -> np.ndarray:
+  """Converts pose protos to an (N, 7) array of [tx, ty, tz, qx, qy, qz, qw].
+
+  The result can be passed to Pose3Array.from_vec7() or, row by row, to
+  Pose3.from_vec7().
+
+  Args:
+    protos: The pose protos.
+    check_normalized: Whether to check that all orientations are normalized,
+      like pose_from_proto() does.
+
+  Returns:
+    The poses in vec7 representation, one per row.
+
+  Raises:
+    ValueError: If check_normalized is True and an orientation is not
+      normalized.
+  """
+  vec7 = _rows_from_protos(
+      protos,
+      lambda p: (
+          p.position.x,
+          p.position.y,
+          p.position.z,
+          p.orientation.x,
+          p.orientation.y,
+          p.orientation.z,
+          p.orientation.w,
+      ),
+      7,
+  )
+  if check_normalized:
+    not_normalized = ~_is_normalized(vec7[:, 3:])
+    if np.any(not_normalized):
+      raise ValueError(
+          '%s: rows %s'
+          % (
+              quaternion.QUATERNION_NOT_NORMALIZED_MESSAGE,
+              np.flatnonzero(not_normalized),
+          )
+      )
+  return vec7
+
+
+def poses_to_protos(
+    poses: np.ndarray,
+    repeated_field: Optional[MutableSequence[pose_pb2.Pose]] = None,
+) -> List[pose_pb2.Pose]:
+  """Converts an (N, 7) array of [tx, ty, tz, qx, qy, qz, qw] to pose protos.
+
+  Like pose_to_proto(), quaternions which are not normalized are normalized
+  and all other quaternions are copied without modification.
+
+  Args:
+    poses: The poses in vec7 representation, one per row, e.g.
+      Pose3Array.vec7.
+    repeated_field: If given, the protos are also appended to this field.
+
+  Returns:
+    The pose protos.
+
+  Raises:
+    ValueError: If the array does not have shape (N, 7).
+  """
+  rows = np.array(_check_rows(poses, 7, 'poses'), dtype=np.float64)
+  quaternions = rows[:, 3:]
+  not_normalized = ~_is_normalized(quaternions)
+  if np.any(not_normalized):
+    quaternions[not_normalized] /= np.linalg.norm(
+        quaternions[not_normalized], axis=1, keepdims=True
+    )
+  return _extend(
+      repeated_field,
+      [
+          pose_pb2.Pose(
+              position=point_pb2.Point(x=tx, y=ty, z=tz),
+              orientation=quaternion_pb2.Quaternion(x=qx, y=qy, z=qz, w=qw),
+          )
+          for tx, ty, tz, qx, qy, qz, qw in rows.tolist()
+      ],
+  )
+
+
+def wrenches_from_protos(
+    protos: Iterable[cart_space_pb2.Wrench],
+) -> np.ndarray:
+  """Converts wrench protos to an (N, 6) array of [x, y, z, rx, ry, rz]."""
+  return _rows_from_protos(
+      protos, lambda w: (w.x, w.y, w.z, w.rx, w.ry, w.rz), 6
+  )
+
+
+def wrenches_to_protos(
+    wrenches: np.ndarray,
+    repeated_field: Optional[MutableSequence[cart_space_pb2.Wrench]] = None,
+) -> List[cart_space_pb2.Wrench]:
+  """Converts an (N, 6) array of [x, y, z, rx, ry, rz] to wrench protos.
+
+  Args:
+    wrenches: The wrenches (force followed by torque), one per row.
+    repeated_field: If given, the protos are also appended to this field.
+
+  Returns:
+    The wrench protos.
+
+  Raises:
+    ValueError: If the array does not have shape (N, 6).
+  """
+  rows = _check_rows(wrenches, 6, 'wrenches')
+  return _extend(
+      repeated_field,
+      [
+          cart_space_pb2.Wrench(x=x, y=y, z=z, rx=rx, ry=ry, rz=rz)
+          for x, y, z, rx, ry, rz in rows
+      ],
+  )
+
+
+def joint_vecs_from_protos(
+    protos: Iterable[joint_space_pb2.JointVec],
+) -> np.ndarray:
+  """Converts JointVec protos to an (N, J) array of joint values.
+
+  Args:
+    protos: The JointVec protos, which must all have the same number of joints.
+
+  Returns:
+    The joint values, one JointVec per row.
+
+  Raises:
+    ValueError: If the protos have different numbers of joints.
+  """
+  protos = list(protos)
+  num_joints = len(protos[0].joints) if protos else 0
+  for index, proto in enumerate(protos):
+    if len(proto.joints) != num_joints:
+      raise ValueError(
+          f'JointVec {index} has {len(proto.joints)} joints, but JointVec 0'
+          f' has {num_joints}.'
+      )
+  return _rows_from_protos(protos, lambda p: p.joints, num_joints)
+
+
+def joint_vecs_to_protos(
+    joint_vecs: np.ndarray,
+    repeated_field: Optional[MutableSequence[joint_space_pb2.JointVec]] = None,
+) -> List[joint_space_pb2.JointVec]:
+  """Converts an (N, J) array of joint values to JointVec protos.
+
+  Args:
+    joint_vecs: The joint values, one JointVec per row.
+    repeated_field: If given, the protos are also appended to this field.
+
+  Returns:
+    The JointVec protos.
+
+  Raises:
+    ValueError: If the array is not two-dimensional.
+  """
+  joint_vecs = np.asarray(joint_vecs)
+  if joint_vecs.ndim != 2:
+    raise ValueError(
+        f'expected joint_vecs of shape (N, J), got shape {joint_vecs.shape}.'
+    )
+  return _extend(
+      repeated_field,
+      [joint_space_pb2.JointVec(joints=row) for row in joint_vecs.tolist()],
+  )
+
+
+def _rows_from_protos(protos, get_values, num_columns: int) -> np.ndarray:
+  """Returns an (N, num_columns) float64 array with get_values(proto) rows."""
+  if not isinstance(protos, Sized):
+    protos = list(protos)
+  values = np.fromiter(
+      itertools.chain.from_iterable(map(get_values, protos)),
+      dtype=np.float64,
+      count=len(protos) * num_columns,
+  )
+  return values.reshape(len(protos), num_columns)
+
+
+def _check_rows(array: np.ndarray, num_columns: int, name: str) -> List:
+  """Returns the rows of an (N, num_columns) array as lists of floats."""
+  array = np.asarray(array, dtype=np.float64)
+  if array.ndim != 2 or array.shape[1] != num_columns:
+    raise ValueError(
+        f'expected {name} of shape (N, {num_columns}), got shape'
+        f' {array.shape}.'
+    )
+  return array.tolist()
+
+
+def _extend(
+    repeated_field: Optional[MutableSequence[_MessageT]],
+    messages: List[_MessageT],
+) -> List[_MessageT]:
+  if repeated_field is not None:
+    repeated_field.extend(messages)
+  return messages
+
+
+def _is_normalized(quaternions: np.ndarray) -> np.ndarray:
+  """Vectorized equivalent of Quaternion.is_normalized() for (N, 4) arrays."""
+  return np.abs(1 - np.sum(quaternions * quaternions, axis=1)) <= (
+      math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE * 2
+  )
+
+
 # Maps between Array.ScalarType and the corresponding numpy dtype.
 _SCALAR_TYPE_TO_DTYPE = {
     array_pb2.Array.ScalarType.BOOL_SCALAR_TYPE: np.dtype('bool'),
@@ -7,6 +7,7 @@ from absl.testing import parameterized
 import hypothesis
 from hypothesis.extra import numpy as np_strategies
 from intrinsic.icon.proto import cart_space_pb2
+from intrinsic.icon.proto import joint_space_pb2
 from intrinsic.math.proto import array_pb2
 from intrinsic.math.proto import matrix_pb2
 from intrinsic.math.proto import point_pb2
@@ -74,6 +75,43 @@ class ProtoConversionTest(parameterized.TestCase):
     self.assertEqual(array.dtype, recovered.dtype)
     np.testing.assert_array_equal(array, recovered)
 
+  def test_ndarray_from_proto_returns_read_only_view(self):
+    proto = proto_conversion.ndarray_to_proto(np.arange(6.0).reshape(2, 3))
+    view = proto_conversion.ndarray_from_proto(proto)
+    self.assertFalse(view.flags.writeable)
+    proto.data = np.zeros(6).tobytes()
+    del proto
+    np.testing.assert_array_equal(view, np.arange(6.0).reshape(2, 3))
+
+  def test_ndarray_from_proto_copy_is_writable(self):
+    proto = proto_conversion.ndarray_to_proto(np.arange(6.0))
+    array = proto_conversion.ndarray_from_proto(proto, copy=True)
+    array[0] = 10.0
+    np.testing.assert_array_equal(
+        proto_conversion.ndarray_from_proto(proto), np.arange(6.0)
+    )
+
+  @parameterized.named_parameters(
+      ('transposed', np.arange(12.0).reshape(3, 4).T),
+      ('strided', np.arange(24, dtype=np.int32).reshape(4, 6)[::2, 1::2]),
+      ('fortran', np.asfortranarray(np.arange(12.0).reshape(3, 4))),
+  )
+  def test_ndarray_to_proto_non_contiguous(self, array):
+    recovered = proto_conversion.ndarray_from_proto(
+        proto_conversion.ndarray_to_proto(array)
+    )
+    np.testing.assert_array_equal(recovered, array)
+
+  def test_ndarray_to_proto_out(self):
+    proto = array_pb2.Array()
+    array = np.arange(6, dtype=np.uint16).reshape(3, 2)
+    result = proto_conversion.ndarray_to_proto(array, out=proto)
+    self.assertIs(result, proto)
+    self.assertEqual(proto, proto_conversion.ndarray_to_proto(array))
+    # Reusing the message replaces its contents.
+    proto_conversion.ndarray_to_proto(np.ones(4), out=proto)
+    self.assertEqual(proto, proto_conversion.ndarray_to_proto(np.ones(4)))
+
   def test_ndarray_to_proto_fails_for_unknown_dtype(self):
     with self.assertRaises(ValueError):
       proto_conversion.ndarray_to_proto(np.array('bob'))
@@ -222,6 +260,105 @@ class ProtoConversionTest(parameterized.TestCase):
     np.testing.assert_array_equal(wrench.force, [1, 2, 3])
     np.testing.assert_array_equal(wrench.torque, [4, 5, 6])
 
+  def test_points_to_from_protos_roundtrip(self):
+    points = _rng.randn(5, 3)
+    protos = proto_conversion.points_to_protos(points)
+    self.assertLen(protos, 5)
+    for point, proto in zip(points, protos):
+      self.assertEqual(proto_conversion.ndarray_to_point_proto(point), proto)
+    np.testing.assert_array_equal(
+        proto_conversion.points_from_protos(protos), points
+    )
+
+  def test_quaternions_to_from_protos_roundtrip(self):
+    quaternions = _rng.randn(4, 4)
+    protos = proto_conversion.quaternions_to_protos(quaternions)
+    x, y, z, w = quaternions[1]
+    self.assertEqual(protos[1], quaternion_pb2.Quaternion(x=x, y=y, z=z, w=w))
+    np.testing.assert_array_equal(
+        proto_conversion.quaternions_from_protos(protos), quaternions
+    )
+
+  def test_poses_from_protos_matches_pose_from_proto(self):
+    protos = [
+        proto_conversion.pose_to_proto(
+            data_types.Pose3(
+                translation=_rng.randn(3),
+                rotation=data_types.Rotation3.random(),
+            )
+        )
+        for _ in range(6)
+    ]
+    vec7 = proto_conversion.poses_from_protos(protos)
+    self.assertEqual(vec7.shape, (6, 7))
+    for row, proto in zip(vec7, protos):
+      np.testing.assert_array_equal(
+          row, proto_conversion.pose_from_proto(proto).vec7
+      )
+
+  def test_poses_from_protos_fails_for_non_unit_quaternions(self):
+    protos = [
+        pose_pb2.Pose(orientation=quaternion_pb2.Quaternion(w=1.0)),
+        pose_pb2.Pose(orientation=quaternion_pb2.Quaternion(w=1.1)),
+    ]
+    with self.assertRaisesRegex(ValueError, r'rows \[1\]'):
+      proto_conversion.poses_from_protos(protos)
+    vec7 = proto_conversion.poses_from_protos(protos, check_normalized=False)
+    self.assertEqual(vec7[1, 6], 1.1)
+
+  def test_poses_to_protos_matches_pose_to_proto(self):
+    vec7 = np.array([
+        [-1.3, -0.2, -0.1, -0.53663178, -0.49717722, 0.24928427, -0.6345853],
+        [1, 2, 3, 0, 0, 0, 1.1],
+    ])
+    repeated_field = []
+    protos = proto_conversion.poses_to_protos(vec7, repeated_field)
+    self.assertEqual(protos, repeated_field)
+    for row, proto in zip(vec7, protos):
+      self.assertEqual(
+          proto,
+          proto_conversion.pose_to_proto(data_types.Pose3.from_vec7(row)),
+      )
+    # Rows of the input are not modified.
+    self.assertEqual(vec7[1, 6], 1.1)
+
+  def test_poses_to_protos_fails_for_wrong_shape(self):
+    with self.assertRaisesRegex(ValueError, r'shape \(N, 7\)'):
+      proto_conversion.poses_to_protos(np.zeros((2, 6)))
+
+  def test_wrenches_to_from_protos_roundtrip(self):
+    wrenches = _rng.randn(3, 6)
+    protos = proto_conversion.wrenches_to_protos(wrenches)
+    for wrench, proto in zip(wrenches, protos):
+      converted = proto_conversion.wrench_from_proto(proto)
+      np.testing.assert_array_equal(converted.force, wrench[:3])
+      np.testing.assert_array_equal(converted.torque, wrench[3:])
+    np.testing.assert_array_equal(
+        proto_conversion.wrenches_from_protos(protos), wrenches
+    )
+
+  def test_joint_vecs_to_from_protos_roundtrip(self):
+    joint_vecs = _rng.randn(4, 6)
+    protos = proto_conversion.joint_vecs_to_protos(joint_vecs)
+    self.assertEqual(
+        protos[2], joint_space_pb2.JointVec(joints=joint_vecs[2].tolist())
+    )
+    np.testing.assert_array_equal(
+        proto_conversion.joint_vecs_from_protos(protos), joint_vecs
+    )
+
+  def test_joint_vecs_from_protos_fails_for_different_lengths(self):
+    with self.assertRaisesRegex(ValueError, 'JointVec 1 has 2 joints'):
+      proto_conversion.joint_vecs_from_protos([
+          joint_space_pb2.JointVec(joints=[1, 2, 3]),
+          joint_space_pb2.JointVec(joints=[1, 2]),
+      ])
+
+  def test_bulk_converters_accept_empty_input(self):
+    self.assertEqual(proto_conversion.poses_from_protos([]).shape, (0, 7))
+    self.assertEqual(proto_conversion.joint_vecs_from_protos([]).shape, (0, 0))
+    self.assertEqual(proto_conversion.points_to_protos(np.zeros((0, 3))), [])
+
   ndarray_from_matrix_proto_test_cases = [
       dict(
           testcase_name='1x1_zeros',
@@ -9,6 +9,7 @@ rotation.
 import math
 from typing import Optional, Text, Union
 
+from intrinsic.math.python import kernels
 from intrinsic.math.python import math_types
 from intrinsic.math.python import vector_util
 import numpy as np
@@ -25,12 +26,6 @@ QUATERNION_INVALID_MESSAGE = (
 QUATERNION_ZERO_MESSAGE = 'Quaternion has zero magnitude'
 QUATERNION_NOT_NORMALIZED_MESSAGE = 'Quaternion is not normalized'
 
-# ----------------------------------------------------------------------------
-# Numpy constant matrix for computing the conjugate.
-_QUATERNION_CONJUGATE_SCALE_FACTORS = np.array(
-    [-1, -1, -1, 1], dtype=np.float64
-)
-
 
 class Quaternion(object):
   """A quaternion represented as an array of four values [x,y,z,w].
@@ -59,6 +54,8 @@ class Quaternion(object):
     random_unit: Returns a random Quaternion with magnitude one.
   """
 
+  __slots__ = ('_xyzw',)
+
   def __init__(
       self,
       xyzw: Optional[math_types.VectorType] = None,
@@ -94,6 +91,23 @@ class Quaternion(object):
         err_msg='Quaternion.__init__',
     ).copy()
 
+  @classmethod
+  def _from_trusted_xyzw(cls, xyzw: np.ndarray) -> 'Quaternion':
+    """Wraps xyzw without validating or copying it.
+
+    Only for values computed from valid quaternions within this package: xyzw
+    must be a float64 array of four finite values that is not shared.
+
+    Args:
+      xyzw: Quaternion component values.
+
+    Returns:
+      The quaternion.
+    """
+    quat = cls.__new__(cls)
+    quat._xyzw = xyzw
+    return quat
+
   # --------------------------------------------------------------------------
   # Properties
   # --------------------------------------------------------------------------
@@ -144,7 +158,9 @@ class Quaternion(object):
     Returns:
       The complex conjugate of the quaternion.
     """
-    return Quaternion(xyzw=self._xyzw * _QUATERNION_CONJUGATE_SCALE_FACTORS)
+    return Quaternion._from_trusted_xyzw(
+        kernels.quaternion_conjugate(self._xyzw)
+    )
 
   def is_normalized(
       self, norm_epsilon: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE
@@ -190,18 +206,12 @@ class Quaternion(object):
     Returns:
       The quaternion product: self * other_quaternion.
     """
-    xyzw = np.zeros(4, dtype=np.float64)
-    xyzw[3] = self._xyzw[3] * other_quaternion.xyzw[3] - np.dot(
-        self._xyzw[:3], other_quaternion.xyzw[:3]
-    )
-    xyzw[:3] = (
-        self._xyzw[3] * other_quaternion.xyzw[:3]
-        + other_quaternion.xyzw[3] * self._xyzw[:3]
-        + np.cross(self._xyzw[:3], other_quaternion.xyzw[:3])
+    return Quaternion._from_trusted_xyzw(
+        kernels.quaternion_multiply(
+            self._xyzw, other_quaternion._xyzw  # pylint: disable=protected-access
+        )
     )
 
-    return Quaternion(xyzw=xyzw)
-
   def divide(self, other: QuaternionOrScalarType) -> 'Quaternion':
     """Returns the quaternion quotient (self * other.inverse()).
 
@@ -248,7 +258,9 @@ class Quaternion(object):
               err_msg=err_msg,
           )
       )
-    return Quaternion(self._xyzw / norm)
+    return Quaternion._from_trusted_xyzw(
+        kernels.quaternion_normalize(self._xyzw)
+    )
 
   # --------------------------------------------------------------------------
   # Operators
@@ -268,7 +280,7 @@ class Quaternion(object):
 
   def __neg__(self) -> 'Quaternion':
     """Returns the negative (additive inverse) of this quaternion."""
-    return Quaternion(xyzw=-(self._xyzw))
+    return Quaternion._from_trusted_xyzw(-self._xyzw)
 
   def __mul__(self, other: QuaternionOrScalarType) -> 'Quaternion':
     """Returns the quaternion product of self * other."""
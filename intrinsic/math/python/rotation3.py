@@ -8,7 +8,7 @@ A rotation is represented internally as a normalized quaternion.
 """
 
 import math
-from typing import Optional, Text, Tuple
+from typing import Optional, Sequence, Text, Tuple
 
 from intrinsic.math.python import math_types
 from intrinsic.math.python import quaternion as quaternion_class
@@ -74,6 +74,46 @@ def check_rotation_matrix(
     )
 
 
+def rotate_point_values(
+    xyzw: Sequence[float], point: math_types.Vector3Type
+) -> Tuple[float, float, float]:
+  """Rotates a point by a non-zero quaternion using Python floats.
+
+  Evaluates (q * p * q^-1) in the closed form
+
+    ((w^2 - v.v) p + 2 (v.p) v + 2 w (v x p)) / |q|^2
+
+  where q = [v, w], which is exact for quaternions that are not normalized and
+  avoids the overhead of numpy operations on tiny arrays.
+
+  Args:
+    xyzw: Components of a non-zero quaternion with real component last.
+    point: The point to be rotated.
+
+  Returns:
+    The components of the rotated point.
+
+  Raises:
+    ValueError: If the point has non-finite values.
+  """
+  x, y, z, w = xyzw
+  px, py, pz = float(point[0]), float(point[1]), float(point[2])
+  if not (math.isfinite(px) and math.isfinite(py) and math.isfinite(pz)):
+    raise ValueError(
+        '%s: %r' % (vector_util.VECTOR_INFINITE_VALUES_MESSAGE, point)
+    )
+  v_dot_v = x * x + y * y + z * z
+  scale = 1.0 / (v_dot_v + w * w)
+  a = (w * w - v_dot_v) * scale
+  b = 2.0 * (x * px + y * py + z * pz) * scale
+  c = 2.0 * w * scale
+  return (
+      a * px + b * x + c * (y * pz - z * py),
+      a * py + b * y + c * (z * px - x * pz),
+      a * pz + b * z + c * (x * py - y * px),
+  )
+
+
 class Rotation3(object):
   """Represents a 3D rigid rotation about an axis through the origin.
 
@@ -86,8 +126,18 @@ class Rotation3(object):
     from_axis_angle: Generates the rotation by the given angle about the given
       axis.
     from_matrix: Extracts rotation from 3x3 rotation matrix.
+
+  Rotations are immutable, so derived representations (the rotation matrix,
+  the inverse and the Euler angles) are computed on first use and cached.
   """
 
+  __slots__ = (
+      '_quaternion',
+      '_matrix3x3',
+      '_inverse',
+      '_euler_angles_radians',
+  )
+
   def __init__(
       self,
       quat: quaternion_class.Quaternion = quaternion_class.Quaternion.one(),
@@ -121,6 +171,33 @@ class Rotation3(object):
         err_msg='%s %s'
         % (ROTATION3_INIT_MESSAGE, INVALID_ROTATION_QUATERNION_MESSAGE)
     )
+    self._clear_cache()
+
+  @classmethod
+  def _from_trusted_quaternion(
+      cls, quat: quaternion_class.Quaternion
+  ) -> 'Rotation3':
+    """Wraps quat without validation.
+
+    Only for quaternions computed from valid rotations within this package,
+    e.g. their products or conjugates, which are non-zero by construction.
+
+    Args:
+      quat: A non-zero quaternion that is not shared.
+
+    Returns:
+      The rotation.
+    """
+    rotation = cls.__new__(cls)
+    rotation._quaternion = quat
+    rotation._clear_cache()
+    return rotation
+
+  def _clear_cache(self) -> None:
+    """Resets the lazily computed derived representations."""
+    self._matrix3x3: Optional[np.ndarray] = None
+    self._inverse: Optional['Rotation3'] = None
+    self._euler_angles_radians: Optional[np.ndarray] = None
 
   # --------------------------------------------------------------------------
   # Properties
@@ -138,20 +215,25 @@ class Rotation3(object):
   def rotate_point(self, point: math_types.Vector3Type) -> np.ndarray:
     """Performs a rotation by this quaternion.
 
-    Rotates the point by the quaternion using quaternion multiplication,
-      (q * p * q^-1), without constructing the rotation matrix.
+    Rotates the point by the quaternion, (q * p * q^-1), without constructing
+    the rotation matrix or any intermediate quaternions.
 
     Args:
       point: The point to be rotated.
 
     Returns:
       A 3D vector in a numpy array.
+
+    Raises:
+      ValueError: If the point has non-finite values.
     """
-    q_point = quaternion_class.Quaternion(
-        xyzw=[point[0], point[1], point[2], 0.0]
+    return np.array(
+        rotate_point_values(
+            self._quaternion._xyzw.tolist(),  # pylint: disable=protected-access
+            point,
+        ),
+        dtype=np.float64,
     )
-    q_point_rotated = self._quaternion * q_point * self._quaternion.inverse()
-    return q_point_rotated.xyzw[:3].copy()
 
   def inverse(self) -> 'Rotation3':
     """Returns the inverse of the rotation.
@@ -169,7 +251,11 @@ class Rotation3(object):
     Returns:
       A rotation that is the inverse of this rotation.
     """
-    return Rotation3(self._quaternion.conjugate(), normalize=False)
+    if self._inverse is None:
+      self._inverse = Rotation3._from_trusted_quaternion(
+          self._quaternion.conjugate()
+      )
+    return self._inverse
 
   def almost_equal(
       self,
@@ -298,6 +384,12 @@ class Rotation3(object):
     Returns:
       3x3 rotation matrix as a numpy array.
     """
+    if self._matrix3x3 is None:
+      self._matrix3x3 = self._compute_matrix3x3()
+    return self._matrix3x3.copy()
+
+  def _compute_matrix3x3(self) -> np.ndarray:
+    """Computes the 3x3 rotation matrix from the quaternion."""
     q = quaternion_class.Quaternion(
         xyzw=self._quaternion.xyzw / np.linalg.norm(self._quaternion.xyzw)
     )
@@ -340,6 +432,15 @@ class Rotation3(object):
     Returns:
       roll, pitch, and yaw in degrees or radians.
     """
+    if self._euler_angles_radians is None:
+      self._euler_angles_radians = self._compute_euler_angles_radians()
+    if radians:
+      return self._euler_angles_radians.copy()
+    else:
+      return np.degrees(self._euler_angles_radians)
+
+  def _compute_euler_angles_radians(self) -> np.ndarray:
+    """Computes roll, pitch and yaw in radians from the rotation matrix."""
     matrix = self.matrix3x3()
     check_rotation_matrix(matrix)
     cos_pitch = np.linalg.norm(matrix[2][1:])
@@ -354,11 +455,7 @@ class Rotation3(object):
       yaw = math.atan2(matrix[1][0], matrix[0][0])
       roll = math.atan2(matrix[2][1], matrix[2][2])
 
-    rpy_radians = np.array((roll, pitch, yaw))
-    if radians:
-      return rpy_radians
-    else:
-      return np.degrees(rpy_radians)
+    return np.array((roll, pitch, yaw))
 
   # --------------------------------------------------------------------------
   # Operators
@@ -407,7 +504,12 @@ class Rotation3(object):
     Returns:
       The composite rotation (self * other).
     """
-    return Rotation3(self._quaternion * other.quaternion, normalize=False)
+    if not isinstance(other, Rotation3):
+      # Lets batch types such as Rotation3Array implement other * self.
+      return NotImplemented
+    return Rotation3._from_trusted_quaternion(
+        self._quaternion.multiply(other.quaternion)
+    )
 
   def __div__(self, other: 'Rotation3') -> 'Rotation3':
     """Returns quotient of this / other (python2).
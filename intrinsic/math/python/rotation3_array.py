@@ -0,0 +1,646 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Rotation3Array class (python3).
+
+This library implements a batch of 3D rotations stored as an (N, 4) array of
+normalized quaternions [x, y, z, w].
+
+All operations are vectorized over the batch, so that e.g. rotating a point
+cloud or composing thousands of rotations does not require a Python loop over
+Rotation3 objects.  Indexing with an integer returns a Rotation3.
+"""
+
+from typing import Iterator, List, Optional, Sequence, Text, Union
+
+from intrinsic.math.python import math_types
+from intrinsic.math.python import quaternion as quaternion_class
+from intrinsic.math.python import rotation3
+import numpy as np
+
+# ----------------------------------------------------------------------------
+# Error messages for exceptions.
+ROTATION3_ARRAY_SHAPE_MESSAGE = 'Quaternion array should have shape (N, 4)'
+ROTATION3_ARRAY_INFINITE_VALUES_MESSAGE = (
+    'Quaternion array has non-finite values'
+)
+ROTATION3_ARRAY_LENGTH_MISMATCH_MESSAGE = (
+    'Rotation arrays should have the same length or length 1'
+)
+POINTS_SHAPE_MESSAGE = 'Points should have shape (3,) or (M, 3)'
+MATRIX_ARRAY_SHAPE_MESSAGE = (
+    'Matrix array should have shape (N, 3, 3) or (N, 4, 4)'
+)
+EULER_ANGLES_SHAPE_MESSAGE = 'Euler angle array should have shape (N, 3)'
+UNKNOWN_VALIDATION_MESSAGE = 'Unknown validation mode'
+
+# ----------------------------------------------------------------------------
+# Validation modes of the batch factory functions.
+
+# Performs the same checks as the corresponding Rotation3 factory function for
+# every element, e.g. that every matrix is orthogonal within tolerances.
+VALIDATE_STRICT = 'strict'
+# Only performs checks that are linear in the input size and catch the most
+# common errors, e.g. that the values are finite and every column of every
+# matrix has unit length within tolerances.
+VALIDATE_FAST = 'fast'
+# Only checks the shape of the input.  The result is undefined for invalid
+# input values.
+VALIDATE_NONE = 'none'
+_VALIDATION_MODES = (VALIDATE_STRICT, VALIDATE_FAST, VALIDATE_NONE)
+
+# ----------------------------------------------------------------------------
+# Numpy constant vector for computing the conjugates.
+_QUATERNION_CONJUGATE_SCALE_FACTORS = np.array(
+    [-1, -1, -1, 1], dtype=np.float64
+)
+
+
+def quaternion_product(
+    lhs_xyzw: np.ndarray, rhs_xyzw: np.ndarray
+) -> np.ndarray:
+  """Returns the quaternion products lhs * rhs of two arrays of quaternions.
+
+  Both inputs have quaternions [x, y, z, w] in the last dimension and are
+  broadcast against each other.
+
+  Args:
+    lhs_xyzw: Left hand side quaternions with shape (..., 4).
+    rhs_xyzw: Right hand side quaternions with shape (..., 4).
+
+  Returns:
+    The quaternion products with the broadcast shape (..., 4).
+  """
+  lhs_xyz = lhs_xyzw[..., :3]
+  rhs_xyz = rhs_xyzw[..., :3]
+  lhs_w = lhs_xyzw[..., 3:]
+  rhs_w = rhs_xyzw[..., 3:]
+  xyz = lhs_w * rhs_xyz + rhs_w * lhs_xyz + np.cross(lhs_xyz, rhs_xyz)
+  w = lhs_w * rhs_w - np.sum(lhs_xyz * rhs_xyz, axis=-1, keepdims=True)
+  return np.concatenate((xyz, w), axis=-1)
+
+
+def quaternion_conjugates(xyzw: np.ndarray) -> np.ndarray:
+  """Returns the conjugates of an array of quaternions with shape (..., 4)."""
+  return xyzw * _QUATERNION_CONJUGATE_SCALE_FACTORS
+
+
+def normalized_quaternions(xyzw: np.ndarray) -> np.ndarray:
+  """Returns the non-zero quaternions with shape (..., 4) scaled to norm 1."""
+  return xyzw / np.linalg.norm(xyzw, axis=-1, keepdims=True)
+
+
+def rotate_points(xyzw: np.ndarray, points: np.ndarray) -> np.ndarray:
+  """Rotates points by unit quaternions.
+
+  Uses the expanded form of q * p * q^-1 for unit quaternions,
+    p' = p + 2w (v x p) + 2 v x (v x p),
+  which needs neither the quaternion inverse nor the rotation matrix.
+
+  Args:
+    xyzw: Unit quaternions with shape (..., 4).
+    points: Points with shape (..., 3), broadcast against the quaternions.
+
+  Returns:
+    The rotated points with the broadcast shape (..., 3).
+  """
+  xyz = xyzw[..., :3]
+  w = xyzw[..., 3:]
+  t = 2.0 * np.cross(xyz, points)
+  return points + w * t + np.cross(xyz, t)
+
+
+def rotation_matrices(xyzw: np.ndarray) -> np.ndarray:
+  """Returns the rotation matrices of an array of quaternions.
+
+  The quaternions are normalized before the conversion.
+
+  Args:
+    xyzw: Non-zero quaternions with shape (..., 4).
+
+  Returns:
+    The 3x3 rotation matrices with shape (..., 3, 3).
+  """
+  q = normalized_quaternions(xyzw)
+  x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+  matrices = np.empty(q.shape[:-1] + (3, 3), dtype=np.float64)
+  matrices[..., 0, 0] = 1 - 2 * (y * y + z * z)
+  matrices[..., 0, 1] = 2 * (x * y - z * w)
+  matrices[..., 0, 2] = 2 * (x * z + y * w)
+  matrices[..., 1, 0] = 2 * (x * y + z * w)
+  matrices[..., 1, 1] = 1 - 2 * (x * x + z * z)
+  matrices[..., 1, 2] = 2 * (y * z - x * w)
+  matrices[..., 2, 0] = 2 * (x * z - y * w)
+  matrices[..., 2, 1] = 2 * (y * z + x * w)
+  matrices[..., 2, 2] = 1 - 2 * (x * x + y * y)
+  return matrices
+
+
+def check_rotation_matrices(
+    matrices: np.ndarray,
+    validate: Text = VALIDATE_STRICT,
+    rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+    atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+    err_msg: Text = '',
+) -> None:
+  """Verifies that an array contains rotation matrices.
+
+  With VALIDATE_STRICT, this is the vectorized equivalent of calling
+  rotation3.check_rotation_matrix() on every matrix.
+
+  Args:
+    matrices: An (N, 3, 3) or (N, 4, 4) array whose upper 3x3 submatrices
+      should be orthogonal.
+    validate: VALIDATE_STRICT, VALIDATE_FAST or VALIDATE_NONE.
+    rtol: relative error tolerance, passed through to np.isclose.
+    atol: absolute error tolerance, passed through to np.isclose.
+    err_msg: Error message string added to exception in case of invalid input.
+
+  Raises:
+    ValueError: If the array has the wrong shape or the validation mode is
+      unknown, or if the matrices fail the checks of the validation mode.
+  """
+  if validate not in _VALIDATION_MODES:
+    raise ValueError('%s: %r' % (UNKNOWN_VALIDATION_MESSAGE, validate))
+  if matrices.ndim != 3 or matrices.shape[1:] not in ((3, 3), (4, 4)):
+    raise ValueError(
+        '%s: Actual: %s\n%s'
+        % (MATRIX_ARRAY_SHAPE_MESSAGE, matrices.shape, err_msg)
+    )
+  if validate == VALIDATE_NONE:
+    return
+  matrices3x3 = matrices[:, :3, :3]
+  if validate == VALIDATE_STRICT:
+    # If m is a rotation matrix, m * m' should be the identity matrix.
+    products = np.matmul(matrices3x3, np.swapaxes(matrices3x3, 1, 2))
+    valid = np.all(
+        np.isclose(products, np.identity(3), rtol=rtol, atol=atol),
+        axis=(1, 2),
+    )
+  else:
+    column_norms_squared = np.sum(matrices3x3 * matrices3x3, axis=1)
+    valid = np.all(
+        np.isclose(column_norms_squared, 1.0, rtol=rtol, atol=atol), axis=1
+    )
+  # Comparisons with nan are False, so non-finite matrices are invalid, too.
+  if not np.all(valid):
+    invalid = np.flatnonzero(~valid)
+    raise ValueError(
+        '%s: rows %s\n%r\n%s'
+        % (
+            rotation3.MATRIX_NOT_ORTHOGONAL_MESSAGE,
+            invalid,
+            matrices[invalid],
+            err_msg,
+        )
+    )
+
+
+def quaternions_from_matrices(matrices: np.ndarray) -> np.ndarray:
+  """Converts rotation matrices to quaternions with non-negative real part.
+
+  This is the vectorized equivalent of Rotation3.from_matrix() without the
+  validation and gives bitwise identical results.
+
+  Args:
+    matrices: Rotation matrices with shape (N, 3, 3) or (N, 4, 4).
+
+  Returns:
+    The (N, 4) quaternions [x, y, z, w].
+  """
+  m = matrices[:, :3, :3]
+  xyzw = np.empty((len(m), 4), dtype=np.float64)
+  trace = np.trace(m, axis1=1, axis2=2) + 1
+  # Solve for the largest quaternion component first.
+  largest = np.where(
+      trace > 1, 3, np.argmax(np.diagonal(m, axis1=1, axis2=2), axis=1)
+  )
+  rows = largest == 3
+  if np.any(rows):
+    # The real component is the largest.
+    mr = m[rows]
+    scale = trace[rows]
+    xyzw[rows, 3] = scale
+    xyzw[rows, 2] = mr[:, 1, 0] - mr[:, 0, 1]
+    xyzw[rows, 1] = mr[:, 0, 2] - mr[:, 2, 0]
+    xyzw[rows, 0] = mr[:, 2, 1] - mr[:, 1, 2]
+    xyzw[rows] *= (0.5 / np.sqrt(scale))[:, np.newaxis]
+  for i in range(3):
+    # i is the index of the diagonal element with the largest value.  j and k
+    # are the following indices in order.
+    rows = largest == i
+    if not np.any(rows):
+      continue
+    j = (i + 1) % 3
+    k = (i + 2) % 3
+    mr = m[rows]
+    scale = 1 + mr[:, i, i] - (mr[:, j, j] + mr[:, k, k])
+    xyzw[rows, i] = scale
+    xyzw[rows, j] = mr[:, i, j] + mr[:, j, i]
+    xyzw[rows, k] = mr[:, k, i] + mr[:, i, k]
+    xyzw[rows, 3] = mr[:, k, j] - mr[:, j, k]
+    xyzw[rows] *= (0.5 / np.sqrt(scale))[:, np.newaxis]
+  # Selects the quaternions with positive real coefficient.
+  xyzw[xyzw[:, 3] < 0] *= -1
+  return xyzw
+
+
+def quaternions_from_euler_angles(rpy_radians: np.ndarray) -> np.ndarray:
+  """Converts roll-pitch-yaw Euler angles to quaternions.
+
+  This is the vectorized equivalent of Rotation3.from_euler_angles(), i.e. the
+  rotations yaw * pitch * roll about the fixed z, y and x axes.
+
+  Args:
+    rpy_radians: (N, 3) roll, pitch and yaw angles in radians.
+
+  Returns:
+    The (N, 4) unit quaternions [x, y, z, w].
+  """
+  half_angles = 0.5 * rpy_radians
+  cos_roll, cos_pitch, cos_yaw = np.cos(half_angles).T
+  sin_roll, sin_pitch, sin_yaw = np.sin(half_angles).T
+  return np.stack(
+      (
+          sin_roll * cos_pitch * cos_yaw - cos_roll * sin_pitch * sin_yaw,
+          cos_roll * sin_pitch * cos_yaw + sin_roll * cos_pitch * sin_yaw,
+          cos_roll * cos_pitch * sin_yaw - sin_roll * sin_pitch * cos_yaw,
+          cos_roll * cos_pitch * cos_yaw + sin_roll * sin_pitch * sin_yaw,
+      ),
+      axis=1,
+  )
+
+
+def as_points_array(
+    points: math_types.VectorType, err_msg: Text = ''
+) -> np.ndarray:
+  """Interprets the values as a single 3D point or an (M, 3) array of points.
+
+  Args:
+    points: A 3D point or an array of 3D points.
+    err_msg: Error message string appended to exception in case of failure.
+
+  Returns:
+    The points as a float64 numpy array with shape (3,) or (M, 3).
+
+  Raises:
+    ValueError: If the points have the wrong shape or non-finite values.
+  """
+  points = np.asarray(points, dtype=np.float64)
+  if points.ndim not in (1, 2) or points.shape[-1] != 3:
+    raise ValueError(
+        '%s: Actual: %s\n%s' % (POINTS_SHAPE_MESSAGE, points.shape, err_msg)
+    )
+  if not np.all(np.isfinite(points)):
+    raise ValueError(
+        'Points have non-finite values: %r\n%s' % (points, err_msg)
+    )
+  return points
+
+
+def check_broadcast_lengths(lhs_length: int, rhs_length: int) -> None:
+  """Raises a ValueError if two batch lengths cannot be broadcast."""
+  if lhs_length != rhs_length and lhs_length != 1 and rhs_length != 1:
+    raise ValueError(
+        '%s: %d != %d'
+        % (ROTATION3_ARRAY_LENGTH_MISMATCH_MESSAGE, lhs_length, rhs_length)
+    )
+
+
+class Rotation3Array(object):
+  """Represents a batch of N 3D rotations.
+
+  The rotations are stored as an (N, 4) array of unit quaternions [x, y, z, w].
+
+  Binary operations with another Rotation3Array broadcast over the batch: both
+  operands must have the same length or one of them must have length 1.  A
+  Rotation3 operand is treated like a Rotation3Array of length 1.
+
+  Properties:
+    xyzw: The (N, 4) quaternion components.
+
+  Factory functions:
+    identity: Returns N identity rotations.
+    from_xyzw: Constructs the rotations from an (N, 4) array of quaternions.
+    from_rotations: Constructs the batch from a sequence of Rotation3 objects.
+    from_matrix: Converts a stack of rotation matrices.
+    from_euler_angles: Converts an (N, 3) array of roll-pitch-yaw angles.
+  """
+
+  def __init__(self, xyzw: np.ndarray, normalize: bool = False):
+    """Constructs a Rotation3Array from an (N, 4) array of quaternions.
+
+    If the normalize flag is False, the input quaternions should already be
+    normalized.  Quaternions that are exactly zero are replaced by identity,
+    matching the behavior of Rotation3.
+
+    Args:
+      xyzw: Array of non-zero quaternions with shape (N, 4).
+      normalize: Indicates whether to normalize the quaternions.
+
+    Raises:
+      ValueError: If the array has the wrong shape, non-finite values or
+        quaternions that cannot be normalized.
+    """
+    xyzw = np.array(xyzw, dtype=np.float64)
+    if xyzw.ndim != 2 or xyzw.shape[1] != 4:
+      raise ValueError(
+          '%s: Actual: %s' % (ROTATION3_ARRAY_SHAPE_MESSAGE, xyzw.shape)
+      )
+    if not np.all(np.isfinite(xyzw)):
+      raise ValueError(
+          '%s: %r' % (ROTATION3_ARRAY_INFINITE_VALUES_MESSAGE, xyzw)
+      )
+    xyzw[~np.any(xyzw, axis=1)] = (0.0, 0.0, 0.0, 1.0)
+    norms = np.linalg.norm(xyzw, axis=1)
+    zero = norms <= math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE
+    if np.any(zero):
+      raise ValueError(
+          '%s %s: rows %s'
+          % (
+              rotation3.ROTATION3_INIT_MESSAGE,
+              rotation3.INVALID_ROTATION_QUATERNION_MESSAGE,
+              np.flatnonzero(zero),
+          )
+      )
+    if normalize:
+      xyzw /= norms[:, np.newaxis]
+    self._xyzw = xyzw
+
+  @classmethod
+  def _from_trusted_xyzw(cls, xyzw: np.ndarray) -> 'Rotation3Array':
+    """Wraps an owned (N, 4) array of unit quaternions without validation."""
+    rotations = cls.__new__(cls)
+    rotations._xyzw = xyzw
+    return rotations
+
+  # --------------------------------------------------------------------------
+  # Properties
+  # --------------------------------------------------------------------------
+
+  @property
+  def xyzw(self) -> np.ndarray:
+    """Returns a copy of the (N, 4) quaternion components."""
+    return self._xyzw.copy()
+
+  # --------------------------------------------------------------------------
+  # Utility functions
+  # --------------------------------------------------------------------------
+
+  def rotate_points(self, points: math_types.VectorType) -> np.ndarray:
+    """Rotates points by the rotations.
+
+    Broadcasting rules:
+      - N rotations and a single point (3,) give (N, 3) points.
+      - A single rotation and M points (M, 3) give (M, 3) points.
+      - N rotations and N points (N, 3) rotate each point by its rotation.
+
+    Args:
+      points: A 3D point or an (M, 3) array of points.
+
+    Returns:
+      The rotated points as a numpy array.
+
+    Raises:
+      ValueError: If the points have the wrong shape or the lengths of the
+        rotations and points cannot be broadcast.
+    """
+    points = as_points_array(points)
+    if points.ndim == 2:
+      check_broadcast_lengths(len(self), len(points))
+    return rotate_points(self._normalized_xyzw(), points)
+
+  def inverse(self) -> 'Rotation3Array':
+    """Returns the inverse of every rotation."""
+    return Rotation3Array._from_trusted_xyzw(quaternion_conjugates(self._xyzw))
+
+  def multiply(
+      self, other: Union['Rotation3Array', rotation3.Rotation3]
+  ) -> 'Rotation3Array':
+    """Returns the element-wise compositions (self * other).
+
+    Args:
+      other: Right hand operand as a Rotation3Array or Rotation3.
+
+    Returns:
+      The composite rotations.
+
+    Raises:
+      ValueError: If the lengths of the operands cannot be broadcast.
+    """
+    other_xyzw = _as_xyzw_array(other)
+    check_broadcast_lengths(len(self), len(other_xyzw))
+    return Rotation3Array._from_trusted_xyzw(
+        quaternion_product(self._xyzw, other_xyzw)
+    )
+
+  def matrix3x3(self) -> np.ndarray:
+    """Returns the (N, 3, 3) stack of rotation matrices."""
+    return rotation_matrices(self._xyzw)
+
+  def almost_equal(
+      self,
+      other: Union['Rotation3Array', rotation3.Rotation3],
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+  ) -> bool:
+    """Returns true if all rotations are equivalent within tolerances.
+
+    Args:
+      other: Rotations to compare against self, broadcast over the batch.
+      rtol: relative error tolerance, passed through to np.isclose.
+      atol: absolute error tolerance, passed through to np.isclose.
+
+    Returns:
+      True if every pair of rotations is equivalent within tolerances.
+    """
+    other_xyzw = _as_xyzw_array(other)
+    check_broadcast_lengths(len(self), len(other_xyzw))
+    lhs = self._normalized_xyzw()
+    rhs = normalized_quaternions(other_xyzw)
+    same = np.all(np.isclose(lhs, rhs, rtol=rtol, atol=atol), axis=1)
+    negated = np.all(np.isclose(lhs, -rhs, rtol=rtol, atol=atol), axis=1)
+    return bool(np.all(same | negated))
+
+  def to_rotations(self) -> List[rotation3.Rotation3]:
+    """Returns the rotations as a list of Rotation3 objects."""
+    return [self[i] for i in range(len(self))]
+
+  def _normalized_xyzw(self) -> np.ndarray:
+    return normalized_quaternions(self._xyzw)
+
+  # --------------------------------------------------------------------------
+  # Operators
+  # --------------------------------------------------------------------------
+
+  def __len__(self) -> int:
+    return self._xyzw.shape[0]
+
+  def __iter__(self) -> Iterator[rotation3.Rotation3]:
+    for i in range(len(self)):
+      yield self[i]
+
+  def __getitem__(self, index) -> Union[rotation3.Rotation3, 'Rotation3Array']:
+    """Returns a Rotation3 for an integer index and a Rotation3Array else."""
+    if isinstance(index, (int, np.integer)):
+      return rotation3.Rotation3(
+          quaternion_class.Quaternion(xyzw=self._xyzw[index])
+      )
+    return Rotation3Array._from_trusted_xyzw(
+        np.array(self._xyzw[index], ndmin=2)
+    )
+
+  def __mul__(
+      self, other: Union['Rotation3Array', rotation3.Rotation3]
+  ) -> 'Rotation3Array':
+    """Returns the element-wise compositions (self * other)."""
+    if not isinstance(other, (Rotation3Array, rotation3.Rotation3)):
+      return NotImplemented
+    return self.multiply(other)
+
+  def __rmul__(self, other: rotation3.Rotation3) -> 'Rotation3Array':
+    """Returns the compositions (other * self) for a Rotation3 operand."""
+    if not isinstance(other, rotation3.Rotation3):
+      return NotImplemented
+    return Rotation3Array.from_rotations([other]).multiply(self)
+
+  __hash__ = None  # This class is not hashable.
+
+  # --------------------------------------------------------------------------
+  # Factory functions
+  # --------------------------------------------------------------------------
+
+  @classmethod
+  def identity(cls, length: int) -> 'Rotation3Array':
+    """Returns an array of identity rotations with the given length."""
+    xyzw = np.zeros((length, 4), dtype=np.float64)
+    xyzw[:, 3] = 1.0
+    return cls._from_trusted_xyzw(xyzw)
+
+  @classmethod
+  def from_xyzw(
+      cls, xyzw: np.ndarray, normalize: bool = False
+  ) -> 'Rotation3Array':
+    """Returns rotations with the given (N, 4) quaternion components."""
+    return cls(xyzw, normalize=normalize)
+
+  @classmethod
+  def from_rotations(
+      cls, rotations: Sequence[rotation3.Rotation3]
+  ) -> 'Rotation3Array':
+    """Constructs the batch from a sequence of Rotation3 objects.
+
+    The quaternions are copied without modification, so that the conversion
+    to and from a list of rotations is lossless.
+
+    Args:
+      rotations: The rotations.
+
+    Returns:
+      A Rotation3Array with len(rotations) elements.
+    """
+    xyzw = np.empty((len(rotations), 4), dtype=np.float64)
+    for i, rotation in enumerate(rotations):
+      xyzw[i] = rotation.quaternion.xyzw
+    return cls._from_trusted_xyzw(xyzw)
+
+  @classmethod
+  def from_matrix(
+      cls,
+      matrices: np.ndarray,
+      validate: Text = VALIDATE_STRICT,
+      rtol: float = math_types.DEFAULT_RTOL_VALUE_FOR_NP_IS_CLOSE,
+      atol: float = math_types.DEFAULT_ATOL_VALUE_FOR_NP_IS_CLOSE,
+      err_msg: Text = '',
+  ) -> 'Rotation3Array':
+    """Constructs the rotations from a stack of rotation matrices.
+
+    The batch equivalent of Rotation3.from_matrix().  The quaternions are
+    normalized, so that the result is valid for any matrices which pass the
+    validation.
+
+    Args:
+      matrices: An (N, 3, 3) or (N, 4, 4) array of rotation or transformation
+        matrices.
+      validate: VALIDATE_STRICT, VALIDATE_FAST or VALIDATE_NONE, see
+        check_rotation_matrices().
+      rtol: relative error tolerance, passed through to np.isclose.
+      atol: absolute error tolerance, passed through to np.isclose.
+      err_msg: Error message string added to exception in case of invalid
+        input.
+
+    Returns:
+      The rotations as a Rotation3Array.
+
+    Raises:
+      ValueError: If the input has the wrong shape or fails validation.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    check_rotation_matrices(
+        matrices, validate=validate, rtol=rtol, atol=atol, err_msg=err_msg
+    )
+    return cls._from_trusted_xyzw(
+        normalized_quaternions(quaternions_from_matrices(matrices))
+    )
+
+  @classmethod
+  def from_euler_angles(
+      cls,
+      rpy_degrees: Optional[np.ndarray] = None,
+      rpy_radians: Optional[np.ndarray] = None,
+      validate: Text = VALIDATE_STRICT,
+  ) -> 'Rotation3Array':
+    """Constructs the rotations from roll-pitch-yaw Euler angles.
+
+    The batch equivalent of Rotation3.from_euler_angles().
+
+    Args:
+      rpy_degrees: (N, 3) roll, pitch and yaw in degrees.
+      rpy_radians: (N, 3) roll, pitch and yaw in radians.
+      validate: VALIDATE_STRICT or VALIDATE_FAST check that all angles are
+        finite, VALIDATE_NONE only checks the shape.
+
+    Returns:
+      The rotations as a Rotation3Array.
+
+    Raises:
+      ValueError: If neither or both of the angle arrays are given, if the
+        input has the wrong shape or fails validation.
+    """
+    if (rpy_degrees is None) == (rpy_radians is None):
+      raise ValueError(
+          'Rotation3Array.from_euler_angles requires exactly one of'
+          ' rpy_degrees or rpy_radians.'
+      )
+    if validate not in _VALIDATION_MODES:
+      raise ValueError('%s: %r' % (UNKNOWN_VALIDATION_MESSAGE, validate))
+    if rpy_degrees is not None:
+      rpy_radians = np.radians(np.asarray(rpy_degrees, dtype=np.float64))
+    rpy_radians = np.asarray(rpy_radians, dtype=np.float64)
+    if rpy_radians.ndim != 2 or rpy_radians.shape[1] != 3:
+      raise ValueError(
+          '%s: Actual: %s' % (EULER_ANGLES_SHAPE_MESSAGE, rpy_radians.shape)
+      )
+    if validate != VALIDATE_NONE and not np.all(np.isfinite(rpy_radians)):
+      raise ValueError(
+          'Euler angles have non-finite values: rows %s'
+          % np.flatnonzero(~np.all(np.isfinite(rpy_radians), axis=1))
+      )
+    return cls._from_trusted_xyzw(quaternions_from_euler_angles(rpy_radians))
+
+  # --------------------------------------------------------------------------
+  # String representations
+  # --------------------------------------------------------------------------
+
+  def __str__(self) -> Text:
+    return 'Rotation3Array(%s)' % self._normalized_xyzw()
+
+  def __repr__(self) -> Text:
+    return 'Rotation3Array(%r)' % self._normalized_xyzw()
+
+
+def _as_xyzw_array(
+    rotations: Union[Rotation3Array, rotation3.Rotation3],
+) -> np.ndarray:
+  if isinstance(rotations, rotation3.Rotation3):
+    return rotations.quaternion.xyzw[np.newaxis]
+  return rotations._xyzw  # pylint: disable=protected-access
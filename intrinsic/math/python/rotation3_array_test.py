@@ -0,0 +1,204 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.math.python.rotation3_array."""
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from intrinsic.math.python import math_test
+from intrinsic.math.python import rotation3
+from intrinsic.math.python import rotation3_array
+import numpy as np
+
+_TEST_ROTATIONS = [rotation for _, rotation in math_test.make_named_rotations()]
+_TEST_VECTORS = [vector for _, vector in math_test.make_named_vectors()]
+
+
+class Rotation3ArrayTest(parameterized.TestCase, math_test.TestCase):
+
+  def test_from_rotations_is_lossless(self):
+    rotations = rotation3_array.Rotation3Array.from_rotations(_TEST_ROTATIONS)
+    self.assertLen(rotations, len(_TEST_ROTATIONS))
+    for rotation, expected in zip(rotations.to_rotations(), _TEST_ROTATIONS):
+      self.assertEqual(rotation.quaternion, expected.quaternion)
+
+  def test_rotate_points_matches_rotation3(self):
+    rotations = rotation3_array.Rotation3Array.from_rotations(_TEST_ROTATIONS)
+    points = np.array(
+        [
+            _TEST_VECTORS[i % len(_TEST_VECTORS)]
+            for i in range(len(_TEST_ROTATIONS))
+        ]
+    )
+    rotated = rotations.rotate_points(points)
+    for i, rotation in enumerate(_TEST_ROTATIONS):
+      self.assert_all_close(rotated[i], rotation.rotate_point(points[i]))
+
+  def test_rotate_points_broadcasts_single_rotation(self):
+    rotation = rotation3.Rotation3.from_axis_angle((1, 2, 3), 0.7)
+    rotations = rotation3_array.Rotation3Array.from_rotations([rotation])
+    rotated = rotations.rotate_points(np.array(_TEST_VECTORS))
+    self.assertEqual(rotated.shape, (len(_TEST_VECTORS), 3))
+    for i, vector in enumerate(_TEST_VECTORS):
+      self.assert_all_close(rotated[i], rotation.rotate_point(vector))
+
+  def test_rotate_points_broadcasts_single_point(self):
+    rotations = rotation3_array.Rotation3Array.from_rotations(_TEST_ROTATIONS)
+    rotated = rotations.rotate_points([1, 2, 3])
+    for i, rotation in enumerate(_TEST_ROTATIONS):
+      self.assert_all_close(rotated[i], rotation.rotate_point([1, 2, 3]))
+
+  def test_rotate_points_length_mismatch_raises(self):
+    rotations = rotation3_array.Rotation3Array.identity(2)
+    with self.assertRaises(ValueError):
+      rotations.rotate_points(np.zeros((3, 3)))
+
+  def test_multiply_and_inverse(self):
+    rotations = rotation3_array.Rotation3Array.from_rotations(_TEST_ROTATIONS)
+    other = rotation3.Rotation3.from_axis_angle((0, 1, 0), 0.3)
+    products = rotations * other
+    for i, rotation in enumerate(_TEST_ROTATIONS):
+      self.assert_rotation_close(products[i], rotation * other)
+    left_products = other * rotations
+    for i, rotation in enumerate(_TEST_ROTATIONS):
+      self.assert_rotation_close(left_products[i], other * rotation)
+    self.assertTrue(
+        (rotations * rotations.inverse()).almost_equal(
+            rotation3.Rotation3.identity()
+        )
+    )
+
+  def test_matrix3x3(self):
+    rotations = rotation3_array.Rotation3Array.from_rotations(_TEST_ROTATIONS)
+    matrices = rotations.matrix3x3()
+    self.assertEqual(matrices.shape, (len(_TEST_ROTATIONS), 3, 3))
+    for i, rotation in enumerate(_TEST_ROTATIONS):
+      self.assert_all_close(matrices[i], rotation.matrix3x3())
+
+  def test_indexing(self):
+    rotations = rotation3_array.Rotation3Array.from_rotations(_TEST_ROTATIONS)
+    self.assertIsInstance(rotations[-1], rotation3.Rotation3)
+    self.assertEqual(rotations[-1], _TEST_ROTATIONS[-1])
+    self.assertLen(rotations[1:3], 2)
+    self.assertLen(rotations[np.array([0, 2, 4])], 3)
+
+  def test_zero_quaternion_is_identity(self):
+    rotations = rotation3_array.Rotation3Array(np.zeros((2, 4)))
+    self.assertTrue(rotations.almost_equal(rotation3.Rotation3.identity()))
+
+  @parameterized.named_parameters(
+      ('wrong_shape', np.zeros((2, 3))),
+      ('vector', np.array([0, 0, 0, 1])),
+      ('tiny', np.array([[0, 0, 0, 1e-12]])),
+      ('infinite', np.array([[0, 0, 0, np.inf]])),
+  )
+  def test_invalid_input_raises(self, xyzw):
+    with self.assertRaises(ValueError):
+      rotation3_array.Rotation3Array(xyzw)
+
+  def test_normalize(self):
+    rotations = rotation3_array.Rotation3Array(
+        np.array([[0, 0, 0, 2.0], [0, 3.0, 0, 0]]), normalize=True
+    )
+    self.assert_all_close(rotations.xyzw, [[0, 0, 0, 1], [0, 1, 0, 0]])
+
+  def test_from_matrix_matches_rotation3(self):
+    matrices = np.array([rotation.matrix3x3() for rotation in _TEST_ROTATIONS])
+    for validate in (
+        rotation3_array.VALIDATE_STRICT,
+        rotation3_array.VALIDATE_FAST,
+        rotation3_array.VALIDATE_NONE,
+    ):
+      rotations = rotation3_array.Rotation3Array.from_matrix(
+          matrices, validate=validate
+      )
+      for i, matrix in enumerate(matrices):
+        self.assert_all_close(
+            rotations.xyzw[i],
+            rotation3.Rotation3.from_matrix(matrix).quaternion.normalize().xyzw,
+        )
+
+  def test_quaternions_from_matrices_is_bitwise_equal_to_rotation3(self):
+    matrices = np.array([rotation.matrix3x3() for rotation in _TEST_ROTATIONS])
+    xyzw = rotation3_array.quaternions_from_matrices(matrices)
+    for i, matrix in enumerate(matrices):
+      self.assert_all_equal(
+          xyzw[i], rotation3.Rotation3.from_matrix(matrix).quaternion.xyzw
+      )
+
+  def test_from_matrix_accepts_homogeneous_matrices(self):
+    rotation = rotation3.Rotation3.from_axis_angle((1, 2, 3), 0.7)
+    matrix = np.identity(4)
+    matrix[:3, :3] = rotation.matrix3x3()
+    matrix[:3, 3] = (1, 2, 3)
+    rotations = rotation3_array.Rotation3Array.from_matrix(matrix[np.newaxis])
+    self.assert_rotation_close(rotations[0], rotation)
+
+  def test_from_matrix_validation(self):
+    matrices = np.array([np.identity(3)] * 3)
+    # Columns of unit length, which are not orthogonal.
+    matrices[1] = [[1, 1, 0], [0, 0, 0], [0, 0, 1]]
+    with self.assertRaisesRegex(ValueError, r'rows \[1\]'):
+      rotation3_array.Rotation3Array.from_matrix(matrices)
+    rotation3_array.Rotation3Array.from_matrix(
+        matrices, validate=rotation3_array.VALIDATE_FAST
+    )
+    matrices[2] *= 2.0
+    with self.assertRaisesRegex(ValueError, r'rows \[2\]'):
+      rotation3_array.Rotation3Array.from_matrix(
+          matrices, validate=rotation3_array.VALIDATE_FAST
+      )
+    rotation3_array.Rotation3Array.from_matrix(
+        matrices, validate=rotation3_array.VALIDATE_NONE
+    )
+
+  @parameterized.named_parameters(
+      ('strict', rotation3_array.VALIDATE_STRICT),
+      ('fast', rotation3_array.VALIDATE_FAST),
+  )
+  def test_from_matrix_non_finite_raises(self, validate):
+    matrices = np.array([np.identity(3)] * 2)
+    matrices[1, 0, 0] = np.nan
+    with self.assertRaises(ValueError):
+      rotation3_array.Rotation3Array.from_matrix(matrices, validate=validate)
+
+  @parameterized.named_parameters(
+      ('wrong_shape', np.zeros((2, 3, 4)), rotation3_array.VALIDATE_NONE),
+      ('single_matrix', np.identity(3), rotation3_array.VALIDATE_NONE),
+      ('unknown_mode', np.zeros((2, 3, 3)), 'lenient'),
+  )
+  def test_from_matrix_invalid_arguments_raises(self, matrices, validate):
+    with self.assertRaises(ValueError):
+      rotation3_array.Rotation3Array.from_matrix(matrices, validate=validate)
+
+  def test_from_euler_angles_matches_rotation3(self):
+    rpy_degrees = np.random.default_rng(0).uniform(-360, 360, size=(20, 3))
+    rpy_degrees[0] = (10, 90, -30)
+    rotations = rotation3_array.Rotation3Array.from_euler_angles(
+        rpy_degrees=rpy_degrees
+    )
+    rotations_from_radians = rotation3_array.Rotation3Array.from_euler_angles(
+        rpy_radians=np.radians(rpy_degrees)
+    )
+    self.assertTrue(rotations.almost_equal(rotations_from_radians))
+    for i, rpy in enumerate(rpy_degrees):
+      self.assert_rotation_close(
+          rotations[i], rotation3.Rotation3.from_euler_angles(rpy_degrees=rpy)
+      )
+
+  def test_from_euler_angles_invalid_input_raises(self):
+    with self.assertRaises(ValueError):
+      rotation3_array.Rotation3Array.from_euler_angles()
+    with self.assertRaises(ValueError):
+      rotation3_array.Rotation3Array.from_euler_angles(
+          rpy_degrees=np.zeros((1, 3)), rpy_radians=np.zeros((1, 3))
+      )
+    with self.assertRaises(ValueError):
+      rotation3_array.Rotation3Array.from_euler_angles(rpy_radians=np.zeros(3))
+    with self.assertRaises(ValueError):
+      rotation3_array.Rotation3Array.from_euler_angles(
+          rpy_radians=[[0, np.inf, 0]]
+      )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -346,6 +346,23 @@ class Rotation3Test(parameterized.TestCase, math_test.TestCase):
         p_by_matrix = np.matmul(matrix, np.asarray(point))
         self.assert_all_close(p_rotated, p_by_matrix)
 
+  @parameterized.parameters(*_TEST_AXIS_ANGLES)
+  def test_rotate_point_not_normalized(self, axis, angle):
+    rotation = rotation3.Rotation3.from_axis_angle(axis, angle)
+    scaled_rotation = rotation3.Rotation3(rotation.quaternion * 1.001)
+    for point_name, point in _TEST_POINTS:
+      with self.subTest(point_name=point_name, point=point):
+        self.assert_all_close(
+            scaled_rotation.rotate_point(point), rotation.rotate_point(point)
+        )
+
+  def test_rotate_point_invalid_point_raises(self):
+    rotation = rotation3.Rotation3.from_axis_angle((0, 0, 1), 1.0)
+    with self.assertRaises(ValueError):
+      rotation.rotate_point([1.0, np.nan, 0.0])
+    with self.assertRaises(ValueError):
+      rotation.rotate_point([1.0, np.inf, 0.0])
+
   @parameterized.named_parameters(*_TEST_ROTATIONS)
   def test_inverse(self, rotation):
     inverse = rotation.inverse()
@@ -392,6 +409,26 @@ class Rotation3Test(parameterized.TestCase, math_test.TestCase):
     logging.debug('q: %r\nmatrix: %r\n', rotation.quaternion, rotation_matrix)
     self.assert_all_close(rotation_matrix, rotation.matrix3x3())
 
+  @parameterized.named_parameters(*_TEST_ROTATIONS)
+  def test_derived_representations_are_cached(self, rotation):
+    def uncached():
+      return rotation3.Rotation3(rotation.quaternion)
+
+    matrix = rotation.matrix3x3()
+    self.assert_all_equal(matrix, uncached().matrix3x3())
+    # Callers own the returned arrays, so modifying them must not affect the
+    # cache.
+    matrix[:] = 0
+    self.assert_all_equal(rotation.matrix3x3(), uncached().matrix3x3())
+    rpy_radians = rotation.euler_angles(radians=True)
+    self.assert_all_equal(rpy_radians, uncached().euler_angles(radians=True))
+    rpy_radians[:] = 0
+    self.assert_all_equal(rotation.euler_angles(), uncached().euler_angles())
+    self.assertIs(rotation.inverse(), rotation.inverse())
+    self.assertEqual(
+        rotation.inverse().quaternion, rotation.quaternion.conjugate()
+    )
+
   @parameterized.named_parameters(*_TEST_ROTATIONS)
   def test_from_matrix(self, rotation):
     rotation_matrix = rotation.matrix3x3()
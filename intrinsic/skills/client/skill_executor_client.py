@@ -0,0 +1,102 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Lightweight Python wrapper around the operations of a skill service."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, Optional
+
+from google.longrunning import operations_pb2
+import grpc
+from intrinsic.skills.proto import skill_service_pb2
+from intrinsic.skills.proto import skill_service_pb2_grpc
+
+
+class SkillExecutorClient:
+  """Client library for watching the operations of a skill service."""
+
+  def __init__(self, stub: skill_service_pb2_grpc.ExecutorStub):
+    """Constructs a new SkillExecutorClient object.
+
+    Args:
+      stub: The gRPC stub to be used for communication with the skill
+        service's Executor service.
+    """
+    self._stub: skill_service_pb2_grpc.ExecutorStub = stub
+
+  @classmethod
+  def connect(cls, grpc_channel: grpc.Channel) -> SkillExecutorClient:
+    """Connect to a running skill service.
+
+    Args:
+      grpc_channel: Channel to the skill service.
+
+    Returns:
+      A newly created instance of the SkillExecutorClient class.
+    """
+    stub = skill_service_pb2_grpc.ExecutorStub(grpc_channel)
+    return cls(stub)
+
+  def watch_operations(
+      self, names: Iterable[str], timeout: Optional[float] = None
+  ) -> Iterator[skill_service_pb2.OperationEvent]:
+    """Streams the state transitions of operations as they happen.
+
+    The stream starts with the current state of each operation and ends once
+    all operations are done.
+
+    Args:
+      names: The names of the operations to watch.
+      timeout: The maximum number of seconds to watch, or None for no timeout.
+
+    Returns:
+      An iterator over the state transitions.
+
+    Raises:
+      grpc.RpcError: If the operations cannot be watched, e.g., NOT_FOUND if
+        any of them does not exist, or DEADLINE_EXCEEDED if the timeout expires
+        while iterating.
+    """
+    return self._stub.WatchOperations(
+        skill_service_pb2.WatchOperationsRequest(names=list(names)),
+        timeout=timeout,
+    )
+
+  def as_completed(
+      self, names: Iterable[str], timeout: Optional[float] = None
+  ) -> Iterator[operations_pb2.Operation]:
+    """Yields operations as they finish.
+
+    Args:
+      names: The names of the operations to wait for.
+      timeout: The maximum number of seconds to wait, or None for no timeout.
+
+    Yields:
+      The final state of each operation, in the order in which they finish.
+
+    Raises:
+      grpc.RpcError: See watch_operations().
+    """
+    for event in self.watch_operations(names, timeout=timeout):
+      if event.event_type == skill_service_pb2.OperationEvent.EVENT_TYPE_DONE:
+        yield event.operation
+
+  def wait_operations(
+      self, names: Iterable[str], timeout: Optional[float] = None
+  ) -> Dict[str, operations_pb2.Operation]:
+    """Waits for all of the operations to finish.
+
+    Args:
+      names: The names of the operations to wait for.
+      timeout: The maximum number of seconds to wait, or None for no timeout.
+
+    Returns:
+      The final state of each operation, by name.
+
+    Raises:
+      grpc.RpcError: See watch_operations().
+    """
+    return {
+        operation.name: operation
+        for operation in self.as_completed(names, timeout=timeout)
+    }
@@ -0,0 +1,67 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for intrinsic.skills.client.skill_executor_client."""
+
+from unittest import mock
+
+from absl.testing import absltest
+from google.longrunning import operations_pb2
+from intrinsic.skills.client import skill_executor_client
+from intrinsic.skills.proto import skill_service_pb2
+
+_EventType = skill_service_pb2.OperationEvent.EventType
+
+
+def _event(
+    event_type: int, name: str, done: bool = False
+) -> skill_service_pb2.OperationEvent:
+  return skill_service_pb2.OperationEvent(
+      event_type=event_type,
+      operation=operations_pb2.Operation(name=name, done=done),
+  )
+
+
+class SkillExecutorClientTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+
+    self._executor_stub = mock.MagicMock()
+    self._client = skill_executor_client.SkillExecutorClient(
+        self._executor_stub
+    )
+    self._executor_stub.WatchOperations.return_value = iter(
+        [
+            _event(_EventType.EVENT_TYPE_STARTED, 'a'),
+            _event(_EventType.EVENT_TYPE_STARTED, 'b'),
+            _event(_EventType.EVENT_TYPE_CANCELLING, 'b'),
+            _event(_EventType.EVENT_TYPE_DONE, 'b', done=True),
+            _event(_EventType.EVENT_TYPE_DONE, 'a', done=True),
+        ]
+    )
+
+  def test_watch_operations_works(self):
+    events = list(self._client.watch_operations(['a', 'b'], timeout=5.0))
+
+    self.assertLen(events, 5)
+    self.assertEqual(events[2].event_type, _EventType.EVENT_TYPE_CANCELLING)
+    self._executor_stub.WatchOperations.assert_called_once_with(
+        skill_service_pb2.WatchOperationsRequest(names=['a', 'b']),
+        timeout=5.0,
+    )
+
+  def test_as_completed_yields_in_finishing_order(self):
+    operations = list(self._client.as_completed(['a', 'b']))
+
+    self.assertEqual([operation.name for operation in operations], ['b', 'a'])
+    self.assertTrue(all(operation.done for operation in operations))
+
+  def test_wait_operations_works(self):
+    operations = self._client.wait_operations(['a', 'b'])
+
+    self.assertCountEqual(operations, ['a', 'b'])
+    self.assertTrue(operations['a'].done)
+
+
+if __name__ == '__main__':
+  absltest.main()
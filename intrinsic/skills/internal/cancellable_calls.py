@@ -0,0 +1,125 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Cancels the gRPC calls of a skill together with the skill."""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+from typing import Any, Iterator, Optional
+
+import grpc
+from intrinsic.skills.python import skill_canceller
+
+# The canceller of the skill operation that runs in the current context.
+_canceller: contextvars.ContextVar[
+    Optional[skill_canceller.SkillCancellationManager]
+] = contextvars.ContextVar('skill_canceller', default=None)
+
+
+@contextlib.contextmanager
+def cancel_calls_with(
+    canceller: skill_canceller.SkillCancellationManager,
+) -> Iterator[None]:
+  """Ties calls made through CancellableStubs to the cancellation of a skill.
+
+  Within the context, unary calls made through a CancellableStub are cancelled
+  when the canceller is cancelled, and fail with SkillCancelledError.
+
+  The association is held in a context variable. It carries over to coroutines
+  and tasks started within the context, and to functions run via
+  contextvars.copy_context() (e.g., by asyncio.to_thread or AsyncClient), but
+  not to threads started by the skill.
+
+  Args:
+    canceller: The canceller of the skill.
+
+  Yields:
+    None.
+  """
+  token = _canceller.set(canceller)
+  try:
+    yield
+  finally:
+    _canceller.reset(token)
+
+
+class CancellableStub:
+  """Wraps a gRPC stub so that calls are cancelled together with skills.
+
+  Unary-unary methods of the stub are replaced by ones that make calls
+  cancellable if they are made within cancel_calls_with(). Outside of it, or
+  for other kinds of methods, the calls are passed to the stub unchanged.
+
+  Since the association with a skill is made per call, the wrapped stub can be
+  shared by clients which serve several skill operations concurrently.
+  """
+
+  def __init__(self, stub: Any):
+    """Initializes the instance.
+
+    Args:
+      stub: The gRPC stub to wrap.
+    """
+    self._stub = stub
+
+  def __getattr__(self, name: str) -> Any:
+    attribute = getattr(self._stub, name)
+    if isinstance(attribute, grpc.UnaryUnaryMultiCallable):
+      attribute = _CancellableUnaryUnaryMultiCallable(attribute)
+    # Subsequent lookups find the attribute without calling __getattr__.
+    setattr(self, name, attribute)
+    return attribute
+
+
+class _CancellableUnaryUnaryMultiCallable(grpc.UnaryUnaryMultiCallable):
+  """Makes the calls of a unary-unary method cancellable with the skill."""
+
+  def __init__(self, multi_callable: grpc.UnaryUnaryMultiCallable):
+    self._multi_callable = multi_callable
+
+  def __call__(self, request: Any, *args, **kwargs) -> Any:
+    canceller = _canceller.get()
+    if canceller is None:
+      return self._multi_callable(request, *args, **kwargs)
+    call = self._start(canceller, request, args, kwargs)
+    return _result(call)
+
+  def with_call(self, request: Any, *args, **kwargs) -> tuple[Any, grpc.Call]:
+    canceller = _canceller.get()
+    if canceller is None:
+      return self._multi_callable.with_call(request, *args, **kwargs)
+    call = self._start(canceller, request, args, kwargs)
+    return _result(call), call
+
+  def future(self, request: Any, *args, **kwargs) -> grpc.Future:
+    canceller = _canceller.get()
+    if canceller is None:
+      return self._multi_callable.future(request, *args, **kwargs)
+    return self._start(canceller, request, args, kwargs)
+
+  def _start(
+      self,
+      canceller: skill_canceller.SkillCancellationManager,
+      request: Any,
+      args: tuple[Any, ...],
+      kwargs: dict[str, Any],
+  ) -> grpc.Future:
+    """Starts a call that is cancelled together with the skill."""
+    if canceller.cancelled:
+      raise skill_canceller.SkillCancelledError(
+          'The call was not made, since the skill was cancelled.'
+      )
+    call = self._multi_callable.future(request, *args, **kwargs)
+    canceller.add_cancellable_call(call)
+    return call
+
+
+def _result(call: grpc.Future) -> Any:
+  """Returns the response of a call started by _start()."""
+  try:
+    return call.result()
+  except grpc.FutureCancelledError as err:
+    raise skill_canceller.SkillCancelledError(
+        'The call was cancelled, since the skill was cancelled.'
+    ) from err
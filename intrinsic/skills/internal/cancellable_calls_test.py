@@ -0,0 +1,235 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for cancellable_calls."""
+
+import threading
+from typing import Any, Callable, List, Optional
+
+from absl.testing import absltest
+import grpc
+from intrinsic.skills.internal import cancellable_calls
+from intrinsic.skills.python import skill_canceller
+
+_TIMEOUT = 10.0
+
+
+class _FakeCall:
+  """A fake grpc.Future of a unary call, which is completed by the test."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._done = threading.Event()
+    self._cancelled = False
+    self._response = None
+    self._callbacks: List[Callable[[Any], None]] = []
+
+  def cancel(self) -> bool:
+    with self._lock:
+      if self._done.is_set():
+        return False
+      self._cancelled = True
+    self._finish()
+    return True
+
+  def cancelled(self) -> bool:
+    return self._cancelled
+
+  def done(self) -> bool:
+    return self._done.is_set()
+
+  def set_response(self, response: Any) -> None:
+    with self._lock:
+      self._response = response
+    self._finish()
+
+  def result(self, timeout: Optional[float] = _TIMEOUT) -> Any:
+    if not self._done.wait(timeout):
+      raise grpc.FutureTimeoutError()
+    if self._cancelled:
+      raise grpc.FutureCancelledError()
+    return self._response
+
+  def add_done_callback(self, fn: Callable[[Any], None]) -> None:
+    with self._lock:
+      if not self._done.is_set():
+        self._callbacks.append(fn)
+        return
+    fn(self)
+
+  def _finish(self) -> None:
+    with self._lock:
+      self._done.set()
+      callbacks = self._callbacks
+      self._callbacks = []
+    for fn in callbacks:
+      fn(self)
+
+
+class _FakeUnaryUnaryMultiCallable(grpc.UnaryUnaryMultiCallable):
+  """Records the calls made and returns a _FakeCall for each of them."""
+
+  def __init__(self):
+    self.calls: List[_FakeCall] = []
+    self.started = threading.Event()
+    self.direct_requests: List[Any] = []
+
+  def __call__(self, request, *args, **kwargs):
+    self.direct_requests.append(request)
+    return 'direct response'
+
+  def with_call(self, request, *args, **kwargs):
+    self.direct_requests.append(request)
+    return 'direct response', _FakeCall()
+
+  def future(self, request, *args, **kwargs):
+    call = _FakeCall()
+    self.calls.append(call)
+    self.started.set()
+    return call
+
+
+class _FakeStub:
+
+  def __init__(self):
+    self.Method = _FakeUnaryUnaryMultiCallable()  # pylint: disable=invalid-name
+    self.OtherMethod = lambda request: 'other response'  # pylint: disable=invalid-name
+
+
+class CancellableCallsTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._stub = _FakeStub()
+    self._multi_callable = self._stub.Method
+    self._cancellable_stub = cancellable_calls.CancellableStub(self._stub)
+    self._canceller = skill_canceller.SkillCancellationManager(
+        ready_timeout=_TIMEOUT
+    )
+    self._canceller.ready()
+
+  def test_call_outside_cancel_calls_with_is_passed_through(self):
+    self.assertEqual(self._cancellable_stub.Method('a'), 'direct response')
+    response, _ = self._cancellable_stub.Method.with_call('b')
+    self.assertEqual(response, 'direct response')
+    call = self._cancellable_stub.Method.future('c')
+
+    self.assertEqual(self._multi_callable.direct_requests, ['a', 'b'])
+    self.assertEqual(self._multi_callable.calls, [call])
+    self._canceller.cancel()
+    self.assertFalse(call.cancelled())
+
+  def test_other_attributes_are_passed_through(self):
+    self.assertEqual(
+        self._cancellable_stub.OtherMethod('request'), 'other response'
+    )
+
+  def test_call_after_cancel_is_not_made(self):
+    self._canceller.cancel()
+
+    with cancellable_calls.cancel_calls_with(self._canceller):
+      with self.assertRaises(skill_canceller.SkillCancelledError):
+        self._cancellable_stub.Method('request')
+      with self.assertRaises(skill_canceller.SkillCancelledError):
+        self._cancellable_stub.Method.with_call('request')
+      with self.assertRaises(skill_canceller.SkillCancelledError):
+        self._cancellable_stub.Method.future('request')
+
+    self.assertEmpty(self._multi_callable.calls)
+    self.assertEmpty(self._multi_callable.direct_requests)
+
+  def test_call_in_flight_is_cancelled(self):
+    errors = []
+
+    def make_call() -> None:
+      with cancellable_calls.cancel_calls_with(self._canceller):
+        try:
+          self._cancellable_stub.Method('request')
+        except skill_canceller.SkillCancelledError as err:
+          errors.append(err)
+
+    thread = threading.Thread(target=make_call)
+    thread.start()
+    self.assertTrue(self._multi_callable.started.wait(_TIMEOUT))
+    self._canceller.cancel()
+    thread.join(_TIMEOUT)
+
+    self.assertFalse(thread.is_alive())
+    self.assertLen(errors, 1)
+    self.assertIsInstance(errors[0].__cause__, grpc.FutureCancelledError)
+    self.assertTrue(self._multi_callable.calls[0].cancelled())
+
+  def test_future_in_flight_is_cancelled(self):
+    with cancellable_calls.cancel_calls_with(self._canceller):
+      call = self._cancellable_stub.Method.future('request')
+
+    self._canceller.cancel()
+
+    self.assertIs(call, self._multi_callable.calls[0])
+    self.assertTrue(call.cancelled())
+
+  def test_with_call_returns_response_and_call(self):
+    results = []
+
+    def make_call() -> None:
+      with cancellable_calls.cancel_calls_with(self._canceller):
+        results.append(self._cancellable_stub.Method.with_call('request'))
+
+    thread = threading.Thread(target=make_call)
+    thread.start()
+    self.assertTrue(self._multi_callable.started.wait(_TIMEOUT))
+    self._multi_callable.calls[0].set_response('response')
+    thread.join(_TIMEOUT)
+
+    self.assertEqual(results, [('response', self._multi_callable.calls[0])])
+
+  def test_finished_calls_are_forgotten(self):
+    with cancellable_calls.cancel_calls_with(self._canceller):
+      calls = [self._cancellable_stub.Method.future(i) for i in range(3)]
+    for call in calls:
+      call.set_response('response')
+
+    self.assertEmpty(self._canceller._calls)  # pylint: disable=protected-access
+    self._canceller.cancel()
+    self.assertFalse(any(call.cancelled() for call in calls))
+
+
+class AddCancellableCallTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._canceller = skill_canceller.SkillCancellationManager(
+        ready_timeout=_TIMEOUT
+    )
+    self._canceller.ready()
+
+  def test_call_is_cancelled_with_skill(self):
+    call = _FakeCall()
+    self._canceller.add_cancellable_call(call)
+
+    self._canceller.cancel()
+
+    self.assertTrue(call.cancelled())
+
+  def test_call_added_after_cancel_is_cancelled_immediately(self):
+    self._canceller.cancel()
+    call = _FakeCall()
+
+    self._canceller.add_cancellable_call(call)
+
+    self.assertTrue(call.cancelled())
+    self.assertEmpty(self._canceller._calls)  # pylint: disable=protected-access
+
+  def test_done_call_is_discarded(self):
+    done_call = _FakeCall()
+    done_call.set_response('response')
+    pending_call = _FakeCall()
+
+    self._canceller.add_cancellable_call(done_call)
+    self._canceller.add_cancellable_call(pending_call)
+    pending_call.set_response('response')
+
+    self.assertEmpty(self._canceller._calls)  # pylint: disable=protected-access
+
+
+if __name__ == '__main__':
+  absltest.main()
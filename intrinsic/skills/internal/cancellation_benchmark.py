@@ -0,0 +1,377 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Benchmarks the cancellation latency of skill operations under load.
+
+Starts a number of concurrent skill operations on an operation executor, waits
+until every skill is ready for cancellation and then cancels them all at once
+from several threads, as concurrent CancelOperation RPCs would. For each
+operation, measures the time from the cancellation request until
+  * the skill observes the cancellation ("observed"), and
+  * the operation is done ("done").
+
+Each kind of skill observes the cancellation in a different way:
+  poll:     polls `canceller.cancelled` every --poll_interval seconds.
+  wait:     blocks in `canceller.wait()`.
+  callback: blocks on an event which is set by a registered callback.
+  async:    a coroutine skill which awaits `canceller.wait_async()`.
+  call:     blocks in a gRPC call to a server which never responds, made
+            through a CancellableStub (as the clients of the skill's context
+            are), until the call is cancelled together with the skill.
+
+Every kind of skill has a budget for the 99th percentile of the "done" latency
+which is far above the expected value, so that running with --check catches
+regressions without being sensitive to machine noise. The budgets apply without
+--load_threads: busy threads which compete with the operations for the GIL
+delay every wake-up by up to the interpreter's switch interval.
+
+Usage:
+  bazel run //intrinsic/skills/internal:cancellation_benchmark -- --check
+"""
+
+from concurrent import futures
+import dataclasses
+import sys
+import threading
+import time
+from typing import Callable, List, Sequence
+
+from absl import app
+from absl import flags
+from google.protobuf import empty_pb2
+import grpc
+from intrinsic.skills.internal import cancellable_calls
+from intrinsic.skills.internal import operation_executor
+from intrinsic.skills.internal import runtime_data as rd
+from intrinsic.skills.internal import skill_service_impl
+from intrinsic.skills.internal import skill_service_metrics
+from intrinsic.skills.python import skill_canceller
+
+_SKILLS = flags.DEFINE_list(
+    'skills',
+    ['poll', 'wait', 'callback', 'async', 'call'],
+    'Kinds of skills to benchmark.',
+)
+_OPERATIONS = flags.DEFINE_integer(
+    'operations', 32, 'Number of concurrent operations per round.'
+)
+_ROUNDS = flags.DEFINE_integer('rounds', 20, 'Number of rounds per skill.')
+_CANCEL_THREADS = flags.DEFINE_integer(
+    'cancel_threads', 8, 'Number of threads which request cancellation.'
+)
+_LOAD_THREADS = flags.DEFINE_integer(
+    'load_threads', 0, 'Number of busy threads which compete for the GIL.'
+)
+_POLL_INTERVAL = flags.DEFINE_float(
+    'poll_interval', 0.01, 'Polling interval of "poll" skills in seconds.'
+)
+_CHECK = flags.DEFINE_bool(
+    'check', False, 'Exit with an error if any benchmark exceeds its budget.'
+)
+
+_SKILL_ID = 'ai.intrinsic.cancellation_benchmark'
+
+# Method of the benchmark's gRPC server, which never responds.
+_HANG_METHOD = '/intrinsic.skills.CancellationBenchmark/Hang'
+
+# Maximum number of seconds to wait for skills and operations.
+_TIMEOUT_SECONDS = 60.0
+
+# Budgets of the 99th percentile of the "done" latency in milliseconds, in
+# addition to the polling interval for "poll" skills.
+_BUDGETS_MS = {
+    'poll': 50.0,
+    'wait': 50.0,
+    'callback': 50.0,
+    'async': 50.0,
+    'call': 50.0,
+}
+
+
+@dataclasses.dataclass
+class _Sample:
+  """The times of a single cancelled operation, from time.perf_counter().
+
+  Attributes:
+    requested: The time at which cancellation was requested.
+    observed: The time at which the skill observed the cancellation.
+    done: The time at which the operation was done.
+  """
+
+  requested: float = 0.0
+  observed: float = 0.0
+  done: float = 0.0
+
+
+class _HangStub:
+  """A stub of the benchmark's gRPC server."""
+
+  def __init__(self, channel: grpc.Channel):
+    self.Hang = channel.unary_unary(_HANG_METHOD)  # pylint: disable=invalid-name
+
+
+def _start_hang_server(max_workers: int) -> tuple[grpc.Server, int]:
+  """Starts a gRPC server whose only method never responds.
+
+  Args:
+    max_workers: The maximum number of concurrent calls.
+
+  Returns:
+    The server and its port.
+  """
+
+  def hang(request: bytes, context: grpc.ServicerContext) -> bytes:
+    del request  # Unused.
+    terminated = threading.Event()
+    context.add_callback(terminated.set)
+    terminated.wait(_TIMEOUT_SECONDS)
+    return b''
+
+  server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+  service, method = _HANG_METHOD.rsplit('/', 1)
+  server.add_generic_rpc_handlers(
+      (
+          grpc.method_handlers_generic_handler(
+              service.lstrip('/'),
+              {method: grpc.unary_unary_rpc_method_handler(hang)},
+          ),
+      )
+  )
+  port = server.add_insecure_port('localhost:0')
+  server.start()
+  return server, port
+
+
+def _make_skill(
+    kind: str,
+    canceller: skill_canceller.SkillCanceller,
+    ready: threading.Event,
+    sample: _Sample,
+    stub: cancellable_calls.CancellableStub,
+) -> Callable[[], None]:
+  """Returns the operation of a skill of the given kind.
+
+  The operation signals `ready` once the skill is ready for cancellation,
+  records in `sample` when it observes the cancellation and then raises
+  SkillCancelledError.
+  """
+
+  def observed() -> skill_canceller.SkillCancelledError:
+    sample.observed = time.perf_counter()
+    return skill_canceller.SkillCancelledError('The skill was cancelled.')
+
+  if kind == 'poll':
+
+    def poll() -> None:
+      canceller.ready()
+      ready.set()
+      while not canceller.cancelled:
+        time.sleep(_POLL_INTERVAL.value)
+      raise observed()
+
+    return poll
+
+  if kind == 'wait':
+
+    def wait() -> None:
+      canceller.ready()
+      ready.set()
+      canceller.wait(_TIMEOUT_SECONDS)
+      raise observed()
+
+    return wait
+
+  if kind == 'callback':
+
+    def callback() -> None:
+      cancelled = threading.Event()
+      canceller.register_callback(cancelled.set)
+      canceller.ready()
+      ready.set()
+      cancelled.wait(_TIMEOUT_SECONDS)
+      raise observed()
+
+    return callback
+
+  if kind == 'async':
+
+    async def wait_async() -> None:
+      canceller.ready()
+      ready.set()
+      await canceller.wait_async(_TIMEOUT_SECONDS)
+      raise observed()
+
+    return wait_async
+
+  if kind == 'call':
+
+    def call() -> None:
+      canceller.ready()
+      ready.set()
+      try:
+        stub.Hang(b'', timeout=_TIMEOUT_SECONDS)
+      except skill_canceller.SkillCancelledError as err:
+        raise observed() from err
+
+    return call
+
+  raise app.UsageError(f'Unknown kind of skill: {kind!r}.')
+
+
+def _run_round(
+    kind: str,
+    executor: operation_executor.OperationExecutor,
+    cancel_pool: futures.ThreadPoolExecutor,
+    metrics: skill_service_metrics.SkillServiceMetrics,
+    runtime_data: rd.SkillRuntimeData,
+    stub: cancellable_calls.CancellableStub,
+) -> List[_Sample]:
+  """Starts and cancels one round of concurrent operations."""
+  operations = []
+  samples = []
+  ready_events = []
+  for _ in range(_OPERATIONS.value):
+    # pylint: disable-next=protected-access
+    operation = skill_service_impl._SkillOperation(
+        name=f'{kind}-{len(operations)}',
+        runtime_data=runtime_data,
+        executor=executor,
+        metrics=metrics,
+    )
+    sample = _Sample()
+    ready = threading.Event()
+    operation.add_finished_callback(
+        lambda _, sample=sample: setattr(sample, 'done', time.perf_counter())
+    )
+    operation.start(
+        op=_make_skill(kind, operation.canceller, ready, sample, stub),
+        to_result=lambda result: empty_pb2.Empty(),
+        op_name=skill_service_metrics.OP_EXECUTE,
+    )
+    operations.append(operation)
+    samples.append(sample)
+    ready_events.append(ready)
+
+  for ready in ready_events:
+    if not ready.wait(_TIMEOUT_SECONDS):
+      raise TimeoutError(f'Timed out waiting for {kind!r} skills to start.')
+
+  def cancel(
+      operation: skill_service_impl._SkillOperation,  # pylint: disable=protected-access
+      sample: _Sample,
+  ) -> None:
+    sample.requested = time.perf_counter()
+    operation.request_cancellation()
+
+  for future in [
+      cancel_pool.submit(cancel, operation, sample)
+      for operation, sample in zip(operations, samples)
+  ]:
+    future.result()
+  for operation in operations:
+    if not operation.wait(_TIMEOUT_SECONDS).done:
+      raise TimeoutError(f'Timed out waiting for {kind!r} skills to finish.')
+  return samples
+
+
+def _percentile(values: Sequence[float], percentile: float) -> float:
+  values = sorted(values)
+  return values[min(len(values) - 1, int(len(values) * percentile / 100.0))]
+
+
+def _report(kind: str, samples: Sequence[_Sample]) -> bool:
+  """Prints the latencies of a kind of skill.
+
+  Returns:
+    True if the latency is within the budget.
+  """
+  budget_ms = _BUDGETS_MS[kind]
+  if kind == 'poll':
+    budget_ms += _POLL_INTERVAL.value * 1e3
+  over_budget = False
+  for name, latencies in (
+      ('observed', [s.observed - s.requested for s in samples]),
+      ('done', [s.done - s.requested for s in samples]),
+  ):
+    p50 = _percentile(latencies, 50) * 1e3
+    p99 = _percentile(latencies, 99) * 1e3
+    worst = max(latencies) * 1e3
+    line = '%-9s %-9s p50 %8.3f ms  p99 %8.3f ms  max %8.3f ms' % (
+        kind,
+        name,
+        p50,
+        p99,
+        worst,
+    )
+    if name == 'done':
+      over_budget = p99 > budget_ms
+      line += '  (budget %.1f ms)%s' % (
+          budget_ms,
+          '  OVER BUDGET' if over_budget else '',
+      )
+    print(line)
+  return not over_budget
+
+
+def _burn(stop: threading.Event) -> None:
+  while not stop.is_set():
+    sum(range(1000))
+
+
+def main(argv: List[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  for kind in _SKILLS.value:
+    if kind not in _BUDGETS_MS:
+      raise app.UsageError(f'Unknown kind of skill: {kind!r}.')
+
+  runtime_data = rd.SkillRuntimeData(
+      parameter_data=rd.ParameterData(descriptor=empty_pb2.Empty.DESCRIPTOR),
+      return_type_data=rd.ReturnTypeData(),
+      execution_options=rd.ExecutionOptions(supports_cancellation=True),
+      resource_data=rd.ResourceData(required_resources={}),
+      skill_id=_SKILL_ID,
+  )
+  metrics = skill_service_metrics.SkillServiceMetrics()
+  executor = operation_executor.OperationExecutor(
+      max_workers=_OPERATIONS.value,
+      max_queued=0,
+      max_async_operations=_OPERATIONS.value,
+  )
+  cancel_pool = futures.ThreadPoolExecutor(max_workers=_CANCEL_THREADS.value)
+  server, port = _start_hang_server(max_workers=_OPERATIONS.value + 1)
+  channel = grpc.insecure_channel(f'localhost:{port}')
+  stub = cancellable_calls.CancellableStub(_HangStub(channel))
+
+  stop_load = threading.Event()
+  load_threads = [
+      threading.Thread(target=_burn, args=(stop_load,), daemon=True)
+      for _ in range(_LOAD_THREADS.value)
+  ]
+  for thread in load_threads:
+    thread.start()
+
+  failures = []
+  try:
+    for kind in _SKILLS.value:
+      samples = []
+      for _ in range(_ROUNDS.value):
+        samples += _run_round(
+            kind, executor, cancel_pool, metrics, runtime_data, stub
+        )
+      if not _report(kind, samples):
+        failures.append(kind)
+  finally:
+    stop_load.set()
+    for thread in load_threads:
+      thread.join()
+    channel.close()
+    server.stop(grace=None)
+    cancel_pool.shutdown()
+    executor.shutdown()
+
+  if _CHECK.value and failures:
+    sys.exit('Benchmarks over budget: %s' % ', '.join(failures))
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -2,6 +2,7 @@
 
 """Implementation of default handling for python Skills."""
 
+import dataclasses
 import typing
 
 from google.protobuf import any_pb2
@@ -12,39 +13,117 @@ from intrinsic.skills.internal import error_bindings
 from pybind11_abseil import status
 
 
-def _one_ofs_set(
-    field_descriptors: typing.Iterable[descriptor.FieldDescriptor],
-) -> typing.Set[descriptor.FieldDescriptor]:
-  """Returns a set of the oneofs that have been set in the msg."""
-  one_ofs_set = set()
-  for field in field_descriptors:
-    if (
-        field.containing_oneof is not None
-        and field.containing_oneof not in one_ofs_set
-    ):
-      one_ofs_set.add(field.containing_oneof)
-  return one_ofs_set
+@dataclasses.dataclass(frozen=True)
+class _FieldMergeStep:
+  """How to merge a single field of a message type.
+
+  Attributes:
+    field: The field descriptor.
+    name: The field name.
+    oneof_name: The name of the containing oneof, or None.
+    is_repeated: True if the field is repeated (including maps).
+    is_message: True if the field is a singular message field.
+    has_presence: True if the field tracks presence, i.e., supports HasField.
+    default_value: The value of an unset scalar field without presence.
+  """
+
+  field: descriptor.FieldDescriptor
+  name: str
+  oneof_name: typing.Optional[str]
+  is_repeated: bool
+  is_message: bool
+  has_presence: bool
+  default_value: typing.Any
+
+  def is_set(self, msg: message.Message) -> bool:
+    """Returns True if the field is set in msg, matching msg.ListFields()."""
+    if self.is_repeated:
+      return bool(getattr(msg, self.name))
+    if self.has_presence:
+      return msg.HasField(self.name)
+    return getattr(msg, self.name) != self.default_value
+
+  def copy(self, from_msg: message.Message, to_msg: message.Message):
+    """Copies the value of the field in from_msg to to_msg."""
+    value = getattr(from_msg, self.name)
+    if self.is_repeated:
+      if self.field.message_type is not None and (
+          self.field.message_type.GetOptions().map_entry
+      ):
+        getattr(to_msg, self.name).MergeFrom(value)
+      else:
+        getattr(to_msg, self.name).extend(value)
+    elif self.is_message:
+      getattr(to_msg, self.name).CopyFrom(value)
+    else:
+      setattr(to_msg, self.name, value)
+
+
+def _make_merge_plan(
+    msg_descriptor: descriptor.Descriptor,
+) -> typing.Tuple[_FieldMergeStep, ...]:
+  """Returns the merge steps for all fields of a message type."""
+  plan = []
+  for field in msg_descriptor.fields:
+    is_repeated = field.label == descriptor.FieldDescriptor.LABEL_REPEATED
+    plan.append(
+        _FieldMergeStep(
+            field=field,
+            name=field.name,
+            oneof_name=(
+                field.containing_oneof.name
+                if field.containing_oneof is not None
+                else None
+            ),
+            is_repeated=is_repeated,
+            is_message=not is_repeated and field.message_type is not None,
+            has_presence=not is_repeated and field.has_presence,
+            default_value=None if is_repeated else field.default_value,
+        )
+    )
+  return tuple(plan)
+
+
+def _merge_plan(
+    msg_descriptor: descriptor.Descriptor,
+) -> typing.Tuple[_FieldMergeStep, ...]:
+  """Returns the cached merge plan for a message type."""
+  try:
+    return _merge_plan_cache[msg_descriptor]
+  except KeyError:
+    plan = _merge_plan_cache[msg_descriptor] = _make_merge_plan(msg_descriptor)
+    return plan
 
 
-def _set_fields(
-    fields: typing.Dict[descriptor.FieldDescriptor, typing.Any],
-    msg: message.Message,
+# Cache used by _merge_plan.
+_merge_plan_cache = {}
+
+
+def _merge_steps(
+    steps: typing.Iterable[_FieldMergeStep],
+    from_msg: message.Message,
+    to_msg: message.Message,
 ):
-  """Sets the fields in msg to the values contained in fields.
+  """Merges the fields of the steps that are set in from_msg but not to_msg."""
+  for step in steps:
+    # Don't overwrite oneof fields of which a different member of the oneof is
+    # set.
+    if step.is_set(to_msg) or (
+        step.oneof_name is not None
+        and to_msg.WhichOneof(step.oneof_name) is not None
+    ):
+      continue
+    step.copy(from_msg, to_msg)
 
-  Args:
-    fields: A dictionary of fields to set.
-    msg: A protobuf message to mutate
-  """
-  for field, value in fields.items():
-    if field.label == descriptor.FieldDescriptor.LABEL_REPEATED:
-      repeated = getattr(msg, field.name)
-      repeated.extend(value)
-    elif field.message_type is not None:
-      submessage = getattr(msg, field.name)
-      submessage.CopyFrom(value)
-    else:
-      setattr(msg, field.name, value)
+
+def _check_same_descriptor(from_msg: message.Message, to_msg: message.Message):
+  if from_msg.DESCRIPTOR != to_msg.DESCRIPTOR:
+    raise ValueError(
+        '`from_msg` and `to_msg` must have the same descriptor (same type of'
+        'message). If you believe these are messages of the same type, but are'
+        'seeing this error, check that the messages were generated by the same'
+        'message pool.'
+    )
 
 
 def merge_unset(from_msg: message.Message, to_msg: message.Message):
@@ -60,33 +139,66 @@ def merge_unset(from_msg: message.Message, to_msg: message.Message):
   Raises:
     Raises a ValueError if from_msg and to_msg do not have matching descriptors.
   """
-  if from_msg.DESCRIPTOR != to_msg.DESCRIPTOR:
-    raise ValueError(
-        '`from_msg` and `to_msg` must have the same descriptor (same type of'
-        'message). If you believe these are messages of the same type, but are'
-        'seeing this error, check that the messages were generated by the same'
-        'message pool.'
-    )
-
-  to_fields = to_msg.ListFields()
-  from_fields = from_msg.ListFields()
+  _check_same_descriptor(from_msg, to_msg)
+  _merge_steps(
+      (
+          step
+          for step in _merge_plan(from_msg.DESCRIPTOR)
+          if step.is_set(from_msg)
+      ),
+      from_msg,
+      to_msg,
+  )
+
+
+class ParameterDefaults:
+  """Default values for the parameters of a skill.
+
+  Unpacks the defaults once and precomputes which of their fields to merge, so
+  that applying them to a parameter message does not need to repack or
+  re-unpack any Any protos.
+  """
 
-  to_field_set_oneofs = _one_ofs_set([field for field, _ in to_fields])
+  def __init__(
+      self,
+      msg_descriptor: descriptor.Descriptor,
+      default_value_any: any_pb2.Any,
+  ):
+    """Initializes the instance.
+
+    Args:
+      msg_descriptor: The type information for the expected parameter and
+        default message type.
+      default_value_any: The defaults to apply to parameters.
+
+    Raises:
+      status.StatusNotOk if the defaults are of an unexpected type.
+    """
+    defaults = message_factory.GetMessageClass(descriptor=msg_descriptor)()
+    if not default_value_any.Unpack(defaults):
+      error_bindings.raise_status(
+          status.StatusCode.INVALID_ARGUMENT,
+          'Unexpected default type. Expected: {}. Got: {}'.format(
+              msg_descriptor.full_name, default_value_any.TypeName()
+          ),
+      )
+
+    self._defaults = defaults
+    self._steps = tuple(
+        step for step in _merge_plan(msg_descriptor) if step.is_set(defaults)
+    )
 
-  to_fields_set = set([field for field, _ in to_fields])
-  fields_set_in_from_but_not_to = {}
+  def apply(self, parameters: message.Message):
+    """Merges the defaults into the fields of parameters that are not set.
 
-  for field, value in from_fields:
-    # Don't overwrite oneof fields of which a different member of the oneof is
-    # set.
-    if field in to_fields_set or (
-        field.containing_oneof is not None
-        and field.containing_oneof in to_field_set_oneofs
-    ):
-      continue
-    fields_set_in_from_but_not_to[field] = value
+    Args:
+      parameters: The parameters to modify. Must be of the defaults' type.
 
-  _set_fields(fields_set_in_from_but_not_to, to_msg)
+    Raises:
+      Raises a ValueError if parameters is not of the defaults' type.
+    """
+    _check_same_descriptor(self._defaults, parameters)
+    _merge_steps(self._steps, self._defaults, parameters)
 
 
 def apply_defaults_to_parameters(
@@ -106,18 +218,9 @@ def apply_defaults_to_parameters(
   Raises:
     status.StatusNotOk if the parameters or defaults are of an unexpected type.
   """
-  cls = message_factory.GetMessageClass(descriptor=msg_descriptor)
-
-  defaults = cls()
-  if not default_value_any.Unpack(defaults):
-    error_bindings.raise_status(
-        status.StatusCode.INVALID_ARGUMENT,
-        'Unexpected default type. Expected: {}. Got: {}'.format(
-            msg_descriptor.full_name, default_value_any.TypeName()
-        ),
-    )
+  defaults = ParameterDefaults(msg_descriptor, default_value_any)
 
-  parameters = cls()
+  parameters = message_factory.GetMessageClass(descriptor=msg_descriptor)()
   if not parameters_any.Unpack(parameters):
     error_bindings.raise_status(
         status.StatusCode.INVALID_ARGUMENT,
@@ -126,5 +229,5 @@ def apply_defaults_to_parameters(
         ),
     )
 
-  merge_unset(defaults, parameters)
+  defaults.apply(parameters)
   parameters_any.Pack(parameters)
@@ -0,0 +1,185 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for default_parameters."""
+
+from absl.testing import absltest
+from google.protobuf import any_pb2
+from google.protobuf import duration_pb2
+from google.protobuf import source_context_pb2
+from google.protobuf import struct_pb2
+from google.protobuf import type_pb2
+from intrinsic.skills.internal import default_parameters
+from pybind11_abseil import status
+
+# pylint: disable=protected-access
+
+
+def _pack(msg) -> any_pb2.Any:
+  packed = any_pb2.Any()
+  packed.Pack(msg)
+  return packed
+
+
+class FieldMergeStepTest(absltest.TestCase):
+
+  def assertIsSetMatchesListFields(self, msg):
+    plan = default_parameters._make_merge_plan(msg.DESCRIPTOR)
+
+    self.assertEqual(
+        {step.name for step in plan if step.is_set(msg)},
+        {field.name for field, _ in msg.ListFields()},
+    )
+
+  def test_is_set_of_scalars_without_presence(self):
+    self.assertIsSetMatchesListFields(duration_pb2.Duration())
+    self.assertIsSetMatchesListFields(duration_pb2.Duration(seconds=1))
+    self.assertIsSetMatchesListFields(duration_pb2.Duration(nanos=-1))
+
+  def test_is_set_of_repeated_and_message_fields(self):
+    self.assertIsSetMatchesListFields(type_pb2.Type())
+    self.assertIsSetMatchesListFields(
+        type_pb2.Type(
+            name='my_type',
+            fields=[type_pb2.Field(name='my_field')],
+            source_context=source_context_pb2.SourceContext(),
+            syntax=type_pb2.SYNTAX_PROTO3,
+        )
+    )
+
+  def test_is_set_of_maps(self):
+    self.assertIsSetMatchesListFields(struct_pb2.Struct())
+    msg = struct_pb2.Struct()
+    msg.fields['a'].number_value = 1.0
+    self.assertIsSetMatchesListFields(msg)
+
+  def test_is_set_of_oneof_members_with_default_values(self):
+    self.assertIsSetMatchesListFields(struct_pb2.Value())
+    self.assertIsSetMatchesListFields(
+        struct_pb2.Value(null_value=struct_pb2.NULL_VALUE)
+    )
+    self.assertIsSetMatchesListFields(struct_pb2.Value(number_value=0.0))
+
+
+class MergeUnsetTest(absltest.TestCase):
+
+  def test_merges_only_unset_scalars(self):
+    parameters = duration_pb2.Duration(seconds=1)
+
+    default_parameters.merge_unset(
+        duration_pb2.Duration(seconds=5, nanos=7), parameters
+    )
+
+    self.assertEqual(parameters, duration_pb2.Duration(seconds=1, nanos=7))
+
+  def test_merges_unset_repeated_and_message_fields(self):
+    defaults = type_pb2.Type(
+        name='default',
+        oneofs=['a', 'b'],
+        source_context=source_context_pb2.SourceContext(file_name='a.proto'),
+    )
+    parameters = type_pb2.Type(name='my_type', oneofs=['c'])
+
+    default_parameters.merge_unset(defaults, parameters)
+
+    self.assertEqual(
+        parameters,
+        type_pb2.Type(
+            name='my_type',
+            oneofs=['c'],
+            source_context=source_context_pb2.SourceContext(
+                file_name='a.proto'
+            ),
+        ),
+    )
+
+  def test_merges_maps_only_if_unset(self):
+    defaults = struct_pb2.Struct()
+    defaults.fields['a'].number_value = 1.0
+    defaults.fields['b'].string_value = 'b'
+    parameters = struct_pb2.Struct()
+    parameters.fields['b'].string_value = 'my_b'
+    unset_parameters = struct_pb2.Struct()
+
+    default_parameters.merge_unset(defaults, parameters)
+    default_parameters.merge_unset(defaults, unset_parameters)
+
+    self.assertEqual(dict(parameters), {'b': 'my_b'})
+    self.assertEqual(unset_parameters, defaults)
+    # The merged map is a copy of the defaults.
+    unset_parameters.fields['a'].number_value = 2.0
+    self.assertEqual(defaults.fields['a'].number_value, 1.0)
+
+  def test_does_not_overwrite_other_member_of_oneof(self):
+    defaults = struct_pb2.Value(number_value=1.0)
+    parameters = struct_pb2.Value(null_value=struct_pb2.NULL_VALUE)
+    unset_parameters = struct_pb2.Value()
+
+    default_parameters.merge_unset(defaults, parameters)
+    default_parameters.merge_unset(defaults, unset_parameters)
+
+    self.assertEqual(parameters.WhichOneof('kind'), 'null_value')
+    self.assertEqual(unset_parameters, defaults)
+
+  def test_different_types_raise(self):
+    with self.assertRaises(ValueError):
+      default_parameters.merge_unset(
+          duration_pb2.Duration(), struct_pb2.Struct()
+      )
+
+
+class ParameterDefaultsTest(absltest.TestCase):
+
+  def test_apply_merges_defaults(self):
+    defaults = default_parameters.ParameterDefaults(
+        duration_pb2.Duration.DESCRIPTOR,
+        _pack(duration_pb2.Duration(seconds=5, nanos=7)),
+    )
+    parameters = duration_pb2.Duration(nanos=1)
+    other_parameters = duration_pb2.Duration()
+
+    defaults.apply(parameters)
+    defaults.apply(other_parameters)
+
+    self.assertEqual(parameters, duration_pb2.Duration(seconds=5, nanos=1))
+    self.assertEqual(
+        other_parameters, duration_pb2.Duration(seconds=5, nanos=7)
+    )
+
+  def test_apply_to_other_type_raises(self):
+    defaults = default_parameters.ParameterDefaults(
+        duration_pb2.Duration.DESCRIPTOR, _pack(duration_pb2.Duration())
+    )
+
+    with self.assertRaises(ValueError):
+      defaults.apply(struct_pb2.Struct())
+
+  def test_defaults_of_unexpected_type_raise(self):
+    with self.assertRaises(status.StatusNotOk):
+      default_parameters.ParameterDefaults(
+          duration_pb2.Duration.DESCRIPTOR, _pack(struct_pb2.Struct())
+      )
+
+  def test_apply_defaults_to_parameters(self):
+    parameters_any = _pack(duration_pb2.Duration(seconds=1))
+
+    default_parameters.apply_defaults_to_parameters(
+        duration_pb2.Duration.DESCRIPTOR,
+        _pack(duration_pb2.Duration(seconds=5, nanos=7)),
+        parameters_any,
+    )
+
+    parameters = duration_pb2.Duration()
+    self.assertTrue(parameters_any.Unpack(parameters))
+    self.assertEqual(parameters, duration_pb2.Duration(seconds=1, nanos=7))
+
+  def test_parameters_of_unexpected_type_raise(self):
+    with self.assertRaises(status.StatusNotOk):
+      default_parameters.apply_defaults_to_parameters(
+          duration_pb2.Duration.DESCRIPTOR,
+          _pack(duration_pb2.Duration()),
+          _pack(struct_pb2.Struct()),
+      )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -5,6 +5,7 @@
 from absl import app
 from absl import flags
 from intrinsic.skills.internal import module_utils
+from intrinsic.skills.internal import operation_executor
 from intrinsic.skills.internal import runtime_data as rd
 from intrinsic.skills.internal import single_skill_factory
 from intrinsic.skills.internal import skill_init
@@ -13,7 +14,37 @@ from intrinsic.skills.python import skill_interface as skl
 _THREADS = flags.DEFINE_integer(
     "threads", 8, "Number of server threads to run."
 )
+_OPERATION_THREADS = flags.DEFINE_integer(
+    "operation_threads",
+    operation_executor.DEFAULT_MAX_WORKERS,
+    "Maximum number of skill operations (execute and preview) that run"
+    " concurrently.",
+)
+_MAX_QUEUED_OPERATIONS = flags.DEFINE_integer(
+    "max_queued_operations",
+    operation_executor.DEFAULT_MAX_QUEUED,
+    "Maximum number of skill operations that wait for a free operation thread."
+    " Further operations are rejected with RESOURCE_EXHAUSTED.",
+)
+_MAX_ASYNC_OPERATIONS = flags.DEFINE_integer(
+    "max_async_operations",
+    operation_executor.DEFAULT_MAX_ASYNC_OPERATIONS,
+    "Maximum number of skill operations implemented as coroutine functions"
+    " that run concurrently on the event loop.",
+)
 _PORT = flags.DEFINE_integer("port", 8002, "Port to serve gRPC on.")
+_METRICS_PORT = flags.DEFINE_integer(
+    "metrics_port",
+    None,
+    "Local port to serve skill operation metrics on in the OpenMetrics text"
+    " format. Metrics are not served if unset.",
+)
+_TRACE_OPERATIONS = flags.DEFINE_bool(
+    "trace_operations",
+    False,
+    "Whether to emit a trace span for each phase of skill operations. Requires"
+    " opentelemetry.",
+)
 _SKILL_SERVICE_CONFIG_FILENAME = flags.DEFINE_string(
     "skill_service_config_filename",
     "",
@@ -90,7 +121,12 @@ def main(argv):
       skill_repository=skill_repository,
       skill_service_config=service_config,
       num_threads=_THREADS.value,
+      num_operation_threads=_OPERATION_THREADS.value,
+      max_queued_operations=_MAX_QUEUED_OPERATIONS.value,
+      max_async_operations=_MAX_ASYNC_OPERATIONS.value,
       skill_service_port=_PORT.value,
+      metrics_port=_METRICS_PORT.value,
+      enable_tracing=_TRACE_OPERATIONS.value,
       world_service_address=_WORLD_SERVICE_ADDRESS.value,
       motion_planner_service_address=_MOTION_PLANNER_SERVICE_ADDRESS.value,
       geometry_service_address=_GEOMETRY_SERVICE_ADDRESS.value,
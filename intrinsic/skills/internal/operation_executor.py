@@ -0,0 +1,379 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""A bounded, shared executor for skill operations."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent import futures
+import dataclasses
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+from absl import logging
+
+# Default maximum number of operations that run concurrently. Matches the
+# maximum number of operations that a skill service tracks, so that by default
+# every admitted operation starts right away.
+DEFAULT_MAX_WORKERS = 100
+
+# Default maximum number of operations that wait for a worker.
+DEFAULT_MAX_QUEUED = 0
+
+# Default maximum number of coroutine operations that run concurrently on the
+# event loop. They do not occupy a worker thread while they await.
+DEFAULT_MAX_ASYNC_OPERATIONS = 1000
+
+# Default maximum number of helper tasks that run concurrently. Helpers, e.g.
+# those evaluating the requests of a batch, do not take slots of operations.
+DEFAULT_MAX_HELPERS = 8
+
+
+@dataclasses.dataclass(frozen=True)
+class OperationExecutorStats:
+  """A snapshot of the state of an OperationExecutor.
+
+  Attributes:
+    max_workers: Maximum number of operations that run concurrently.
+    max_queued: Maximum number of operations that wait for a worker.
+    running: Number of operations currently running.
+    queued: Number of admitted operations waiting for a worker.
+    completed: Number of operations that have finished since creation.
+    rejected: Number of operations rejected since creation.
+    max_async_operations: Maximum number of coroutine operations that run
+      concurrently.
+    running_async: Number of coroutine operations currently running.
+  """
+
+  max_workers: int
+  max_queued: int
+  running: int
+  queued: int
+  completed: int
+  rejected: int
+  max_async_operations: int
+  running_async: int
+
+
+class OperationExecutor:
+  """Runs skill operations on a shared, bounded pool of worker threads.
+
+  Worker threads are created on demand and reused across operations. An
+  operation is admitted if fewer than max_workers + max_queued operations are
+  running or waiting; otherwise submit() raises ExecutorFullError instead of
+  queueing the operation indefinitely.
+
+  Coroutine operations, submitted with submit_async(), run on a single event
+  loop thread, which is started on demand. Blocking calls that they delegate to
+  the event loop's executor (e.g., via async_client.AsyncClient) run on a
+  separate pool of at most max_workers threads.
+
+  Helper tasks, submitted with submit_helper(), run on a third pool of at most
+  max_helpers threads. They queue instead of being rejected and are not counted
+  as operations, so that they never make the executor reject an operation.
+  """
+
+  class ExecutorFullError(RuntimeError):
+    """The executor cannot admit another operation."""
+
+  class ExecutorShutdownError(RuntimeError):
+    """The executor has been shut down."""
+
+  def __init__(
+      self,
+      max_workers: int = DEFAULT_MAX_WORKERS,
+      max_queued: int = DEFAULT_MAX_QUEUED,
+      max_async_operations: int = DEFAULT_MAX_ASYNC_OPERATIONS,
+      max_helpers: int = DEFAULT_MAX_HELPERS,
+  ):
+    """Initializes the instance.
+
+    Args:
+      max_workers: Maximum number of operations that run concurrently.
+      max_queued: Maximum number of admitted operations that wait for a
+        worker.
+      max_async_operations: Maximum number of coroutine operations that run
+        concurrently.
+      max_helpers: Maximum number of helper tasks that run concurrently.
+
+    Raises:
+      ValueError: If max_workers, max_async_operations or max_helpers is not
+        positive or max_queued is negative.
+    """
+    if max_workers < 1:
+      raise ValueError(f'max_workers must be positive, got {max_workers}.')
+    if max_queued < 0:
+      raise ValueError(f'max_queued must not be negative, got {max_queued}.')
+    if max_async_operations < 1:
+      raise ValueError(
+          'max_async_operations must be positive, got'
+          f' {max_async_operations}.'
+      )
+    if max_helpers < 1:
+      raise ValueError(f'max_helpers must be positive, got {max_helpers}.')
+    self._max_workers = max_workers
+    self._max_queued = max_queued
+    self._max_async_operations = max_async_operations
+    self._pool = futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix='skill_operation'
+    )
+    self._helper_pool = futures.ThreadPoolExecutor(
+        max_workers=max_helpers, thread_name_prefix='skill_helper'
+    )
+    self._lock = threading.Lock()
+    self._admitted = 0
+    self._running = 0
+    self._completed = 0
+    self._rejected = 0
+    self._shutdown = False
+
+    self._running_async = 0
+    self._async_futures: set[futures.Future] = set()
+    self._loop: Optional[asyncio.AbstractEventLoop] = None
+    self._loop_thread: Optional[threading.Thread] = None
+    self._blocking_pool: Optional[futures.ThreadPoolExecutor] = None
+
+  @property
+  def stats(self) -> OperationExecutorStats:
+    """A snapshot of the queue depth and running operations."""
+    with self._lock:
+      return OperationExecutorStats(
+          max_workers=self._max_workers,
+          max_queued=self._max_queued,
+          running=self._running,
+          queued=self._admitted - self._running,
+          completed=self._completed,
+          rejected=self._rejected,
+          max_async_operations=self._max_async_operations,
+          running_async=self._running_async,
+      )
+
+  def submit(self, fn: Callable[..., Any], *args, **kwargs) -> futures.Future:
+    """Submits an operation for execution.
+
+    Args:
+      fn: The operation callable.
+      *args: Positional arguments for fn.
+      **kwargs: Keyword arguments for fn.
+
+    Returns:
+      A future for the result of fn.
+
+    Raises:
+      ExecutorFullError: If max_workers + max_queued operations are already
+        running or waiting.
+      ExecutorShutdownError: If the executor has been shut down.
+    """
+    with self._lock:
+      if self._shutdown:
+        raise self.ExecutorShutdownError(
+            'Cannot submit operation, since the executor has been shut down.'
+        )
+      if self._admitted >= self._max_workers + self._max_queued:
+        self._rejected += 1
+        raise self.ExecutorFullError(
+            'Cannot submit operation, since there are already'
+            f' {self._running} running and'
+            f' {self._admitted - self._running} queued operations.'
+        )
+      self._admitted += 1
+
+    try:
+      future = self._pool.submit(self._run, fn, *args, **kwargs)
+    except RuntimeError as err:
+      # The pool has been shut down concurrently.
+      with self._lock:
+        self._admitted -= 1
+      raise self.ExecutorShutdownError(str(err)) from err
+    future.add_done_callback(self._release_if_cancelled)
+    return future
+
+  def submit_async(
+      self, fn: Callable[..., Awaitable[Any]], *args, **kwargs
+  ) -> futures.Future:
+    """Submits a coroutine operation for execution on the event loop.
+
+    Args:
+      fn: The coroutine function of the operation.
+      *args: Positional arguments for fn.
+      **kwargs: Keyword arguments for fn.
+
+    Returns:
+      A future for the result of the coroutine.
+
+    Raises:
+      ExecutorFullError: If max_async_operations coroutine operations are
+        already running.
+      ExecutorShutdownError: If the executor has been shut down.
+    """
+    with self._lock:
+      if self._shutdown:
+        raise self.ExecutorShutdownError(
+            'Cannot submit operation, since the executor has been shut down.'
+        )
+      if self._running_async >= self._max_async_operations:
+        self._rejected += 1
+        raise self.ExecutorFullError(
+            'Cannot submit operation, since there are already'
+            f' {self._running_async} running coroutine operations.'
+        )
+      self._running_async += 1
+      loop = self._get_loop_locked()
+
+      release = self._make_async_release()
+      future = asyncio.run_coroutine_threadsafe(
+          self._run_async(release, fn, *args, **kwargs), loop
+      )
+      self._async_futures.add(future)
+    # The coroutine does not run at all if its task is cancelled before its
+    # first step, so the slot is also released when the future is done.
+    future.add_done_callback(
+        functools.partial(self._on_async_future_done, release)
+    )
+    return future
+
+  def submit_helper(
+      self, fn: Callable[..., Any], *args, **kwargs
+  ) -> futures.Future:
+    """Submits a helper task, which does not take the slot of an operation.
+
+    Helper tasks wait for a helper thread if max_helpers of them are running.
+    Callers that no longer need a helper which has not started yet should
+    cancel its future.
+
+    Args:
+      fn: The helper callable.
+      *args: Positional arguments for fn.
+      **kwargs: Keyword arguments for fn.
+
+    Returns:
+      A future for the result of fn.
+
+    Raises:
+      ExecutorShutdownError: If the executor has been shut down.
+    """
+    with self._lock:
+      if self._shutdown:
+        raise self.ExecutorShutdownError(
+            'Cannot submit helper, since the executor has been shut down.'
+        )
+    try:
+      return self._helper_pool.submit(fn, *args, **kwargs)
+    except RuntimeError as err:
+      # The pool has been shut down concurrently.
+      raise self.ExecutorShutdownError(str(err)) from err
+
+  def shutdown(self, wait: bool = True, cancel_queued: bool = True) -> None:
+    """Shuts down the executor.
+
+    Subsequent calls to submit() raise ExecutorShutdownError.
+
+    Coroutine operations always finish before the event loop is stopped: if
+    wait is False, their tasks are cancelled and shutdown() waits for them to
+    unwind, so that they can still clean up.
+
+    Args:
+      wait: If True, waits for running operations to finish.
+      cancel_queued: If True, queued operations which have not started are
+        cancelled.
+    """
+    with self._lock:
+      self._shutdown = True
+      stats_message = (
+          f'{self._running} running, {self._admitted - self._running} queued,'
+          f' {self._running_async} running coroutine'
+      )
+      async_futures = list(self._async_futures)
+    logging.info('Shutting down skill operation executor (%s).', stats_message)
+    self._pool.shutdown(wait=wait, cancel_futures=cancel_queued)
+    self._helper_pool.shutdown(wait=wait, cancel_futures=cancel_queued)
+
+    if self._loop is None:
+      return
+    if wait:
+      futures.wait(async_futures)
+    else:
+      asyncio.run_coroutine_threadsafe(_cancel_tasks(), self._loop).result()
+    self._loop.call_soon_threadsafe(self._loop.stop)
+    self._loop_thread.join()
+    self._loop.close()
+    self._blocking_pool.shutdown(wait=wait, cancel_futures=cancel_queued)
+
+  def _run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    with self._lock:
+      self._running += 1
+    try:
+      return fn(*args, **kwargs)
+    finally:
+      with self._lock:
+        self._running -= 1
+        self._admitted -= 1
+        self._completed += 1
+
+  async def _run_async(
+      self,
+      release: Callable[[], None],
+      fn: Callable[..., Awaitable[Any]],
+      *args,
+      **kwargs,
+  ) -> Any:
+    try:
+      return await fn(*args, **kwargs)
+    finally:
+      with self._lock:
+        self._completed += 1
+      # Releases the slot before the result is set on the future.
+      release()
+
+  def _make_async_release(self) -> Callable[[], None]:
+    """Returns a callable releasing the slot of a coroutine operation once."""
+    released = False
+
+    def release() -> None:
+      nonlocal released
+      with self._lock:
+        if not released:
+          released = True
+          self._running_async -= 1
+
+    return release
+
+  def _get_loop_locked(self) -> asyncio.AbstractEventLoop:
+    """Returns the event loop, starting it if necessary.
+
+    Requires self._lock to be held.
+    """
+    if self._loop is None:
+      self._blocking_pool = futures.ThreadPoolExecutor(
+          max_workers=self._max_workers, thread_name_prefix='skill_blocking'
+      )
+      self._loop = asyncio.new_event_loop()
+      self._loop.set_default_executor(self._blocking_pool)
+      self._loop_thread = threading.Thread(
+          target=self._loop.run_forever,
+          name='skill_event_loop',
+          daemon=True,
+      )
+      self._loop_thread.start()
+    return self._loop
+
+  def _on_async_future_done(
+      self, release: Callable[[], None], future: futures.Future
+  ) -> None:
+    release()
+    with self._lock:
+      self._async_futures.discard(future)
+
+  def _release_if_cancelled(self, future: futures.Future) -> None:
+    if future.cancelled():
+      with self._lock:
+        self._admitted -= 1
+
+
+async def _cancel_tasks() -> None:
+  """Cancels all other tasks of the running loop and waits for them to end."""
+  tasks = asyncio.all_tasks() - {asyncio.current_task()}
+  for task in tasks:
+    task.cancel()
+  await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,240 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for operation_executor."""
+
+import asyncio
+from concurrent import futures
+import threading
+
+from absl.testing import absltest
+from intrinsic.skills.internal import operation_executor
+
+_TIMEOUT = 10.0
+
+
+class OperationExecutorTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._release = threading.Event()
+    # Releases blocked operations, so that failing tests do not hang.
+    self.addCleanup(self._release.set)
+
+  def _block(self) -> str:
+    self._release.wait(_TIMEOUT)
+    return 'done'
+
+  def _wait_for_running(
+      self, executor: operation_executor.OperationExecutor, running: int
+  ) -> None:
+    for _ in range(1000):
+      if executor.stats.running == running:
+        return
+      threading.Event().wait(0.01)
+    self.fail(f'Expected {running} running operations: {executor.stats}')
+
+  def _wait_for_running_async(
+      self, executor: operation_executor.OperationExecutor, running: int
+  ) -> None:
+    for _ in range(1000):
+      if executor.stats.running_async == running:
+        return
+      threading.Event().wait(0.01)
+    self.fail(
+        f'Expected {running} running coroutine operations: {executor.stats}'
+    )
+
+  def test_admits_up_to_max_workers_plus_max_queued(self):
+    executor = operation_executor.OperationExecutor(max_workers=2, max_queued=1)
+    self.addCleanup(executor.shutdown, wait=False)
+
+    submitted = [executor.submit(self._block) for _ in range(3)]
+    self._wait_for_running(executor, 2)
+    with self.assertRaises(
+        operation_executor.OperationExecutor.ExecutorFullError
+    ):
+      executor.submit(self._block)
+
+    stats = executor.stats
+    self.assertEqual(stats.running, 2)
+    self.assertEqual(stats.queued, 1)
+    self.assertEqual(stats.rejected, 1)
+
+    self._release.set()
+    self.assertEqual(
+        [future.result(_TIMEOUT) for future in submitted], ['done'] * 3
+    )
+    stats = executor.stats
+    self.assertEqual(stats.running, 0)
+    self.assertEqual(stats.queued, 0)
+    self.assertEqual(stats.completed, 3)
+
+  def test_shutdown_cancels_queued_operations(self):
+    executor = operation_executor.OperationExecutor(max_workers=1, max_queued=2)
+    running = executor.submit(self._block)
+    self._wait_for_running(executor, 1)
+    queued = [executor.submit(self._block) for _ in range(2)]
+
+    executor.shutdown(wait=False, cancel_queued=True)
+
+    self.assertTrue(all(future.cancelled() for future in queued))
+    stats = executor.stats
+    self.assertEqual(stats.running, 1)
+    self.assertEqual(stats.queued, 0)
+    self.assertEqual(stats.rejected, 0)
+    self._release.set()
+    self.assertEqual(running.result(_TIMEOUT), 'done')
+    with self.assertRaises(
+        operation_executor.OperationExecutor.ExecutorShutdownError
+    ):
+      executor.submit(self._block)
+
+  def test_shutdown_waits_for_running_operations(self):
+    executor = operation_executor.OperationExecutor(max_workers=1)
+    future = executor.submit(self._block)
+    self._wait_for_running(executor, 1)
+
+    threading.Timer(0.1, self._release.set).start()
+    executor.shutdown(wait=True)
+
+    self.assertTrue(future.done())
+    self.assertEqual(executor.stats.completed, 1)
+
+  def test_submit_async_runs_coroutine(self):
+    executor = operation_executor.OperationExecutor()
+    self.addCleanup(executor.shutdown)
+
+    async def add(a: int, b: int) -> int:
+      await asyncio.sleep(0)
+      return a + b
+
+    self.assertEqual(executor.submit_async(add, 1, b=2).result(_TIMEOUT), 3)
+    self.assertEqual(executor.stats.completed, 1)
+    self.assertEqual(executor.stats.running_async, 0)
+
+  def test_submit_async_rejects_past_max_async_operations(self):
+    executor = operation_executor.OperationExecutor(max_async_operations=1)
+    self.addCleanup(executor.shutdown)
+
+    async def block() -> None:
+      while not self._release.is_set():
+        await asyncio.sleep(0.01)
+
+    future = executor.submit_async(block)
+    with self.assertRaises(
+        operation_executor.OperationExecutor.ExecutorFullError
+    ):
+      executor.submit_async(block)
+    self.assertEqual(executor.stats.rejected, 1)
+    self.assertEqual(executor.stats.running_async, 1)
+
+    self._release.set()
+    future.result(_TIMEOUT)
+
+  def test_coroutine_operation_cancelled_before_start_releases_slot(self):
+    executor = operation_executor.OperationExecutor()
+    self.addCleanup(executor.shutdown)
+    loop_blocked = threading.Event()
+    started = threading.Event()
+
+    async def cancel_other_tasks() -> None:
+      loop_blocked.set()
+      # Blocks the event loop thread until the other operation is submitted.
+      self._release.wait(_TIMEOUT)
+      # Lets the task of the other operation be created, but not started.
+      await asyncio.sleep(0)
+      for task in asyncio.all_tasks() - {asyncio.current_task()}:
+        task.cancel()
+
+    async def record_start() -> None:
+      started.set()
+
+    canceller_future = executor.submit_async(cancel_other_tasks)
+    self.assertTrue(loop_blocked.wait(_TIMEOUT))
+    future = executor.submit_async(record_start)
+    self.assertEqual(executor.stats.running_async, 2)
+    self._release.set()
+    canceller_future.result(_TIMEOUT)
+
+    with self.assertRaises(futures.CancelledError):
+      future.result(_TIMEOUT)
+    self.assertFalse(started.is_set())
+    self._wait_for_running_async(executor, 0)
+    self.assertEqual(executor.stats.completed, 1)
+
+  def test_shutdown_waits_for_coroutine_operations(self):
+    executor = operation_executor.OperationExecutor()
+
+    async def sleep() -> str:
+      await asyncio.sleep(0.1)
+      return 'done'
+
+    future = executor.submit_async(sleep)
+    executor.shutdown(wait=True)
+
+    self.assertEqual(future.result(0), 'done')
+    with self.assertRaises(
+        operation_executor.OperationExecutor.ExecutorShutdownError
+    ):
+      executor.submit_async(sleep)
+
+  def test_shutdown_without_wait_unwinds_coroutine_operations(self):
+    executor = operation_executor.OperationExecutor()
+    started = threading.Event()
+    unwound = threading.Event()
+
+    async def block() -> None:
+      started.set()
+      try:
+        await asyncio.sleep(_TIMEOUT)
+      finally:
+        unwound.set()
+
+    future = executor.submit_async(block)
+    self.assertTrue(started.wait(_TIMEOUT))
+    executor.shutdown(wait=False)
+
+    # The coroutine has unwound by the time shutdown() returns.
+    self.assertTrue(unwound.is_set())
+    with self.assertRaises(futures.CancelledError):
+      future.result(0)
+    self.assertEqual(executor.stats.running_async, 0)
+
+  def test_helpers_do_not_take_operation_slots(self):
+    executor = operation_executor.OperationExecutor(max_workers=1, max_queued=0)
+    self.addCleanup(executor.shutdown, wait=False)
+    operation = executor.submit(self._block)
+    self._wait_for_running(executor, 1)
+
+    helper = executor.submit_helper(lambda a, b: a + b, 1, b=2)
+
+    self.assertEqual(helper.result(_TIMEOUT), 3)
+    stats = executor.stats
+    self.assertEqual(stats.running, 1)
+    self.assertEqual(stats.rejected, 0)
+    self.assertEqual(stats.completed, 0)
+    self._release.set()
+    operation.result(_TIMEOUT)
+
+  def test_submit_helper_after_shutdown_raises(self):
+    executor = operation_executor.OperationExecutor()
+    executor.shutdown()
+
+    with self.assertRaises(
+        operation_executor.OperationExecutor.ExecutorShutdownError
+    ):
+      executor.submit_helper(self._block)
+
+  def test_invalid_arguments_raise(self):
+    with self.assertRaises(ValueError):
+      operation_executor.OperationExecutor(max_workers=0)
+    with self.assertRaises(ValueError):
+      operation_executor.OperationExecutor(max_queued=-1)
+    with self.assertRaises(ValueError):
+      operation_executor.OperationExecutor(max_async_operations=0)
+    with self.assertRaises(ValueError):
+      operation_executor.OperationExecutor(max_helpers=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -9,10 +9,12 @@ defined here should not be used in user-facing contexts.
 
 import dataclasses
 import datetime
+import functools
 from typing import Mapping, Sequence
 
 from google.protobuf import any_pb2
 from google.protobuf import descriptor as proto_descriptor
+from intrinsic.skills.internal import default_parameters
 from intrinsic.skills.proto import equipment_pb2
 from intrinsic.skills.proto import skill_service_config_pb2
 from intrinsic.skills.proto import skills_pb2
@@ -30,6 +32,21 @@ class ParameterData:
   descriptor: proto_descriptor.Descriptor
   default_value: any_pb2.Any | None = None
 
+  @functools.cached_property
+  def parameter_defaults(self) -> default_parameters.ParameterDefaults | None:
+    """The unpacked default value, or None if there is no default value.
+
+    Unpacked on first access and cached for subsequent requests.
+
+    Raises:
+      status.StatusNotOk if the default value is of an unexpected type.
+    """
+    if self.default_value is None:
+      return None
+    return default_parameters.ParameterDefaults(
+        self.descriptor, self.default_value
+    )
+
 
 @dataclasses.dataclass(frozen=True)
 class ReturnTypeData:
@@ -50,12 +67,16 @@ class ExecutionOptions:
     supports_cancellation: True, if the skill supports cancellation.
     cancellation_ready_timeout: The amount of time the skill has to prepare for
       cancellation.
+    instance_pool_size: The number of pre-constructed skill instances that the
+      skill service reuses across operations, or 0 to construct a new instance
+      for every operation.
   """
 
   supports_cancellation: bool = False
   cancellation_ready_timeout: datetime.timedelta = datetime.timedelta(
       seconds=30
   )
+  instance_pool_size: int = 0
 
 
 @dataclasses.dataclass(frozen=True)
@@ -121,10 +142,12 @@ def get_runtime_data_from(
     execute_opts = ExecutionOptions(
         skill_service_config.skill_description.execution_options.supports_cancellation,
         timeout,
+        instance_pool_size=skill_service_config.python_config.instance_pool_size,
     )
   else:
     execute_opts = ExecutionOptions(
-        skill_service_config.skill_description.execution_options.supports_cancellation
+        skill_service_config.skill_description.execution_options.supports_cancellation,
+        instance_pool_size=skill_service_config.python_config.instance_pool_size,
     )
 
   resource_data = dict(
@@ -3,22 +3,32 @@
 """Implements a SkillRepository to only serve a single skill."""
 
 import threading
-from typing import Callable, List
+from typing import Callable, List, Optional, Union
 
 from intrinsic.assets import id_utils
 from intrinsic.skills.internal import runtime_data as rd
+from intrinsic.skills.internal import skill_instance_pool
 from intrinsic.skills.internal import skill_repository as repo
 from intrinsic.skills.python import skill_interface as skl
 from intrinsic.util.decorators import overrides
 
 
 class SingleSkillFactory(repo.SkillRepository):
-  """Implements a SkillRepository to only serve a single skill."""
+  """Implements a SkillRepository to only serve a single skill.
+
+  By default, a new skill instance is created for every request. If the skill's
+  execution options set an instance pool size, the factory instead warm-starts:
+  it constructs that many instances and precomputes the skill's runtime data
+  (e.g., the unpacked parameter defaults) up front, and hands out pooled
+  instances from get_skill_execute and get_skill_project until they are
+  released (see SkillInstancePool).
+  """
 
   def __init__(
       self,
       skill_runtime_data: rd.SkillRuntimeData,
       create_skill: Callable[[], skl.Skill],
+      instance_pool_size: Optional[int] = None,
   ):
     """Creates a SingleSkillFactory.
 
@@ -28,6 +38,12 @@ class SingleSkillFactory(repo.SkillRepository):
     Args:
       skill_runtime_data: The skill's runtime data.
       create_skill: The function to create a new skill instance.
+      instance_pool_size: The number of pre-constructed instances to reuse, or
+        0 to create a new instance for every request. If None, uses the size
+        from the skill's execution options.
+
+    Raises:
+      Exception: Any exception raised when warm-starting the skill.
     """
     self._skill_runtime_data = skill_runtime_data
     # SkillRuntimeData should always have a valid ID after construction, so
@@ -36,6 +52,18 @@ class SingleSkillFactory(repo.SkillRepository):
     self._create_skill = create_skill
     self._lock = threading.Lock()
 
+    if instance_pool_size is None:
+      instance_pool_size = (
+          skill_runtime_data.execution_options.instance_pool_size
+      )
+    self._pool = None
+    if instance_pool_size > 0:
+      # Unpacks the parameter defaults now rather than on the first request.
+      _ = skill_runtime_data.parameter_data.parameter_defaults
+      self._pool = skill_instance_pool.SkillInstancePool(
+          self._create_skill_locked, instance_pool_size
+      )
+
   @overrides(repo.SkillRepository)
   def get_skill(self, skill_alias: str) -> skl.Skill:
     """Returns a new skill instance.
@@ -47,12 +75,13 @@ class SingleSkillFactory(repo.SkillRepository):
       InvalidSkillAliasError: If the skill is not found in the factory.
     """
     self._validate_skill_alias(skill_alias)
-    with self._lock:
-      return self._create_skill()
+    return self._create_skill_locked()
 
   @overrides(repo.SkillRepository)
   def get_skill_execute(self, skill_alias: str) -> skl.SkillExecuteInterface:
-    """Returns a new skill execute interface.
+    """Returns a skill execute interface.
+
+    The instance is new, or a pooled instance if pooling is enabled.
 
     Args:
       skill_alias: The skill's alias.
@@ -61,12 +90,13 @@ class SingleSkillFactory(repo.SkillRepository):
       InvalidSkillAliasError: If the skill is not found in the factory.
     """
     self._validate_skill_alias(skill_alias)
-    with self._lock:
-      return self._create_skill()
+    return self._checkout()
 
   @overrides(repo.SkillRepository)
   def get_skill_project(self, skill_alias: str) -> skl.SkillProjectInterface:
-    """Returns a new skill project interface.
+    """Returns a skill project interface.
+
+    The instance is new, or a pooled instance if pooling is enabled.
 
     Args:
       skill_alias: The skill's alias.
@@ -75,8 +105,28 @@ class SingleSkillFactory(repo.SkillRepository):
       InvalidSkillAliasError: If the skill is not found in the factory.
     """
     self._validate_skill_alias(skill_alias)
-    with self._lock:
-      return self._create_skill()
+    return self._checkout()
+
+  @overrides(repo.SkillRepository)
+  def release_skill(
+      self,
+      skill_alias: str,
+      skill: Union[skl.SkillExecuteInterface, skl.SkillProjectInterface],
+  ) -> None:
+    """Hands back a skill instance once the caller no longer uses it.
+
+    Returns the instance to the pool if pooling is enabled.
+
+    Args:
+      skill_alias: The skill's alias.
+      skill: The instance to release.
+
+    Raises:
+      InvalidSkillAliasError: If the skill is not found in the factory.
+    """
+    self._validate_skill_alias(skill_alias)
+    if self._pool is not None:
+      self._pool.checkin(skill)
 
   @overrides(repo.SkillRepository)
   def get_skill_runtime_data(self, skill_alias: str) -> rd.SkillRuntimeData:
@@ -96,6 +146,15 @@ class SingleSkillFactory(repo.SkillRepository):
     """Returns the list of aliases of the registered skill."""
     return [self._skill_alias]
 
+  def _checkout(self) -> skl.Skill:
+    if self._pool is not None:
+      return self._pool.checkout()
+    return self._create_skill_locked()
+
+  def _create_skill_locked(self) -> skl.Skill:
+    with self._lock:
+      return self._create_skill()
+
   def _validate_skill_alias(self, skill_alias: str) -> None:
     """Checks if the skill alias matches the registered skill.
 
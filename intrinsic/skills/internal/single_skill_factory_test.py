@@ -0,0 +1,129 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for single_skill_factory."""
+
+from unittest import mock
+
+from absl.testing import absltest
+from google.protobuf import empty_pb2
+from intrinsic.skills.internal import runtime_data as rd
+from intrinsic.skills.internal import single_skill_factory
+from intrinsic.skills.internal import skill_repository
+from intrinsic.skills.python import skill_interface as skl
+
+_SKILL_ID = 'ai.intrinsic.my_skill'
+_SKILL_ALIAS = 'my_skill'
+
+
+class _Skill(skl.Skill):
+
+  def __init__(self):
+    self.healthy = True
+
+  def execute(
+      self,
+      request: skl.ExecuteRequest,
+      context: skl.ExecuteContext,
+  ) -> None:
+    del request, context  # Unused.
+
+  def is_healthy(self) -> bool:
+    return self.healthy
+
+
+def _runtime_data(instance_pool_size: int = 0) -> rd.SkillRuntimeData:
+  return rd.SkillRuntimeData(
+      parameter_data=rd.ParameterData(descriptor=empty_pb2.Empty.DESCRIPTOR),
+      return_type_data=rd.ReturnTypeData(),
+      execution_options=rd.ExecutionOptions(
+          instance_pool_size=instance_pool_size
+      ),
+      resource_data=rd.ResourceData(required_resources={}),
+      skill_id=_SKILL_ID,
+  )
+
+
+class SingleSkillFactoryTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._create_skill = mock.Mock(side_effect=_Skill)
+
+  def test_creates_new_instance_per_request_without_pool(self):
+    factory = single_skill_factory.SingleSkillFactory(
+        _runtime_data(), self._create_skill
+    )
+    self._create_skill.assert_not_called()
+
+    skill = factory.get_skill_execute(_SKILL_ALIAS)
+    factory.release_skill(_SKILL_ALIAS, skill)
+
+    self.assertIsNot(factory.get_skill_project(_SKILL_ALIAS), skill)
+    self.assertEqual(self._create_skill.call_count, 2)
+
+  def test_pool_size_from_execution_options(self):
+    factory = single_skill_factory.SingleSkillFactory(
+        _runtime_data(instance_pool_size=2), self._create_skill
+    )
+
+    self.assertEqual(self._create_skill.call_count, 2)
+    skill = factory.get_skill_execute(_SKILL_ALIAS)
+    factory.release_skill(_SKILL_ALIAS, skill)
+    factory.get_skill_project(_SKILL_ALIAS)
+    self.assertEqual(self._create_skill.call_count, 2)
+
+  def test_checkout_past_capacity_and_surplus_dropped_on_release(self):
+    factory = single_skill_factory.SingleSkillFactory(
+        _runtime_data(), self._create_skill, instance_pool_size=2
+    )
+
+    skills = [factory.get_skill_execute(_SKILL_ALIAS) for _ in range(3)]
+    self.assertLen({id(skill) for skill in skills}, 3)
+    self.assertEqual(self._create_skill.call_count, 3)
+
+    for skill in skills:
+      factory.release_skill(_SKILL_ALIAS, skill)
+    reused = [factory.get_skill_execute(_SKILL_ALIAS) for _ in range(2)]
+    self.assertCountEqual(
+        [id(skill) for skill in reused], [id(skills[0]), id(skills[1])]
+    )
+    self.assertEqual(self._create_skill.call_count, 3)
+
+  def test_unhealthy_instance_is_replaced(self):
+    factory = single_skill_factory.SingleSkillFactory(
+        _runtime_data(), self._create_skill, instance_pool_size=1
+    )
+    skill = factory.get_skill_execute(_SKILL_ALIAS)
+    skill.healthy = False
+
+    with self.assertLogs(level='WARNING'):
+      factory.release_skill(_SKILL_ALIAS, skill)
+
+    self.assertIsNot(factory.get_skill_execute(_SKILL_ALIAS), skill)
+    self.assertEqual(self._create_skill.call_count, 2)
+
+  def test_instance_whose_health_check_raises_is_replaced(self):
+    factory = single_skill_factory.SingleSkillFactory(
+        _runtime_data(), self._create_skill, instance_pool_size=1
+    )
+    skill = factory.get_skill_execute(_SKILL_ALIAS)
+    skill.is_healthy = mock.Mock(side_effect=RuntimeError('broken'))
+
+    with self.assertLogs(level='ERROR'):
+      factory.release_skill(_SKILL_ALIAS, skill)
+
+    self.assertIsNot(factory.get_skill_execute(_SKILL_ALIAS), skill)
+
+  def test_invalid_alias_raises(self):
+    factory = single_skill_factory.SingleSkillFactory(
+        _runtime_data(), self._create_skill, instance_pool_size=1
+    )
+
+    with self.assertRaises(skill_repository.InvalidSkillAliasError):
+      factory.get_skill_execute('other_skill')
+    with self.assertRaises(skill_repository.InvalidSkillAliasError):
+      factory.release_skill('other_skill', _Skill())
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -4,13 +4,18 @@
 
 from concurrent import futures
 import time
+from typing import Optional
 
 from absl import logging
 import grpc
 from intrinsic.geometry.service import geometry_service_pb2_grpc
 from intrinsic.motion_planning.proto import motion_planner_service_pb2_grpc
+from intrinsic.skills.internal import cancellable_calls
+from intrinsic.skills.internal import operation_executor
 from intrinsic.skills.internal import skill_repository as skill_repo
 from intrinsic.skills.internal import skill_service_impl
+from intrinsic.skills.internal import skill_service_metrics
+from intrinsic.skills.internal import world_client_registry
 from intrinsic.skills.proto import skill_service_config_pb2
 from intrinsic.skills.proto import skill_service_pb2_grpc
 from intrinsic.world.proto import object_world_service_pb2_grpc
@@ -79,6 +84,11 @@ def skill_init(
     motion_planner_service_address: str,
     geometry_service_address: str,
     connection_timeout: int,
+    num_operation_threads: int = operation_executor.DEFAULT_MAX_WORKERS,
+    max_queued_operations: int = operation_executor.DEFAULT_MAX_QUEUED,
+    max_async_operations: int = operation_executor.DEFAULT_MAX_ASYNC_OPERATIONS,
+    metrics_port: Optional[int] = None,
+    enable_tracing: bool = False,
 ):
   """Starts the skill services on a gRPC server at port `skill_service_port`.
 
@@ -95,7 +105,17 @@ def skill_init(
   service_config.
 
   If setup passes, this method does not return until the gRPC skill server is
-  shutdown. This normally occurs when the process is killed.
+  shutdown. This normally occurs when the process is killed. Skill operations
+  (execute and preview) and batched footprint requests run on a single executor
+  shared by all operations, which is shut down after the gRPC server stops.
+  Batched footprint requests run on separate helper threads of the executor, so
+  that they do not take the slots of operations.
+  Operations of skills that implement them as coroutine functions run on the
+  executor's event loop.
+
+  The services record latency metrics of skill operations, which are served in
+  the OpenMetrics text format at http://localhost:<metrics_port>/metrics if
+  `metrics_port` is set.
 
   Args:
     skill_repository: The skill repository used to create the skill instance
@@ -106,6 +126,16 @@ def skill_init(
     motion_planner_service_address: The address of the motion planner service
     geometry_service_address: The address of the geometry service
     connection_timeout: The connection timeout
+    num_operation_threads: The maximum number of skill operations that run
+      concurrently
+    max_queued_operations: The maximum number of skill operations that wait for
+      a free operation thread before further operations are rejected
+    max_async_operations: The maximum number of coroutine skill operations that
+      run concurrently on the event loop
+    metrics_port: The local port on which to serve the metrics, or None to not
+      serve them
+    enable_tracing: Whether to emit a trace span for each phase of skill
+      operations (requires opentelemetry)
 
   Raises:
     RuntimeError: if skill service fails to use skill_service_port
@@ -115,14 +145,41 @@ def skill_init(
       options=(("grpc.so_reuseport", 0),),
   )  # pytype: disable=wrong-keyword-args
 
-  object_world_service = _create_object_world_service_stub(
-      world_service_address, connection_timeout
+  # Calls that skills make through the clients of their context are cancelled
+  # together with the skill, so that skills blocked in them unwind promptly.
+  object_world_service = cancellable_calls.CancellableStub(
+      _create_object_world_service_stub(
+          world_service_address, connection_timeout
+      )
+  )
+  motion_planner_service = cancellable_calls.CancellableStub(
+      _create_motion_planner_service_stub(
+          motion_planner_service_address, connection_timeout
+      )
   )
-  motion_planner_service = _create_motion_planner_service_stub(
-      motion_planner_service_address, connection_timeout
+  geometry_service = cancellable_calls.CancellableStub(
+      _create_geometry_service_stub(
+          geometry_service_address, connection_timeout
+      )
   )
-  geometry_service = _create_geometry_service_stub(
-      geometry_service_address, connection_timeout
+
+  # Metrics are shared by the projector and executor services.
+  metrics = skill_service_metrics.SkillServiceMetrics(
+      enable_tracing=enable_tracing
+  )
+
+  # Clients are shared per world by the projector and executor services.
+  world_clients = world_client_registry.WorldClientRegistry(
+      object_world_service=object_world_service,
+      motion_planner_service=motion_planner_service,
+      geometry_service=geometry_service,
+  )
+
+  # Skill operations and batched footprint requests share one executor.
+  executor = operation_executor.OperationExecutor(
+      max_workers=num_operation_threads,
+      max_queued=max_queued_operations,
+      max_async_operations=max_async_operations,
   )
 
   # Initialize the projector service.
@@ -131,6 +188,9 @@ def skill_init(
       object_world_service=object_world_service,
       motion_planner_service=motion_planner_service,
       geometry_service=geometry_service,
+      world_clients=world_clients,
+      metrics=metrics,
+      executor=executor,
   )
   skill_service_pb2_grpc.add_ProjectorServicer_to_server(
       projector_servicer, server
@@ -142,6 +202,9 @@ def skill_init(
       object_world_service=object_world_service,
       motion_planner_service=motion_planner_service,
       geometry_service=geometry_service,
+      executor=executor,
+      world_clients=world_clients,
+      metrics=metrics,
   )
   skill_service_pb2_grpc.add_ExecutorServicer_to_server(
       executor_servicer, server
@@ -178,6 +241,12 @@ def skill_init(
     raise RuntimeError(f"Failed to use port {skill_service_port}")
   server.start()
 
+  metrics_server = None
+  if metrics_port is not None:
+    metrics_server = skill_service_metrics.start_http_server(
+        metrics, metrics_port
+    )
+
   logging.info("""==========================================================
       """)
   logging.info("--------------------------------")
@@ -193,3 +262,6 @@ def skill_init(
     pass
   finally:
     server.stop(None)
+    executor.shutdown(wait=True, cancel_queued=True)
+    if metrics_server is not None:
+      metrics_server.shutdown()
@@ -0,0 +1,101 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""A pool of pre-constructed, reusable skill instances."""
+
+from __future__ import annotations
+
+import collections
+import threading
+from typing import Callable
+
+from absl import logging
+from intrinsic.skills.python import skill_interface as skl
+
+
+class SkillInstancePool:
+  """A pool of pre-constructed, reusable skill instances.
+
+  The pool constructs `size` instances up front, so that skills which do
+  expensive work in their constructor (e.g., loading models or meshes) do not
+  repeat it for every operation. Instances are checked out for exclusive use by
+  a single operation and checked in when the operation has finished.
+
+  checkout() never blocks on other operations: if all pooled instances are in
+  use, it constructs a new instance. When instances are checked in, the pool
+  keeps at most `size` of them and discards the others. It also discards
+  instances which fail their health check (see Skill.is_healthy). checkin()
+  never constructs instances, since it may run on a thread that must not block
+  (e.g., the event loop of coroutine skills); a discarded instance is instead
+  replaced by the next checkout() which finds the pool empty.
+
+  The pool is thread-safe. create_skill may be called concurrently from
+  several threads.
+  """
+
+  def __init__(self, create_skill: Callable[[], skl.Skill], size: int):
+    """Initializes the pool and constructs its instances.
+
+    Args:
+      create_skill: The function to create a new skill instance.
+      size: The number of instances to keep in the pool.
+
+    Raises:
+      ValueError: If size is not positive.
+      Exception: Any exception raised when constructing the instances.
+    """
+    if size < 1:
+      raise ValueError(f'size must be positive, got {size}.')
+    self._create_skill = create_skill
+    self._size = size
+
+    self._lock = threading.Lock()
+    self._idle: collections.deque[skl.Skill] = collections.deque(
+        create_skill() for _ in range(size)
+    )
+
+  @property
+  def size(self) -> int:
+    """The number of instances kept in the pool."""
+    return self._size
+
+  @property
+  def num_idle(self) -> int:
+    """The number of instances that are available for checkout."""
+    with self._lock:
+      return len(self._idle)
+
+  def checkout(self) -> skl.Skill:
+    """Returns an instance for exclusive use until it is checked in.
+
+    Returns a pooled instance if one is available, or a new instance
+    otherwise.
+    """
+    with self._lock:
+      if self._idle:
+        return self._idle.popleft()
+    return self._create_skill()
+
+  def checkin(self, skill: skl.Skill) -> None:
+    """Returns an instance that was checked out.
+
+    The instance must not be used after it has been checked in.
+
+    Args:
+      skill: The instance.
+    """
+    if not self._is_healthy(skill):
+      logging.warning(
+          'Discarding skill instance %r after a failed health check.', skill
+      )
+      return
+
+    with self._lock:
+      if len(self._idle) < self._size:
+        self._idle.append(skill)
+
+  def _is_healthy(self, skill: skl.Skill) -> bool:
+    try:
+      return skill.is_healthy()
+    except Exception:  # pylint: disable=broad-except
+      logging.exception('Health check of skill instance %r raised.', skill)
+      return False
@@ -0,0 +1,105 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for skill_instance_pool."""
+
+from unittest import mock
+
+from absl.testing import absltest
+from intrinsic.skills.internal import skill_instance_pool
+from intrinsic.skills.python import skill_interface as skl
+
+
+class _Skill(skl.Skill):
+
+  def __init__(self):
+    self.healthy = True
+
+  def execute(
+      self,
+      request: skl.ExecuteRequest,
+      context: skl.ExecuteContext,
+  ) -> None:
+    del request, context  # Unused.
+
+  def is_healthy(self) -> bool:
+    return self.healthy
+
+
+class SkillInstancePoolTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._create_skill = mock.Mock(side_effect=_Skill)
+
+  def test_constructs_instances_up_front(self):
+    pool = skill_instance_pool.SkillInstancePool(self._create_skill, 2)
+
+    self.assertEqual(self._create_skill.call_count, 2)
+    self.assertEqual(pool.size, 2)
+    self.assertEqual(pool.num_idle, 2)
+
+  def test_checkout_reuses_checked_in_instance(self):
+    pool = skill_instance_pool.SkillInstancePool(self._create_skill, 1)
+
+    skill = pool.checkout()
+    pool.checkin(skill)
+
+    self.assertIs(pool.checkout(), skill)
+    self.assertEqual(self._create_skill.call_count, 1)
+
+  def test_checkout_past_capacity_constructs_instance(self):
+    pool = skill_instance_pool.SkillInstancePool(self._create_skill, 2)
+
+    skills = [pool.checkout() for _ in range(3)]
+
+    self.assertLen({id(skill) for skill in skills}, 3)
+    self.assertEqual(self._create_skill.call_count, 3)
+    self.assertEqual(pool.num_idle, 0)
+
+  def test_checkin_drops_surplus_instances(self):
+    pool = skill_instance_pool.SkillInstancePool(self._create_skill, 2)
+    skills = [pool.checkout() for _ in range(3)]
+
+    for skill in skills:
+      pool.checkin(skill)
+
+    self.assertEqual(pool.num_idle, 2)
+    self.assertCountEqual(
+        [id(pool.checkout()), id(pool.checkout())],
+        [id(skills[0]), id(skills[1])],
+    )
+
+  def test_unhealthy_instance_is_replaced_on_checkout(self):
+    pool = skill_instance_pool.SkillInstancePool(self._create_skill, 1)
+    skill = pool.checkout()
+    skill.healthy = False
+
+    with self.assertLogs(level='WARNING'):
+      pool.checkin(skill)
+
+    # The replacement is not constructed by checkin().
+    self.assertEqual(self._create_skill.call_count, 1)
+    self.assertEqual(pool.num_idle, 0)
+    replacement = pool.checkout()
+    self.assertIsNot(replacement, skill)
+    self.assertEqual(self._create_skill.call_count, 2)
+
+  def test_instance_whose_health_check_raises_is_discarded(self):
+    pool = skill_instance_pool.SkillInstancePool(self._create_skill, 1)
+    skill = pool.checkout()
+    skill.is_healthy = mock.Mock(side_effect=RuntimeError('broken'))
+
+    with self.assertLogs(level='ERROR'):
+      pool.checkin(skill)
+
+    self.assertEqual(pool.num_idle, 0)
+    self.assertIsNot(pool.checkout(), skill)
+
+  def test_invalid_size_raises(self):
+    with self.assertRaises(ValueError):
+      skill_instance_pool.SkillInstancePool(self._create_skill, 0)
+    self._create_skill.assert_not_called()
+
+
+if __name__ == '__main__':
+  absltest.main()
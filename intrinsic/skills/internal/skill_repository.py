@@ -3,7 +3,7 @@
 """Provides access to a collection of skills."""
 
 import abc
-from typing import List
+from typing import List, Union
 
 from intrinsic.skills.internal import runtime_data as rd
 from intrinsic.skills.python import skill_interface as skl
@@ -62,6 +62,24 @@ class SkillRepository(metaclass=abc.ABCMeta):
     """
     raise NotImplementedError('Method not implemented!')
 
+  def release_skill(
+      self,
+      skill_alias: str,
+      skill: Union[skl.SkillExecuteInterface, skl.SkillProjectInterface],
+  ) -> None:
+    """Hands back a skill instance once the caller no longer uses it.
+
+    Callers should release every instance obtained from get_skill_execute or
+    get_skill_project when the operation using it has finished, and must not
+    use the instance afterwards. This allows implementations to reuse
+    instances. The default implementation does nothing.
+
+    Args:
+      skill_alias: The skill's alias.
+      skill: The instance to release.
+    """
+    del skill_alias, skill  # Unused in this default implementation.
+
   @abc.abstractmethod
   def get_skill_runtime_data(self, skill_alias: str) -> rd.SkillRuntimeData:
     """Returns the skill runtime data given the provided alias.
@@ -47,6 +47,11 @@ absl::Status MainImpl() {
         manifest.options().cancellation_ready_timeout();
   }
 
+  if (manifest.options().has_python_config()) {
+    service_config.mutable_python_config()->set_instance_pool_size(
+        manifest.options().python_config().instance_pool_size());
+  }
+
   const std::string proto_descriptor_filename =
       absl::GetFlag(FLAGS_proto_descriptor_filename);
   if (proto_descriptor_filename.empty()) {
@@ -4,10 +4,17 @@
 
 from __future__ import annotations
 
+import asyncio
+import collections
 from concurrent import futures
+import functools
+import inspect
+import itertools
+import math
 import threading
+import time
 import traceback
-from typing import Callable, Dict, NoReturn, Optional, cast
+from typing import Awaitable, Callable, Dict, Iterator, NoReturn, Optional, Union, cast
 
 from absl import logging
 from google.longrunning import operations_pb2
@@ -21,15 +28,17 @@ import grpc
 from intrinsic.assets import id_utils
 from intrinsic.geometry.service import geometry_service_pb2_grpc
 from intrinsic.logging.proto import context_pb2
-from intrinsic.motion_planning import motion_planner_client
 from intrinsic.motion_planning.proto import motion_planner_service_pb2_grpc
-from intrinsic.skills.internal import default_parameters
+from intrinsic.skills.internal import cancellable_calls
 from intrinsic.skills.internal import error_utils
 from intrinsic.skills.internal import execute_context_impl
 from intrinsic.skills.internal import get_footprint_context_impl
+from intrinsic.skills.internal import operation_executor as op_executor
 from intrinsic.skills.internal import preview_context_impl
 from intrinsic.skills.internal import runtime_data as rd
 from intrinsic.skills.internal import skill_repository as skill_repo
+from intrinsic.skills.internal import skill_service_metrics as metrics_lib
+from intrinsic.skills.internal import world_client_registry
 from intrinsic.skills.proto import error_pb2
 from intrinsic.skills.proto import footprint_pb2
 from intrinsic.skills.proto import prediction_pb2
@@ -43,7 +52,6 @@ from intrinsic.skills.python import skill_logging_context
 from intrinsic.util.status import extended_status_pb2
 from intrinsic.util.status import status_exception
 from intrinsic.world.proto import object_world_service_pb2_grpc
-from intrinsic.world.python import object_world_client
 from pybind11_abseil import status
 
 # Maximum number of operations to keep in a SkillOperations instance.
@@ -51,6 +59,33 @@ from pybind11_abseil import status
 # can execute simultaneously.
 MAX_NUM_OPERATIONS = 100
 
+# Number of seconds for which a finished operation is kept in a SkillOperations
+# instance before it expires.
+FINISHED_OPERATION_TTL_SECONDS = 60 * 60
+
+# Number of lock stripes over which a SkillOperations instance distributes its
+# operations.
+_NUM_OPERATION_LOCK_STRIPES = 16
+
+# Maximum number of requests of a GetFootprints call that are evaluated
+# concurrently.
+_MAX_FOOTPRINT_BATCH_CONCURRENCY = 8
+
+# A skill operation: a callable or coroutine function returning the skill's
+# result.
+_OperationCallable = Callable[
+    [],
+    Union[
+        Optional[proto_message.Message],
+        Awaitable[Optional[proto_message.Message]],
+    ],
+]
+
+# Converts the skill's result to the proto result of the operation.
+_ResultCallable = Callable[
+    [Optional[proto_message.Message]], proto_message.Message
+]
+
 
 class InvalidResultTypeError(TypeError):
   """A skill returned a result that does not match the expected type."""
@@ -60,6 +95,29 @@ class _CannotConstructRequestError(Exception):
   """The service cannot construct a request for a skill."""
 
 
+class _FootprintError(Exception):
+  """A footprint request failed with the given status."""
+
+  def __init__(
+      self,
+      code: status.StatusCode,
+      message: str,
+      skill_error_info: error_pb2.SkillErrorInfo,
+  ):
+    super().__init__(message)
+    self.code = code
+    self.message = message
+    self.skill_error_info = skill_error_info
+
+  def to_status(self) -> status_pb2.Status:
+    """Returns the status that GetFootprint returns for this error."""
+    error_status = status_pb2.Status(
+        code=status.StatusCodeAsInt(self.code), message=self.message
+    )
+    error_status.details.add().Pack(self.skill_error_info)
+    return error_status
+
+
 class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
   """Implementation of the skill Projector servicer."""
 
@@ -69,12 +127,39 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
       object_world_service: object_world_service_pb2_grpc.ObjectWorldServiceStub,
       motion_planner_service: motion_planner_service_pb2_grpc.MotionPlannerServiceStub,
       geometry_service: geometry_service_pb2_grpc.GeometryServiceStub,
+      world_clients: Optional[world_client_registry.WorldClientRegistry] = None,
+      metrics: Optional[metrics_lib.SkillServiceMetrics] = None,
+      executor: Optional[op_executor.OperationExecutor] = None,
   ):
+    """Initializes the servicer.
+
+    Args:
+      skill_repository: The repository of skills to serve.
+      object_world_service: Stub of the object world service.
+      motion_planner_service: Stub of the motion planner service.
+      geometry_service: Stub of the geometry service.
+      world_clients: The registry of per-world clients, which may be shared
+        with other servicers. If None, the servicer creates one.
+      metrics: The metrics to record operations in, which may be shared with
+        other servicers. If None, the servicer creates its own.
+      executor: The executor on whose helper threads GetFootprints evaluates
+        requests concurrently, which may be shared with other servicers. If
+        None, the servicer creates one with default limits.
+    """
     self._skill_repository = skill_repository
     self._object_world_service = object_world_service
     self._motion_planner_service = motion_planner_service
     self._geometry_service = geometry_service
 
+    self._world_clients = (
+        world_clients
+        or world_client_registry.WorldClientRegistry(
+            object_world_service, motion_planner_service, geometry_service
+        )
+    )
+    self._metrics = metrics or metrics_lib.SkillServiceMetrics()
+    self._executor = executor or op_executor.OperationExecutor()
+
   def GetFootprint(
       self,
       footprint_request: skill_service_pb2.GetFootprintRequest,
@@ -93,19 +178,130 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
     Raises:
      grpc.RpcError:
       NOT_FOUND: If the skill is not found.
-      INVALID_ARGUMENT: If unable to apply the default parameters.
+      INTERNAL: If unable to apply the default parameters.
       INTERNAL: If unable to get the skill's footprint.
       INVALID_ARGUMENT: When the required equipment does not match the
           requested.
     """
+    try:
+      return self._get_footprint(footprint_request)
+    except _FootprintError as err:
+      _abort_with_status(
+          context=context,
+          code=err.code,
+          message=err.message,
+          skill_error_info=err.skill_error_info,
+      )
+
+  def GetFootprints(
+      self,
+      footprints_request: skill_service_pb2.GetFootprintsRequest,
+      context: grpc.ServicerContext,
+  ) -> skill_service_pb2.GetFootprintsResult:
+    """Runs Skill get_footprint operations for many requests.
+
+    Up to _MAX_FOOTPRINT_BATCH_CONCURRENCY requests are evaluated concurrently
+    on helper threads of the executor, which do not take the slots of skill
+    operations. The calling thread evaluates requests as well, so that the
+    batch makes progress even if all helper threads are busy. Requests on the
+    same world share the world's clients.
+
+    Args:
+      footprints_request: The GetFootprintRequests to evaluate.
+      context: gRPC servicer context.
+
+    Returns:
+      GetFootprintsResult with the result of or the error for each request, in
+      the order of the requests. Errors are the same as those of GetFootprint.
+    """
+    del context  # Errors are returned per request.
+    requests = footprints_request.requests
+    world_clients = {
+        world_id: self._world_clients.get(world_id)
+        for world_id in {request.world_id for request in requests}
+    }
+
+    items: list[Optional[skill_service_pb2.GetFootprintsResult.Item]] = [
+        None
+    ] * len(requests)
+    # Hands out the index of each request exactly once across threads.
+    indices = itertools.count()
+
+    def evaluate_remaining() -> None:
+      while True:
+        index = next(indices)
+        if index >= len(requests):
+          return
+        request = requests[index]
+        items[index] = self._get_footprints_item(
+            request, world_clients[request.world_id]
+        )
+
+    helpers = []
+    for _ in range(min(len(requests), _MAX_FOOTPRINT_BATCH_CONCURRENCY) - 1):
+      try:
+        helpers.append(self._executor.submit_helper(evaluate_remaining))
+      except op_executor.OperationExecutor.ExecutorShutdownError:
+        break
+
+    evaluate_remaining()
+    for helper in helpers:
+      # Helpers which have not started yet have nothing left to do.
+      if not helper.cancel():
+        helper.result()
+
+    return skill_service_pb2.GetFootprintsResult(items=items)
+
+  def _get_footprints_item(
+      self,
+      footprint_request: skill_service_pb2.GetFootprintRequest,
+      world_clients: world_client_registry.WorldClients,
+  ) -> skill_service_pb2.GetFootprintsResult.Item:
+    """Evaluates one request of a GetFootprints call."""
+    try:
+      result = self._get_footprint(footprint_request, world_clients)
+    except _FootprintError as err:
+      return skill_service_pb2.GetFootprintsResult.Item(error=err.to_status())
+    except Exception as err:  # pylint: disable=broad-except
+      logging.exception(
+          'Unexpected error in get_footprint of %s.',
+          footprint_request.instance.id_version,
+      )
+      return skill_service_pb2.GetFootprintsResult.Item(
+          error=status_pb2.Status(
+              code=status.StatusCodeAsInt(status.StatusCode.UNKNOWN),
+              message=str(err),
+          )
+      )
+    return skill_service_pb2.GetFootprintsResult.Item(result=result)
+
+  def _get_footprint(
+      self,
+      footprint_request: skill_service_pb2.GetFootprintRequest,
+      world_clients: Optional[world_client_registry.WorldClients] = None,
+  ) -> skill_service_pb2.GetFootprintResult:
+    """Runs Skill get_footprint operation with provided parameters.
+
+    Args:
+      footprint_request: GetFootprintRequest with skill instance to run
+        get_footprint on.
+      world_clients: The clients for the request's world. If None, they are
+        taken from the registry.
+
+    Returns:
+      GetFootprintResult containing results of the footprint calculation.
+
+    Raises:
+      _FootprintError: See GetFootprint.
+    """
+    start = time.perf_counter()
     skill_name = id_utils.name_from(footprint_request.instance.id_version)
     try:
       skill_project_instance = self._skill_repository.get_skill_project(
           skill_name
       )
-    except skill_repo.InvalidSkillAliasError:
-      _abort_with_status(
-          context=context,
+    except skill_repo.InvalidSkillAliasError as err:
+      raise _FootprintError(
           code=status.StatusCode.NOT_FOUND,
           message=(
               f'Skill not found: {footprint_request.instance.id_version!r}.'
@@ -113,37 +309,51 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
           skill_error_info=error_pb2.SkillErrorInfo(
               error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
           ),
-      )
+      ) from err
+
+    if world_clients is None:
+      world_clients = self._world_clients.get(footprint_request.world_id)
 
-    # Apply default parameters if available.
     skill_runtime_data = self._skill_repository.get_skill_runtime_data(
         skill_name
     )
-    defaults = skill_runtime_data.parameter_data.default_value
-    if defaults is not None and footprint_request.HasField('parameters'):
-      try:
-        default_parameters.apply_defaults_to_parameters(
-            skill_runtime_data.parameter_data.descriptor,
-            defaults,
-            footprint_request.parameters,
-        )
-      except status.StatusNotOk as e:
-        _abort_with_status(
-            context=context,
-            code=e.status.code(),
-            message=str(e),
-            skill_error_info=error_pb2.SkillErrorInfo(
-                error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_SKILL
-            ),
-        )
+
+    skill_id = skill_runtime_data.skill_id
+    op_name = metrics_lib.OP_GET_FOOTPRINT
+    self._metrics.add_in_flight(skill_id, op_name, 1)
+    try:
+      return self._evaluate_footprint(
+          footprint_request,
+          skill_project_instance,
+          skill_runtime_data,
+          world_clients,
+          start,
+      )
+    finally:
+      self._skill_repository.release_skill(skill_name, skill_project_instance)
+      self._metrics.add_in_flight(skill_id, op_name, -1)
+      self._metrics.record(
+          skill_id, op_name, metrics_lib.PHASE_TOTAL, start, time.perf_counter()
+      )
+
+  def _evaluate_footprint(
+      self,
+      footprint_request: skill_service_pb2.GetFootprintRequest,
+      skill_project_instance: skl.SkillProjectInterface,
+      skill_runtime_data: rd.SkillRuntimeData,
+      world_clients: world_client_registry.WorldClients,
+      start: float,
+  ) -> skill_service_pb2.GetFootprintResult:
+    """Runs Skill get_footprint operation once the skill has been found."""
+    skill_id = skill_runtime_data.skill_id
+    op_name = metrics_lib.OP_GET_FOOTPRINT
 
     try:
       request = _proto_to_get_footprint_request(
           footprint_request, skill_runtime_data
       )
     except _CannotConstructRequestError as err:
-      _abort_with_status(
-          context=context,
+      raise _FootprintError(
           code=status.StatusCode.INTERNAL,
           message=(
               'Could not construct get footprint request for skill'
@@ -152,20 +362,15 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
           skill_error_info=error_pb2.SkillErrorInfo(
               error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_SKILL
           ),
-      )
+      ) from err
 
-    object_world = object_world_client.ObjectWorldClient(
-        footprint_request.world_id,
-        self._object_world_service,
-        self._geometry_service,
-    )
-    motion_planner = motion_planner_client.MotionPlannerClient(
-        footprint_request.world_id, self._motion_planner_service
+    request_done = self._metrics.record(
+        skill_id, op_name, metrics_lib.PHASE_REQUEST, start, time.perf_counter()
     )
 
     footprint_context = get_footprint_context_impl.GetFootprintContextImpl(
-        motion_planner=motion_planner,
-        object_world=object_world,
+        motion_planner=world_clients.motion_planner,
+        object_world=world_clients.object_world,
         resource_handles=dict(footprint_request.instance.resource_handles),
     )
 
@@ -174,6 +379,13 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
           request, footprint_context
       )
     except Exception as err:  # pylint: disable=broad-except
+      self._metrics.record(
+          skill_id,
+          op_name,
+          metrics_lib.PHASE_SKILL,
+          request_done,
+          time.perf_counter(),
+      )
       error_status = _handle_skill_error(
           err=err,
           skill_id=skill_runtime_data.skill_id,
@@ -181,14 +393,20 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
           log_context=footprint_request.context,
       )
 
-      _abort_with_status(
-          context=context,
+      raise _FootprintError(
           code=status.StatusCodeFromInt(error_status.code),
           message=error_status.message,
           skill_error_info=error_pb2.SkillErrorInfo(
               error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_SKILL
           ),
-      )
+      ) from err
+    skill_done = self._metrics.record(
+        skill_id,
+        op_name,
+        metrics_lib.PHASE_SKILL,
+        request_done,
+        time.perf_counter(),
+    )
 
     # Add required equipment to the footprint automatically
     required_equipment = skill_runtime_data.resource_data.required_resources
@@ -201,8 +419,7 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
             )
         )
       else:
-        _abort_with_status(
-            context=context,
+        raise _FootprintError(
             code=status.StatusCode.INVALID_ARGUMENT,
             message=(
                 'Error when specifying equipment resources. Skill requires'
@@ -214,6 +431,13 @@ class SkillProjectorServicer(skill_service_pb2_grpc.ProjectorServicer):
             ),
         )
 
+    self._metrics.record(
+        skill_id,
+        op_name,
+        metrics_lib.PHASE_RESULT,
+        skill_done,
+        time.perf_counter(),
+    )
     return skill_service_pb2.GetFootprintResult(footprint=skill_footprint)
 
   def Predict(
@@ -240,12 +464,39 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
           motion_planner_service_pb2_grpc.MotionPlannerServiceStub
       ),
       geometry_service: geometry_service_pb2_grpc.GeometryServiceStub,
+      executor: Optional[op_executor.OperationExecutor] = None,
+      world_clients: Optional[world_client_registry.WorldClientRegistry] = None,
+      metrics: Optional[metrics_lib.SkillServiceMetrics] = None,
   ):
+    """Initializes the servicer.
+
+    Args:
+      skill_repository: The repository of skills to serve.
+      object_world_service: Stub of the object world service.
+      motion_planner_service: Stub of the motion planner service.
+      geometry_service: Stub of the geometry service.
+      executor: The executor on which skill operations run. It is shared by all
+        operations and owned by the caller. If None, the servicer creates one
+        with default limits.
+      world_clients: The registry of per-world clients, which may be shared
+        with other servicers. If None, the servicer creates one.
+      metrics: The metrics to record operations in, which may be shared with
+        other servicers. If None, the servicer creates its own.
+    """
     self._skill_repository = skill_repository
     self._object_world_service = object_world_service
     self._motion_planner_service = motion_planner_service
     self._geometry_service = geometry_service
 
+    self._world_clients = (
+        world_clients
+        or world_client_registry.WorldClientRegistry(
+            object_world_service, motion_planner_service, geometry_service
+        )
+    )
+    self._metrics = metrics or metrics_lib.SkillServiceMetrics()
+
+    self._executor = executor or op_executor.OperationExecutor()
     self._operations = _SkillOperations()
 
   def StartExecute(
@@ -270,6 +521,9 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
             (i.e., the skill instance name) already exists.
         FAILED_PRECONDITION: If the operation cache is already full of
             unfinished operations.
+        RESOURCE_EXHAUSTED: If the operation executor cannot admit another
+            operation.
+        UNAVAILABLE: If the operation executor has been shut down.
     """
     skill_name = id_utils.name_from(request.instance.id_version)
     operation = self._make_operation(
@@ -278,8 +532,7 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
         context=context,
     )
 
-    skill = self._skill_repository.get_skill_execute(skill_name)
-
+    start = time.perf_counter()
     try:
       skill_request = skl.ExecuteRequest(
           params=_resolve_params(request.parameters, operation.runtime_data),
@@ -296,27 +549,33 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
               error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_SKILL
           ),
       )
+    self._metrics.record(
+        operation.runtime_data.skill_id,
+        metrics_lib.OP_EXECUTE,
+        metrics_lib.PHASE_REQUEST,
+        start,
+        time.perf_counter(),
+    )
+
+    skill = self._checkout_skill(skill_name, operation)
 
     logging_context = skill_logging_context.SkillLoggingContext(
         data_logger_context=request.context,
         skill_id=operation.runtime_data.skill_id,
     )
 
+    world_clients = self._world_clients.get(request.world_id)
     skill_context = execute_context_impl.ExecuteContextImpl(
         canceller=operation.canceller,
         logging_context=logging_context,
-        motion_planner=motion_planner_client.MotionPlannerClient(
-            request.world_id, self._motion_planner_service
-        ),
-        object_world=object_world_client.ObjectWorldClient(
-            request.world_id, self._object_world_service, self._geometry_service
-        ),
+        motion_planner=world_clients.motion_planner,
+        object_world=world_clients.object_world,
         resource_handles=dict(request.instance.resource_handles),
     )
 
-    def execute() -> skill_service_pb2.ExecuteResult:
-      result = skill.execute(skill_request, skill_context)
-
+    def to_execute_result(
+        result: Optional[proto_message.Message],
+    ) -> skill_service_pb2.ExecuteResult:
       # Verify that the skill returned the expected type.
       got_name = None if result is None else result.DESCRIPTOR.full_name
       want_name = operation.runtime_data.return_type_data.message_full_name
@@ -335,7 +594,14 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
 
       return skill_service_pb2.ExecuteResult(result=result_any)
 
-    operation.start(op=execute, op_name='execute', log_context=request.context)
+    self._start_operation(
+        operation,
+        op=functools.partial(skill.execute, skill_request, skill_context),
+        to_result=to_execute_result,
+        op_name=metrics_lib.OP_EXECUTE,
+        log_context=request.context,
+        context=context,
+    )
 
     return operation.operation
 
@@ -361,6 +627,9 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
             (i.e., the skill instance name) already exists.
         FAILED_PRECONDITION: If the operation cache is already full of
             unfinished operations.
+        RESOURCE_EXHAUSTED: If the operation executor cannot admit another
+            operation.
+        UNAVAILABLE: If the operation executor has been shut down.
     """
     skill_name = id_utils.name_from(request.instance.id_version)
     operation = self._make_operation(
@@ -369,8 +638,7 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
         context=context,
     )
 
-    skill = self._skill_repository.get_skill_execute(skill_name)
-
+    start = time.perf_counter()
     try:
       skill_request = skl.PreviewRequest(
           params=_resolve_params(request.parameters, operation.runtime_data),
@@ -387,27 +655,33 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
               error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_SKILL
           ),
       )
+    self._metrics.record(
+        operation.runtime_data.skill_id,
+        metrics_lib.OP_PREVIEW,
+        metrics_lib.PHASE_REQUEST,
+        start,
+        time.perf_counter(),
+    )
+
+    skill = self._checkout_skill(skill_name, operation)
 
     logging_context = skill_logging_context.SkillLoggingContext(
         data_logger_context=request.context,
         skill_id=operation.runtime_data.skill_id,
     )
 
+    world_clients = self._world_clients.get(request.world_id)
     skill_context = preview_context_impl.PreviewContextImpl(
         canceller=operation.canceller,
         logging_context=logging_context,
-        motion_planner=motion_planner_client.MotionPlannerClient(
-            request.world_id, self._motion_planner_service
-        ),
-        object_world=object_world_client.ObjectWorldClient(
-            request.world_id, self._object_world_service, self._geometry_service
-        ),
+        motion_planner=world_clients.motion_planner,
+        object_world=world_clients.object_world,
         resource_handles=dict(request.instance.resource_handles),
     )
 
-    def preview() -> skill_service_pb2.PreviewResult:
-      result = skill.preview(skill_request, skill_context)
-
+    def to_preview_result(
+        result: Optional[proto_message.Message],
+    ) -> skill_service_pb2.PreviewResult:
       # Verify that the skill returned the expected type.
       got_name = None if result is None else result.DESCRIPTOR.full_name
       want_name = operation.runtime_data.return_type_data.message_full_name
@@ -428,7 +702,14 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
           result=result_any, expected_states=skill_context.world_updates
       )
 
-    operation.start(op=preview, op_name='preview', log_context=request.context)
+    self._start_operation(
+        operation,
+        op=functools.partial(skill.preview, skill_request, skill_context),
+        to_result=to_preview_result,
+        op_name=metrics_lib.OP_PREVIEW,
+        log_context=request.context,
+        context=context,
+    )
 
     return operation.operation
 
@@ -604,6 +885,69 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
 
     return empty_pb2.Empty()
 
+  def WatchOperations(
+      self,
+      watch_request: skill_service_pb2.WatchOperationsRequest,
+      context: grpc.ServicerContext,
+  ) -> Iterator[skill_service_pb2.OperationEvent]:
+    """Streams the state transitions of skill operations as they happen.
+
+    Args:
+      watch_request: Watch request with the names of the operations to watch.
+      context: gRPC servicer context.
+
+    Yields:
+      An event with the current state of each operation, followed by an event
+      for each subsequent state transition, until all operations are done.
+
+    Raises:
+      grpc.RpcError:
+        INVALID_ARGUMENT: If no operation names are specified.
+        NOT_FOUND: If any of the operations cannot be found.
+    """
+    if not watch_request.names:
+      _abort_with_status(
+          context=context,
+          code=status.StatusCode.INVALID_ARGUMENT,
+          message='No operation names were specified.',
+          skill_error_info=error_pb2.SkillErrorInfo(
+              error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
+          ),
+      )
+
+    try:
+      operations = [
+          self._operations.get(name)
+          for name in dict.fromkeys(watch_request.names)
+      ]
+    except self._operations.OperationNotFoundError as err:
+      _abort_with_status(
+          context=context,
+          code=status.StatusCode.NOT_FOUND,
+          message=str(err),
+          skill_error_info=error_pb2.SkillErrorInfo(
+              error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
+          ),
+      )
+
+    watcher = _OperationWatcher()
+    # Wakes up the stream if the client goes away.
+    context.add_callback(watcher.close)
+    for operation in operations:
+      operation.add_state_listener(watcher.notify)
+    try:
+      unfinished_names = {operation.name for operation in operations}
+      while unfinished_names:
+        event = watcher.next_event()
+        if event is None:
+          return
+        if event.event_type == skill_service_pb2.OperationEvent.EVENT_TYPE_DONE:
+          unfinished_names.discard(event.operation.name)
+        yield event
+    finally:
+      for operation in operations:
+        operation.remove_state_listener(watcher.notify)
+
   def _make_operation(
       self, name: str, skill_name: str, context: grpc.ServicerContext
   ) -> _SkillOperation:
@@ -620,7 +964,12 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
           ),
       )
 
-    operation = _SkillOperation(name=name, runtime_data=runtime_data)
+    operation = _SkillOperation(
+        name=name,
+        runtime_data=runtime_data,
+        executor=self._executor,
+        metrics=self._metrics,
+    )
 
     try:
       self._operations.add(operation)
@@ -643,6 +992,49 @@ class SkillExecutorServicer(skill_service_pb2_grpc.ExecutorServicer):
 
     return operation
 
+  def _checkout_skill(
+      self, skill_name: str, operation: _SkillOperation
+  ) -> skl.SkillExecuteInterface:
+    """Returns a skill instance that is released when the operation ends."""
+    skill = self._skill_repository.get_skill_execute(skill_name)
+    operation.add_finished_callback(
+        lambda _: self._skill_repository.release_skill(skill_name, skill)
+    )
+    return skill
+
+  def _start_operation(
+      self,
+      operation: _SkillOperation,
+      op: _OperationCallable,
+      to_result: _ResultCallable,
+      op_name: str,
+      log_context: context_pb2.Context,
+      context: grpc.ServicerContext,
+  ) -> None:
+    """Starts an operation, aborting the RPC if it is not admitted."""
+    try:
+      operation.start(
+          op=op, to_result=to_result, op_name=op_name, log_context=log_context
+      )
+    except op_executor.OperationExecutor.ExecutorFullError as err:
+      _abort_with_status(
+          context=context,
+          code=status.StatusCode.RESOURCE_EXHAUSTED,
+          message=str(err),
+          skill_error_info=error_pb2.SkillErrorInfo(
+              error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
+          ),
+      )
+    except op_executor.OperationExecutor.ExecutorShutdownError as err:
+      _abort_with_status(
+          context=context,
+          code=status.StatusCode.UNAVAILABLE,
+          message=str(err),
+          skill_error_info=error_pb2.SkillErrorInfo(
+              error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_GRPC
+          ),
+      )
+
 
 class SkillInformationServicer(skill_service_pb2_grpc.SkillInformationServicer):
   """Implementation of the skill Information service."""
@@ -668,7 +1060,15 @@ class SkillInformationServicer(skill_service_pb2_grpc.SkillInformationServicer):
 
 
 class _SkillOperations:
-  """A collection of skill operations."""
+  """A collection of skill operations.
+
+  Operations are stored in lock stripes keyed by name, so that looking up an
+  operation (e.g., when polling GetOperation or WaitOperation) only contends
+  with accesses to the same stripe. Finished operations are additionally
+  indexed in the order in which they finished, so that making room for a new
+  operation and expiring finished operations take constant time per removed
+  operation.
+  """
 
   class OperationError(Exception):
     """Base _SkillOperations error."""
@@ -685,9 +1085,42 @@ class _SkillOperations:
   class OperationCacheFullError(OperationError, RuntimeError):
     """The skill operation cache is full of unfinished operations."""
 
-  def __init__(self):
+  def __init__(
+      self,
+      max_num_operations: int = MAX_NUM_OPERATIONS,
+      finished_operation_ttl: Optional[float] = FINISHED_OPERATION_TTL_SECONDS,
+      clock: Callable[[], float] = time.monotonic,
+  ):
+    """Initializes the instance.
+
+    Args:
+      max_num_operations: The maximum number of operations in the collection.
+      finished_operation_ttl: The number of seconds for which an operation is
+        kept after it finished, or None to keep finished operations until room
+        is needed for new operations.
+      clock: Monotonic clock returning seconds, on the same time base as the
+        finished_time of the operations. Can be replaced for testing.
+    """
+    self._max_num_operations = max_num_operations
+    self._finished_operation_ttl = finished_operation_ttl
+    self._clock = clock
+
+    # Guards the operation count and the finished operations index. Acquired
+    # before any stripe lock.
     self._lock = threading.Lock()
-    self._operations: Dict[str, _SkillOperation] = {}
+    self._num_operations = 0
+    # Finished operations by name, in the order in which they finished, with
+    # the monotonic time at which they expire.
+    self._finished: collections.OrderedDict[
+        str, tuple[_SkillOperation, float]
+    ] = collections.OrderedDict()
+
+    self._stripe_locks = [
+        threading.Lock() for _ in range(_NUM_OPERATION_LOCK_STRIPES)
+    ]
+    self._stripes: list[Dict[str, _SkillOperation]] = [
+        {} for _ in range(_NUM_OPERATION_LOCK_STRIPES)
+    ]
 
   def add(self, operation: _SkillOperation) -> None:
     """Adds an operation to the collection.
@@ -701,31 +1134,35 @@ class _SkillOperations:
       OperationCacheFullError: If the cache is already full of unfinished
         operations.
     """
+    stripe_index = self._stripe_index(operation.name)
     with self._lock:
-      # First remove the oldest finished operation if we've reached our limit of
+      self._remove_expired_locked()
+
+      with self._stripe_locks[stripe_index]:
+        if operation.name in self._stripes[stripe_index]:
+          raise self.OperationAlreadyExistsError(
+              f'An operation already exists with name {operation.name!r}.'
+          )
+
+      # Remove the oldest finished operation if we've reached our limit of
       # tracked operations.
-      while len(self._operations) >= MAX_NUM_OPERATIONS:
-        old_operation_name = None
-        for name, old_operation in self._operations.items():
-          if old_operation.finished:
-            assert name is not None, 'Operation name was unexpectedly None.'
-            old_operation_name = name
-            break
-
-        if old_operation_name is None:
+      while self._num_operations >= self._max_num_operations:
+        if not self._finished:
+          self._index_unindexed_finished_locked()
+        if not self._finished:
           raise self.OperationCacheFullError(
               f'Cannot add operation {operation.name!r}, since there are'
-              f' already {len(self._operations)} unfinished operations.'
+              f' already {self._num_operations} unfinished operations.'
           )
+        self._remove_locked(next(iter(self._finished)))
 
-        del self._operations[old_operation_name]
-
-      if operation.name in self._operations:
-        raise self.OperationAlreadyExistsError(
-            f'An operation already exists with name {operation.name!r}.'
-        )
+      with self._stripe_locks[stripe_index]:
+        self._stripes[stripe_index][operation.name] = operation
+      self._num_operations += 1
 
-      self._operations[operation.name] = operation
+    # Called immediately if the operation has already finished, so this must
+    # happen without holding self._lock.
+    operation.add_finished_callback(self._on_operation_finished)
 
   def get(self, name: str) -> _SkillOperation:
     """Gets an operation by name.
@@ -737,15 +1174,23 @@ class _SkillOperations:
       The operation.
 
     Raises:
-      OperationNotFoundError: If no operation with the specified name exists.
+      OperationNotFoundError: If no operation with the specified name exists,
+        or if the operation finished longer than the TTL ago.
     """
-    with self._lock:
-      try:
-        return self._operations[name]
-      except KeyError as err:
-        raise self.OperationNotFoundError(
-            f'No operation found with name {name!r}.'
-        ) from err
+    stripe_index = self._stripe_index(name)
+    with self._stripe_locks[stripe_index]:
+      operation = self._stripes[stripe_index].get(name)
+
+    if operation is not None and self._is_expired(operation):
+      with self._lock:
+        self._remove_expired_locked()
+      operation = None
+
+    if operation is None:
+      raise self.OperationNotFoundError(
+          f'No operation found with name {name!r}.'
+      )
+    return operation
 
   def clear(self) -> None:
     """Clears all operations in the collection.
@@ -758,18 +1203,129 @@ class _SkillOperations:
       OperationNotFinishedError: If any operation is not yet finished.
     """
     with self._lock:
-      unfinished_operation_names = []
-      for operation in self._operations.values():
-        if not operation.finished:
-          unfinished_operation_names.append(operation.name)
-
-      if unfinished_operation_names:
+      if len(self._finished) < self._num_operations:
+        self._index_unindexed_finished_locked()
+      if len(self._finished) < self._num_operations:
+        unfinished_operation_names = []
+        for stripe_lock, stripe in zip(self._stripe_locks, self._stripes):
+          with stripe_lock:
+            unfinished_operation_names.extend(
+                name for name in stripe if name not in self._finished
+            )
         names_list = ', '.join(unfinished_operation_names)
         raise self.OperationNotFinishedError(
             f'The following operations are not yet finished: {names_list}.'
         )
 
-      self._operations = {}
+      for stripe_lock, stripe in zip(self._stripe_locks, self._stripes):
+        with stripe_lock:
+          stripe.clear()
+      self._finished.clear()
+      self._num_operations = 0
+
+  def _stripe_index(self, name: str) -> int:
+    return hash(name) % _NUM_OPERATION_LOCK_STRIPES
+
+  def _is_expired(self, operation: _SkillOperation) -> bool:
+    """Returns True if the operation finished longer than the TTL ago."""
+    if self._finished_operation_ttl is None:
+      return False
+    finished_time = operation.finished_time
+    return (
+        finished_time is not None
+        and self._clock() - finished_time >= self._finished_operation_ttl
+    )
+
+  def _on_operation_finished(self, operation: _SkillOperation) -> None:
+    """Indexes an operation of the collection that has finished."""
+    stripe_index = self._stripe_index(operation.name)
+    with self._lock:
+      with self._stripe_locks[stripe_index]:
+        # The operation may have been replaced after the collection was cleared.
+        if self._stripes[stripe_index].get(operation.name) is not operation:
+          return
+      if operation.name not in self._finished:
+        self._index_finished_locked(operation)
+
+  def _index_finished_locked(self, operation: _SkillOperation) -> None:
+    """Indexes a finished operation. Requires self._lock to be held."""
+    expiry_time = (
+        math.inf
+        if self._finished_operation_ttl is None
+        else operation.finished_time + self._finished_operation_ttl
+    )
+    self._finished[operation.name] = (operation, expiry_time)
+
+  def _index_unindexed_finished_locked(self) -> None:
+    """Indexes finished operations whose finished callback has not yet run.
+
+    An operation is finished (and visible as done to clients) before its
+    finished callbacks run, so clients may observe it as done before it is
+    indexed. Scans all operations, so only call this on the slow path.
+
+    Requires self._lock to be held.
+    """
+    unindexed = []
+    for stripe_lock, stripe in zip(self._stripe_locks, self._stripes):
+      with stripe_lock:
+        unindexed.extend(
+            operation
+            for name, operation in stripe.items()
+            if name not in self._finished
+            and operation.finished_time is not None
+        )
+    for operation in sorted(unindexed, key=lambda op: op.finished_time):
+      self._index_finished_locked(operation)
+
+  def _remove_expired_locked(self) -> None:
+    """Removes expired operations. Requires self._lock to be held."""
+    if self._finished_operation_ttl is None:
+      return
+    now = self._clock()
+    while self._finished:
+      name, (_, expiry_time) = next(iter(self._finished.items()))
+      if expiry_time > now:
+        break
+      self._remove_locked(name)
+
+  def _remove_locked(self, name: str) -> None:
+    """Removes a finished operation. Requires self._lock to be held."""
+    del self._finished[name]
+    stripe_index = self._stripe_index(name)
+    with self._stripe_locks[stripe_index]:
+      del self._stripes[stripe_index][name]
+    self._num_operations -= 1
+
+
+class _OperationWatcher:
+  """Collects the state transitions of operations for a single watch stream."""
+
+  def __init__(self):
+    self._condition = threading.Condition()
+    self._events: collections.deque[skill_service_pb2.OperationEvent] = (
+        collections.deque()
+    )
+    self._closed = False
+
+  def notify(self, event: skill_service_pb2.OperationEvent) -> None:
+    """Adds an event and wakes up the stream."""
+    with self._condition:
+      self._events.append(event)
+      self._condition.notify()
+
+  def close(self) -> None:
+    """Wakes up the stream and makes it end."""
+    with self._condition:
+      self._closed = True
+      self._condition.notify()
+
+  def next_event(self) -> Optional[skill_service_pb2.OperationEvent]:
+    """Waits for the next event, or returns None if the watcher was closed."""
+    with self._condition:
+      self._condition.wait_for(lambda: self._events or self._closed)
+      if self._closed:
+        return None
+      return self._events.popleft()
 
 
 class _SkillOperation:
@@ -778,6 +1334,8 @@ class _SkillOperation:
   Attributes:
     canceller: Supports cooperative cancellation of the operation.
     finished: True if the operation has finished.
+    finished_time: The monotonic time at which the operation finished, or None
+      if it has not finished.
     name: A unique name for the operation.
     operation: The current operation proto for the operation.
     runtime_data: The skill's runtime data.
@@ -794,6 +1352,10 @@ class _SkillOperation:
   def finished(self) -> bool:
     return self._finished_event.is_set()
 
+  @property
+  def finished_time(self) -> Optional[float]:
+    return self._finished_time
+
   @property
   def name(self) -> str:
     return self.operation.name
@@ -807,12 +1369,20 @@ class _SkillOperation:
   def runtime_data(self) -> rd.SkillRuntimeData:
     return self._runtime_data
 
-  def __init__(self, name: str, runtime_data: rd.SkillRuntimeData) -> None:
+  def __init__(
+      self,
+      name: str,
+      runtime_data: rd.SkillRuntimeData,
+      executor: op_executor.OperationExecutor,
+      metrics: metrics_lib.SkillServiceMetrics,
+  ) -> None:
     """Initializes the instance.
 
     Args:
       name: A unique name for the operation.
       runtime_data: The skill's runtime data.
+      executor: The executor on which to run the operation.
+      metrics: The metrics to record the operation in.
     """
     self._canceller = skill_canceller.SkillCancellationManager(
         ready_timeout=(
@@ -823,27 +1393,53 @@ class _SkillOperation:
     self._runtime_data = runtime_data
 
     self._started = False
+    self._op_name = None
+    # The time.perf_counter() times at which the operation was started and at
+    # which its cancellation was requested.
+    self._start_time = None
+    self._cancellation_time = None
     self._cancelled = False
+    # Whether state listeners have been notified of the cancellation. Set only
+    # together with the notification, so that a listener added concurrently
+    # receives the CANCELLING event exactly once.
+    self._cancelling = False
     self._finished_event = threading.Event()
+    self._finished_time = None
+    self._finished_callbacks: list[Callable[[_SkillOperation], None]] = []
+    self._state_listeners: list[
+        Callable[[skill_service_pb2.OperationEvent], None]
+    ] = []
     self._lock = threading.RLock()
 
-    self._pool = futures.ThreadPoolExecutor()
+    self._executor = executor
+    self._metrics = metrics
 
   def start(
       self,
-      op: Callable[[], proto_message.Message],
+      op: _OperationCallable,
+      to_result: _ResultCallable,
       op_name: str,
       log_context: Optional[context_pb2.Context] = None,
   ) -> None:
     """Starts executing the skill operation.
 
+    Coroutine operations run on the executor's event loop, other operations on
+    one of its worker threads.
+
     Args:
-      op: The operation callable. It should return a proto result.
-      op_name: A name to describe the operation.
+      op: The operation callable or coroutine function. It should return the
+        skill's result.
+      to_result: Converts the skill's result to the proto result of the
+        operation.
+      op_name: A name to describe the operation, e.g., 'execute'.
       log_context: Data logger context to add to ExtendedStatus.
 
     Raises:
       OperationAlreadyStartedError: If an operation has already started.
+      OperationExecutor.ExecutorFullError: If the executor cannot admit the
+        operation. The operation is then finished with an error.
+      OperationExecutor.ExecutorShutdownError: If the executor has been shut
+        down. The operation is then finished with an error.
     """
     with self._lock:
       if self._started:
@@ -851,8 +1447,89 @@ class _SkillOperation:
             f'Execution has already started: {self.name!r}.'
         )
       self._started = True
+      self._op_name = op_name
+      self._start_time = time.perf_counter()
+      self._notify_state_listeners_locked(
+          skill_service_pb2.OperationEvent.EVENT_TYPE_STARTED
+      )
+    self._metrics.add_in_flight(self._runtime_data.skill_id, op_name, 1)
+
+    try:
+      if inspect.iscoroutinefunction(op):
+        future = self._executor.submit_async(
+            self._execute_async, op, to_result, op_name, log_context=log_context
+        )
+      else:
+        future = self._executor.submit(
+            self._execute, op, to_result, op_name, log_context=log_context
+        )
+    except op_executor.OperationExecutor.ExecutorFullError as err:
+      self._finish(
+          result=None,
+          error_status=status_pb2.Status(
+              code=status.StatusCodeAsInt(status.StatusCode.RESOURCE_EXHAUSTED),
+              message=str(err),
+          ),
+      )
+      raise
+    except op_executor.OperationExecutor.ExecutorShutdownError as err:
+      self._finish(
+          result=None,
+          error_status=status_pb2.Status(
+              code=status.StatusCodeAsInt(status.StatusCode.UNAVAILABLE),
+              message=str(err),
+          ),
+      )
+      raise
+    future.add_done_callback(self._finish_if_cancelled)
+
+  def add_finished_callback(
+      self, callback: Callable[[_SkillOperation], None]
+  ) -> None:
+    """Adds a callback that is called with the operation when it finishes.
 
-    self._pool.submit(self._execute, op, op_name, log_context=log_context)
+    The callback is called immediately if the operation has already finished.
+
+    Args:
+      callback: The callback.
+    """
+    with self._lock:
+      if not self.finished:
+        self._finished_callbacks.append(callback)
+        return
+    callback(self)
+
+  def add_state_listener(
+      self, listener: Callable[[skill_service_pb2.OperationEvent], None]
+  ) -> None:
+    """Adds a listener that is called on each state transition.
+
+    The listener is called immediately with the current state of the operation
+    (unless it has not started yet), and then with each subsequent transition,
+    in order. It is called while the operation's lock is held, so it must not
+    block or call back into the operation.
+
+    Args:
+      listener: The listener.
+    """
+    with self._lock:
+      self._state_listeners.append(listener)
+      if self.finished:
+        event_type = skill_service_pb2.OperationEvent.EVENT_TYPE_DONE
+      elif self._cancelling:
+        event_type = skill_service_pb2.OperationEvent.EVENT_TYPE_CANCELLING
+      elif self._started:
+        event_type = skill_service_pb2.OperationEvent.EVENT_TYPE_STARTED
+      else:
+        return
+      listener(self._make_event_locked(event_type))
+
+  def remove_state_listener(
+      self, listener: Callable[[skill_service_pb2.OperationEvent], None]
+  ) -> None:
+    """Removes a listener added with add_state_listener()."""
+    with self._lock:
+      self._state_listeners.remove(listener)
 
   def request_cancellation(self) -> None:
     """Requests cancellation of the operation.
@@ -882,8 +1559,16 @@ class _SkillOperation:
       )
       return
 
+    self._cancellation_time = time.perf_counter()
     self.canceller.cancel()
 
+    with self._lock:
+      if not self.finished:
+        self._cancelling = True
+        self._notify_state_listeners_locked(
+            skill_service_pb2.OperationEvent.EVENT_TYPE_CANCELLING
+        )
+
   def wait(self, timeout: Optional[float] = None) -> operations_pb2.Operation:
     """Waits for the operation to finish.
 
@@ -900,44 +1585,243 @@ class _SkillOperation:
 
   def _execute(
       self,
-      op: Callable[[], proto_message.Message],
+      op: Callable[[], Optional[proto_message.Message]],
+      to_result: _ResultCallable,
       op_name: str,
       log_context: Optional[context_pb2.Context],
   ) -> None:
     """Executes the skill operation.
 
     Args:
-      op: The operation callable. It should return a proto result.
+      op: The operation callable. It should return the skill's result.
+      to_result: Converts the skill's result to the proto result.
       op_name: A name to describe the operation.
       log_context: Data logger context to add to ExtendedStatus.
     """
-    result = None
-    error_status = None
+    skill_start = self._metrics.record(
+        self._runtime_data.skill_id,
+        op_name,
+        metrics_lib.PHASE_QUEUE,
+        self._start_time,
+        time.perf_counter(),
+    )
     try:
-      result = op()
+      with cancellable_calls.cancel_calls_with(self._canceller):
+        skill_result = op()
     # Since we are calling user-provided code here, we want to be as broad as
     # possible and catch anything that could occur.
+    except Exception as err:  # pylint: disable=broad-except
+      self._finish_with_skill_error(err, op_name, log_context, skill_start)
+    else:
+      self._finish_with_skill_output(
+          skill_result, to_result, op_name, log_context, skill_start
+      )
+
+  async def _execute_async(
+      self,
+      op: Callable[[], Awaitable[Optional[proto_message.Message]]],
+      to_result: _ResultCallable,
+      op_name: str,
+      log_context: Optional[context_pb2.Context],
+  ) -> None:
+    """Executes the coroutine skill operation.
+
+    Args:
+      op: The operation coroutine function. It should return the skill's
+        result.
+      to_result: Converts the skill's result to the proto result.
+      op_name: A name to describe the operation.
+      log_context: Data logger context to add to ExtendedStatus.
+    """
+    skill_start = self._metrics.record(
+        self._runtime_data.skill_id,
+        op_name,
+        metrics_lib.PHASE_QUEUE,
+        self._start_time,
+        time.perf_counter(),
+    )
+    try:
+      with cancellable_calls.cancel_calls_with(self._canceller):
+        skill_result = await op()
+    except asyncio.CancelledError:
+      # The executor cancels coroutine operations when it is shut down without
+      # waiting for them.
+      self._finish_with_skill_error(
+          skill_canceller.SkillCancelledError(
+              'The operation was cancelled, since the skill service is'
+              ' shutting down.'
+          ),
+          op_name,
+          log_context,
+          skill_start,
+      )
+      raise
+    # Since we are calling user-provided code here, we want to be as broad as
+    # possible and catch anything that could occur.
+    except Exception as err:  # pylint: disable=broad-except
+      self._finish_with_skill_error(err, op_name, log_context, skill_start)
+    else:
+      self._finish_with_skill_output(
+          skill_result, to_result, op_name, log_context, skill_start
+      )
+
+  def _finish_if_cancelled(self, future: futures.Future) -> None:
+    """Finishes the operation if the executor cancelled it before it started.
+
+    Operations which were cancelled while running have already finished.
+    """
+    if not future.cancelled() or self.finished:
+      return
+    self._finish(
+        result=None,
+        error_status=status_pb2.Status(
+            code=status.StatusCodeAsInt(status.StatusCode.UNAVAILABLE),
+            message=(
+                f'Operation {self.name!r} was cancelled before it started,'
+                ' since the skill service is shutting down.'
+            ),
+        ),
+    )
+
+  def _finish_with_skill_output(
+      self,
+      skill_result: Optional[proto_message.Message],
+      to_result: _ResultCallable,
+      op_name: str,
+      log_context: Optional[context_pb2.Context],
+      skill_start: float,
+  ) -> None:
+    """Finishes the operation with the result returned by the skill."""
+    skill_id = self._runtime_data.skill_id
+    skill_end = self._metrics.record(
+        skill_id,
+        op_name,
+        metrics_lib.PHASE_SKILL,
+        skill_start,
+        time.perf_counter(),
+    )
+
+    result = None
+    error_status = None
+    try:
+      result = to_result(skill_result)
     except Exception as err:  # pylint: disable=broad-except
       error_status = _handle_skill_error(
           err=err,
-          skill_id=self._runtime_data.skill_id,
+          skill_id=skill_id,
           op_name=op_name,
           log_context=log_context,
       )
+    self._metrics.record(
+        skill_id,
+        op_name,
+        metrics_lib.PHASE_RESULT,
+        skill_end,
+        time.perf_counter(),
+    )
+
+    self._finish_with_skill_result(result=result, error_status=error_status)
+
+  def _finish_with_skill_error(
+      self,
+      err: Exception,
+      op_name: str,
+      log_context: Optional[context_pb2.Context],
+      skill_start: float,
+  ) -> None:
+    """Finishes the operation with the error raised by the skill."""
+    skill_id = self._runtime_data.skill_id
+    self._metrics.record(
+        skill_id,
+        op_name,
+        metrics_lib.PHASE_SKILL,
+        skill_start,
+        time.perf_counter(),
+    )
+
+    error_status = _handle_skill_error(
+        err=err,
+        skill_id=skill_id,
+        op_name=op_name,
+        log_context=log_context,
+    )
+    self._finish_with_skill_result(result=None, error_status=error_status)
 
+  def _finish_with_skill_result(
+      self,
+      result: Optional[proto_message.Message],
+      error_status: Optional[status_pb2.Status],
+  ) -> None:
+    """Finishes the operation with the outcome of the skill."""
     if error_status is not None:
       error_status.details.add().Pack(
           error_pb2.SkillErrorInfo(
               error_type=error_pb2.SkillErrorInfo.ERROR_TYPE_SKILL
           )
       )
+    self._finish(result=result, error_status=error_status)
+
+  def _finish(
+      self,
+      result: Optional[proto_message.Message],
+      error_status: Optional[status_pb2.Status],
+  ) -> None:
+    """Marks the operation as done with a result or an error."""
+    if error_status is not None:
       self.operation.error.CopyFrom(error_status)
     if result is not None:
       self.operation.response.Pack(result)
 
-    self.operation.done = True
+    with self._lock:
+      self._operation.done = True
+      self._finished_time = time.monotonic()
+      self._finished_event.set()
+      callbacks = self._finished_callbacks
+      self._finished_callbacks = []
+      self._notify_state_listeners_locked(
+          skill_service_pb2.OperationEvent.EVENT_TYPE_DONE
+      )
 
-    self._finished_event.set()
+    self._record_finished()
+
+    for callback in callbacks:
+      callback(self)
+
+  def _record_finished(self) -> None:
+    """Records the metrics of the finished operation."""
+    if self._op_name is None:
+      return
+    skill_id = self._runtime_data.skill_id
+    done = time.perf_counter()
+    self._metrics.add_in_flight(skill_id, self._op_name, -1)
+    self._metrics.record(
+        skill_id, self._op_name, metrics_lib.PHASE_TOTAL, self._start_time, done
+    )
+    if self._cancellation_time is not None:
+      self._metrics.record_cancellation(
+          skill_id, self._op_name, self._cancellation_time, done
+      )
+
+  def _make_event_locked(
+      self, event_type: skill_service_pb2.OperationEvent.EventType
+  ) -> skill_service_pb2.OperationEvent:
+    """Returns an event with a snapshot of the operation.
+
+    Requires self._lock to be held.
+    """
+    event = skill_service_pb2.OperationEvent(event_type=event_type)
+    event.operation.CopyFrom(self._operation)
+    return event
+
+  def _notify_state_listeners_locked(
+      self, event_type: skill_service_pb2.OperationEvent.EventType
+  ) -> None:
+    """Calls the state listeners. Requires self._lock to be held."""
+    if not self._state_listeners:
+      return
+    event = self._make_event_locked(event_type)
+    for listener in self._state_listeners:
+      listener(event)
 
 
 def _skill_error_to_code_and_action(
@@ -968,7 +1852,12 @@ def _handle_skill_error(
   """Handles an error raised by a skill."""
   code, action = _skill_error_to_code_and_action(err)
   message = f'Skill {skill_id} {action} {op_name}:'
-  logging.exception(message)
+  if code == status.StatusCode.CANCELLED:
+    # Cancellation is expected, so its traceback is not logged; formatting it
+    # would delay the end of every cancelled operation.
+    logging.info('%s %s', message, err)
+  else:
+    logging.exception(message)
 
   details = []
 
@@ -1067,40 +1956,45 @@ def _proto_to_get_footprint_request(
   Raises:
     _CannotConstructRequestError: If the request cannot be converted.
   """
-  try:
-    params = _unpack_any_from_descriptor(
-        proto.parameters, skill_runtime_data.parameter_data.descriptor
-    )
-  except proto_utils.ProtoMismatchTypeError as err:
-    raise _CannotConstructRequestError(str(err)) from err
-
   return skl.GetFootprintRequest(
-      params=params,
+      params=_resolve_params(proto.parameters, skill_runtime_data),
   )
 
 
 def _resolve_params(
     params_any: any_pb2.Any, skill_runtime_data: rd.SkillRuntimeData
 ) -> proto_message.Message:
-  """Applies defaults and resolves a params Any into its target message type."""
-  defaults = skill_runtime_data.parameter_data.default_value
-  if defaults is not None:
-    try:
-      default_parameters.apply_defaults_to_parameters(
-          msg_descriptor=skill_runtime_data.parameter_data.descriptor,
-          default_value_any=defaults,
-          parameters_any=params_any,
-      )
-    except status.StatusNotOk as err:
-      raise _CannotConstructRequestError(str(err)) from err
+  """Resolves a params Any into its target message type and applies defaults.
+
+  The params are unpacked once and the skill's cached defaults are merged into
+  the unpacked message; params_any is not modified.
+
+  Args:
+    params_any: The packed params.
+    skill_runtime_data: The runtime data for the skill.
 
+  Returns:
+    The params message, with defaults applied to fields that are not set.
+
+  Raises:
+    _CannotConstructRequestError: If the params or defaults are of an
+      unexpected type.
+  """
+  parameter_data = skill_runtime_data.parameter_data
   try:
-    return _unpack_any_from_descriptor(
-        params_any, skill_runtime_data.parameter_data.descriptor
-    )
+    params = _unpack_any_from_descriptor(params_any, parameter_data.descriptor)
   except proto_utils.ProtoMismatchTypeError as err:
     raise _CannotConstructRequestError(str(err)) from err
 
+  try:
+    defaults = parameter_data.parameter_defaults
+  except status.StatusNotOk as err:
+    raise _CannotConstructRequestError(str(err)) from err
+  if defaults is not None:
+    defaults.apply(params)
+
+  return params
+
 
 def _unpack_any_from_descriptor(
     any_message: any_pb2.Any, descriptor: proto_descriptor.Descriptor
@@ -0,0 +1,663 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for skill_service_impl."""
+
+import asyncio
+import threading
+from typing import Awaitable, Callable, Iterator, List, Optional, Tuple
+from unittest import mock
+
+from absl.testing import absltest
+from google.longrunning import operations_pb2
+from google.protobuf import empty_pb2
+import grpc
+from intrinsic.skills.internal import cancellable_calls
+from intrinsic.skills.internal import operation_executor
+from intrinsic.skills.internal import runtime_data as rd
+from intrinsic.skills.internal import skill_repository as skill_repo
+from intrinsic.skills.internal import skill_service_impl
+from intrinsic.skills.proto import error_pb2
+from intrinsic.skills.proto import footprint_pb2
+from intrinsic.skills.proto import skill_service_pb2
+from intrinsic.skills.proto import skills_pb2
+from intrinsic.skills.python import skill_canceller
+from intrinsic.skills.python import skill_interface as skl
+from intrinsic.util.testing import fake_clock
+
+# pylint: disable=protected-access
+
+_SkillOperations = skill_service_impl._SkillOperations
+
+_TIMEOUT = 10.0
+
+
+class _FakeOperation:
+  """A stand-in for a skill operation, which is finished by the test."""
+
+  def __init__(self, name: str):
+    self.name = name
+    self.finished_time: Optional[float] = None
+    self._callbacks: List[Callable[['_FakeOperation'], None]] = []
+
+  def add_finished_callback(
+      self, callback: Callable[['_FakeOperation'], None]
+  ) -> None:
+    if self.finished_time is not None:
+      callback(self)
+    else:
+      self._callbacks.append(callback)
+
+  def finish(self, finished_time: float, run_callbacks: bool = True) -> None:
+    self.finished_time = finished_time
+    if run_callbacks:
+      self.run_callbacks()
+
+  def run_callbacks(self) -> None:
+    callbacks = self._callbacks
+    self._callbacks = []
+    for callback in callbacks:
+      callback(self)
+
+
+class _AbortError(Exception):
+
+  def __init__(self, status: grpc.Status):
+    super().__init__(status.details)
+    self.status = status
+
+
+def _abort_with_status(status: grpc.Status) -> None:
+  raise _AbortError(status)
+
+
+class SkillOperationsTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._clock = fake_clock.FakeClock(100.0)
+
+  def _add(
+      self, operations: _SkillOperations, *names: str
+  ) -> List[_FakeOperation]:
+    added = []
+    for name in names:
+      operation = _FakeOperation(name)
+      operations.add(operation)
+      added.append(operation)
+    return added
+
+  def _finish(self, operation: _FakeOperation) -> None:
+    operation.finish(self._clock())
+    self._clock.now += 1.0
+
+  def test_get_returns_added_operation(self):
+    operations = _SkillOperations(clock=self._clock)
+    (operation,) = self._add(operations, 'a')
+
+    self.assertIs(operations.get('a'), operation)
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('b')
+
+  def test_evicts_finished_operations_in_order_of_finishing(self):
+    operations = _SkillOperations(max_num_operations=3, clock=self._clock)
+    a, b, c = self._add(operations, 'a', 'b', 'c')
+    self._finish(b)
+    self._finish(a)
+
+    self._add(operations, 'd')
+
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('b')
+    self.assertIs(operations.get('a'), a)
+
+    self._add(operations, 'e')
+
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+    self.assertIs(operations.get('c'), c)
+
+  def test_full_of_unfinished_operations_raises(self):
+    operations = _SkillOperations(max_num_operations=2, clock=self._clock)
+    a, _ = self._add(operations, 'a', 'b')
+
+    with self.assertRaises(_SkillOperations.OperationCacheFullError):
+      self._add(operations, 'c')
+
+    self._finish(a)
+    self._add(operations, 'c')
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+
+  def test_finished_operations_expire_after_ttl(self):
+    operations = _SkillOperations(
+        finished_operation_ttl=10.0, clock=self._clock
+    )
+    a, b = self._add(operations, 'a', 'b')
+    a.finish(self._clock.now)
+
+    self._clock.now += 9.0
+    self.assertIs(operations.get('a'), a)
+
+    self._clock.now += 1.0
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+    # Unfinished operations do not expire.
+    self.assertIs(operations.get('b'), b)
+    # The name of an expired operation can be reused.
+    self._add(operations, 'a')
+
+  def test_finished_operations_do_not_expire_without_ttl(self):
+    operations = _SkillOperations(
+        finished_operation_ttl=None, clock=self._clock
+    )
+    (a,) = self._add(operations, 'a')
+    a.finish(self._clock.now)
+
+    self._clock.now += 1e6
+
+    self.assertIs(operations.get('a'), a)
+
+  def test_add_existing_name_raises(self):
+    operations = _SkillOperations(clock=self._clock)
+    (a,) = self._add(operations, 'a')
+
+    with self.assertRaises(_SkillOperations.OperationAlreadyExistsError):
+      self._add(operations, 'a')
+
+    self._finish(a)
+    with self.assertRaises(_SkillOperations.OperationAlreadyExistsError):
+      self._add(operations, 'a')
+
+  def test_clear_requires_finished_operations(self):
+    operations = _SkillOperations(clock=self._clock)
+    a, b = self._add(operations, 'a', 'b')
+    self._finish(a)
+
+    with self.assertRaises(_SkillOperations.OperationNotFinishedError):
+      operations.clear()
+
+    self._finish(b)
+    operations.clear()
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+
+  def test_clear_before_finished_callbacks_ran(self):
+    operations = _SkillOperations(clock=self._clock)
+    a, b = self._add(operations, 'a', 'b')
+    # The operations are done, but their finished callbacks have not run yet.
+    a.finish(self._clock.now, run_callbacks=False)
+    b.finish(self._clock.now, run_callbacks=False)
+
+    operations.clear()
+
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+    a.run_callbacks()
+    b.run_callbacks()
+    self._add(operations, 'a')
+
+  def test_clear_names_only_unfinished_operations(self):
+    operations = _SkillOperations(clock=self._clock)
+    a, _ = self._add(operations, 'a', 'b')
+    a.finish(self._clock.now, run_callbacks=False)
+
+    with self.assertRaisesRegex(
+        _SkillOperations.OperationNotFinishedError, r'finished: b\.$'
+    ):
+      operations.clear()
+
+  def test_evicts_finished_operations_before_finished_callbacks_ran(self):
+    operations = _SkillOperations(max_num_operations=2, clock=self._clock)
+    a, b = self._add(operations, 'a', 'b')
+    b.finish(self._clock.now, run_callbacks=False)
+    a.finish(self._clock.now + 1.0, run_callbacks=False)
+
+    self._add(operations, 'c')
+
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('b')
+    self.assertIs(operations.get('a'), a)
+    b.run_callbacks()
+    a.run_callbacks()
+    self._add(operations, 'd')
+    with self.assertRaises(_SkillOperations.OperationNotFoundError):
+      operations.get('a')
+
+
+class _FootprintSkill:
+  """A skill whose footprint reserves a resource named after the skill."""
+
+  def __init__(self, name: str, error: Optional[Exception] = None):
+    self._name = name
+    self._error = error
+
+  def get_footprint(self, request, context) -> footprint_pb2.Footprint:
+    del request, context  # Unused.
+    if self._error is not None:
+      raise self._error
+    return footprint_pb2.Footprint(
+        resource_reservation=[
+            footprint_pb2.ResourceReservation(name=self._name)
+        ]
+    )
+
+
+class SkillProjectorServicerGetFootprintsTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._skills = {}
+    self._skill_repository = mock.MagicMock()
+    self._skill_repository.get_skill_project.side_effect = self._get_skill
+    self._skill_repository.get_skill_runtime_data.return_value = (
+        rd.SkillRuntimeData(
+            parameter_data=rd.ParameterData(
+                descriptor=empty_pb2.Empty.DESCRIPTOR
+            ),
+            return_type_data=rd.ReturnTypeData(),
+            execution_options=rd.ExecutionOptions(),
+            resource_data=rd.ResourceData(required_resources={}),
+            skill_id='ai.intrinsic.my_skill',
+        )
+    )
+    self._executor = operation_executor.OperationExecutor(
+        max_workers=1, max_queued=0
+    )
+    self.addCleanup(self._executor.shutdown, wait=False)
+
+  def _get_skill(self, skill_name: str) -> _FootprintSkill:
+    if skill_name not in self._skills:
+      raise skill_repo.InvalidSkillAliasError(f'Unknown skill {skill_name}.')
+    return self._skills[skill_name]
+
+  def _create_servicer(
+      self, executor: operation_executor.OperationExecutor
+  ) -> skill_service_impl.SkillProjectorServicer:
+    return skill_service_impl.SkillProjectorServicer(
+        self._skill_repository,
+        mock.MagicMock(),
+        mock.MagicMock(),
+        mock.MagicMock(),
+        world_clients=mock.MagicMock(),
+        executor=executor,
+    )
+
+  def _request(
+      self, *skill_names: str
+  ) -> skill_service_pb2.GetFootprintsRequest:
+    request = skill_service_pb2.GetFootprintsRequest()
+    for skill_name in skill_names:
+      footprint_request = request.requests.add(
+          instance=skills_pb2.SkillInstance(
+              id_version=f'ai.intrinsic.{skill_name}.0.0.1'
+          ),
+          world_id='world',
+      )
+      footprint_request.parameters.Pack(empty_pb2.Empty())
+    return request
+
+  def _reserved_names(
+      self, result: skill_service_pb2.GetFootprintsResult
+  ) -> List[Optional[str]]:
+    return [
+        item.result.footprint.resource_reservation[0].name
+        if item.HasField('result')
+        else None
+        for item in result.items
+    ]
+
+  def test_results_are_in_request_order(self):
+    names = [f'skill_{i}' for i in range(20)]
+    for name in names:
+      self._skills[name] = _FootprintSkill(name)
+
+    result = self._create_servicer(self._executor).GetFootprints(
+        self._request(*names), mock.MagicMock()
+    )
+
+    self.assertEqual(self._reserved_names(result), names)
+
+  def test_errors_are_returned_per_request(self):
+    self._skills['good'] = _FootprintSkill('good')
+    self._skills['bad'] = _FootprintSkill(
+        'bad', error=skl.InvalidSkillParametersError('Invalid.')
+    )
+
+    result = self._create_servicer(self._executor).GetFootprints(
+        self._request('good', 'missing', 'bad'), mock.MagicMock()
+    )
+
+    self.assertEqual(self._reserved_names(result), ['good', None, None])
+    self.assertEqual(
+        result.items[1].error.code, grpc.StatusCode.NOT_FOUND.value[0]
+    )
+    self.assertEqual(
+        result.items[2].error.code, grpc.StatusCode.INVALID_ARGUMENT.value[0]
+    )
+    skill_error_info = error_pb2.SkillErrorInfo()
+    self.assertTrue(result.items[2].error.details[0].Unpack(skill_error_info))
+    self.assertEqual(
+        skill_error_info.error_type,
+        error_pb2.SkillErrorInfo.ERROR_TYPE_SKILL,
+    )
+
+  def test_evaluates_requests_on_calling_thread_without_helpers(self):
+    names = ['a', 'b', 'c']
+    for name in names:
+      self._skills[name] = _FootprintSkill(name)
+    executor = mock.MagicMock()
+    executor.submit_helper.side_effect = (
+        operation_executor.OperationExecutor.ExecutorShutdownError()
+    )
+
+    result = self._create_servicer(executor).GetFootprints(
+        self._request(*names), mock.MagicMock()
+    )
+
+    self.assertEqual(self._reserved_names(result), names)
+    executor.submit_helper.assert_called_once()
+
+  def test_helpers_do_not_take_operation_slots(self):
+    names = [f'skill_{i}' for i in range(20)]
+    for name in names:
+      self._skills[name] = _FootprintSkill(name)
+    release = threading.Event()
+    self.addCleanup(release.set)
+    # Occupies the only operation slot of the executor.
+    operation = self._executor.submit(release.wait, _TIMEOUT)
+
+    result = self._create_servicer(self._executor).GetFootprints(
+        self._request(*names), mock.MagicMock()
+    )
+
+    self.assertEqual(self._reserved_names(result), names)
+    self.assertEqual(self._executor.stats.rejected, 0)
+    release.set()
+    operation.result(_TIMEOUT)
+
+
+class SkillExecutorServicerOperationsTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    skill_repository = mock.MagicMock()
+    skill_repository.get_skill_runtime_data.return_value = rd.SkillRuntimeData(
+        parameter_data=rd.ParameterData(descriptor=empty_pb2.Empty.DESCRIPTOR),
+        return_type_data=rd.ReturnTypeData(),
+        execution_options=rd.ExecutionOptions(),
+        resource_data=rd.ResourceData(required_resources={}),
+        skill_id='ai.intrinsic.my_skill',
+    )
+    executor = operation_executor.OperationExecutor()
+    self.addCleanup(executor.shutdown, wait=False)
+    self._servicer = skill_service_impl.SkillExecutorServicer(
+        skill_repository,
+        mock.MagicMock(),
+        mock.MagicMock(),
+        mock.MagicMock(),
+        executor=executor,
+    )
+    self._servicer._operations = _SkillOperations(max_num_operations=1)
+    self._context = mock.MagicMock()
+    self._context.abort_with_status.side_effect = _abort_with_status
+
+  def _make_operation(self, name: str) -> None:
+    self._servicer._make_operation(
+        name=name, skill_name='my_skill', context=self._context
+    )
+
+  def test_existing_operation_name_aborts_with_already_exists(self):
+    self._make_operation('a')
+
+    with self.assertRaises(_AbortError) as context:
+      self._make_operation('a')
+
+    self.assertEqual(
+        context.exception.status.code, grpc.StatusCode.ALREADY_EXISTS
+    )
+
+  def test_full_operation_cache_aborts_with_failed_precondition(self):
+    self._make_operation('a')
+
+    with self.assertRaises(_AbortError) as context:
+      self._make_operation('b')
+
+    self.assertEqual(
+        context.exception.status.code, grpc.StatusCode.FAILED_PRECONDITION
+    )
+
+
+class _AsyncSkill:
+  """A skill whose execute is a coroutine function provided by the test."""
+
+  def __init__(self, execute: Callable[..., Awaitable[None]]):
+    self._execute = execute
+
+  async def execute(self, request, context) -> None:
+    return await self._execute(request, context)
+
+
+class SkillExecutorServicerTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._skill_repository = mock.MagicMock()
+    self._skill_repository.get_skill_runtime_data.return_value = (
+        rd.SkillRuntimeData(
+            parameter_data=rd.ParameterData(
+                descriptor=empty_pb2.Empty.DESCRIPTOR
+            ),
+            return_type_data=rd.ReturnTypeData(),
+            execution_options=rd.ExecutionOptions(supports_cancellation=True),
+            resource_data=rd.ResourceData(required_resources={}),
+            skill_id='ai.intrinsic.my_skill',
+        )
+    )
+    self._world_clients = mock.MagicMock()
+    self._executor = operation_executor.OperationExecutor()
+    self.addCleanup(self._executor.shutdown, wait=False)
+    self._servicer = skill_service_impl.SkillExecutorServicer(
+        self._skill_repository,
+        mock.MagicMock(),
+        mock.MagicMock(),
+        mock.MagicMock(),
+        world_clients=self._world_clients,
+        executor=self._executor,
+    )
+    self._context = mock.MagicMock()
+    self._context.abort_with_status.side_effect = _abort_with_status
+
+  def _start_execute(
+      self, execute: Callable[..., Awaitable[None]]
+  ) -> operations_pb2.Operation:
+    self._skill_repository.get_skill_execute.return_value = _AsyncSkill(execute)
+    request = skill_service_pb2.ExecuteRequest(
+        instance=skills_pb2.SkillInstance(
+            instance_name='my_operation',
+            id_version='ai.intrinsic.my_skill.0.0.1',
+        )
+    )
+    request.parameters.Pack(empty_pb2.Empty())
+    return self._servicer.StartExecute(request, self._context)
+
+  def _wait(self, name: str) -> operations_pb2.Operation:
+    request = operations_pb2.WaitOperationRequest(name=name)
+    request.timeout.FromSeconds(int(_TIMEOUT))
+    return self._servicer.WaitOperation(request, self._context)
+
+  def test_async_execute_runs_on_event_loop(self):
+    loops = []
+
+    async def execute(request, context) -> None:
+      del request, context  # Unused.
+      loops.append(asyncio.get_running_loop())
+      await asyncio.sleep(0)
+
+    operation = self._start_execute(execute)
+    operation = self._wait(operation.name)
+
+    self.assertTrue(operation.done)
+    self.assertFalse(operation.HasField('error'))
+    self.assertEqual(loops, [self._executor._loop])
+
+  def test_async_execute_is_cancelled_via_wait_async(self):
+    waiting = threading.Event()
+
+    async def execute(request, context) -> None:
+      del request  # Unused.
+      context.canceller.ready()
+      waiting.set()
+      if await context.canceller.wait_async(_TIMEOUT):
+        raise skill_canceller.SkillCancelledError('Cancelled.')
+
+    operation = self._start_execute(execute)
+    self.assertTrue(waiting.wait(_TIMEOUT))
+    self._servicer.CancelOperation(
+        operations_pb2.CancelOperationRequest(name=operation.name),
+        self._context,
+    )
+    operation = self._wait(operation.name)
+
+    self.assertTrue(operation.done)
+    self.assertEqual(operation.error.code, grpc.StatusCode.CANCELLED.value[0])
+
+  def test_async_client_propagates_cancellable_calls_context(self):
+    cancellers = []
+    object_world = self._world_clients.get.return_value.object_world
+    object_world.get_object.side_effect = lambda name: cancellers.append(
+        cancellable_calls._canceller.get()
+    )
+
+    async def execute(request, context) -> None:
+      del request  # Unused.
+      await context.async_object_world.get_object('my_object')
+      cancellers.append(context.canceller)
+
+    operation = self._start_execute(execute)
+    self._wait(operation.name)
+
+    object_world.get_object.assert_called_once_with('my_object')
+    self.assertLen(cancellers, 2)
+    self.assertIsNotNone(cancellers[0])
+    self.assertIs(cancellers[0], cancellers[1])
+
+  def _start_cancellable(
+      self, on_cancel: Optional[Callable[[], None]] = None
+  ) -> Tuple[operations_pb2.Operation, threading.Event]:
+    """Starts an operation that runs until it is cancelled."""
+    waiting = threading.Event()
+
+    async def execute(request, context) -> None:
+      del request  # Unused.
+      if on_cancel is not None:
+        context.canceller.register_callback(on_cancel)
+      context.canceller.ready()
+      waiting.set()
+      if await context.canceller.wait_async(_TIMEOUT):
+        raise skill_canceller.SkillCancelledError('Cancelled.')
+
+    operation = self._start_execute(execute)
+    self.assertTrue(waiting.wait(_TIMEOUT))
+    return operation, waiting
+
+  def _cancel(self, name: str) -> None:
+    self._servicer.CancelOperation(
+        operations_pb2.CancelOperationRequest(name=name), self._context
+    )
+
+  def _watch(self, *names: str) -> Iterator[skill_service_pb2.OperationEvent]:
+    return self._servicer.WatchOperations(
+        skill_service_pb2.WatchOperationsRequest(names=names), self._context
+    )
+
+  def test_watch_operations_streams_transitions_until_done(self):
+    operation, _ = self._start_cancellable()
+    stream = self._watch(operation.name)
+
+    initial_event = next(stream)
+    self._cancel(operation.name)
+    events = [initial_event, *stream]
+
+    self.assertEqual(
+        [event.event_type for event in events],
+        [
+            skill_service_pb2.OperationEvent.EVENT_TYPE_STARTED,
+            skill_service_pb2.OperationEvent.EVENT_TYPE_CANCELLING,
+            skill_service_pb2.OperationEvent.EVENT_TYPE_DONE,
+        ],
+    )
+    self.assertEqual(events[0].operation.name, operation.name)
+    self.assertTrue(events[-1].operation.done)
+    self.assertEqual(
+        events[-1].operation.error.code, grpc.StatusCode.CANCELLED.value[0]
+    )
+
+  def test_watch_operations_of_done_operation_streams_done(self):
+    async def execute(request, context) -> None:
+      del request, context  # Unused.
+
+    operation = self._start_execute(execute)
+    self._wait(operation.name)
+
+    self.assertEqual(
+        [event.event_type for event in self._watch(operation.name)],
+        [skill_service_pb2.OperationEvent.EVENT_TYPE_DONE],
+    )
+
+  def test_watch_started_during_cancellation_streams_cancelling_once(self):
+    events = []
+    streams = []
+
+    def watch() -> None:
+      stream = self._watch('my_operation')
+      events.append(next(stream))
+      streams.append(stream)
+
+    # The skill's cancellation callback runs after its canceller is cancelled,
+    # but before the operation notifies its state listeners.
+    operation, _ = self._start_cancellable(on_cancel=watch)
+    self._cancel(operation.name)
+    events.extend(streams[0])
+
+    self.assertEqual(
+        [event.event_type for event in events],
+        [
+            skill_service_pb2.OperationEvent.EVENT_TYPE_STARTED,
+            skill_service_pb2.OperationEvent.EVENT_TYPE_CANCELLING,
+            skill_service_pb2.OperationEvent.EVENT_TYPE_DONE,
+        ],
+    )
+
+  def test_watch_operations_without_names_aborts_with_invalid_argument(self):
+    with self.assertRaises(_AbortError) as context:
+      next(self._watch())
+
+    self.assertEqual(
+        context.exception.status.code, grpc.StatusCode.INVALID_ARGUMENT
+    )
+
+  def test_watch_unknown_operation_aborts_with_not_found(self):
+    with self.assertRaises(_AbortError) as context:
+      next(self._watch('unknown_operation'))
+
+    self.assertEqual(context.exception.status.code, grpc.StatusCode.NOT_FOUND)
+
+  def test_watch_operations_ends_when_rpc_terminates(self):
+    operation, _ = self._start_cancellable()
+    self.addCleanup(self._wait, operation.name)
+    self.addCleanup(self._cancel, operation.name)
+    stream = self._watch(operation.name)
+    next(stream)
+
+    # Called by gRPC when the RPC terminates, e.g. if the client goes away.
+    (on_terminated,) = self._context.add_callback.call_args.args
+    on_terminated()
+
+    self.assertEmpty(list(stream))
+    self.assertEmpty(
+        self._servicer._operations.get(operation.name)._state_listeners
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,377 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Latency metrics and trace spans of skill operations."""
+
+from __future__ import annotations
+
+import bisect
+import collections
+import http.server
+import threading
+import time
+from typing import Sequence
+
+from absl import logging
+
+try:
+  # pytype: disable=import-error
+  # pylint: disable=g-import-not-at-top
+  from opentelemetry import trace
+  # pytype: enable=import-error
+  # pylint: enable=g-import-not-at-top
+except ImportError:
+  trace = None
+
+# Operations of a skill.
+OP_EXECUTE = 'execute'
+OP_PREVIEW = 'preview'
+OP_GET_FOOTPRINT = 'get_footprint'
+
+# Phases of a skill operation.
+# Waiting for the operation executor, from start until the skill is called.
+PHASE_QUEUE = 'queue'
+# Unpacking the parameters and applying their defaults.
+PHASE_REQUEST = 'request'
+# The skill's own implementation of the operation.
+PHASE_SKILL = 'skill'
+# Checking and packing the skill's result.
+PHASE_RESULT = 'result'
+# The whole operation, from start until it is done.
+PHASE_TOTAL = 'total'
+
+# Default upper bounds, in seconds, of the latency histogram buckets.
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+# Content type of the OpenMetrics text format.
+OPENMETRICS_CONTENT_TYPE = (
+    'application/openmetrics-text; version=1.0.0; charset=utf-8'
+)
+
+_PHASE_METRIC = 'skill_service_operation_phase_seconds'
+_IN_FLIGHT_METRIC = 'skill_service_operations_in_flight'
+_CANCELLATION_METRIC = 'skill_service_cancellation_latency_seconds'
+
+# Number of observed values after which a histogram sorts them into its buckets.
+_MAX_PENDING_VALUES = 1024
+
+
+class Histogram:
+  """A thread-safe histogram with fixed bucket bounds.
+
+  Observed values are appended to a deque, which is thread-safe without a lock,
+  and are sorted into the buckets in batches, when the deque is full or when a
+  snapshot is taken. This keeps observe() cheap on the caller's thread.
+  """
+
+  __slots__ = ('_bounds', '_counts', '_sum', '_pending', '_lock')
+
+  def __init__(self, bounds: Sequence[float]):
+    """Initializes the instance.
+
+    Args:
+      bounds: The increasing upper bounds of the buckets. An additional bucket
+        holds values above the last bound.
+    """
+    self._bounds = tuple(bounds)
+    self._counts = [0] * (len(self._bounds) + 1)
+    self._sum = 0.0
+    self._pending: collections.deque[float] = collections.deque()
+    self._lock = threading.Lock()
+
+  def observe(self, value: float) -> None:
+    """Adds a value to the histogram."""
+    self._pending.append(value)
+    if len(self._pending) >= _MAX_PENDING_VALUES:
+      self._fold()
+
+  def snapshot(self) -> tuple[list[tuple[float, int]], int, float]:
+    """Returns the cumulative bucket counts, the count and the sum.
+
+    Returns:
+      A tuple of the (upper bound, cumulative count) of each bucket, including
+      the +Inf bucket, the number of values and their sum.
+    """
+    with self._lock:
+      self._fold_locked()
+      counts = list(self._counts)
+      total = self._sum
+
+    buckets = []
+    cumulative = 0
+    for bound, count in zip(self._bounds + (float('inf'),), counts):
+      cumulative += count
+      buckets.append((bound, cumulative))
+    return buckets, cumulative, total
+
+  def _fold(self) -> None:
+    with self._lock:
+      self._fold_locked()
+
+  def _fold_locked(self) -> None:
+    """Sorts pending values into the buckets. Requires self._lock to be held."""
+    pending = self._pending
+    bounds = self._bounds
+    counts = self._counts
+    # Values appended concurrently are either folded now or in the next batch.
+    for _ in range(len(pending)):
+      value = pending.popleft()
+      counts[bisect.bisect_left(bounds, value)] += 1
+      self._sum += value
+
+
+class SkillServiceMetrics:
+  """Collects latency metrics and trace spans of skill operations.
+
+  Records, per skill and operation (execute, preview or get_footprint):
+    * a latency histogram of each phase of the operation (queue, request,
+      skill, result and total);
+    * the number of operations in flight;
+    * a histogram of the time from a cancellation request until the operation
+      is done.
+
+  Recording a sample takes less than a microsecond. Metrics are exported in
+  the OpenMetrics text format by render(), e.g., over HTTP via
+  start_http_server().
+
+  If tracing is enabled, each recorded phase is also emitted as an
+  OpenTelemetry span. Tracing requires the opentelemetry package; it is
+  disabled with a warning if the package is not available.
+
+  The instance is thread-safe.
+  """
+
+  def __init__(
+      self,
+      latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+      enable_tracing: bool = False,
+  ):
+    """Initializes the instance.
+
+    Args:
+      latency_buckets: The increasing upper bounds, in seconds, of the latency
+        histogram buckets.
+      enable_tracing: Whether to emit a trace span for each recorded phase.
+    """
+    self._latency_buckets = tuple(latency_buckets)
+
+    self._lock = threading.Lock()
+    # Histograms by (skill id, operation, phase).
+    self._phases: dict[tuple[str, str, str], Histogram] = {}
+    # Numbers of operations in flight by (skill id, operation).
+    self._in_flight: dict[tuple[str, str], int] = {}
+    # Histograms by (skill id, operation).
+    self._cancellations: dict[tuple[str, str], Histogram] = {}
+
+    self._tracer = None
+    if enable_tracing:
+      if trace is None:
+        logging.warning(
+            'Tracing of skill operations is disabled: opentelemetry is not'
+            ' available.'
+        )
+      else:
+        self._tracer = trace.get_tracer(__name__)
+    # Offset from perf_counter() time to the wall time of spans, in seconds.
+    self._wall_time_offset = time.time() - time.perf_counter()
+
+  def record(
+      self, skill_id: str, op: str, phase: str, start: float, end: float
+  ) -> float:
+    """Records a phase of an operation.
+
+    Args:
+      skill_id: The id of the skill.
+      op: The operation, e.g., OP_EXECUTE.
+      phase: The phase of the operation, e.g., PHASE_SKILL.
+      start: The time.perf_counter() time at which the phase started.
+      end: The time.perf_counter() time at which the phase ended.
+
+    Returns:
+      end, so that consecutive phases can be chained.
+    """
+    key = (skill_id, op, phase)
+    histogram = self._phases.get(key)
+    if histogram is None:
+      histogram = self._get_or_add(self._phases, key)
+    histogram.observe(end - start)
+
+    if self._tracer is not None:
+      self._emit_span(skill_id, op, phase, start, end)
+
+    return end
+
+  def record_cancellation(
+      self, skill_id: str, op: str, requested: float, done: float
+  ) -> None:
+    """Records the latency of a cancelled operation.
+
+    Args:
+      skill_id: The id of the skill.
+      op: The operation, e.g., OP_EXECUTE.
+      requested: The time.perf_counter() time at which cancellation was
+        requested.
+      done: The time.perf_counter() time at which the operation was done.
+    """
+    key = (skill_id, op)
+    histogram = self._cancellations.get(key)
+    if histogram is None:
+      histogram = self._get_or_add(self._cancellations, key)
+    histogram.observe(done - requested)
+
+  def add_in_flight(self, skill_id: str, op: str, delta: int) -> None:
+    """Adds delta to the number of operations in flight."""
+    key = (skill_id, op)
+    with self._lock:
+      self._in_flight[key] = self._in_flight.get(key, 0) + delta
+
+  def render(self) -> str:
+    """Returns the metrics in the OpenMetrics text format."""
+    with self._lock:
+      phases = sorted(self._phases.items())
+      in_flight = sorted(self._in_flight.items())
+      cancellations = sorted(self._cancellations.items())
+
+    lines = [
+        f'# TYPE {_PHASE_METRIC} histogram',
+        f'# UNIT {_PHASE_METRIC} seconds',
+        f'# HELP {_PHASE_METRIC} Time spent in each phase of skill'
+        ' operations.',
+    ]
+    for (skill_id, op, phase), histogram in phases:
+      _render_histogram(
+          lines,
+          _PHASE_METRIC,
+          _labels(skill=skill_id, op=op, phase=phase),
+          histogram,
+      )
+
+    lines += [
+        f'# TYPE {_IN_FLIGHT_METRIC} gauge',
+        f'# HELP {_IN_FLIGHT_METRIC} Number of skill operations in flight.',
+    ]
+    for (skill_id, op), count in in_flight:
+      lines.append(
+          f'{_IN_FLIGHT_METRIC}{{{_labels(skill=skill_id, op=op)}}} {count}'
+      )
+
+    lines += [
+        f'# TYPE {_CANCELLATION_METRIC} histogram',
+        f'# UNIT {_CANCELLATION_METRIC} seconds',
+        f'# HELP {_CANCELLATION_METRIC} Time from a cancellation request until'
+        ' the skill operation is done.',
+    ]
+    for (skill_id, op), histogram in cancellations:
+      _render_histogram(
+          lines,
+          _CANCELLATION_METRIC,
+          _labels(skill=skill_id, op=op),
+          histogram,
+      )
+
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+  def _get_or_add(self, histograms: dict, key: tuple) -> Histogram:
+    with self._lock:
+      histogram = histograms.get(key)
+      if histogram is None:
+        histogram = Histogram(self._latency_buckets)
+        histograms[key] = histogram
+      return histogram
+
+  def _emit_span(
+      self, skill_id: str, op: str, phase: str, start: float, end: float
+  ) -> None:
+    span = self._tracer.start_span(
+        f'skill.{op}.{phase}',
+        start_time=int((start + self._wall_time_offset) * 1e9),
+        attributes={'skill.id': skill_id, 'skill.op': op},
+    )
+    span.end(end_time=int((end + self._wall_time_offset) * 1e9))
+
+
+def start_http_server(
+    metrics: SkillServiceMetrics, port: int, address: str = 'localhost'
+) -> http.server.ThreadingHTTPServer:
+  """Serves the metrics over HTTP in the OpenMetrics text format.
+
+  The metrics are served at /metrics from a daemon thread. Call shutdown() on
+  the returned server to stop serving.
+
+  Args:
+    metrics: The metrics to serve.
+    port: The port to serve on, or 0 to pick a free port.
+    address: The address to serve on. Defaults to the local host only.
+
+  Returns:
+    The running server.
+  """
+
+  class Handler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):  # pylint: disable=invalid-name
+      if self.path.split('?', 1)[0] != '/metrics':
+        self.send_error(404)
+        return
+      body = metrics.render().encode('utf-8')
+      self.send_response(200)
+      self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE)
+      self.send_header('Content-Length', str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+      del format, args  # Scrapes are not logged.
+
+  server = http.server.ThreadingHTTPServer((address, port), Handler)
+  server.daemon_threads = True
+  threading.Thread(
+      target=server.serve_forever, name='skill_metrics_http', daemon=True
+  ).start()
+  logging.info(
+      'Serving skill service metrics on http://%s:%d/metrics',
+      address,
+      server.server_address[1],
+  )
+  return server
+
+
+def _labels(**labels: str) -> str:
+  return ','.join(
+      f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()
+  )
+
+
+def _escape_label_value(value: str) -> str:
+  return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _render_histogram(
+    lines: list[str], name: str, labels: str, histogram: Histogram
+) -> None:
+  buckets, count, total = histogram.snapshot()
+  for bound, cumulative in buckets:
+    le = '+Inf' if bound == float('inf') else repr(float(bound))
+    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+  lines.append(f'{name}_count{{{labels}}} {count}')
+  lines.append(f'{name}_sum{{{labels}}} {total!r}')
@@ -0,0 +1,167 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for skill_service_metrics."""
+
+import urllib.error
+import urllib.request
+
+from absl.testing import absltest
+from intrinsic.skills.internal import skill_service_metrics as metrics_lib
+
+# pylint: disable=protected-access
+
+
+class HistogramTest(absltest.TestCase):
+
+  def test_snapshot_of_empty_histogram(self):
+    histogram = metrics_lib.Histogram((0.1, 1.0))
+
+    self.assertEqual(
+        histogram.snapshot(), ([(0.1, 0), (1.0, 0), (float('inf'), 0)], 0, 0.0)
+    )
+
+  def test_snapshot_has_cumulative_counts(self):
+    histogram = metrics_lib.Histogram((0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 2.0, 3.0):
+      histogram.observe(value)
+    buckets, count, total = histogram.snapshot()
+
+    # Bounds are inclusive upper bounds.
+    self.assertEqual(buckets, [(0.1, 2), (1.0, 3), (float('inf'), 5)])
+    self.assertEqual(count, 5)
+    self.assertAlmostEqual(total, 5.65)
+
+  def test_folds_pending_values_when_full(self):
+    histogram = metrics_lib.Histogram((1.0,))
+
+    for _ in range(metrics_lib._MAX_PENDING_VALUES - 1):
+      histogram.observe(0.5)
+    self.assertLen(histogram._pending, metrics_lib._MAX_PENDING_VALUES - 1)
+    self.assertEqual(histogram._counts, [0, 0])
+
+    histogram.observe(2.0)
+
+    self.assertEmpty(histogram._pending)
+    self.assertEqual(
+        histogram._counts, [metrics_lib._MAX_PENDING_VALUES - 1, 1]
+    )
+
+  def test_snapshot_includes_folded_and_pending_values(self):
+    histogram = metrics_lib.Histogram((1.0,))
+
+    for _ in range(metrics_lib._MAX_PENDING_VALUES + 1):
+      histogram.observe(0.5)
+    _, count, total = histogram.snapshot()
+
+    self.assertEqual(count, metrics_lib._MAX_PENDING_VALUES + 1)
+    self.assertEqual(total, 0.5 * (metrics_lib._MAX_PENDING_VALUES + 1))
+    self.assertEmpty(histogram._pending)
+
+
+class SkillServiceMetricsTest(absltest.TestCase):
+
+  def test_render_without_samples(self):
+    metrics = metrics_lib.SkillServiceMetrics()
+
+    self.assertEqual(
+        metrics.render(),
+        '# TYPE skill_service_operation_phase_seconds histogram\n'
+        '# UNIT skill_service_operation_phase_seconds seconds\n'
+        '# HELP skill_service_operation_phase_seconds Time spent in each phase'
+        ' of skill operations.\n'
+        '# TYPE skill_service_operations_in_flight gauge\n'
+        '# HELP skill_service_operations_in_flight Number of skill operations'
+        ' in flight.\n'
+        '# TYPE skill_service_cancellation_latency_seconds histogram\n'
+        '# UNIT skill_service_cancellation_latency_seconds seconds\n'
+        '# HELP skill_service_cancellation_latency_seconds Time from a'
+        ' cancellation request until the skill operation is done.\n'
+        '# EOF\n',
+    )
+
+  def test_render(self):
+    metrics = metrics_lib.SkillServiceMetrics(latency_buckets=(0.5, 1.0))
+
+    self.assertEqual(
+        metrics.record(
+            'ai.intrinsic.my_skill',
+            metrics_lib.OP_EXECUTE,
+            metrics_lib.PHASE_SKILL,
+            start=10.0,
+            end=10.25,
+        ),
+        10.25,
+    )
+    metrics.add_in_flight('ai.intrinsic.my_skill', metrics_lib.OP_EXECUTE, 2)
+    metrics.add_in_flight('ai.intrinsic.my_skill', metrics_lib.OP_EXECUTE, -1)
+    metrics.record_cancellation(
+        'ai.intrinsic.my_skill',
+        metrics_lib.OP_EXECUTE,
+        requested=20.0,
+        done=22.0,
+    )
+
+    labels = 'skill="ai.intrinsic.my_skill",op="execute"'
+    phase_labels = f'{labels},phase="skill"'
+    lines = metrics.render().splitlines()
+    self.assertContainsSubsequence(
+        lines,
+        [
+            '# TYPE skill_service_operation_phase_seconds histogram',
+            'skill_service_operation_phase_seconds_bucket'
+            f'{{{phase_labels},le="0.5"}} 1',
+            'skill_service_operation_phase_seconds_bucket'
+            f'{{{phase_labels},le="1.0"}} 1',
+            'skill_service_operation_phase_seconds_bucket'
+            f'{{{phase_labels},le="+Inf"}} 1',
+            f'skill_service_operation_phase_seconds_count{{{phase_labels}}} 1',
+            f'skill_service_operation_phase_seconds_sum{{{phase_labels}}} 0.25',
+            '# TYPE skill_service_operations_in_flight gauge',
+            f'skill_service_operations_in_flight{{{labels}}} 1',
+            '# TYPE skill_service_cancellation_latency_seconds histogram',
+            'skill_service_cancellation_latency_seconds_bucket'
+            f'{{{labels},le="0.5"}} 0',
+            'skill_service_cancellation_latency_seconds_bucket'
+            f'{{{labels},le="1.0"}} 0',
+            'skill_service_cancellation_latency_seconds_bucket'
+            f'{{{labels},le="+Inf"}} 1',
+            f'skill_service_cancellation_latency_seconds_count{{{labels}}} 1',
+            f'skill_service_cancellation_latency_seconds_sum{{{labels}}} 2.0',
+            '# EOF',
+        ],
+    )
+    self.assertEqual(lines[-1], '# EOF')
+
+  def test_render_escapes_label_values(self):
+    metrics = metrics_lib.SkillServiceMetrics()
+
+    metrics.add_in_flight('a"b\\c\nd', metrics_lib.OP_PREVIEW, 1)
+
+    self.assertIn(
+        'skill_service_operations_in_flight{skill="a\\"b\\\\c\\nd",'
+        'op="preview"} 1',
+        metrics.render(),
+    )
+
+  def test_http_server_serves_metrics(self):
+    metrics = metrics_lib.SkillServiceMetrics()
+    metrics.add_in_flight('ai.intrinsic.my_skill', metrics_lib.OP_EXECUTE, 1)
+    server = metrics_lib.start_http_server(metrics, port=0)
+    self.addCleanup(server.server_close)
+    self.addCleanup(server.shutdown)
+    url = f'http://localhost:{server.server_address[1]}'
+
+    with urllib.request.urlopen(f'{url}/metrics', timeout=10) as response:
+      self.assertEqual(
+          response.headers['Content-Type'],
+          metrics_lib.OPENMETRICS_CONTENT_TYPE,
+      )
+      self.assertEqual(response.read().decode('utf-8'), metrics.render())
+    with self.assertRaises(urllib.error.HTTPError) as context:
+      urllib.request.urlopen(f'{url}/other', timeout=10)
+    self.assertEqual(context.exception.code, 404)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,153 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""A registry of world and motion planner clients shared across skill calls."""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import threading
+import time
+from typing import Callable, Optional
+
+from intrinsic.geometry.service import geometry_service_pb2_grpc
+from intrinsic.motion_planning import motion_planner_client
+from intrinsic.motion_planning.proto import motion_planner_service_pb2_grpc
+from intrinsic.world.proto import object_world_service_pb2_grpc
+from intrinsic.world.python import object_world_client
+
+# Default maximum number of worlds for which clients are kept.
+DEFAULT_MAX_WORLDS = 16
+
+# Default number of seconds after which the clients of an unused world are
+# dropped.
+DEFAULT_IDLE_TTL_SECONDS = 10 * 60
+
+
+@dataclasses.dataclass(frozen=True)
+class WorldClients:
+  """The clients for a single world.
+
+  Attributes:
+    object_world: A client for interacting with the object world.
+    motion_planner: A client for the motion planning service.
+  """
+
+  object_world: object_world_client.ObjectWorldClient
+  motion_planner: motion_planner_client.MotionPlannerClient
+
+
+class WorldClientRegistry:
+  """Creates and reuses clients per world id.
+
+  Skill calls on the same world share the same clients, so that state held by
+  the clients (e.g., the object world client's resource id index and optional
+  proto cache) carries over between consecutive skill calls. The registry keeps
+  clients for at most max_worlds worlds; when it is full, the clients of the
+  least recently used world are dropped. Clients of worlds that have not been
+  used for idle_ttl seconds are dropped as well.
+
+  Clients that have been dropped remain usable by the skill calls which hold
+  them. The registry is thread-safe.
+  """
+
+  def __init__(
+      self,
+      object_world_service: object_world_service_pb2_grpc.ObjectWorldServiceStub,
+      motion_planner_service: motion_planner_service_pb2_grpc.MotionPlannerServiceStub,
+      geometry_service: geometry_service_pb2_grpc.GeometryServiceStub,
+      *,
+      max_worlds: int = DEFAULT_MAX_WORLDS,
+      idle_ttl: Optional[float] = DEFAULT_IDLE_TTL_SECONDS,
+      object_world_proto_cache_ttl: Optional[float] = None,
+      clock: Callable[[], float] = time.monotonic,
+  ):
+    """Initializes the instance.
+
+    Args:
+      object_world_service: Stub of the object world service.
+      motion_planner_service: Stub of the motion planner service.
+      geometry_service: Stub of the geometry service.
+      max_worlds: The maximum number of worlds for which clients are kept.
+      idle_ttl: The number of seconds after which the clients of an unused
+        world are dropped, or None to keep them until room is needed.
+      object_world_proto_cache_ttl: If set, the object world clients cache
+        fetched object and frame protos for this many seconds. See
+        ObjectWorldClient.
+      clock: Monotonic clock returning seconds. Can be replaced for testing.
+
+    Raises:
+      ValueError: If max_worlds is not positive.
+    """
+    if max_worlds < 1:
+      raise ValueError(f'max_worlds must be positive, got {max_worlds}.')
+    self._object_world_service = object_world_service
+    self._motion_planner_service = motion_planner_service
+    self._geometry_service = geometry_service
+    self._max_worlds = max_worlds
+    self._idle_ttl = idle_ttl
+    self._object_world_proto_cache_ttl = object_world_proto_cache_ttl
+    self._clock = clock
+
+    self._lock = threading.Lock()
+    # Clients with the clock time of their last use, by world id, least
+    # recently used first.
+    self._clients: collections.OrderedDict[str, tuple[WorldClients, float]] = (
+        collections.OrderedDict()
+    )
+
+  def __len__(self) -> int:
+    with self._lock:
+      return len(self._clients)
+
+  def get(self, world_id: str) -> WorldClients:
+    """Returns the clients for a world, creating them if necessary.
+
+    Args:
+      world_id: The id of the world.
+
+    Returns:
+      The clients for the world.
+    """
+    now = self._clock()
+    with self._lock:
+      self._remove_idle_locked(now)
+
+      entry = self._clients.pop(world_id, None)
+      if entry is None:
+        clients = self._create_clients(world_id)
+        while len(self._clients) >= self._max_worlds:
+          self._clients.popitem(last=False)
+      else:
+        clients, _ = entry
+      self._clients[world_id] = (clients, now)
+
+    return clients
+
+  def clear(self) -> None:
+    """Drops all clients."""
+    with self._lock:
+      self._clients.clear()
+
+  def _create_clients(self, world_id: str) -> WorldClients:
+    return WorldClients(
+        object_world=object_world_client.ObjectWorldClient(
+            world_id,
+            self._object_world_service,
+            self._geometry_service,
+            proto_cache_ttl=self._object_world_proto_cache_ttl,
+        ),
+        motion_planner=motion_planner_client.MotionPlannerClient(
+            world_id, self._motion_planner_service
+        ),
+    )
+
+  def _remove_idle_locked(self, now: float) -> None:
+    """Drops idle clients. Requires self._lock to be held."""
+    if self._idle_ttl is None:
+      return
+    while self._clients:
+      _, last_used = next(iter(self._clients.values()))
+      if now - last_used < self._idle_ttl:
+        break
+      self._clients.popitem(last=False)
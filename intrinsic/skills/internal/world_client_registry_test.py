@@ -0,0 +1,99 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for world_client_registry."""
+
+from typing import Optional
+from unittest import mock
+
+from absl.testing import absltest
+from intrinsic.skills.internal import world_client_registry
+from intrinsic.util.testing import fake_clock
+
+
+class WorldClientRegistryTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._clock = fake_clock.FakeClock(100.0)
+
+  def _create_registry(
+      self, max_worlds: int = 2, idle_ttl: Optional[float] = 60.0
+  ) -> world_client_registry.WorldClientRegistry:
+    return world_client_registry.WorldClientRegistry(
+        mock.MagicMock(),
+        mock.MagicMock(),
+        mock.MagicMock(),
+        max_worlds=max_worlds,
+        idle_ttl=idle_ttl,
+        clock=self._clock,
+    )
+
+  def test_reuses_clients_of_world(self):
+    registry = self._create_registry()
+
+    clients = registry.get('world')
+
+    self.assertIs(registry.get('world'), clients)
+    self.assertIsNot(registry.get('other_world'), clients)
+    self.assertLen(registry, 2)
+
+  def test_drops_least_recently_used_world_when_full(self):
+    registry = self._create_registry(max_worlds=2)
+    world_a = registry.get('a')
+    world_b = registry.get('b')
+    # Uses world a, so that world b is the least recently used.
+    registry.get('a')
+
+    registry.get('c')
+
+    self.assertLen(registry, 2)
+    self.assertIs(registry.get('a'), world_a)
+    self.assertIsNot(registry.get('b'), world_b)
+
+  def test_drops_idle_worlds(self):
+    registry = self._create_registry(max_worlds=4, idle_ttl=60.0)
+    world_a = registry.get('a')
+    self._clock.now += 30.0
+    world_b = registry.get('b')
+
+    self._clock.now += 40.0
+    registry.get('c')
+
+    self.assertLen(registry, 2)
+    self.assertIs(registry.get('b'), world_b)
+    self.assertIsNot(registry.get('a'), world_a)
+
+  def test_use_refreshes_idle_time(self):
+    registry = self._create_registry(idle_ttl=60.0)
+    clients = registry.get('world')
+
+    self._clock.now += 40.0
+    registry.get('world')
+    self._clock.now += 40.0
+
+    self.assertIs(registry.get('world'), clients)
+
+  def test_keeps_idle_worlds_without_idle_ttl(self):
+    registry = self._create_registry(idle_ttl=None)
+    clients = registry.get('world')
+
+    self._clock.now += 1e6
+
+    self.assertIs(registry.get('world'), clients)
+
+  def test_clear_drops_all_worlds(self):
+    registry = self._create_registry()
+    clients = registry.get('world')
+
+    registry.clear()
+
+    self.assertEmpty(registry)
+    self.assertIsNot(registry.get('world'), clients)
+
+  def test_invalid_max_worlds_raises(self):
+    with self.assertRaises(ValueError):
+      self._create_registry(max_worlds=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
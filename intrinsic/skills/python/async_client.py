@@ -0,0 +1,59 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Awaitable access to the blocking clients provided to skills."""
+
+import asyncio
+import contextvars
+import functools
+from typing import Any, Generic, TypeVar
+
+TClient = TypeVar('TClient')
+
+
+class AsyncClient(Generic[TClient]):
+  """Awaitable view of a blocking client, for use in `async def` skills.
+
+  Calling a method through the view returns a coroutine, which runs the
+  blocking method on the executor of the running event loop, in a copy of the
+  caller's context (as with asyncio.to_thread). While the call is in flight,
+  the event loop continues to run other skill operations. E.g.:
+  ```
+  async def execute(self, request, context):
+    world = context.async_object_world
+    obj = await world.get_object('my_object')
+  ```
+
+  Non-callable attributes are returned unchanged.
+
+  Attributes:
+    client: The wrapped blocking client.
+  """
+
+  @property
+  def client(self) -> TClient:
+    return self._client
+
+  def __init__(self, client: TClient):
+    """Initializes the instance.
+
+    Args:
+      client: The blocking client to wrap.
+    """
+    self._client = client
+
+  def __getattr__(self, name: str) -> Any:
+    attribute = getattr(self._client, name)
+    if not callable(attribute):
+      return attribute
+
+    @functools.wraps(attribute)
+    async def call(*args, **kwargs):
+      loop = asyncio.get_running_loop()
+      # Context variables, e.g., the skill service's association of calls with
+      # the skill's cancellation, carry over to the executor thread.
+      context = contextvars.copy_context()
+      return await loop.run_in_executor(
+          None, functools.partial(context.run, attribute, *args, **kwargs)
+      )
+
+    return call
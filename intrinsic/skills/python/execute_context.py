@@ -7,6 +7,7 @@ from typing import Mapping
 
 from intrinsic.motion_planning import motion_planner_client
 from intrinsic.resources.proto import resource_handle_pb2
+from intrinsic.skills.python import async_client
 from intrinsic.skills.python import skill_canceller
 from intrinsic.skills.python import skill_logging_context
 from intrinsic.world.python import object_world_client
@@ -25,6 +26,10 @@ class ExecuteContext(abc.ABC):
   2) raise SkillCancelledError.
 
   Attributes:
+    async_motion_planner: An awaitable view of `motion_planner`, for skills
+      that implement `execute` as a coroutine function.
+    async_object_world: An awaitable view of `object_world`, for skills that
+      implement `execute` as a coroutine function.
     canceller: Supports cooperative cancellation of the skill.
     logging_context: The skill's logging context.
     motion_planner: A client for the motion planning service.
@@ -32,6 +37,18 @@ class ExecuteContext(abc.ABC):
     resource_handles: A map of resource names to handles.
   """
 
+  @property
+  def async_motion_planner(
+      self,
+  ) -> async_client.AsyncClient[motion_planner_client.MotionPlannerClient]:
+    return async_client.AsyncClient(self.motion_planner)
+
+  @property
+  def async_object_world(
+      self,
+  ) -> async_client.AsyncClient[object_world_client.ObjectWorldClient]:
+    return async_client.AsyncClient(self.object_world)
+
   @property
   @abc.abstractmethod
   def canceller(self) -> skill_canceller.SkillCanceller:
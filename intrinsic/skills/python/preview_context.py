@@ -5,6 +5,7 @@
 import abc
 
 from intrinsic.motion_planning import motion_planner_client
+from intrinsic.skills.python import async_client
 from intrinsic.skills.python import skill_canceller
 from intrinsic.skills.python import skill_logging_context
 from intrinsic.world.proto import object_world_updates_pb2
@@ -20,6 +21,11 @@ class PreviewContext(abc.ABC):
   and other services that a skill may use.
 
   Attributes:
+    async_motion_planner: An awaitable view of `motion_planner`, for skills
+      that implement `preview` as a coroutine function.
+    async_object_world: An awaitable view of `object_world`, for skills that
+      implement `preview` as a coroutine function. The same read-only note as
+      for `object_world` applies.
     canceller: Supports cooperative cancellation of the skill.
     logging_context: The logging context of the execution.
     motion_planner: A client for the motion planning service.
@@ -29,6 +35,18 @@ class PreviewContext(abc.ABC):
       (See further explanation in Skill.preview.)
   """
 
+  @property
+  def async_motion_planner(
+      self,
+  ) -> async_client.AsyncClient[motion_planner_client.MotionPlannerClient]:
+    return async_client.AsyncClient(self.motion_planner)
+
+  @property
+  def async_object_world(
+      self,
+  ) -> async_client.AsyncClient[object_world_client.ObjectWorldClient]:
+    return async_client.AsyncClient(self.object_world)
+
   @property
   @abc.abstractmethod
   def canceller(self) -> skill_canceller.SkillCanceller:
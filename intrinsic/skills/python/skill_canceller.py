@@ -3,8 +3,9 @@
 """Supports cooperative cancellation of skills by the skill service."""
 
 import abc
+import asyncio
 import threading
-from typing import Callable
+from typing import Any, Callable, Optional, Protocol
 
 
 class CallbackAlreadyRegisteredError(RuntimeError):
@@ -23,6 +24,16 @@ class SkillCancelledError(RuntimeError):
   """A skill was aborted due to a cancellation request."""
 
 
+class CancellableCall(Protocol):
+  """An outstanding call that can be cancelled, e.g., a grpc.Future."""
+
+  def cancel(self) -> bool:
+    ...
+
+  def add_done_callback(self, fn: Callable[[Any], None]) -> None:
+    ...
+
+
 class SkillCanceller(abc.ABC):
   """Supports cooperative cancellation of skills by the skill service.
 
@@ -33,10 +44,18 @@ class SkillCanceller(abc.ABC):
 
   The skill must call `ready` once it is ready to be cancelled.
 
-  A skill can implement cancellation in one of two ways:
+  A skill can implement cancellation in one of three ways:
   1) Poll `cancelled`, and safely cancel if and when it becomes true.
   2) Register a callback via `register_callback`. This callback will be invoked
      when the skill receives a cancellation request.
+  3) In a coroutine skill, await `wait_async`, e.g. in a task that runs
+     alongside the skill's work.
+
+  In addition, when the skill service cancels a skill, it cancels the calls
+  which the skill has outstanding on the clients of its context (e.g.,
+  `object_world` and `motion_planner`). A skill that is blocked in such a call
+  is woken up immediately by a SkillCancelledError. Calls made after
+  cancellation fail in the same way.
 
   Attributes:
     cancelled: True if the skill has received a cancellation request.
@@ -80,6 +99,21 @@ class SkillCanceller(abc.ABC):
       cancelled: True if the skill was cancelled.
     """
 
+  async def wait_async(self, timeout: Optional[float] = None) -> bool:
+    """Waits for the skill to be cancelled without blocking the event loop.
+
+    This default implementation waits on a worker thread of the running event
+    loop.
+
+    Args:
+      timeout: The maximum number of seconds to wait for cancellation, or None
+        to wait until the skill is cancelled.
+
+    Returns:
+      cancelled: True if the skill was cancelled.
+    """
+    return await asyncio.to_thread(self.wait, timeout)
+
 
 class SkillCancellationManager(SkillCanceller):
   """A SkillCanceller used by the skill service to cancel skills.
@@ -105,9 +139,38 @@ class SkillCancellationManager(SkillCanceller):
     self._ready = threading.Event()
     self._cancelled = threading.Event()
     self._callback = None
+    # Outstanding calls to cancel together with the skill.
+    self._calls: set[CancellableCall] = set()
+    # Futures of wait_async() calls, with the loops they belong to.
+    self._async_waiters: list[
+        tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]
+    ] = []
+
+  def add_cancellable_call(self, call: CancellableCall) -> None:
+    """Cancels an outstanding call when the skill is cancelled.
+
+    The call is forgotten once it is done. If the skill has already been
+    cancelled, the call is cancelled immediately.
+
+    Args:
+      call: The outstanding call.
+    """
+    with self._lock:
+      cancelled = self.cancelled
+      if not cancelled:
+        self._calls.add(call)
+    if cancelled:
+      call.cancel()
+      return
+    # Called immediately if the call is already done.
+    call.add_done_callback(self._discard_call)
 
   def cancel(self) -> None:
-    """Sets the cancelled flag and calls the callback (if set).
+    """Sets the cancelled flag and notifies the skill.
+
+    Outstanding calls are cancelled first, since they may keep the skill from
+    noticing the cancellation. Then wait_async() calls are woken up and finally
+    the callback (if set) is called.
 
     Raises:
       Exception: Any exception raised when calling the callback.
@@ -123,6 +186,15 @@ class SkillCancellationManager(SkillCanceller):
       self._cancelled.set()
 
       callback = self._callback
+      calls = self._calls
+      self._calls = set()
+      async_waiters = self._async_waiters
+      self._async_waiters = []
+
+    for call in calls:
+      call.cancel()
+    for loop, future in async_waiters:
+      loop.call_soon_threadsafe(_set_future_done, future)
 
     if callback is not None:
       callback()
@@ -171,6 +243,34 @@ class SkillCancellationManager(SkillCanceller):
     """
     return self._cancelled.wait(timeout)
 
+  async def wait_async(self, timeout: Optional[float] = None) -> bool:
+    """Waits for the skill to be cancelled without blocking the event loop.
+
+    Args:
+      timeout: The maximum number of seconds to wait for cancellation, or None
+        to wait until the skill is cancelled.
+
+    Returns:
+      cancelled: True if the skill was cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    waiter = (loop, future)
+    with self._lock:
+      if self.cancelled:
+        return True
+      self._async_waiters.append(waiter)
+
+    try:
+      await asyncio.wait_for(future, timeout)
+      return True
+    except asyncio.TimeoutError:
+      return False
+    finally:
+      with self._lock:
+        if waiter in self._async_waiters:
+          self._async_waiters.remove(waiter)
+
   def wait_for_ready(self) -> None:
     """Waits for the skill to be ready for cancellation.
 
@@ -182,3 +282,12 @@ class SkillCancellationManager(SkillCanceller):
       raise TimeoutError(
           "Timed out waiting for the skill to be ready for cancellation."
       )
+
+  def _discard_call(self, call: CancellableCall) -> None:
+    with self._lock:
+      self._calls.discard(call)
+
+
+def _set_future_done(future: asyncio.Future[None]) -> None:
+  if not future.done():
+    future.set_result(None)
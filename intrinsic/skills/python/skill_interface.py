@@ -38,6 +38,14 @@ class SkillExecuteInterface(abc.ABC, Generic[TParamsType, TResultType]):
 
   Implementations of the SkillExecuteInterface define how a skill behaves when
   it is executed.
+
+  `execute` and `preview` may be implemented as coroutine functions
+  (`async def`). The skill service then runs them on a shared event loop
+  instead of a dedicated thread, so that a skill which mostly awaits other
+  services does not occupy a thread while it waits. Such skills must not block
+  the event loop: they should use the awaitable clients of their context
+  (`async_object_world`, `async_motion_planner`) and await
+  `context.canceller.wait_async()` instead of calling `wait()`.
   """
 
   @abc.abstractmethod
@@ -186,3 +194,21 @@ class Skill(
   - SkillProjectInterface: Skill prediction.
   - SkillExecuteInterface: Skill execution.
   """
+
+  def is_healthy(self) -> bool:
+    """Returns whether this instance can be reused for further operations.
+
+    Only relevant if the skill service keeps a pool of pre-constructed
+    instances (see `instance_pool_size` in the skill manifest's Python
+    options). Pooled instances are reused across operations, one operation at a
+    time. The service calls this method whenever an operation that used the
+    instance has finished, and discards the instance if it returns False or
+    raises; a new instance is then constructed when one is needed. Since the
+    method may be called on the event loop of coroutine skills, it should
+    return quickly.
+
+    Returns:
+      True if the instance can be reused. The default implementation always
+      returns True.
+    """
+    return True
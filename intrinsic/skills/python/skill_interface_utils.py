@@ -31,6 +31,9 @@ def preview_via_execute(
   A skill should only use this util to implement `preview` if its `execute`
   method does not require resources or modify the object world.
 
+  If `execute` is a coroutine function, this returns the coroutine, and the
+  skill's `preview` should be a coroutine function that awaits it.
+
   Args:
     skill: The skill instance.
     request: The preview request.
@@ -3,7 +3,7 @@
 """Implementation of SkillRepository to store skills in a map."""
 
 import threading
-from typing import Dict, List
+from typing import Dict, List, Union
 
 from intrinsic.skills.internal import runtime_data as rd
 from intrinsic.skills.internal import single_skill_factory as skill_factory
@@ -86,6 +86,30 @@ class MapSkillRepository(repo.SkillRepository):
 
     return factory.get_skill_project(skill_alias)
 
+  @overrides(repo.SkillRepository)
+  def release_skill(
+      self,
+      skill_alias: str,
+      skill: Union[skl.SkillExecuteInterface, skl.SkillProjectInterface],
+  ) -> None:
+    """Hands back a skill instance once the caller no longer uses it.
+
+    Args:
+      skill_alias: The skill's alias.
+      skill: The instance to release.
+
+    Raises:
+      SkillNotFoundError if the skill is not found in the repository.
+    """
+    try:
+      factory = self._skill_factories[skill_alias]
+    except KeyError as err:
+      raise repo.InvalidSkillAliasError(
+          f'Skill with alias [{skill_alias}]" not found in the repository'
+      ) from err
+
+    factory.release_skill(skill_alias, skill)
+
   @overrides(repo.SkillRepository)
   def get_skill_runtime_data(self, skill_alias: str) -> rd.SkillRuntimeData:
     """Returns runtime data for the skill.
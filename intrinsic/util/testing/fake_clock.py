@@ -0,0 +1,19 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""A fake monotonic clock for tests."""
+
+
+class FakeClock:
+  """A clock which only advances when the test says so.
+
+  Can be passed wherever a clock like time.monotonic is injected.
+
+  Attributes:
+    now: The current time in seconds, which may be set by the test.
+  """
+
+  def __init__(self, now: float = 0.0):
+    self.now = now
+
+  def __call__(self) -> float:
+    return self.now
@@ -0,0 +1,246 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Defines the JointMirror class.
+
+The JointMirror keeps the joint positions of kinematic objects in the object
+world up to date without blocking the caller on world service RPCs. Updates are
+coalesced per kinematic object and pushed to the world on a background thread
+at a bounded rate, always sending only the most recent value.
+"""
+
+import dataclasses
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from intrinsic.icon.proto import service_pb2
+from intrinsic.world.python import object_world_client
+from intrinsic.world.python import object_world_ids
+from intrinsic.world.python import object_world_resources
+
+# Returns the latest joint positions or None if there is no new value.
+JointPositionSource = Callable[[], Optional[Sequence[float]]]
+
+
+def icon_joint_position_source(
+    get_status: Callable[[], service_pb2.GetStatusResponse],
+    part_name: str,
+) -> JointPositionSource:
+  """Returns a source reading the sensed joint positions of an ICON part.
+
+  Args:
+    get_status: Returns the ICON server status, e.g. the 'get_status' method of
+      an icon_api.Client.
+    part_name: The name of the ICON part whose joint positions are read.
+
+  Returns:
+    A joint position source for JointMirror.add_source().
+  """
+
+  def source() -> Optional[Sequence[float]]:
+    status = get_status()
+    if part_name not in status.part_status:
+      raise KeyError(f'ICON status does not contain the part "{part_name}".')
+    return [
+        joint_state.position_sensed
+        for joint_state in status.part_status[part_name].joint_states
+    ]
+
+  return source
+
+
+@dataclasses.dataclass
+class _JointUpdate:
+  kinematic_object: object_world_resources.KinematicObject
+  joint_positions: List[float]
+  joint_names: Optional[List[str]]
+
+
+class JointMirror:
+  """Mirrors joint positions into the object world at a bounded rate.
+
+  Joint positions can either be pushed with update_joint_positions(), which has
+  the same signature as ObjectWorldClient.update_joint_positions() but never
+  blocks, or pulled from sources (e.g. an ICON part) that are polled once per
+  update cycle. Multiple updates of the same kinematic object within one cycle
+  are coalesced into the latest one. The latest value is always sent, even if
+  it equals the previous one, since the joints may have been changed by other
+  writers or a reset of the world in between.
+
+  Usage:
+    with joint_mirror.JointMirror(world, max_rate_hz=20) as mirror:
+      mirror.add_source(
+          world.get_kinematic_object('robot'),
+          joint_mirror.icon_joint_position_source(icon.get_status, 'arm'),
+      )
+      ...
+
+  Attributes:
+    max_rate_hz: Maximum number of update cycles per second.
+    running: Whether the background thread is running.
+  """
+
+  def __init__(
+      self,
+      world: object_world_client.ObjectWorldClient,
+      *,
+      max_rate_hz: float = 30.0,
+  ):
+    """Creates a new JointMirror.
+
+    Args:
+      world: The world into which joint positions are mirrored.
+      max_rate_hz: Maximum number of update cycles per second.
+    """
+    if max_rate_hz <= 0:
+      raise ValueError(f'max_rate_hz must be positive, got {max_rate_hz}.')
+    self._world = world
+    self._max_rate_hz = max_rate_hz
+    self._lock = threading.Lock()
+    # Serializes update cycles, which may also be triggered by flush().
+    self._flush_lock = threading.Lock()
+    self._pending: Dict[
+        object_world_ids.ObjectWorldResourceId, _JointUpdate
+    ] = {}
+    self._sources: Dict[
+        object_world_ids.ObjectWorldResourceId,
+        Tuple[object_world_resources.KinematicObject, JointPositionSource],
+    ] = {}
+    self._stop_event = threading.Event()
+    self._wake_event = threading.Event()
+    self._thread: Optional[threading.Thread] = None
+
+  @property
+  def max_rate_hz(self) -> float:
+    return self._max_rate_hz
+
+  @property
+  def running(self) -> bool:
+    return self._thread is not None and self._thread.is_alive()
+
+  def update_joint_positions(
+      self,
+      kinematic_object: object_world_resources.KinematicObject,
+      joint_positions: Sequence[float],
+      joint_names: Optional[List[str]] = None,
+  ) -> None:
+    """Schedules an update of the joint positions of a kinematic object.
+
+    Returns immediately. The update is sent with the next update cycle unless
+    it is superseded by a newer update of the same object before that.
+
+    Args:
+      kinematic_object: The kinematic object that should be changed.
+      joint_positions: The new joint positions in radians (for revolute joints)
+        or meters (for prismatic joints).
+      joint_names: Optional joint names to correspond to the given
+        joint_positions.
+    """
+    with self._lock:
+      self._pending[kinematic_object.id] = _JointUpdate(
+          kinematic_object,
+          [float(position) for position in joint_positions],
+          None if joint_names is None else list(joint_names),
+      )
+    self._wake_event.set()
+
+  def add_source(
+      self,
+      kinematic_object: object_world_resources.KinematicObject,
+      source: JointPositionSource,
+  ) -> None:
+    """Polls source once per update cycle and mirrors the result.
+
+    Replaces any previously added source for the same kinematic object.
+
+    Args:
+      kinematic_object: The kinematic object to update.
+      source: Returns the latest joint positions or None.
+    """
+    with self._lock:
+      self._sources[kinematic_object.id] = (kinematic_object, source)
+
+  def remove_source(
+      self, kinematic_object: object_world_resources.KinematicObject
+  ) -> None:
+    """Stops polling the source of the given kinematic object."""
+    with self._lock:
+      self._sources.pop(kinematic_object.id, None)
+
+  def flush(self) -> None:
+    """Polls all sources and sends all pending updates synchronously."""
+    with self._flush_lock:
+      self._flush()
+
+  def _flush(self) -> None:
+    with self._lock:
+      sources = list(self._sources.values())
+    for kinematic_object, source in sources:
+      try:
+        joint_positions = source()
+      except Exception:  # pylint: disable=broad-except
+        logging.exception(
+            'Failed to read joint positions for "%s".', kinematic_object.name
+        )
+        continue
+      if joint_positions is not None:
+        self.update_joint_positions(kinematic_object, joint_positions)
+
+    with self._lock:
+      pending = self._pending
+      self._pending = {}
+    for update in pending.values():
+      try:
+        self._world.update_joint_positions(
+            update.kinematic_object,
+            joint_positions=update.joint_positions,
+            joint_names=update.joint_names,
+        )
+      except Exception:  # pylint: disable=broad-except
+        logging.exception(
+            'Failed to update joint positions of "%s".',
+            update.kinematic_object.name,
+        )
+
+  def start(self) -> None:
+    """Starts mirroring on a background thread."""
+    if self.running:
+      return
+    self._stop_event.clear()
+    self._thread = threading.Thread(
+        target=self._run, name='JointMirror', daemon=True
+    )
+    self._thread.start()
+
+  def stop(self) -> None:
+    """Stops the background thread after sending all pending updates."""
+    if self._thread is None:
+      return
+    self._stop_event.set()
+    self._wake_event.set()
+    self._thread.join()
+    self._thread = None
+    self.flush()
+
+  def __enter__(self) -> 'JointMirror':
+    self.start()
+    return self
+
+  def __exit__(self, *unused_exc_info) -> None:
+    self.stop()
+
+  def _run(self) -> None:
+    period = 1.0 / self._max_rate_hz
+    while not self._stop_event.is_set():
+      cycle_start = time.monotonic()
+      self.flush()
+      remaining = period - (time.monotonic() - cycle_start)
+      if remaining > 0:
+        self._stop_event.wait(remaining)
+      with self._lock:
+        has_sources = bool(self._sources)
+      if not has_sources:
+        # Nothing to poll, so sleep until the next pushed update.
+        self._wake_event.wait()
+      self._wake_event.clear()
@@ -0,0 +1,157 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for joint_mirror."""
+
+import threading
+from unittest import mock
+
+from absl.testing import absltest
+from intrinsic.icon.proto import part_status_pb2
+from intrinsic.icon.proto import service_pb2
+from intrinsic.world.proto import object_world_refs_pb2
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.python import joint_mirror
+from intrinsic.world.python import object_world_client
+from intrinsic.world.python import object_world_resources
+
+
+def _create_kinematic_object(
+    object_id: str,
+) -> object_world_resources.KinematicObject:
+  return object_world_resources.KinematicObject(
+      object_world_service_pb2.Object(
+          id=object_id,
+          name=f'object_{object_id}',
+          object_component=object_world_service_pb2.ObjectComponent(),
+          kinematic_object_component=object_world_service_pb2.KinematicObjectComponent(),
+      ),
+      mock.MagicMock(),
+  )
+
+
+class JointMirrorTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._world = mock.MagicMock()
+
+  def test_coalesces_updates_per_object(self):
+    mirror = joint_mirror.JointMirror(self._world)
+    robot = _create_kinematic_object('1')
+    gripper = _create_kinematic_object('2')
+
+    mirror.update_joint_positions(robot, [1.0, 2.0])
+    mirror.update_joint_positions(robot, [3.0, 4.0])
+    mirror.update_joint_positions(gripper, [0.5])
+    mirror.flush()
+
+    self._world.update_joint_positions.assert_has_calls(
+        [
+            mock.call(robot, joint_positions=[3.0, 4.0], joint_names=None),
+            mock.call(gripper, joint_positions=[0.5], joint_names=None),
+        ],
+        any_order=True,
+    )
+    self.assertEqual(self._world.update_joint_positions.call_count, 2)
+
+  def test_resends_unchanged_positions(self):
+    mirror = joint_mirror.JointMirror(self._world)
+    robot = _create_kinematic_object('1')
+
+    mirror.update_joint_positions(robot, [1.0])
+    mirror.flush()
+    # Another writer may change the joints in between, e.g. a world reset.
+    mirror.update_joint_positions(robot, [1.0])
+    mirror.flush()
+
+    self._world.update_joint_positions.assert_has_calls(
+        [mock.call(robot, joint_positions=[1.0], joint_names=None)] * 2
+    )
+    mirror.flush()
+    self.assertEqual(self._world.update_joint_positions.call_count, 2)
+
+  def test_failed_update_is_logged_and_retried_with_next_value(self):
+    mirror = joint_mirror.JointMirror(self._world)
+    robot = _create_kinematic_object('1')
+    self._world.update_joint_positions.side_effect = [RuntimeError(), None]
+
+    mirror.update_joint_positions(robot, [1.0])
+    with self.assertLogs(level='ERROR'):
+      mirror.flush()
+    mirror.update_joint_positions(robot, [1.0])
+    mirror.flush()
+
+    self.assertEqual(self._world.update_joint_positions.call_count, 2)
+
+  def test_polls_icon_source(self):
+    mirror = joint_mirror.JointMirror(self._world)
+    robot = _create_kinematic_object('1')
+    status = service_pb2.GetStatusResponse()
+    status.part_status['arm'].joint_states.extend([
+        part_status_pb2.PartJointState(position_sensed=0.1),
+        part_status_pb2.PartJointState(position_sensed=0.2),
+    ])
+
+    mirror.add_source(
+        robot,
+        joint_mirror.icon_joint_position_source(lambda: status, 'arm'),
+    )
+    mirror.flush()
+
+    self._world.update_joint_positions.assert_called_once_with(
+        robot, joint_positions=[0.1, 0.2], joint_names=None
+    )
+
+  def test_background_thread_sends_latest_value(self):
+    sent = threading.Event()
+    self._world.update_joint_positions.side_effect = (
+        lambda *args, **kwargs: sent.set()
+    )
+    robot = _create_kinematic_object('1')
+
+    with joint_mirror.JointMirror(self._world, max_rate_hz=100) as mirror:
+      self.assertTrue(mirror.running)
+      mirror.update_joint_positions(robot, [1.0])
+      self.assertTrue(sent.wait(timeout=10))
+
+    self.assertFalse(mirror.running)
+    self._world.update_joint_positions.assert_called_once_with(
+        robot, joint_positions=[1.0], joint_names=None
+    )
+
+  def test_mirror_keeps_proto_cache_of_other_objects_warm(self):
+    stub = mock.MagicMock()
+    stub.GetObject.side_effect = lambda request: object_world_service_pb2.Object(
+        id=request.object.id,
+        name=f'object_{request.object.id}',
+        object_component=object_world_service_pb2.ObjectComponent(),
+        kinematic_object_component=object_world_service_pb2.KinematicObjectComponent(),
+    )
+    world = object_world_client.ObjectWorldClient(
+        'world', stub, proto_cache_ttl=60.0
+    )
+    robot_reference = object_world_refs_pb2.ObjectReference(id='1')
+    gripper_reference = object_world_refs_pb2.ObjectReference(id='2')
+    robot = world.get_kinematic_object(robot_reference)
+    world.get_kinematic_object(gripper_reference)
+
+    mirror = joint_mirror.JointMirror(world)
+    for positions in ([1.0], [2.0], [3.0]):
+      mirror.update_joint_positions(robot, positions)
+      mirror.flush()
+    self.assertEqual(stub.UpdateObjectJoints.call_count, 3)
+
+    stub.GetObject.reset_mock()
+    world.get_kinematic_object(gripper_reference)
+    stub.GetObject.assert_not_called()
+    world.get_kinematic_object(robot_reference)
+    stub.GetObject.assert_called_once()
+    self.assertEqual(world.proto_cache_stats.invalidations, 0)
+
+  def test_invalid_rate_raises(self):
+    with self.assertRaises(ValueError):
+      joint_mirror.JointMirror(self._world, max_rate_hz=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
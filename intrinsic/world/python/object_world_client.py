@@ -6,8 +6,9 @@ The ObjectWorldClient is used to access all elements in the object world in
 Python.
 """
 
+import functools
 import re
-from typing import Dict, List, Optional, Tuple, Union, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union, cast
 
 import grpc
 from intrinsic.geometry.service import geometry_service_pb2
@@ -26,6 +27,7 @@ from intrinsic.world.proto import object_world_service_pb2
 from intrinsic.world.proto import object_world_service_pb2_grpc
 from intrinsic.world.proto import object_world_updates_pb2
 from intrinsic.world.python import object_world_ids
+from intrinsic.world.python import object_world_proto_cache
 from intrinsic.world.python import object_world_resources
 from intrinsic.world.robot_payload.python import robot_payload
 
@@ -48,6 +50,8 @@ INCLUDE_ALL_ENTITIES = object_world_refs_pb2.ObjectEntityFilter(
 
 ICON2_POSITION_PART_KEY = 'Icon2PositionPart'
 
+_T = TypeVar('_T', bound=Callable[..., Any])
+
 
 class ProductPartDoesNotExistError(ValueError):
   """A non-existent product part was specified."""
@@ -78,35 +82,63 @@ def _has_grpc_status(
   return cast(grpc.Call, grpc_error).code() == grpc_status
 
 
-def _get_path_from_root(
-    world_object: object_world_resources.WorldObject,
-    id_to_object: Dict[
-        object_world_ids.ObjectWorldResourceId,
-        object_world_resources.WorldObject,
-    ],
-) -> str:
-  """Returns the full path names of world_object based on a id_to_object dict.
+def _invalidates_proto_cache(method: _T) -> _T:
+  """Decorates ObjectWorldClient methods which modify the world.
+
+  The proto cache of the client is invalidated after the decorated method
+  returns or raises, since a failed request may still have modified the world.
 
   Args:
-    world_object: The object to get the full name for
-    id_to_object: A dict mapping of all objects in the world
+    method: The method to decorate.
 
   Returns:
-    A . joined full path that can be addressed from the world.
-    E.g., "" for the root object; "my_robot.my_gripper" for a gripper attached
-    to a robot object.
+    The decorated method.
   """
-  if world_object.id == object_world_ids.ROOT_OBJECT_ID:
-    return ''
 
-  names: List[str] = [world_object.name]
-  parent_id = world_object.parent_id
-  while parent_id != object_world_ids.ROOT_OBJECT_ID:
-    parent = id_to_object[parent_id]
-    names.append(parent.name)
-    parent_id = parent.parent_id
+  @functools.wraps(method)
+  def wrapper(self: 'ObjectWorldClient', *args, **kwargs):
+    try:
+      return method(self, *args, **kwargs)
+    finally:
+      self.invalidate_proto_cache()
+
+  return cast(_T, wrapper)
 
-  return '.'.join(reversed(names))
+
+def _get_paths_from_root(
+    objects: List[object_world_resources.WorldObject],
+) -> Dict[object_world_ids.ObjectWorldResourceId, str]:
+  """Returns the full path names of all given objects.
+
+  The path of every parent is computed only once and reused for all of its
+  descendants, so the cost is linear in the number of objects.
+
+  Args:
+    objects: All objects in the world.
+
+  Returns:
+    A dict mapping object ids to a . joined full path that can be addressed
+    from the world. E.g., "" for the root object; "my_robot.my_gripper" for a
+    gripper attached to a robot object.
+  """
+  id_to_object = {world_object.id: world_object for world_object in objects}
+  paths: Dict[object_world_ids.ObjectWorldResourceId, str] = {
+      object_world_ids.ROOT_OBJECT_ID: ''
+  }
+  for world_object in objects:
+    # Walk up until an object with a known path is reached.
+    unresolved: List[object_world_resources.WorldObject] = []
+    current = world_object
+    while current.id not in paths:
+      unresolved.append(current)
+      current = id_to_object[current.parent_id]
+    parent_path = paths[current.id]
+    for child in reversed(unresolved):
+      parent_path = (
+          f'{parent_path}.{child.name}' if parent_path else str(child.name)
+      )
+      paths[child.id] = parent_path
+  return paths
 
 
 class ObjectWorldClient:
@@ -116,8 +148,19 @@ class ObjectWorldClient:
   gives access to objects and frames in the world and returns Python objects for
   frames and objects.
 
+  Optionally, the client caches FULL object and frame protos it has fetched.
+  The cache is shared with all WorldObject and Frame instances created by the
+  client, is invalidated whenever the world is modified through the client and
+  its entries expire after a configurable time-to-live. Updates of joint
+  positions only invalidate the entry of the updated object, so that the cache
+  stays warm while they are mirrored continuously. Modifications by other
+  clients become visible once the entries expire or after calling
+  invalidate_proto_cache().
+
   Attributes:
     world_id: The world's ID.
+    proto_cache_stats: Hit and miss statistics of the proto cache or None if
+      caching is disabled.
   """
 
   @property
@@ -131,8 +174,27 @@ class ObjectWorldClient:
       geometry_service_stub: Optional[
           geometry_service_pb2_grpc.GeometryServiceStub
       ] = None,
+      *,
+      proto_cache_ttl: Optional[float] = None,
   ):
+    """Creates a new client.
+
+    Args:
+      world_id: The id of the world to access.
+      stub: The object world service stub.
+      geometry_service_stub: Optional geometry service stub; required for
+        register_geometry().
+      proto_cache_ttl: If set, fetched object and frame protos are cached for
+        this many seconds. Caching is disabled by default.
+    """
     self._stub: object_world_service_pb2_grpc.ObjectWorldServiceStub = stub
+    self._proto_cache: Optional[
+        object_world_proto_cache.ObjectWorldProtoCache
+    ] = (
+        object_world_proto_cache.ObjectWorldProtoCache(proto_cache_ttl)
+        if proto_cache_ttl is not None
+        else None
+    )
 
     if geometry_service_stub is not None:
       self._geometry_service_stub: (
@@ -142,6 +204,23 @@ class ObjectWorldClient:
       self._geometry_service_stub = None
 
     self._world_id: str = world_id
+    # Index of known resource ids; True for frames, False for objects. Ids are
+    # unique among objects and frames and never change their type. Cleared by
+    # reset(), which replaces all resources of the world.
+    self._id_is_frame: Dict[object_world_ids.ObjectWorldResourceId, bool] = {}
+
+  @property
+  def proto_cache_stats(
+      self,
+  ) -> Optional[object_world_proto_cache.CacheStats]:
+    if self._proto_cache is None:
+      return None
+    return self._proto_cache.stats
+
+  def invalidate_proto_cache(self) -> None:
+    """Drops all cached protos, e.g., after the world was modified elsewhere."""
+    if self._proto_cache is not None:
+      self._proto_cache.invalidate()
 
   def list_object_names(self) -> List[object_world_ids.WorldObjectName]:
     """Lists the names of all objects in the world service.
@@ -159,41 +238,86 @@ class ObjectWorldClient:
       A list with the fully qualified names of all objects in the world.
       E.g. ['robot', 'robot.gripper', 'robot.gripper.workpiece', 'workcell']
     """
-    objects = self.list_objects()
-    id_to_object = {world_object.id: world_object for world_object in objects}
-    result: List[str] = []
-    for world_object in objects:
-      if world_object.id == object_world_ids.ROOT_OBJECT_ID:
-        continue
-      result.append(_get_path_from_root(world_object, id_to_object))
-    return result
+    objects = self.list_objects(view=object_world_updates_pb2.ObjectView.BASIC)
+    paths = _get_paths_from_root(objects)
+    return [
+        paths[world_object.id]
+        for world_object in objects
+        if world_object.id != object_world_ids.ROOT_OBJECT_ID
+    ]
 
   def _create_object_with_auto_type(
-      self, world_object: object_world_service_pb2.Object
+      self,
+      world_object: object_world_service_pb2.Object,
+      view: object_world_updates_pb2.ObjectView = object_world_updates_pb2.ObjectView.FULL,
   ) -> object_world_resources.WorldObject:
     """Creates an object from a object proto."""
     return object_world_resources.create_object_with_auto_type(
-        world_object, self._stub
+        world_object, self._stub, view=view, proto_cache=self._proto_cache
     )
 
-  def list_objects(self) -> List[object_world_resources.WorldObject]:
+  def list_objects(
+      self,
+      *,
+      view: object_world_updates_pb2.ObjectView = object_world_updates_pb2.ObjectView.FULL,
+  ) -> List[object_world_resources.WorldObject]:
     """List all objects in the world service.
 
+    Args:
+      view: The view in which the objects are requested. With the BASIC view
+        only the data needed to navigate the object hierarchy (ids, names,
+        parents, children, frame names and poses) is transferred; the remaining
+        data of an individual object is fetched lazily on first access. This is
+        considerably faster for large worlds if only a few objects are
+        inspected in detail.
+
     Returns:
       A list with all objects in the world.
     """
-    response = self._stub.ListObjects(
-        object_world_service_pb2.ListObjectsRequest(
-            world_id=self._world_id,
-            view=object_world_updates_pb2.ObjectView.FULL,
-        )
-    )
-
+    world_objects, view = self._list_object_protos(view)
     return [
-        self._create_object_with_auto_type(world_object)
-        for world_object in response.objects
+        self._create_object_with_auto_type(world_object, view)
+        for world_object in world_objects
     ]
 
+  def _list_object_protos(
+      self, view: object_world_updates_pb2.ObjectView
+  ) -> Tuple[
+      List[object_world_service_pb2.Object], object_world_updates_pb2.ObjectView
+  ]:
+    """Returns the protos of all objects and the view they are in.
+
+    A cached FULL listing is returned regardless of the requested view, since
+    it is a superset of the BASIC view. FULL listings are added to the cache.
+
+    Args:
+      view: The requested view.
+    """
+    if self._proto_cache is not None:
+      world_objects = self._proto_cache.get_object_list()
+      if world_objects is not None:
+        return world_objects, object_world_updates_pb2.ObjectView.FULL
+      cache_version = self._proto_cache.version()
+
+    world_objects = list(
+        self._stub.ListObjects(
+            object_world_service_pb2.ListObjectsRequest(
+                world_id=self._world_id,
+                view=view,
+            )
+        ).objects
+    )
+    for world_object in world_objects:
+      self._id_is_frame[world_object.id] = False
+      for frame in world_object.frames:
+        self._id_is_frame[frame.id] = True
+    if (
+        self._proto_cache is not None
+        and view == object_world_updates_pb2.ObjectView.FULL
+    ):
+      self._proto_cache.put_object_list(world_objects, cache_version)
+    return world_objects, view
+
   @error_handling.retry_on_grpc_unavailable
   def _get_object_proto(
       self,
@@ -222,34 +346,90 @@ class ObjectWorldClient:
           'valid input types.'
       )
     request.view = object_world_updates_pb2.ObjectView.FULL
-    return self._stub.GetObject(request)
+    if self._proto_cache is None:
+      return self._stub.GetObject(request)
+    return self._proto_cache.get_object(
+        object_world_proto_cache.object_key(object_reference),
+        lambda: self._stub.GetObject(request),
+    )
 
   def _get_transform_node_by_id(
       self, resource_id: object_world_ids.ObjectWorldResourceId
   ) -> object_world_resources.TransformNode:
     """Returns a transform node by its id."""
     # If we are given an id, it could be either an object or a frame. Since
-    # there is no dedicated endpoint for this yet, first try to get as an
-    # object, else try getting as a frame.
+    # there is no dedicated endpoint for this yet, consult the index of known
+    # ids first, else try getting it as an object and as a frame in parallel.
+    is_frame = self._id_is_frame.get(resource_id)
+    if is_frame is not None:
+      try:
+        if is_frame:
+          return self.get_frame(
+              object_world_refs_pb2.FrameReference(id=resource_id)
+          )
+        return self.get_object(
+            object_world_refs_pb2.ObjectReference(id=resource_id)
+        )
+      except grpc.RpcError as error:
+        if not _has_grpc_status(error, grpc.StatusCode.NOT_FOUND):
+          raise
+        # The resource has been deleted since it was indexed.
+        self._id_is_frame.pop(resource_id, None)
+
+    node = self._get_object_or_frame_concurrently(resource_id)
+    self._id_is_frame[resource_id] = isinstance(
+        node, object_world_resources.Frame
+    )
+    return node
+
+  @error_handling.retry_on_grpc_unavailable
+  def _get_object_or_frame_concurrently(
+      self, resource_id: object_world_ids.ObjectWorldResourceId
+  ) -> object_world_resources.TransformNode:
+    """Requests an id both as object and as frame and returns the match."""
+    cache_version = (
+        self._proto_cache.version() if self._proto_cache is not None else None
+    )
+    object_future = self._stub.GetObject.future(
+        object_world_service_pb2.GetObjectRequest(
+            world_id=self._world_id,
+            object=object_world_refs_pb2.ObjectReference(id=resource_id),
+            view=object_world_updates_pb2.ObjectView.FULL,
+        )
+    )
+    frame_future = self._stub.GetFrame.future(
+        object_world_service_pb2.GetFrameRequest(
+            world_id=self._world_id,
+            frame=object_world_refs_pb2.FrameReference(id=resource_id),
+        )
+    )
+
     try:
-      return self.get_object(
-          object_world_refs_pb2.ObjectReference(id=resource_id)
-      )
+      object_proto = object_future.result()
     except grpc.RpcError as object_error:
       if not _has_grpc_status(object_error, grpc.StatusCode.NOT_FOUND):
+        frame_future.cancel()
         raise
+    else:
+      frame_future.cancel()
+      if self._proto_cache is not None:
+        self._proto_cache.put_object(object_proto, cache_version)
+      return self._create_object_with_auto_type(object_proto)
 
-      try:
-        return self.get_frame(
-            object_world_refs_pb2.FrameReference(id=resource_id)
-        )
-      except grpc.RpcError as frame_error:
-        if not _has_grpc_status(frame_error, grpc.StatusCode.NOT_FOUND):
-          raise
-        raise LookupError(
-            'No object or frame corresponding to the '
-            f'id "{resource_id}" was found.'
-        ) from frame_error
+    try:
+      frame_proto = frame_future.result()
+    except grpc.RpcError as frame_error:
+      if not _has_grpc_status(frame_error, grpc.StatusCode.NOT_FOUND):
+        raise
+      raise LookupError(
+          'No object or frame corresponding to the '
+          f'id "{resource_id}" was found.'
+      ) from frame_error
+    if self._proto_cache is not None:
+      self._proto_cache.put_frame(frame_proto, cache_version)
+    return object_world_resources.Frame(
+        frame_proto, self._stub, proto_cache=self._proto_cache
+    )
 
   def _get_transform_node_by_name(
       self, reference: object_world_refs_pb2.TransformNodeReferenceByName
@@ -364,7 +544,9 @@ class ObjectWorldClient:
             )
         )
     return object_world_resources.KinematicObject(
-        self._get_object_proto(object_reference), self._stub
+        self._get_object_proto(object_reference),
+        self._stub,
+        proto_cache=self._proto_cache,
     )
 
   @error_handling.retry_on_grpc_unavailable
@@ -425,8 +607,15 @@ class ObjectWorldClient:
       return self.get_object(object_name).get_frame(frame_reference)
     else:
       raise TypeError('get_frame is called with the wrong arguments.')
+    if self._proto_cache is None:
+      frame_proto = self._stub.GetFrame(request)
+    else:
+      frame_proto = self._proto_cache.get_frame(
+          object_world_proto_cache.frame_key(request.frame),
+          lambda: self._stub.GetFrame(request),
+      )
     return object_world_resources.Frame(
-        self._stub.GetFrame(request), self._stub
+        frame_proto, self._stub, proto_cache=self._proto_cache
     )
 
   @error_handling.retry_on_grpc_unavailable
@@ -455,6 +644,7 @@ class ObjectWorldClient:
     )
     return math_proto_conversion.pose_from_proto(response.a_t_b)
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def update_transform(
       self,
@@ -508,6 +698,7 @@ class ObjectWorldClient:
     """Returns the gRPC stub."""
     return self._stub
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def update_object_name(
       self,
@@ -539,6 +730,7 @@ class ObjectWorldClient:
         )
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def update_frame_name(
       self,
@@ -581,16 +773,23 @@ class ObjectWorldClient:
         joint_positions must either be empty or match the size of the
         joint_positions list.
     """
-    self._stub.UpdateObjectJoints(
-        object_world_updates_pb2.UpdateObjectJointsRequest(
-            world_id=self._world_id,
-            object=kinematic_object.reference,
-            joint_positions=joint_positions,
-            joint_names=[] if joint_names is None else joint_names,
-            view=object_world_updates_pb2.ObjectView.BASIC,
-        )
-    )
+    try:
+      self._stub.UpdateObjectJoints(
+          object_world_updates_pb2.UpdateObjectJointsRequest(
+              world_id=self._world_id,
+              object=kinematic_object.reference,
+              joint_positions=joint_positions,
+              joint_names=[] if joint_names is None else joint_names,
+              view=object_world_updates_pb2.ObjectView.BASIC,
+          )
+      )
+    finally:
+      # Joint positions are part of the object's own proto only, so the cached
+      # protos of other objects and of frames stay valid.
+      if self._proto_cache is not None:
+        self._proto_cache.invalidate_object(kinematic_object.id)
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def update_joint_application_limits(
       self,
@@ -613,6 +812,7 @@ class ObjectWorldClient:
         )
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def update_kinematic_object_cartesian_limits(
       self,
@@ -633,6 +833,7 @@ class ObjectWorldClient:
         )
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def update_kinematic_object_payload(
       self,
@@ -648,6 +849,7 @@ class ObjectWorldClient:
         )
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def update_joint_system_limits(
       self,
@@ -670,6 +872,7 @@ class ObjectWorldClient:
         )
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def _call_reparent_object(
       self,
@@ -758,6 +961,7 @@ class ObjectWorldClient:
         object_world_refs_pb2.ObjectEntityFilter(include_final_entity=True),
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def _call_toggle_collisions(
       self,
@@ -864,12 +1068,9 @@ class ObjectWorldClient:
     """Returns name to reference dicts for both objects and frames under the root object namespace."""
     # This is a special helper method to enable __dir__ and __get_attr__ with
     # only one Rpc.
-    world_objects_proto = self._stub.ListObjects(
-        object_world_service_pb2.ListObjectsRequest(
-            world_id=self._world_id,
-            view=object_world_updates_pb2.ObjectView.BASIC,
-        )
-    ).objects
+    world_objects_proto, _ = self._list_object_protos(
+        object_world_updates_pb2.ObjectView.BASIC
+    )
 
     object_name_to_ref: Dict[
         object_world_ids.WorldObjectName, object_world_refs_pb2.ObjectReference
@@ -901,12 +1102,9 @@ class ObjectWorldClient:
   @error_handling.retry_on_grpc_unavailable
   def _get_object_names(self) -> List[object_world_ids.WorldObjectName]:
     """Returns the object names and the root object with a single Rpc."""
-    world_objects_proto = self._stub.ListObjects(
-        object_world_service_pb2.ListObjectsRequest(
-            world_id=self._world_id,
-            view=object_world_updates_pb2.ObjectView.BASIC,
-        )
-    ).objects
+    world_objects_proto, _ = self._list_object_protos(
+        object_world_updates_pb2.ObjectView.BASIC
+    )
 
     object_names: List[object_world_ids.WorldObjectName] = list()
 
@@ -1037,6 +1235,7 @@ class ObjectWorldClient:
     )
     return '\n'.join(lines)
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def delete_object(
       self,
@@ -1056,6 +1255,7 @@ class ObjectWorldClient:
         )
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def delete_frame(
       self, frame: object_world_resources.Frame, *, force: bool = False
@@ -1072,6 +1272,7 @@ class ObjectWorldClient:
         )
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def _call_create_frame(
       self, request: object_world_updates_pb2.CreateFrameRequest
@@ -1112,9 +1313,12 @@ class ObjectWorldClient:
     else:
       raise TypeError(f'Cannot use {parent} as parent frame or object.')
     return object_world_resources.Frame(
-        world_frame=self._call_create_frame(request), stub=self._stub
+        world_frame=self._call_create_frame(request),
+        stub=self._stub,
+        proto_cache=self._proto_cache,
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def _call_reparent_frame(
       self, request: object_world_updates_pb2.ReparentFrameRequest
@@ -1153,9 +1357,12 @@ class ObjectWorldClient:
     else:
       raise TypeError(f'Cannot use {parent} as parent Frame or WorldObject.')
     object_world_resources.Frame(
-        world_frame=self._call_reparent_frame(request), stub=self._stub
+        world_frame=self._call_reparent_frame(request),
+        stub=self._stub,
+        proto_cache=self._proto_cache,
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def _call_create_object(
       self, request: object_world_updates_pb2.CreateObjectRequest
@@ -1280,6 +1487,7 @@ class ObjectWorldClient:
 
     self._call_create_object(request=req)
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
   def batch_update(
       self, updates: object_world_updates_pb2.ObjectWorldUpdates
@@ -1297,12 +1505,9 @@ class ObjectWorldClient:
         )
     )
 
+  @_invalidates_proto_cache
   @error_handling.retry_on_grpc_unavailable
-  def reset(self) -> None:
-    """Restores the initial world from the world service.
-
-    Overrides the current belief world.
-    """
+  def _call_clone_init_world(self) -> None:
     self._stub.CloneWorld(
         object_world_service_pb2.CloneWorldRequest(
             world_id='init_world',
@@ -1310,3 +1515,39 @@ class ObjectWorldClient:
             allow_overwrite=True,
         )
     )
+
+  def reset(self, *, warm: bool = False) -> None:
+    """Restores the initial world from the world service.
+
+    Overrides the current belief world.
+
+    Args:
+      warm: If True, the proto cache is refilled right after the reset with a
+        FULL listing of the new world. A single ListObjects request returns all
+        objects together with their frames and poses, so subsequent object and
+        frame lookups, listings and attribute accesses are served locally.
+        Requires the client to be created with a proto_cache_ttl.
+
+    Raises:
+      ValueError: If warm is True but the client has no proto cache.
+    """
+    if warm and self._proto_cache is None:
+      raise ValueError(
+          'ObjectWorldClient.reset(warm=True) requires a client created with'
+          ' a proto_cache_ttl.'
+      )
+    self._call_clone_init_world()
+    self._id_is_frame.clear()
+    if warm:
+      self.warm_proto_cache()
+
+  @error_handling.retry_on_grpc_unavailable
+  def warm_proto_cache(self) -> None:
+    """Fills the proto cache with a FULL listing of all objects and frames.
+
+    Has no effect if the client has no proto cache.
+    """
+    if self._proto_cache is None:
+      return
+    self._proto_cache.invalidate()
+    self._list_object_protos(object_world_updates_pb2.ObjectView.FULL)
@@ -5,12 +5,33 @@
 from unittest import mock
 
 from absl.testing import absltest
+import grpc
 from intrinsic.world.proto import geometry_component_pb2
 from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.proto import object_world_updates_pb2
 from intrinsic.world.python import object_world_client
 from intrinsic.world.python import object_world_ids
 
 
+class _RpcError(grpc.RpcError, grpc.Call):
+
+  def __init__(self, code: grpc.StatusCode):
+    super().__init__()
+    self._code = code
+
+  def code(self) -> grpc.StatusCode:
+    return self._code
+
+
+def _future(result=None, error=None) -> mock.MagicMock:
+  future = mock.MagicMock()
+  if error is not None:
+    future.result.side_effect = error
+  else:
+    future.result.return_value = result
+  return future
+
+
 class ObjectWorldClientTest(absltest.TestCase):
 
   def setUp(self):
@@ -65,6 +86,244 @@ class ObjectWorldClientTest(absltest.TestCase):
     self.assertEqual(world_client.my_object.name, 'my_object')
     self.assertEqual(world_client.my_object.id, '15')
 
+  def test_list_objects_with_basic_view(self):
+    self._stub.ListObjects.return_value = (
+        object_world_service_pb2.ListObjectsResponse(
+            objects=[
+                object_world_service_pb2.Object(
+                    world_id='world', name='my_object', id='15'
+                )
+            ]
+        )
+    )
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub
+    )
+
+    objects = world_client.list_objects(
+        view=object_world_updates_pb2.ObjectView.BASIC
+    )
+
+    self.assertEqual([o.name for o in objects], ['my_object'])
+    self._stub.ListObjects.assert_called_once_with(
+        object_world_service_pb2.ListObjectsRequest(
+            world_id='world', view=object_world_updates_pb2.ObjectView.BASIC
+        )
+    )
+    self._stub.GetObject.assert_not_called()
+
+  def test_list_object_full_paths(self):
+    def object_proto(name, object_id, parent_id):
+      return object_world_service_pb2.Object(
+          world_id='world',
+          name=name,
+          id=object_id,
+          parent=object_world_service_pb2.IdAndName(id=parent_id),
+      )
+
+    self._stub.ListObjects.return_value = (
+        object_world_service_pb2.ListObjectsResponse(
+            objects=[
+                object_proto('workpiece', '3', '2'),
+                object_proto('root', object_world_ids.ROOT_OBJECT_ID, ''),
+                object_proto('robot', '1', object_world_ids.ROOT_OBJECT_ID),
+                object_proto('gripper', '2', '1'),
+                object_proto('workcell', '4', object_world_ids.ROOT_OBJECT_ID),
+            ]
+        )
+    )
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub
+    )
+
+    self.assertEqual(
+        world_client.list_object_full_paths(),
+        ['robot.gripper.workpiece', 'robot', 'robot.gripper', 'workcell'],
+    )
+    self._stub.GetObject.assert_not_called()
+
+  def test_get_object_with_proto_cache(self):
+    self._stub.GetObject.return_value = self._create_object_proto(
+        name='my_object', object_id='15', world_id='world'
+    )
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub, proto_cache_ttl=60
+    )
+
+    world_client.get_object(object_world_ids.WorldObjectName('my_object'))
+    world_client.get_object(object_world_ids.WorldObjectName('my_object'))
+
+    self._stub.GetObject.assert_called_once()
+    self.assertEqual(world_client.proto_cache_stats.hits, 1)
+    self.assertEqual(world_client.proto_cache_stats.misses, 1)
+
+  def test_world_update_invalidates_proto_cache(self):
+    self._stub.GetObject.return_value = self._create_object_proto(
+        name='my_object', object_id='15', world_id='world'
+    )
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub, proto_cache_ttl=60
+    )
+
+    my_object = world_client.get_object(
+        object_world_ids.WorldObjectName('my_object')
+    )
+    world_client.update_object_name(
+        my_object, object_world_ids.WorldObjectName('new_name')
+    )
+    world_client.get_object(object_world_ids.WorldObjectName('my_object'))
+
+    self.assertEqual(self._stub.GetObject.call_count, 2)
+
+  def test_proto_cache_is_disabled_by_default(self):
+    self._stub.GetObject.return_value = self._create_object_proto(
+        name='my_object', object_id='15', world_id='world'
+    )
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub
+    )
+
+    world_client.get_object(object_world_ids.WorldObjectName('my_object'))
+    world_client.get_object(object_world_ids.WorldObjectName('my_object'))
+
+    self.assertEqual(self._stub.GetObject.call_count, 2)
+    self.assertIsNone(world_client.proto_cache_stats)
+
+  def test_reset_with_warm_proto_cache(self):
+    self._stub.ListObjects.return_value = (
+        object_world_service_pb2.ListObjectsResponse(
+            objects=[
+                self._create_object_proto(
+                    name='my_object', object_id='15', world_id='world'
+                )
+            ]
+        )
+    )
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub, proto_cache_ttl=60
+    )
+
+    world_client.reset(warm=True)
+
+    self._stub.CloneWorld.assert_called_once()
+    self._stub.ListObjects.assert_called_once_with(
+        object_world_service_pb2.ListObjectsRequest(
+            world_id='world', view=object_world_updates_pb2.ObjectView.FULL
+        )
+    )
+    self.assertEqual(world_client.my_object.id, '15')
+    self.assertEqual(
+        world_client.get_object(
+            object_world_ids.WorldObjectName('my_object')
+        ).id,
+        '15',
+    )
+    self.assertEqual(world_client.list_object_names(), ['my_object'])
+    self._stub.ListObjects.assert_called_once()
+    self._stub.GetObject.assert_not_called()
+
+  def test_reset_with_warm_requires_proto_cache(self):
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub
+    )
+
+    with self.assertRaises(ValueError):
+      world_client.reset(warm=True)
+    self._stub.CloneWorld.assert_not_called()
+
+  def test_get_transform_node_by_id_requests_object_and_frame_concurrently(
+      self,
+  ):
+    self._stub.GetObject.future.return_value = _future(
+        error=_RpcError(grpc.StatusCode.NOT_FOUND)
+    )
+    self._stub.GetFrame.future.return_value = _future(
+        object_world_service_pb2.Frame(id='16', name='my_frame')
+    )
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub
+    )
+
+    node = world_client.get_transform_node(
+        object_world_ids.ObjectWorldResourceId('16')
+    )
+
+    self.assertEqual(node.name, 'my_frame')
+    self._stub.GetObject.future.assert_called_once()
+    self._stub.GetFrame.future.assert_called_once()
+
+  def test_get_transform_node_by_id_not_found(self):
+    self._stub.GetObject.future.return_value = _future(
+        error=_RpcError(grpc.StatusCode.NOT_FOUND)
+    )
+    self._stub.GetFrame.future.return_value = _future(
+        error=_RpcError(grpc.StatusCode.NOT_FOUND)
+    )
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub
+    )
+
+    with self.assertRaises(LookupError):
+      world_client.get_transform_node(
+          object_world_ids.ObjectWorldResourceId('16')
+      )
+
+  def test_get_transform_node_by_id_uses_index_from_listing(self):
+    my_object = self._create_object_proto(
+        name='my_object', object_id='15', world_id='world'
+    )
+    my_object.frames.append(
+        object_world_service_pb2.Frame(id='16', name='my_frame')
+    )
+    self._stub.ListObjects.return_value = (
+        object_world_service_pb2.ListObjectsResponse(objects=[my_object])
+    )
+    self._stub.GetFrame.return_value = object_world_service_pb2.Frame(
+        id='16', name='my_frame'
+    )
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub
+    )
+
+    world_client.list_objects()
+    node = world_client.get_transform_node(
+        object_world_ids.ObjectWorldResourceId('16')
+    )
+
+    self.assertEqual(node.name, 'my_frame')
+    self._stub.GetFrame.assert_called_once()
+    self._stub.GetObject.assert_not_called()
+    self._stub.GetObject.future.assert_not_called()
+
+  def test_reset_clears_index_of_resource_ids(self):
+    my_object = self._create_object_proto(
+        name='my_object', object_id='15', world_id='world'
+    )
+    my_object.frames.append(
+        object_world_service_pb2.Frame(id='16', name='my_frame')
+    )
+    self._stub.ListObjects.return_value = (
+        object_world_service_pb2.ListObjectsResponse(objects=[my_object])
+    )
+    self._stub.GetObject.future.return_value = _future(
+        error=_RpcError(grpc.StatusCode.NOT_FOUND)
+    )
+    self._stub.GetFrame.future.return_value = _future(
+        object_world_service_pb2.Frame(id='16', name='my_frame')
+    )
+    world_client = object_world_client.ObjectWorldClient(
+        'world', self._stub, self._geometry_service_stub
+    )
+    world_client.list_objects()
+
+    world_client.reset()
+    world_client.get_transform_node(
+        object_world_ids.ObjectWorldResourceId('16')
+    )
+
+    self._stub.GetObject.future.assert_called_once()
+    self._stub.GetFrame.future.assert_called_once()
+
   def test_create_geometry(self):
     self._stub.CreateObject.return_value = self._create_object_proto(
         name='foo', object_id='23', world_id='world'
@@ -0,0 +1,423 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Defines a read-through cache for object and frame protos of a world.
+
+The cache is shared by an ObjectWorldClient and all the WorldObject and Frame
+instances it creates, so that navigating the world (e.g. via 'parent', child
+objects or 'get_frame') does not re-fetch the same protos from the world
+service over and over again.
+
+Entries expire after a configurable time-to-live. Additionally, every cache
+has a generation counter which is incremented whenever the world is modified
+through the owning client. Entries from an older generation are treated as
+misses, which makes invalidating the whole cache an O(1) operation. Updates
+which only modify a single object (e.g., of its joint positions) invalidate
+just the entries of that object and its frames.
+"""
+
+import dataclasses
+import threading
+import time
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from intrinsic.resources.proto import resource_handle_pb2
+from intrinsic.world.proto import object_world_refs_pb2
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.python import object_world_ids
+
+_Proto = Union[object_world_service_pb2.Object, object_world_service_pb2.Frame]
+
+# Objects and frames share the same id namespace, but are cached separately so
+# that looking up a frame id as an object (or vice versa) is never a hit.
+_OBJECT = 'object'
+_FRAME = 'frame'
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStats:
+  """Hit and miss statistics of an ObjectWorldProtoCache.
+
+  Attributes:
+    hits: Number of lookups that were served from the cache.
+    misses: Number of lookups that had to be fetched from the world service.
+    invalidations: Number of times the cache was invalidated.
+    hit_rate: Fraction of lookups served from the cache.
+  """
+
+  hits: int = 0
+  misses: int = 0
+  invalidations: int = 0
+
+  @property
+  def hit_rate(self) -> float:
+    lookups = self.hits + self.misses
+    return self.hits / lookups if lookups else 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheVersion:
+  """The state of an ObjectWorldProtoCache before protos are fetched.
+
+  Take the version with ObjectWorldProtoCache.version() before fetching protos
+  to put into the cache. The protos are dropped if the cache was invalidated
+  after the version was taken, since they may predate the modification.
+
+  Attributes:
+    generation: The generation of the cache.
+    object_invalidations: The number of invalidations of single objects.
+  """
+
+  generation: int
+  object_invalidations: int
+
+
+def object_key(
+    object_reference: Union[
+        object_world_ids.WorldObjectName,
+        object_world_refs_pb2.ObjectReference,
+        resource_handle_pb2.ResourceHandle,
+    ],
+) -> Optional[Hashable]:
+  """Returns the cache key for an object reference.
+
+  Args:
+    object_reference: The name, reference or resource handle of an object.
+
+  Returns:
+    A hashable key or None if the reference cannot be used for caching.
+  """
+  if isinstance(object_reference, str):
+    return ('object_name', str(object_reference))
+  elif isinstance(object_reference, object_world_refs_pb2.ObjectReference):
+    if object_reference.HasField('id'):
+      return (_OBJECT, object_reference.id)
+    elif object_reference.HasField('by_name'):
+      return ('object_name', object_reference.by_name.object_name)
+  elif isinstance(object_reference, resource_handle_pb2.ResourceHandle):
+    return ('resource_handle', object_reference.name)
+  return None
+
+
+def frame_key(
+    frame_reference: object_world_refs_pb2.FrameReference,
+) -> Optional[Hashable]:
+  """Returns the cache key for a frame reference.
+
+  Args:
+    frame_reference: The reference of a frame.
+
+  Returns:
+    A hashable key or None if the reference cannot be used for caching.
+  """
+  if frame_reference.HasField('id'):
+    return (_FRAME, frame_reference.id)
+  elif frame_reference.HasField('by_name'):
+    return (
+        'frame_name',
+        frame_reference.by_name.object_name,
+        frame_reference.by_name.frame_name,
+    )
+  return None
+
+
+class ObjectWorldProtoCache:
+  """A thread-safe read-through cache for object and frame protos.
+
+  Protos are stored by their type and id. Lookups by name are resolved through
+  an alias index which is populated whenever a proto is stored. Returned protos
+  are shared between all callers and must not be modified.
+  """
+
+  def __init__(
+      self,
+      ttl: float,
+      *,
+      clock: Callable[[], float] = time.monotonic,
+  ):
+    """Creates a new cache.
+
+    Args:
+      ttl: Time in seconds after which a cached proto is fetched again.
+      clock: Monotonic clock returning seconds. Can be replaced for testing.
+    """
+    if ttl <= 0:
+      raise ValueError(f'The cache ttl must be positive, got {ttl}.')
+    self._ttl = ttl
+    self._clock = clock
+    self._lock = threading.Lock()
+    self._generation = 0
+    # Maps (type, id) to (generation, expiry time, proto).
+    self._entries: Dict[Tuple[str, str], Tuple[int, float, _Proto]] = {}
+    # Maps name based keys to (type, id).
+    self._aliases: Dict[Hashable, Tuple[str, str]] = {}
+    # Maps (type, id) to the keys in _aliases which refer to it.
+    self._entry_aliases: Dict[Tuple[str, str], Set[Hashable]] = {}
+    # Maps object ids to the ids of their frames that have been stored.
+    self._object_frames: Dict[str, Set[str]] = {}
+    # Number of invalidations of single objects, and the value it had after
+    # the last invalidation of each (type, id), so that protos which were
+    # fetched before the invalidation are not stored.
+    self._object_invalidations = 0
+    self._invalidated_at: Dict[Tuple[str, str], int] = {}
+    # FULL listing of all objects as (generation, expiry time, protos).
+    self._object_list: Optional[
+        Tuple[int, float, List[object_world_service_pb2.Object]]
+    ] = None
+    self._hits = 0
+    self._misses = 0
+    self._invalidations = 0
+
+  @property
+  def generation(self) -> int:
+    """The current generation; incremented by every invalidation."""
+    return self._generation
+
+  @property
+  def stats(self) -> CacheStats:
+    """A snapshot of the hit and miss statistics."""
+    with self._lock:
+      return CacheStats(
+          hits=self._hits,
+          misses=self._misses,
+          invalidations=self._invalidations,
+      )
+
+  def version(self) -> CacheVersion:
+    """Returns the current version, to be taken before fetching protos."""
+    with self._lock:
+      return self._version_locked()
+
+  def _version_locked(self) -> CacheVersion:
+    return CacheVersion(
+        generation=self._generation,
+        object_invalidations=self._object_invalidations,
+    )
+
+  def reset_stats(self) -> None:
+    """Resets the hit and miss statistics."""
+    with self._lock:
+      self._hits = 0
+      self._misses = 0
+      self._invalidations = 0
+
+  def invalidate(self) -> None:
+    """Invalidates all entries, e.g., after the world has been modified."""
+    with self._lock:
+      self._generation += 1
+      self._invalidations += 1
+      self._entries.clear()
+      self._aliases.clear()
+      self._entry_aliases.clear()
+      self._object_frames.clear()
+      self._invalidated_at.clear()
+      self._object_list = None
+
+  def invalidate_object(self, object_id: str) -> None:
+    """Invalidates a single object, its frames and the listing of all objects.
+
+    Entries of other objects and their frames stay valid. Use this after an
+    update which only modifies the object and its frames, e.g., its joint
+    positions, which move the frames attached to its links.
+
+    Args:
+      object_id: The id of the object.
+    """
+    with self._lock:
+      entry_keys = [(_OBJECT, object_id)] + [
+          (_FRAME, frame_id)
+          for frame_id in self._object_frames.pop(object_id, ())
+      ]
+      self._object_invalidations += 1
+      for entry_key in entry_keys:
+        self._invalidated_at[entry_key] = self._object_invalidations
+        self._entries.pop(entry_key, None)
+        for alias in self._entry_aliases.pop(entry_key, ()):
+          if self._aliases.get(alias) == entry_key:
+            del self._aliases[alias]
+      self._object_list = None
+
+  def _lookup(self, key: Hashable) -> Optional[_Proto]:
+    entry_key = self._aliases.get(key, key)
+    entry = self._entries.get(entry_key)
+    if entry is None:
+      return None
+    generation, expiry, proto = entry
+    if generation != self._generation or self._clock() >= expiry:
+      del self._entries[entry_key]
+      return None
+    return proto
+
+  def _put(
+      self,
+      resource_type: str,
+      proto: _Proto,
+      aliases: Iterable[Hashable],
+      version: CacheVersion,
+  ) -> None:
+    if version.generation != self._generation:
+      # The world was modified while the proto was being fetched.
+      return
+    entry_key = (resource_type, proto.id)
+    # A frame is invalidated together with the object it belongs to.
+    object_id = proto.object.id if resource_type == _FRAME else proto.id
+    object_invalidations = version.object_invalidations
+    if (
+        self._invalidated_at.get(entry_key, 0) > object_invalidations
+        or self._invalidated_at.get((_OBJECT, object_id), 0)
+        > object_invalidations
+    ):
+      # The object was modified while the proto was being fetched.
+      return
+    self._entries[entry_key] = (
+        version.generation,
+        self._clock() + self._ttl,
+        proto,
+    )
+    if resource_type == _FRAME and object_id:
+      self._object_frames.setdefault(object_id, set()).add(proto.id)
+    for alias in aliases:
+      if alias != entry_key:
+        self._aliases[alias] = entry_key
+        self._entry_aliases.setdefault(entry_key, set()).add(alias)
+
+  def _get(
+      self,
+      resource_type: str,
+      key: Optional[Hashable],
+      fetch: Callable[[], _Proto],
+      aliases_of: Callable[[_Proto], Iterable[Hashable]],
+  ) -> _Proto:
+    if key is None:
+      return fetch()
+    with self._lock:
+      proto = self._lookup(key)
+      if proto is not None:
+        self._hits += 1
+        return proto
+      self._misses += 1
+      version = self._version_locked()
+
+    # Fetch without holding the lock so that concurrent lookups of other
+    # resources are not blocked by the RPC.
+    proto = fetch()
+    with self._lock:
+      self._put(resource_type, proto, [key, *aliases_of(proto)], version)
+    return proto
+
+  def get_object(
+      self,
+      key: Optional[Hashable],
+      fetch: Callable[[], object_world_service_pb2.Object],
+  ) -> object_world_service_pb2.Object:
+    """Returns the cached object proto for key or fetches and caches it.
+
+    Args:
+      key: A key as returned by object_key(). If None, the proto is always
+        fetched and not cached.
+      fetch: Fetches the FULL object proto from the world service.
+
+    Returns:
+      The object proto.
+    """
+    return self._get(_OBJECT, key, fetch, _object_aliases)
+
+  def get_frame(
+      self,
+      key: Optional[Hashable],
+      fetch: Callable[[], object_world_service_pb2.Frame],
+  ) -> object_world_service_pb2.Frame:
+    """Returns the cached frame proto for key or fetches and caches it.
+
+    Args:
+      key: A key as returned by frame_key(). If None, the proto is always
+        fetched and not cached.
+      fetch: Fetches the frame proto from the world service.
+
+    Returns:
+      The frame proto.
+    """
+    return self._get(_FRAME, key, fetch, _frame_aliases)
+
+  def put_object(
+      self, proto: object_world_service_pb2.Object, version: CacheVersion
+  ) -> None:
+    """Adds a FULL object proto and the frames it contains to the cache.
+
+    Args:
+      proto: The object in the FULL view.
+      version: The version taken before the proto was fetched.
+    """
+    with self._lock:
+      self._put_object_with_frames(proto, version)
+
+  def _put_object_with_frames(
+      self, proto: object_world_service_pb2.Object, version: CacheVersion
+  ) -> None:
+    self._put(_OBJECT, proto, _object_aliases(proto), version)
+    for frame in proto.frames:
+      self._put(_FRAME, frame, _frame_aliases(frame), version)
+
+  def put_object_list(
+      self,
+      protos: Sequence[object_world_service_pb2.Object],
+      version: CacheVersion,
+  ) -> None:
+    """Caches a FULL listing of all objects in the world.
+
+    Also adds every object and frame of the listing to the cache.
+
+    Args:
+      protos: All objects in the world in the FULL view.
+      version: The version taken before the listing was fetched.
+    """
+    with self._lock:
+      if version != self._version_locked():
+        # Some object was modified while the listing was being fetched.
+        return
+      for proto in protos:
+        self._put_object_with_frames(proto, version)
+      self._object_list = (
+          version.generation,
+          self._clock() + self._ttl,
+          list(protos),
+      )
+
+  def get_object_list(
+      self,
+  ) -> Optional[List[object_world_service_pb2.Object]]:
+    """Returns the cached FULL listing of all objects or None."""
+    with self._lock:
+      if self._object_list is not None:
+        generation, expiry, protos = self._object_list
+        if generation == self._generation and self._clock() < expiry:
+          self._hits += 1
+          return protos
+        self._object_list = None
+      self._misses += 1
+      return None
+
+  def put_frame(
+      self, proto: object_world_service_pb2.Frame, version: CacheVersion
+  ) -> None:
+    """Adds a frame proto to the cache.
+
+    Args:
+      proto: The frame.
+      version: The version taken before the proto was fetched.
+    """
+    with self._lock:
+      self._put(_FRAME, proto, _frame_aliases(proto), version)
+
+
+def _object_aliases(
+    proto: object_world_service_pb2.Object,
+) -> Iterable[Hashable]:
+  if proto.name_is_global_alias or proto.id == object_world_ids.ROOT_OBJECT_ID:
+    return [('object_name', proto.name)]
+  return []
+
+
+def _frame_aliases(
+    proto: object_world_service_pb2.Frame,
+) -> Iterable[Hashable]:
+  return [('frame_name', proto.object.name, proto.name)]
@@ -0,0 +1,338 @@
+# Copyright 2023 Intrinsic Innovation LLC
+
+"""Tests for object_world_proto_cache."""
+
+from unittest import mock
+
+from absl.testing import absltest
+from intrinsic.util.testing import fake_clock
+from intrinsic.world.proto import object_world_refs_pb2
+from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.python import object_world_ids
+from intrinsic.world.python import object_world_proto_cache
+
+
+class ObjectWorldProtoCacheTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._clock = fake_clock.FakeClock()
+    self._cache = object_world_proto_cache.ObjectWorldProtoCache(
+        10.0, clock=self._clock
+    )
+
+  def _object_proto(self, object_id: str, name: str = 'my_object'):
+    return object_world_service_pb2.Object(
+        id=object_id, name=name, name_is_global_alias=True
+    )
+
+  def _frame_proto(
+      self,
+      frame_id: str,
+      name: str,
+      parent: object_world_service_pb2.Object,
+  ) -> object_world_service_pb2.Frame:
+    return object_world_service_pb2.Frame(
+        id=frame_id,
+        name=name,
+        object=object_world_service_pb2.IdAndName(
+            id=parent.id, name=parent.name
+        ),
+    )
+
+  def test_get_object_fetches_once(self):
+    fetch = mock.Mock(return_value=self._object_proto('15'))
+    key = object_world_proto_cache.object_key(
+        object_world_refs_pb2.ObjectReference(id='15')
+    )
+
+    self.assertEqual(self._cache.get_object(key, fetch).id, '15')
+    self.assertEqual(self._cache.get_object(key, fetch).id, '15')
+
+    fetch.assert_called_once()
+    self.assertEqual(
+        self._cache.stats,
+        object_world_proto_cache.CacheStats(hits=1, misses=1),
+    )
+    self.assertEqual(self._cache.stats.hit_rate, 0.5)
+
+  def test_lookup_by_name_after_lookup_by_id(self):
+    self._cache.get_object(
+        object_world_proto_cache.object_key(
+            object_world_refs_pb2.ObjectReference(id='15')
+        ),
+        mock.Mock(return_value=self._object_proto('15')),
+    )
+    fetch = mock.Mock()
+
+    cached = self._cache.get_object(
+        object_world_proto_cache.object_key(
+            object_world_ids.WorldObjectName('my_object')
+        ),
+        fetch,
+    )
+
+    self.assertEqual(cached.id, '15')
+    fetch.assert_not_called()
+
+  def test_entries_expire(self):
+    fetch = mock.Mock(return_value=self._object_proto('15'))
+    key = object_world_proto_cache.object_key(
+        object_world_refs_pb2.ObjectReference(id='15')
+    )
+
+    self._cache.get_object(key, fetch)
+    self._clock.now = 10.0
+    self._cache.get_object(key, fetch)
+
+    self.assertEqual(fetch.call_count, 2)
+
+  def test_invalidate(self):
+    fetch = mock.Mock(return_value=self._object_proto('15'))
+    key = object_world_proto_cache.object_key(
+        object_world_refs_pb2.ObjectReference(id='15')
+    )
+
+    self._cache.get_object(key, fetch)
+    self._cache.invalidate()
+    self._cache.get_object(key, fetch)
+
+    self.assertEqual(fetch.call_count, 2)
+    self.assertEqual(self._cache.generation, 1)
+    self.assertEqual(self._cache.stats.invalidations, 1)
+
+  def test_proto_fetched_during_invalidation_is_not_cached(self):
+    key = object_world_proto_cache.object_key(
+        object_world_refs_pb2.ObjectReference(id='15')
+    )
+
+    def fetch_and_invalidate():
+      self._cache.invalidate()
+      return self._object_proto('15')
+
+    self._cache.get_object(key, fetch_and_invalidate)
+    fetch = mock.Mock(return_value=self._object_proto('15'))
+    self._cache.get_object(key, fetch)
+
+    fetch.assert_called_once()
+
+  def test_invalidate_object_keeps_other_entries(self):
+    self._cache.put_object_list(
+        [self._object_proto('15', 'a'), self._object_proto('16', 'b')],
+        self._cache.version(),
+    )
+    fetch = mock.Mock(return_value=self._object_proto('15', 'a'))
+
+    self._cache.invalidate_object('15')
+
+    self._cache.get_object(
+        object_world_proto_cache.object_key(
+            object_world_refs_pb2.ObjectReference(id='16')
+        ),
+        fetch,
+    )
+    fetch.assert_not_called()
+    self._cache.get_object(
+        object_world_proto_cache.object_key(
+            object_world_ids.WorldObjectName('a')
+        ),
+        fetch,
+    )
+    fetch.assert_called_once()
+    self.assertIsNone(self._cache.get_object_list())
+    self.assertEqual(self._cache.generation, 0)
+
+  def test_object_fetched_during_its_invalidation_is_not_cached(self):
+    key = object_world_proto_cache.object_key(
+        object_world_refs_pb2.ObjectReference(id='15')
+    )
+
+    def fetch_and_invalidate():
+      self._cache.invalidate_object('15')
+      return self._object_proto('15')
+
+    self._cache.get_object(key, fetch_and_invalidate)
+    fetch = mock.Mock(return_value=self._object_proto('15'))
+    self._cache.get_object(key, fetch)
+    self._cache.get_object(key, fetch)
+
+    fetch.assert_called_once()
+
+  def test_invalidate_object_invalidates_its_frames(self):
+    robot = self._object_proto('15', 'robot')
+    robot.frames.append(self._frame_proto('16', 'flange', robot))
+    other = self._object_proto('17', 'other')
+    other.frames.append(self._frame_proto('18', 'tool', other))
+    self._cache.put_object_list([robot, other], self._cache.version())
+    fetch = mock.Mock(return_value=self._frame_proto('16', 'flange', robot))
+
+    self._cache.invalidate_object('15')
+
+    self._cache.get_frame(
+        object_world_proto_cache.frame_key(
+            object_world_refs_pb2.FrameReference(id='18')
+        ),
+        fetch,
+    )
+    fetch.assert_not_called()
+    self._cache.get_frame(
+        object_world_proto_cache.frame_key(
+            object_world_refs_pb2.FrameReference(
+                by_name=object_world_refs_pb2.FrameReferenceByName(
+                    object_name='robot', frame_name='flange'
+                )
+            )
+        ),
+        fetch,
+    )
+    fetch.assert_called_once()
+    self._cache.invalidate_object('15')
+    self._cache.get_frame(
+        object_world_proto_cache.frame_key(
+            object_world_refs_pb2.FrameReference(id='16')
+        ),
+        fetch,
+    )
+    self.assertEqual(fetch.call_count, 2)
+
+  def test_frame_fetched_during_invalidation_of_its_object_is_not_cached(
+      self,
+  ):
+    robot = self._object_proto('15', 'robot')
+    key = object_world_proto_cache.frame_key(
+        object_world_refs_pb2.FrameReference(id='16')
+    )
+
+    def fetch_and_invalidate():
+      self._cache.invalidate_object('15')
+      return self._frame_proto('16', 'flange', robot)
+
+    self._cache.get_frame(key, fetch_and_invalidate)
+    fetch = mock.Mock(return_value=self._frame_proto('16', 'flange', robot))
+    self._cache.get_frame(key, fetch)
+    self._cache.get_frame(key, fetch)
+
+    fetch.assert_called_once()
+
+  def test_put_after_invalidation_during_fetch_is_dropped(self):
+    robot = self._object_proto('15', 'robot')
+    flange = self._frame_proto('16', 'flange', robot)
+    robot.frames.append(flange)
+    version = self._cache.version()
+    # The object is modified between the fetch and the put.
+    self._cache.invalidate_object('15')
+
+    self._cache.put_object(robot, version)
+    self._cache.put_frame(flange, version)
+    self._cache.put_object_list([robot], version)
+
+    self.assertIsNone(self._cache.get_object_list())
+    fetch_object = mock.Mock(return_value=robot)
+    self._cache.get_object(
+        object_world_proto_cache.object_key(
+            object_world_refs_pb2.ObjectReference(id='15')
+        ),
+        fetch_object,
+    )
+    fetch_object.assert_called_once()
+    fetch_frame = mock.Mock(return_value=flange)
+    self._cache.get_frame(
+        object_world_proto_cache.frame_key(
+            object_world_refs_pb2.FrameReference(id='16')
+        ),
+        fetch_frame,
+    )
+    fetch_frame.assert_called_once()
+
+  def test_object_list_fetched_during_invalidation_of_any_object_is_dropped(
+      self,
+  ):
+    version = self._cache.version()
+    self._cache.invalidate_object('16')
+
+    self._cache.put_object_list([self._object_proto('15')], version)
+
+    self.assertIsNone(self._cache.get_object_list())
+
+  def test_objects_and_frames_are_cached_separately(self):
+    self._cache.put_object(self._object_proto('15'), self._cache.version())
+    fetch = mock.Mock(return_value=object_world_service_pb2.Frame(id='15'))
+
+    frame = self._cache.get_frame(
+        object_world_proto_cache.frame_key(
+            object_world_refs_pb2.FrameReference(id='15')
+        ),
+        fetch,
+    )
+
+    self.assertIsInstance(frame, object_world_service_pb2.Frame)
+    fetch.assert_called_once()
+
+  def test_put_object_caches_frames(self):
+    object_proto = self._object_proto('15')
+    object_proto.frames.append(
+        object_world_service_pb2.Frame(
+            id='16',
+            name='my_frame',
+            object=object_world_service_pb2.IdAndName(
+                id='15', name='my_object'
+            ),
+        )
+    )
+    self._cache.put_object(object_proto, self._cache.version())
+    fetch = mock.Mock()
+
+    frame = self._cache.get_frame(
+        object_world_proto_cache.frame_key(
+            object_world_refs_pb2.FrameReference(
+                by_name=object_world_refs_pb2.FrameReferenceByName(
+                    object_name='my_object', frame_name='my_frame'
+                )
+            )
+        ),
+        fetch,
+    )
+
+    self.assertEqual(frame.id, '16')
+    fetch.assert_not_called()
+
+  def test_object_list(self):
+    self.assertIsNone(self._cache.get_object_list())
+
+    self._cache.put_object_list(
+        [self._object_proto('15')], self._cache.version()
+    )
+    fetch = mock.Mock()
+
+    self.assertEqual(
+        [proto.id for proto in self._cache.get_object_list()], ['15']
+    )
+    self.assertEqual(
+        self._cache.get_object(
+            object_world_proto_cache.object_key(
+                object_world_ids.WorldObjectName('my_object')
+            ),
+            fetch,
+        ).id,
+        '15',
+    )
+    fetch.assert_not_called()
+
+    self._cache.invalidate()
+    self.assertIsNone(self._cache.get_object_list())
+
+  def test_uncacheable_key_always_fetches(self):
+    fetch = mock.Mock(return_value=self._object_proto('15'))
+
+    self._cache.get_object(None, fetch)
+    self._cache.get_object(None, fetch)
+
+    self.assertEqual(fetch.call_count, 2)
+
+  def test_invalid_ttl_raises(self):
+    with self.assertRaises(ValueError):
+      object_world_proto_cache.ObjectWorldProtoCache(0)
+
+
+if __name__ == '__main__':
+  absltest.main()
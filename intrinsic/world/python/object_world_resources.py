@@ -15,6 +15,7 @@ from intrinsic.world.proto import object_world_service_pb2
 from intrinsic.world.proto import object_world_service_pb2_grpc
 from intrinsic.world.proto import object_world_updates_pb2
 from intrinsic.world.python import object_world_ids
+from intrinsic.world.python import object_world_proto_cache
 from intrinsic.world.robot_payload.python import robot_payload
 
 
@@ -52,12 +53,47 @@ class TransformNode(metaclass=abc.ABCMeta):
   _proto: TransformNodeProto
 
   def __init__(
-      self, stub: object_world_service_pb2_grpc.ObjectWorldServiceStub
+      self,
+      stub: object_world_service_pb2_grpc.ObjectWorldServiceStub,
+      proto_cache: Optional[object_world_proto_cache.ObjectWorldProtoCache],
   ):
     # The stub is needed for __getattr__ so that auto completion and addressing
     # with chained . operators can be supported.
     # Refrain from using the stub apart from __getattr__ or its helpers.
     self._stub = stub
+    # Optional cache shared with the ObjectWorldClient that created this node.
+    self._proto_cache = proto_cache
+
+  def _fetch_object_proto(
+      self, object_id: object_world_ids.ObjectWorldResourceId
+  ) -> object_world_service_pb2.Object:
+    """Returns the FULL proto of an object in the same world by its id."""
+    request = object_world_service_pb2.GetObjectRequest(
+        world_id=self.world_id,
+        object=object_world_refs_pb2.ObjectReference(id=object_id),
+        view=object_world_updates_pb2.ObjectView.FULL,
+    )
+    if self._proto_cache is None:
+      return self._stub.GetObject(request)
+    return self._proto_cache.get_object(
+        object_world_proto_cache.object_key(request.object),
+        lambda: self._stub.GetObject(request),
+    )
+
+  def _fetch_frame_proto(
+      self, frame_id: object_world_ids.ObjectWorldResourceId
+  ) -> object_world_service_pb2.Frame:
+    """Returns the proto of a frame in the same world by its id."""
+    request = object_world_service_pb2.GetFrameRequest(
+        world_id=self.world_id,
+        frame=object_world_refs_pb2.FrameReference(id=frame_id),
+    )
+    if self._proto_cache is None:
+      return self._stub.GetFrame(request)
+    return self._proto_cache.get_frame(
+        object_world_proto_cache.frame_key(request.frame),
+        lambda: self._stub.GetFrame(request),
+    )
 
   @property
   @abc.abstractmethod
@@ -127,8 +163,12 @@ class Frame(TransformNode):
       self,
       world_frame: object_world_service_pb2.Frame,
       stub: object_world_service_pb2_grpc.ObjectWorldServiceStub,
+      *,
+      proto_cache: Optional[
+          object_world_proto_cache.ObjectWorldProtoCache
+      ] = None,
   ):
-    super().__init__(stub)
+    super().__init__(stub, proto_cache)
     self._proto: object_world_service_pb2.Frame = world_frame
 
   @property
@@ -212,20 +252,17 @@ class Frame(TransformNode):
   @property
   def parent(self) -> Optional[TransformNode]:
     if self.parent_frame_id is not None:
-      get_frame_request = object_world_service_pb2.GetFrameRequest(
-          world_id=self._proto.world_id,
-          frame=object_world_refs_pb2.FrameReference(id=self.parent_frame_id),
+      return Frame(
+          self._fetch_frame_proto(self.parent_frame_id),
+          self._stub,
+          proto_cache=self._proto_cache,
       )
-      frame_proto = self._stub.GetFrame(get_frame_request)
-      return Frame(frame_proto, self._stub)
 
-    get_object_request = object_world_service_pb2.GetObjectRequest(
-        world_id=self._proto.world_id,
-        object=object_world_refs_pb2.ObjectReference(id=self.object_id),
-        view=object_world_updates_pb2.ObjectView.FULL,
+    return WorldObject(
+        self._fetch_object_proto(self.object_id),
+        self._stub,
+        proto_cache=self._proto_cache,
     )
-    object_proto = self._stub.GetObject(get_object_request)
-    return WorldObject(object_proto, self._stub)
 
   @property
   def parent_t_this(self) -> data_types.Pose3:
@@ -245,6 +282,10 @@ class WorldObject(TransformNode):
   Represents an object in the object-world. It wraps a proto and provides
   conversions to appropriate Python types.
 
+  If created from a BASIC view of the object, data that is only part of the
+  FULL view (e.g., entities, frame poses or the kinematic object component) is
+  fetched from the world service on first access.
+
   Attributes:
     id: The unique id of the object in the world.
     name: The human-readable name of the object which is unique in the world.
@@ -280,8 +321,23 @@ class WorldObject(TransformNode):
       self,
       world_object: object_world_service_pb2.Object,
       stub: object_world_service_pb2_grpc.ObjectWorldServiceStub,
+      *,
+      view: object_world_updates_pb2.ObjectView = object_world_updates_pb2.ObjectView.FULL,
+      proto_cache: Optional[
+          object_world_proto_cache.ObjectWorldProtoCache
+      ] = None,
   ):
-    super().__init__(stub)
+    super().__init__(stub, proto_cache)
+    # The service may fall back to a partial view for UNSPECIFIED, so only a
+    # proto requested with the FULL view is known to be complete.
+    self._has_full_view: bool = view == object_world_updates_pb2.ObjectView.FULL
+    if self._has_full_view:
+      self._validate_full_proto(world_object)
+    self._object_proto: object_world_service_pb2.Object = world_object
+
+  def _validate_full_proto(
+      self, world_object: object_world_service_pb2.Object
+  ) -> None:
     if world_object.type == object_world_service_pb2.ObjectType.ROOT:
       world_object.object_component.CopyFrom(
           object_world_service_pb2.ObjectComponent()
@@ -291,40 +347,64 @@ class WorldObject(TransformNode):
           'The world_object proto is missing the field "object_component". '
           f'Cannot create a {self.__class__.__name__} without this field.'
       )
-    self._proto: object_world_service_pb2.Object = world_object
+
+  @error_handling.retry_on_grpc_unavailable
+  def _get_full_proto(self) -> object_world_service_pb2.Object:
+    return self._fetch_object_proto(self.id)
+
+  @property
+  def _basic_proto(self) -> object_world_service_pb2.Object:
+    """Returns the proto without fetching data missing from a BASIC view."""
+    return self._object_proto
+
+  @property
+  def _proto(self) -> object_world_service_pb2.Object:
+    """Returns the FULL proto, fetching it on first access if necessary."""
+    if not self._has_full_view:
+      world_object = self._get_full_proto()
+      self._validate_full_proto(world_object)
+      self._object_proto = world_object
+      self._has_full_view = True
+    return self._object_proto
+
+  @property
+  def world_id(self) -> str:
+    return self._basic_proto.world_id
 
   @property
   def id(self) -> object_world_ids.ObjectWorldResourceId:
-    return object_world_ids.ObjectWorldResourceId(self._proto.id)
+    return object_world_ids.ObjectWorldResourceId(self._basic_proto.id)
 
   @property
   def name(self) -> object_world_ids.WorldObjectName:
-    return object_world_ids.WorldObjectName(self._proto.name)
+    return object_world_ids.WorldObjectName(self._basic_proto.name)
 
   @property
   def frame_ids(self) -> List[object_world_ids.ObjectWorldResourceId]:
     return [
         object_world_ids.ObjectWorldResourceId(frame.id)
-        for frame in self._proto.frames
+        for frame in self._basic_proto.frames
     ]
 
   @property
   def frame_names(self) -> List[object_world_ids.FrameName]:
     return [
-        object_world_ids.FrameName(frame.name) for frame in self._proto.frames
+        object_world_ids.FrameName(frame.name)
+        for frame in self._basic_proto.frames
     ]
 
   @property
   def frames(self) -> List[Frame]:
     return [
-        Frame(frame_proto, self._stub) for frame_proto in self._proto.frames
+        Frame(frame_proto, self._stub, proto_cache=self._proto_cache)
+        for frame_proto in self._proto.frames
     ]
 
   @property
   def child_frame_ids(self) -> List[object_world_ids.ObjectWorldResourceId]:
     return [
         object_world_ids.ObjectWorldResourceId(frame.id)
-        for frame in self._proto.frames
+        for frame in self._basic_proto.frames
         if not frame.HasField('parent_frame')
     ]
 
@@ -332,14 +412,14 @@ class WorldObject(TransformNode):
   def child_frame_names(self) -> List[object_world_ids.FrameName]:
     return [
         object_world_ids.FrameName(frame.name)
-        for frame in self._proto.frames
+        for frame in self._basic_proto.frames
         if not frame.HasField('parent_frame')
     ]
 
   @property
   def child_frames(self) -> List[Frame]:
     return [
-        Frame(frame_proto, self._stub)
+        Frame(frame_proto, self._stub, proto_cache=self._proto_cache)
         for frame_proto in self._proto.frames
         if not frame_proto.HasField('parent_frame')
     ]
@@ -355,7 +435,7 @@ class WorldObject(TransformNode):
     """
     for frame_proto in self._proto.frames:
       if object_world_ids.FrameName(frame_proto.name) == frame_name:
-        return Frame(frame_proto, self._stub)
+        return Frame(frame_proto, self._stub, proto_cache=self._proto_cache)
     raise ValueError(
         f'Frame with name "{frame_name}" attached to the object'
         f'{self.name}" does not exist.'
@@ -365,7 +445,9 @@ class WorldObject(TransformNode):
       self, child_name: object_world_ids.WorldObjectName
   ) -> TransformNode:
     return create_object_with_auto_type(
-        self._get_child_proto(child_name), self._stub
+        self._get_child_proto(child_name),
+        self._stub,
+        proto_cache=self._proto_cache,
     )
 
   @error_handling.retry_on_grpc_unavailable
@@ -381,47 +463,48 @@ class WorldObject(TransformNode):
       The child with child_name that belongs to the object
     """
     child_id = next(
-        child.id for child in self._proto.children if child.name == child_name
+        child.id
+        for child in self._basic_proto.children
+        if child.name == child_name
     )
-    request = object_world_service_pb2.GetObjectRequest(
-        world_id=self._proto.world_id,
-        object=object_world_refs_pb2.ObjectReference(id=child_id),
-        view=object_world_updates_pb2.ObjectView.FULL,
+    return self._fetch_object_proto(
+        object_world_ids.ObjectWorldResourceId(child_id)
     )
-    return self._stub.GetObject(request)
 
   @property
   def parent_name(self) -> object_world_ids.WorldObjectName:
-    return object_world_ids.WorldObjectName(self._proto.parent.name)
+    return object_world_ids.WorldObjectName(self._basic_proto.parent.name)
 
   @property
   def parent_id(self) -> object_world_ids.ObjectWorldResourceId:
-    return object_world_ids.ObjectWorldResourceId(self._proto.parent.id)
+    return object_world_ids.ObjectWorldResourceId(self._basic_proto.parent.id)
 
   @property
   def child_ids(self) -> List[object_world_ids.ObjectWorldResourceId]:
     return [
         object_world_ids.ObjectWorldResourceId(child.id)
-        for child in self._proto.children
+        for child in self._basic_proto.children
     ]
 
   @property
   def child_names(self) -> List[object_world_ids.WorldObjectName]:
     return [
         object_world_ids.WorldObjectName(child.name)
-        for child in self._proto.children
+        for child in self._basic_proto.children
     ]
 
   def _debug_hint(self) -> str:
     if self.id == object_world_ids.ROOT_OBJECT_ID:
       return ''
     return 'Created from path {}'.format(
-        '.'.join(['world'] + list(self._proto.object_full_path.object_names))
+        '.'.join(
+            ['world'] + list(self._basic_proto.object_full_path.object_names)
+        )
     )
 
   @property
   def reference(self) -> object_world_refs_pb2.ObjectReference:
-    if self._proto.name_is_global_alias:
+    if self._basic_proto.name_is_global_alias:
       return object_world_refs_pb2.ObjectReference(
           by_name=object_world_refs_pb2.ObjectReferenceByName(
               object_name=self.name
@@ -435,7 +518,7 @@ class WorldObject(TransformNode):
   def transform_node_reference(
       self,
   ) -> object_world_refs_pb2.TransformNodeReference:
-    if self._proto.name_is_global_alias:
+    if self._basic_proto.name_is_global_alias:
       return object_world_refs_pb2.TransformNodeReference(
           by_name=object_world_refs_pb2.TransformNodeReferenceByName(
               object=object_world_refs_pb2.ObjectReferenceByName(
@@ -449,21 +532,19 @@ class WorldObject(TransformNode):
 
   @property
   def parent(self) -> Optional['WorldObject']:
-    if self._proto.type == object_world_service_pb2.ObjectType.ROOT:
+    if self._basic_proto.type == object_world_service_pb2.ObjectType.ROOT:
       return None
 
-    request = object_world_service_pb2.GetObjectRequest(
-        world_id=self._proto.world_id,
-        object=object_world_refs_pb2.ObjectReference(id=self.parent_id),
-        view=object_world_updates_pb2.ObjectView.FULL,
+    return WorldObject(
+        self._fetch_object_proto(self.parent_id),
+        self._stub,
+        proto_cache=self._proto_cache,
     )
-    object_proto = self._stub.GetObject(request)
-    return WorldObject(object_proto, self._stub)
 
   @property
   def parent_t_this(self) -> data_types.Pose3:
     return math_proto_conversion.pose_from_proto(
-        self._proto.object_component.parent_t_this
+        self._basic_proto.object_component.parent_t_this
     )
 
   def __getattr__(self, child_name: str) -> TransformNode:
@@ -564,18 +645,16 @@ class KinematicObject(WorldObject):
       is not set.
   """
 
-  def __init__(
-      self,
-      world_object: object_world_service_pb2.Object,
-      stub: object_world_service_pb2_grpc.ObjectWorldServiceStub,
-  ):
+  def _validate_full_proto(
+      self, world_object: object_world_service_pb2.Object
+  ) -> None:
     if not world_object.HasField('kinematic_object_component'):
       raise ValueError(
           'The world_object proto is missing the field '
           '"kinematic_object_component". Cannot create a '
           f'{self.__class__.__name__} without this field.'
       )
-    super().__init__(world_object, stub)
+    super()._validate_full_proto(world_object)
 
   @property
   def joint_positions(self) -> List[float]:
@@ -630,7 +709,7 @@ class KinematicObject(WorldObject):
   def iso_flange_frames(self) -> List[Frame]:
     flanges = self.iso_flange_frame_ids
     return [
-        Frame(frame, self._stub)
+        Frame(frame, self._stub, proto_cache=self._proto_cache)
         for frame in self._proto.frames
         if frame.id in flanges
     ]
@@ -678,6 +757,9 @@ class KinematicObject(WorldObject):
 def create_object_with_auto_type(
     object_proto: object_world_service_pb2.Object,
     stub: object_world_service_pb2_grpc.ObjectWorldServiceStub,
+    *,
+    view: object_world_updates_pb2.ObjectView = object_world_updates_pb2.ObjectView.FULL,
+    proto_cache: Optional[object_world_proto_cache.ObjectWorldProtoCache] = None,
 ) -> WorldObject:
   """Creates an object from a object proto.
 
@@ -687,11 +769,18 @@ def create_object_with_auto_type(
   Args:
     object_proto: The object proto.
     stub:  The object world service stub.
+    view: The view with which object_proto was requested. If not FULL, the
+      returned object fetches the FULL view on first access of any data that is
+      not part of the BASIC view.
+    proto_cache: Optional cache through which the object fetches related
+      objects and frames (e.g. its parent or children).
 
   Returns:
     An object in the world.
   """
   if object_proto.type == object_world_service_pb2.ObjectType.KINEMATIC_OBJECT:
-    return KinematicObject(object_proto, stub)
+    return KinematicObject(
+        object_proto, stub, view=view, proto_cache=proto_cache
+    )
   else:
-    return WorldObject(object_proto, stub)
+    return WorldObject(object_proto, stub, view=view, proto_cache=proto_cache)
@@ -15,6 +15,7 @@ from intrinsic.math.python import data_types
 from intrinsic.solutions.testing import compare
 from intrinsic.world.proto import object_world_refs_pb2
 from intrinsic.world.proto import object_world_service_pb2
+from intrinsic.world.proto import object_world_updates_pb2
 
 from intrinsic.world.python import object_world_ids
 from intrinsic.world.python import object_world_resources
@@ -721,6 +722,77 @@ my_object: WorldObject(id=15)
 
     self.assertIs(type(my_object.proto), object_world_service_pb2.Object)
 
+  def test_object_from_basic_view_fetches_full_view_lazily(self):
+    basic_proto = object_world_service_pb2.Object(
+        world_id='world',
+        name='my_object',
+        id='15',
+        parent=object_world_service_pb2.IdAndName(id='root', name='root'),
+        type=object_world_service_pb2.KINEMATIC_OBJECT,
+    )
+    full_proto = text_format.Parse(
+        """
+          world_id: 'world'
+          name: 'my_object'
+          id: '15'
+          type: KINEMATIC_OBJECT
+          object_component: {}
+          kinematic_object_component: { joint_positions: [1.0, 2.0] }
+        """,
+        object_world_service_pb2.Object(),
+    )
+    self._stub.GetObject.return_value = full_proto
+
+    my_object = object_world_resources.create_object_with_auto_type(
+        basic_proto,
+        self._stub,
+        view=object_world_updates_pb2.ObjectView.BASIC,
+    )
+
+    self.assertIsInstance(my_object, object_world_resources.KinematicObject)
+    self.assertEqual(my_object.name, 'my_object')
+    self.assertEqual(my_object.id, '15')
+    self.assertEqual(my_object.parent_id, 'root')
+    self._stub.GetObject.assert_not_called()
+
+    self.assertEqual(my_object.joint_positions, [1.0, 2.0])
+    self.assertEqual(my_object.joint_positions, [1.0, 2.0])
+    self._stub.GetObject.assert_called_once_with(
+        object_world_service_pb2.GetObjectRequest(
+            world_id='world',
+            object=object_world_refs_pb2.ObjectReference(id='15'),
+            view=object_world_updates_pb2.ObjectView.FULL,
+        )
+    )
+
+  def test_object_from_unspecified_view_fetches_full_view_lazily(self):
+    basic_proto = object_world_service_pb2.Object(
+        world_id='world',
+        name='my_object',
+        id='15',
+        type=object_world_service_pb2.PHYSICAL_OBJECT,
+    )
+    self._stub.GetObject.return_value = text_format.Parse(
+        """
+          world_id: 'world'
+          name: 'my_object'
+          id: '15'
+          type: PHYSICAL_OBJECT
+          object_component: {}
+        """,
+        object_world_service_pb2.Object(),
+    )
+
+    my_object = object_world_resources.create_object_with_auto_type(
+        basic_proto,
+        self._stub,
+        view=object_world_updates_pb2.ObjectView.OBJECT_VIEW_UNSPECIFIED,
+    )
+
+    self._stub.GetObject.assert_not_called()
+    self.assertTrue(my_object.proto.HasField('object_component'))
+    self._stub.GetObject.assert_called_once()
+
 
 class KinematicObjectTests(absltest.TestCase):
 